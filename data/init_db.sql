@@ -1,3 +1,5 @@
+DROP TABLE IF EXISTS statistiques_realisabilite CASCADE ;
+DROP TABLE IF EXISTS partage_inventaire CASCADE ;
 DROP TABLE IF EXISTS inventaire_ingredient CASCADE ;
 DROP TABLE IF EXISTS cocktail_ingredient CASCADE ;
 DROP TABLE IF EXISTS commentaire CASCADE;
@@ -35,9 +37,15 @@ CREATE TABLE cocktail (
     instructions_de TEXT,
     instructions_es TEXT,
     instructions_fr TEXT,
-    instructions_it TEXT
+    instructions_it TEXT,
+    nb_ingredients INTEGER NOT NULL DEFAULT 0
 );
 
+-- Listes par nom paginées par clé : WHERE (nom_cocktail, id_cocktail) > (...) ORDER BY nom_cocktail, id_cocktail
+CREATE INDEX idx_cocktail_nom ON cocktail (nom_cocktail, id_cocktail);
+-- Mêmes listes pour les mineurs (filtre AND c.alcool = 'Non alcoholic' des requêtes)
+CREATE INDEX idx_cocktail_sans_alcool ON cocktail (nom_cocktail, id_cocktail) WHERE alcool = 'Non alcoholic';
+
 -----------------------------------------------------
 -- Ingredient
 -----------------------------------------------------
@@ -62,6 +70,37 @@ CREATE TABLE inventaire_ingredient (
     CONSTRAINT fk_ingredient FOREIGN KEY (id_ingredient) REFERENCES ingredient(id_ingredient)
 );
 
+-----------------------------------------------------
+-- Partage_inventaire
+-- Utilisateurs qui acceptent que leur inventaire serve aux soirées
+-- (cocktails réalisables avec les inventaires réunis de plusieurs comptes)
+-----------------------------------------------------
+CREATE TABLE partage_inventaire (
+    id_utilisateur  INT PRIMARY KEY,
+    date_consentement TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_partage_utilisateur
+    FOREIGN KEY (id_utilisateur)
+    REFERENCES utilisateur(id_utilisateur)
+    ON DELETE CASCADE
+);
+
+-----------------------------------------------------
+-- Statistiques_realisabilite
+-- Nombre de cocktails réalisables et presque réalisables de chaque
+-- utilisateur, recalculé en lot (dao/analyse_realisabilite.py)
+-----------------------------------------------------
+CREATE TABLE statistiques_realisabilite (
+    id_utilisateur      INT PRIMARY KEY,
+    nb_complets         INT NOT NULL,
+    nb_un_manquant      INT NOT NULL,
+    nb_deux_manquants   INT NOT NULL,
+    date_calcul         TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_statistiques_utilisateur
+    FOREIGN KEY (id_utilisateur)
+    REFERENCES utilisateur(id_utilisateur)
+    ON DELETE CASCADE
+);
+
 
 -----------------------------------------------------
 -- Cocktail_ingredient
@@ -77,6 +116,45 @@ CREATE TABLE cocktail_ingredient (
         FOREIGN KEY (id_ingredient) REFERENCES ingredient(id_ingredient)
 );
 
+-- Cocktails utilisant un ingrédient donné (jointure avec un inventaire)
+CREATE INDEX idx_cocktail_ingredient_ingredient ON cocktail_ingredient (id_ingredient, id_cocktail);
+
+-- nb_ingredients de chaque cocktail suit les lignes de cocktail_ingredient :
+-- un trigger par instruction, qui compte les lignes ajoutées / retirées par
+-- cocktail (un seul UPDATE par chargement, même pour tout le catalogue)
+CREATE OR REPLACE FUNCTION maj_nb_ingredients()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        UPDATE cocktail SET nb_ingredients = 0 WHERE nb_ingredients <> 0;
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE cocktail c SET nb_ingredients = c.nb_ingredients + n.nb
+        FROM (SELECT id_cocktail, COUNT(*) AS nb FROM nouvelles GROUP BY id_cocktail) n
+        WHERE c.id_cocktail = n.id_cocktail;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE cocktail c SET nb_ingredients = c.nb_ingredients - a.nb
+        FROM (SELECT id_cocktail, COUNT(*) AS nb FROM anciennes GROUP BY id_cocktail) a
+        WHERE c.id_cocktail = a.id_cocktail;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER nb_ingredients_insert AFTER INSERT ON cocktail_ingredient
+    REFERENCING NEW TABLE AS nouvelles
+    FOR EACH STATEMENT EXECUTE FUNCTION maj_nb_ingredients();
+CREATE TRIGGER nb_ingredients_update AFTER UPDATE ON cocktail_ingredient
+    REFERENCING OLD TABLE AS anciennes NEW TABLE AS nouvelles
+    FOR EACH STATEMENT EXECUTE FUNCTION maj_nb_ingredients();
+CREATE TRIGGER nb_ingredients_delete AFTER DELETE ON cocktail_ingredient
+    REFERENCING OLD TABLE AS anciennes
+    FOR EACH STATEMENT EXECUTE FUNCTION maj_nb_ingredients();
+CREATE TRIGGER nb_ingredients_truncate AFTER TRUNCATE ON cocktail_ingredient
+    FOR EACH STATEMENT EXECUTE FUNCTION maj_nb_ingredients();
+
 
 -----------------------------------------------------
 -- Commentaire
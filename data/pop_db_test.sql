@@ -70,6 +70,11 @@ INSERT INTO inventaire_ingredient(id_utilisateur, id_ingredient) VALUES
 (6, 18);
 -- (6, 379)
 
+-- Gilbert et miguel partagent leur inventaire pour les soirées
+INSERT INTO partage_inventaire(id_utilisateur) VALUES
+(5),
+(6);
+
 INSERT INTO commentaire (id_utilisateur, id_cocktail, texte, note, date_creation) VALUES
 -- Commentaires pour le Mojito (id_cocktail = 0)
 (3, 0, 'Super rafraîchissant ! Parfait pour l''été.', 5, '2025-04-11 17:00:00'),
@@ -1,14 +1,39 @@
+from contextlib import asynccontextmanager
+
 import dotenv
 from fastapi import FastAPI
 
 from app.api.api import api_router
+from app.core.echeance import EcheanceMiddleware
+from app.core.mesures import MesureRequetesMiddleware
+from dao import index_ingredients, index_prefixes, tirage_cocktails
 
 dotenv.load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Index d'autocomplétion, de recherche des ingrédients et de tirage au
+    # hasard construits avant la première requête d'un client
+    index_prefixes.prechauffer()
+    index_ingredients.prechauffer()
+    tirage_cocktails.prechauffer()
+    yield
+
+
 app = FastAPI(
-    title="Cocktail API", description="API de gestion de cocktails et d'inventaire", version="1.0.0"
+    title="Cocktail API",
+    description="API de gestion de cocktails et d'inventaire",
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Budget de latence par requête : statement_timeout, réponses 503 / 504
+app.add_middleware(EcheanceMiddleware)
+
+# Nombre de requêtes SQL, temps en base et sérialisation (en-tête Server-Timing)
+app.add_middleware(MesureRequetesMiddleware)
+
 # Inclusion des routes
 app.include_router(api_router)
 
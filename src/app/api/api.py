@@ -1,6 +1,17 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import auth, cocktails, commentaire, inventaire, utilisateurs
+from app.api.endpoints import (
+    admin,
+    auth,
+    cocktails,
+    cocktails_async,
+    commentaire,
+    commentaire_async,
+    inventaire,
+    inventaire_async,
+    utilisateurs,
+    utilisateurs_async,
+)
 
 # Création du routeur principal
 api_router = APIRouter()
@@ -11,6 +22,13 @@ api_router.include_router(utilisateurs.router, prefix="/mon_compte", tags=["Util
 api_router.include_router(inventaire.router, prefix="/inventaire", tags=["Inventaire"])
 api_router.include_router(cocktails.router, prefix="/cocktails", tags=["Cocktails"])
 api_router.include_router(commentaire.router, prefix="/commentaires", tags=["Commentaires"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Administration"])
+
+# Versions asynchrones (asyncpg) des mêmes endpoints
+api_router.include_router(utilisateurs_async.router, prefix="/async/mon_compte")
+api_router.include_router(inventaire_async.router, prefix="/async/inventaire")
+api_router.include_router(cocktails_async.router, prefix="/async/cocktails")
+api_router.include_router(commentaire_async.router, prefix="/async/commentaires")
 
 # Export explicite
 __all__ = ["api_router"]
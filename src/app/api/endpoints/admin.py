@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends
+
+from app.core.mesures import RouteMesuree
+from app.core.security import get_current_admin
+from business_object.utilisateur import Utilisateur
+from service.inventaire_service import InventaireService
+
+router = APIRouter(tags=["Administration"], route_class=RouteMesuree)
+service_inventaire = InventaireService()
+
+
+# ------------------- Endpoint: /admin/index_manquants/verifier -----------------------------
+
+
+@router.post(
+    "/index_manquants/verifier",
+    responses={
+        200: {"description": "Entrées vérifiées et utilisateurs dont l'entrée a été reconstruite."},
+        401: {"description": "Vous devez être connecté."},
+        403: {"description": "Réservé aux administrateurs (ADMIN_PSEUDOS)."},
+    },
+)
+def verifier_index_manquants(admin: Utilisateur = Depends(get_current_admin)):
+    """
+    **Vérifier l'index des cocktails complets et partiels de l'API**
+
+    Chaque utilisateur gardé dans l'index est comparé à un calcul complet
+    depuis son inventaire en base (listes ordonnées comprises) ; une entrée
+    incohérente est reconstruite.
+    """
+    return service_inventaire.verifier_index_manquants()
+
+
+# ------------------- Endpoint: /admin/index_manquants/reconstruire -----------------------------
+
+
+@router.post(
+    "/index_manquants/reconstruire",
+    responses={
+        200: {"description": "Nombre d'entrées reconstruites."},
+        401: {"description": "Vous devez être connecté."},
+        403: {"description": "Réservé aux administrateurs (ADMIN_PSEUDOS)."},
+    },
+)
+def reconstruire_index_manquants(admin: Utilisateur = Depends(get_current_admin)):
+    """
+    **Reconstruire l'index des cocktails complets et partiels de l'API**
+
+    Toutes les entrées sont recalculées depuis le catalogue courant.
+    """
+    return {"reconstruits": service_inventaire.reconstruire_index_manquants()}
@@ -4,11 +4,12 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, Field
 
+from app.core.mesures import RouteMesuree
 from app.core.security import create_access_token, get_current_user_optional
 from business_object.utilisateur import Utilisateur
 from service.utilisateur_service import UtilisateurService
 
-router = APIRouter(tags=["Authentification"])
+router = APIRouter(tags=["Authentification"], route_class=RouteMesuree)
 service_utilisateur = UtilisateurService()
 
 
@@ -1,17 +1,20 @@
+import json
+from itertools import batched
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from app.core.mesures import RouteMesuree
 from app.core.security import get_current_user, get_current_user_optional
 from business_object.utilisateur import Utilisateur
+from dao.pagination import Page
 from service.cocktail_service import CocktailService
-from service.utilisateur_service import UtilisateurService
 
 service_cocktail = CocktailService()
-service_utilisateur = UtilisateurService()
 
-router = APIRouter(tags=["Cocktails"])
+router = APIRouter(tags=["Cocktails"], route_class=RouteMesuree)
 
 
 class CocktailFilter(BaseModel):
@@ -20,6 +23,33 @@ class CocktailFilter(BaseModel):
     alcool: Optional[str] = None
     verre: Optional[str] = None
     ingredients: Optional[list[str]] = None
+    similarite_min: Optional[float] = None
+
+
+def bloc_pagination(page: Page, limit: int, offset: int, request: Request, response: Response) -> dict:
+    """Bloc "pagination" d'une réponse paginée par curseur
+
+    Les curseurs des pages voisines sont aussi donnés dans l'en-tête Link
+    (rel="next" / rel="prev"), sous forme d'URL prêtes à suivre.
+    """
+    liens = []
+    for curseur, parametre, rel in [(page.suivant, "apres", "next"), (page.precedent, "avant", "prev")]:
+        if curseur is not None:
+            url = request.url.remove_query_params(["apres", "avant", "offset"]).include_query_params(
+                **{parametre: curseur}
+            )
+            liens.append(f'<{url}>; rel="{rel}"')
+    if liens:
+        response.headers["Link"] = ", ".join(liens)
+    return {
+        "limit": limit,
+        "offset": offset,
+        "total": page.total,
+        "total_exact": page.total_exact,
+        "a_suivant": page.a_suivant,
+        "suivant": page.suivant,
+        "precedent": page.precedent,
+    }
 
 
 # ------------------- Endpoint: /cocktails/details -----------------------------
@@ -69,28 +99,19 @@ def realiser_cocktail(
     langue = utilisateur.langue if utilisateur else "ENG"
 
     try:
+        # Connecté : le cocktail compte dans ses cocktails réalisés (même aller-retour)
         cocktail = service_cocktail.realiser_cocktail(
-            id_cocktail=id_cocktail, nom_cocktail=nom_cocktail, langue=langue
+            id_cocktail=id_cocktail,
+            nom_cocktail=nom_cocktail,
+            langue=langue,
+            id_utilisateur=utilisateur.id_utilisateur if utilisateur else None,
         )
 
-        if cocktail:
-            service_utilisateur.ajout_cocktail_realise(utilisateur)
-            # Séparer les ingrédients et quantités
-            ingredients_liste = cocktail.ingredients.split(", ")
-            quantites_liste = cocktail.quantites.split(", ")
-
-            ingredients_detailles = [
-                {"ingredient": ing, "quantite": qty}
-                for ing, qty in zip(ingredients_liste, quantites_liste)
-            ]
-        else:
-            ingredients_detailles = []
-
         return {
             "cocktail": {
                 "id": cocktail.id_cocktail,
                 "nom": cocktail.nom_cocktail,
-                "ingredients": ingredients_detailles,
+                "ingredients": cocktail.ingredients_detailles,
                 "instructions": cocktail.instruc_cocktail,
                 "categorie": cocktail.categ_cocktail,
                 "verre": cocktail.verre,
@@ -122,8 +143,12 @@ def realiser_cocktail(
 )
 def rechercher_cocktails(
     filtres: CocktailFilter,
+    request: Request,
+    response: Response,
     limit: int = 10,
     offset: int = 0,
+    apres: Optional[str] = None,
+    avant: Optional[str] = None,
     utilisateur: Optional[Utilisateur] = Depends(get_current_user_optional),
 ):
     """
@@ -133,7 +158,10 @@ def rechercher_cocktails(
 
 
     Vous pouvez filtrer par :
-    - Nom du cocktail (ex: `"Margarita"`)
+    - Nom du cocktail (ex: `"Margarita"`) : les fautes de frappe sont tolérées
+      (`"margerita"` trouve Margarita), les résultats les plus ressemblants
+      d'abord ; `similarite_min` (entre 0 et 1, 0.3 par défaut) règle la
+      ressemblance minimale
     - Type d'alcool (ex: `"Alcoholic"` ou `"Non alcoholic"`)
     - Catégorie (ex: `"Cocktail"`)
     - Verre (ex: `"Highball glass"`)
@@ -142,6 +170,12 @@ def rechercher_cocktails(
     Si vous n'êtes pas connecté, la recherche se fera sans restrictions d'âge.
     Si vous êtes mineur connecté, seuls les cocktails non alcoolisés seront affichés.
 
+    Pour la page suivante, renvoyez `pagination.suivant` dans **apres** (plus rapide
+    qu'un grand **offset** : le coût d'une page ne dépend pas de sa profondeur),
+    pour la précédente `pagination.precedent` dans **avant**. Les mêmes liens sont
+    dans l'en-tête `Link`. `pagination.total` compte tous les résultats (au-delà de
+    10 000, le comptage s'arrête et `total_exact` vaut false).
+
     """
     try:
         # Si pas connecté → pas de restriction (None)
@@ -162,16 +196,19 @@ def rechercher_cocktails(
             langue=langue,
             limit=limit,
             offset=offset,
+            apres=apres,
+            avant=avant,
+            seuil_similarite=filtres.similarite_min,
         )
 
-        if not cocktails:
+        if not cocktails and not cocktails.suivant:
             raise HTTPException(
                 status_code=404,
                 detail="Désolé, aucun cocktail n'a pu être trouvé avec vos filtres.",
             )
 
         return {
-            "pagination": {"limit": limit, "offset": offset, "total": len(cocktails)},
+            "pagination": bloc_pagination(cocktails, limit, offset, request, response),
             "resultats": [c.__dict__ for c in cocktails],
         }
 
@@ -192,8 +229,12 @@ def rechercher_cocktails(
     },
 )
 def lister_cocktails_complets(
+    request: Request,
+    response: Response,
     limit: int = 10,
     offset: int = 0,
+    apres: Optional[str] = None,
+    avant: Optional[str] = None,
     utilisateur: Utilisateur = Depends(get_current_user),
 ):
     """
@@ -204,6 +245,11 @@ def lister_cocktails_complets(
     ### Paramètres de requête
     - **limit** *(int, optionnel)* : Nombre maximum de cocktails à renvoyer (défaut 10).
     - **offset** *(int, optionnel)* : Décalage pour la pagination.
+    - **apres** *(str, optionnel)* : Curseur `pagination.suivant` de la page précédente.
+    - **avant** *(str, optionnel)* : Curseur `pagination.precedent` de la page suivante.
+
+    `pagination.total` compte tous les résultats ; les pages voisines sont aussi
+    dans l'en-tête `Link`.
     """
     if utilisateur:
         langue = utilisateur.langue
@@ -216,15 +262,17 @@ def lister_cocktails_complets(
             langue=langue,
             limit=limit,
             offset=offset,
+            apres=apres,
+            avant=avant,
         )
-        if not cocktails:
+        if not cocktails and not cocktails.suivant:
             raise HTTPException(
                 status_code=404,
                 detail="Désolée, mais nous n'avons pas trouvé de cocktail en fonction de votre inventaire. "
                 "Nous vous suggérons de rajouter des ingrédients pour plus de choix.",
             )
         return {
-            "pagination": {"limit": limit, "offset": offset, "total": len(cocktails)},
+            "pagination": bloc_pagination(cocktails, limit, offset, request, response),
             "resultats": [c.__dict__ for c in cocktails],
         }
     except ValueError as e:
@@ -244,8 +292,12 @@ def lister_cocktails_complets(
 )
 def lister_cocktails_partiels(
     nb_manquants: int,
+    request: Request,
+    response: Response,
     limit: int = 10,
     offset: int = 0,
+    apres: Optional[str] = None,
+    avant: Optional[str] = None,
     utilisateur: Utilisateur = Depends(get_current_user),
 ):
     """
@@ -257,6 +309,11 @@ def lister_cocktails_partiels(
     - **nb_manquants** *(int, requis)* : Nombre maximal d'ingrédients manquants autorisés (0-5).
     - **limit** *(int, optionnel)* : Nombre maximum de cocktails à renvoyer.
     - **offset** *(int, optionnel)* : Pagination.
+    - **apres** *(str, optionnel)* : Curseur `pagination.suivant` de la page précédente.
+    - **avant** *(str, optionnel)* : Curseur `pagination.precedent` de la page suivante.
+
+    `pagination.total` compte tous les résultats ; les pages voisines sont aussi
+    dans l'en-tête `Link`.
     """
     if utilisateur:
         langue = utilisateur.langue
@@ -270,15 +327,17 @@ def lister_cocktails_partiels(
             langue=langue,
             limit=limit,
             offset=offset,
+            apres=apres,
+            avant=avant,
         )
-        if not cocktails:
+        if not cocktails and not cocktails.suivant:
             raise HTTPException(
                 status_code=404,
                 detail="Désolée, aucun cocktail partiellement réalisable n'a été trouvé en fonction de votre inventaire. "
                 "Nous vous suggérons de rajouter des ingrédients pour plus de choix.",
             )
         return {
-            "pagination": {"limit": limit, "offset": offset, "total": len(cocktails)},
+            "pagination": bloc_pagination(cocktails, limit, offset, request, response),
             "resultats": [c.__dict__ for c in cocktails],
         }
 
@@ -286,6 +345,193 @@ def lister_cocktails_partiels(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# ------------------- Endpoint: /cocktails/ingredients_debloquants -----------------------------
+
+
+@router.get(
+    "/ingredients_debloquants",
+    responses={
+        200: {"description": "Ingrédients à acheter, du plus utile au moins utile."},
+        401: {"description": "Vous devez être connecté."},
+    },
+)
+def classer_ingredients_debloquants(
+    request: Request,
+    response: Response,
+    limit: int = 10,
+    offset: int = 0,
+    apres: Optional[str] = None,
+    avant: Optional[str] = None,
+    utilisateur: Utilisateur = Depends(get_current_user),
+):
+    """
+    **Quelle bouteille acheter ensuite ?**
+
+    Classe les ingrédients que vous n'avez pas selon le nombre de cocktails
+    supplémentaires que chacun vous permettrait de réaliser complètement.
+
+    Nécessite d'être connecté pour accéder à votre inventaire. Si vous êtes
+    mineur, seuls les cocktails non alcoolisés sont comptés.
+
+    ### Paramètres de requête
+    - **limit** *(int, optionnel)* : Nombre maximum d'ingrédients à renvoyer (défaut 10).
+    - **offset** *(int, optionnel)* : Pagination.
+    - **apres** *(str, optionnel)* : Curseur `pagination.suivant` de la page précédente.
+    - **avant** *(str, optionnel)* : Curseur `pagination.precedent` de la page suivante.
+
+    `pagination.total` compte tous les ingrédients classés ; les pages voisines
+    sont aussi dans l'en-tête `Link`.
+    """
+    try:
+        classement = service_cocktail.classer_ingredients_debloquants(
+            id_utilisateur=utilisateur.id_utilisateur,
+            est_majeur=utilisateur.est_majeur,
+            limit=limit,
+            offset=offset,
+            apres=apres,
+            avant=avant,
+        )
+        if not classement and not classement.suivant:
+            raise HTTPException(
+                status_code=404,
+                detail="Aucun ingrédient ne vous permettrait de réaliser un cocktail de plus. "
+                "Consultez /cocktails/partiels pour les cocktails qui vous demandent plusieurs ingrédients.",
+            )
+        return {
+            "pagination": bloc_pagination(classement, limit, offset, request, response),
+            "resultats": [
+                {
+                    "id_ingredient": ingredient.id_ingredient,
+                    "nom_ingredient": ingredient.nom_ingredient,
+                    "cocktails_debloques": nb,
+                }
+                for ingredient, nb in classement
+            ],
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ------------------- Endpoint: /cocktails/optimiser_courses -----------------------------
+
+
+@router.get(
+    "/optimiser_courses",
+    responses={
+        200: {"description": "Liste de courses et cocktails qu'elle rend réalisables."},
+        400: {"description": "Nombre d'ingrédients invalide (1-10)."},
+        401: {"description": "Vous devez être connecté."},
+    },
+)
+def optimiser_courses(
+    k: int = 3,
+    utilisateur: Utilisateur = Depends(get_current_user),
+):
+    """
+    **Quels k ingrédients acheter ensemble ?**
+
+    Choisit au plus k ingrédients que vous n'avez pas et qui, achetés ensemble,
+    vous permettent de réaliser le plus de cocktails supplémentaires.
+    Contrairement à /cocktails/ingredients_debloquants, un cocktail auquel il
+    manque plusieurs ingrédients compte dès qu'ils sont tous dans la liste.
+
+    Nécessite d'être connecté pour accéder à votre inventaire. Si vous êtes
+    mineur, seuls les cocktails non alcoolisés sont comptés.
+
+    ### Paramètres de requête
+    - **k** *(int, optionnel)* : Nombre maximal d'ingrédients à acheter (1 à 10, défaut 3).
+    """
+    try:
+        ingredients, nb_cocktails = service_cocktail.optimiser_courses(
+            id_utilisateur=utilisateur.id_utilisateur,
+            est_majeur=utilisateur.est_majeur,
+            k=k,
+        )
+        if not ingredients:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Aucun achat de {k} ingrédient(s) ou moins ne vous permettrait de réaliser "
+                "un cocktail de plus.",
+            )
+        return {
+            "k": k,
+            "cocktails_debloques": nb_cocktails,
+            "ingredients": [
+                {"id_ingredient": i.id_ingredient, "nom_ingredient": i.nom_ingredient}
+                for i in ingredients
+            ],
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ------------------- Endpoint: /cocktails/soiree -----------------------------
+
+
+@router.get(
+    "/soiree",
+    responses={
+        200: {"description": "Cocktails réalisables avec les inventaires réunis."},
+        400: {"description": "Paramètres invalides ou invité qui ne partage pas son inventaire."},
+        401: {"description": "Vous devez être connecté."},
+    },
+)
+def lister_cocktails_soiree(
+    request: Request,
+    response: Response,
+    invites: list[int] = Query(...),
+    nb_manquants: int = 0,
+    limit: int = 10,
+    offset: int = 0,
+    apres: Optional[str] = None,
+    avant: Optional[str] = None,
+    utilisateur: Utilisateur = Depends(get_current_user),
+):
+    """
+    **Lister les cocktails réalisables en soirée, avec les bars de plusieurs comptes**
+
+    Votre inventaire et ceux de vos invités sont réunis : un cocktail est
+    réalisable dès que chacun de ses ingrédients est chez au moins un participant.
+    Chaque invité doit avoir accepté de partager son inventaire (PUT /inventaire/partage).
+    Si vous êtes mineur, seuls les cocktails non alcoolisés sont proposés.
+
+    ### Paramètres de requête
+    - **invites** *(list[int], requis)* : Identifiants des invités (répéter le paramètre, 49 au plus).
+    - **nb_manquants** *(int, optionnel)* : Nombre maximal d'ingrédients manquants autorisés (0-5, défaut 0).
+    - **limit** *(int, optionnel)* : Nombre maximum de cocktails à renvoyer.
+    - **offset** *(int, optionnel)* : Pagination.
+    - **apres** *(str, optionnel)* : Curseur `pagination.suivant` de la page précédente.
+    - **avant** *(str, optionnel)* : Curseur `pagination.precedent` de la page suivante.
+
+    `pagination.total` compte tous les résultats ; les pages voisines sont aussi
+    dans l'en-tête `Link`.
+    """
+    try:
+        classement = service_cocktail.lister_cocktails_soiree(
+            id_utilisateur=utilisateur.id_utilisateur,
+            est_majeur=utilisateur.est_majeur,
+            ids_invites=invites,
+            nb_manquants=nb_manquants,
+            langue=utilisateur.langue,
+            limit=limit,
+            offset=offset,
+            apres=apres,
+            avant=avant,
+        )
+        if not classement and not classement.suivant:
+            raise HTTPException(
+                status_code=404,
+                detail="Aucun cocktail n'est réalisable avec vos inventaires réunis. "
+                "Essayez d'autoriser des ingrédients manquants avec nb_manquants.",
+            )
+        return {
+            "pagination": bloc_pagination(classement, limit, offset, request, response),
+            "resultats": [{**c.__dict__, "nb_manquants": nb} for c, nb in classement],
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # ------------------- Endpoint: /cocktails/aleatoires -----------------------------
 
 
@@ -331,6 +577,75 @@ def cocktails_aleatoires(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# ------------------- Endpoint: /cocktails/du_jour -----------------------------
+
+
+@router.get(
+    "/du_jour",
+    responses={
+        200: {"description": "Cocktail du jour."},
+        404: {"description": "Aucun cocktail dans le catalogue."},
+    },
+)
+def cocktail_du_jour(utilisateur: Optional[Utilisateur] = Depends(get_current_user_optional)):
+    """
+    **Obtenir le cocktail du jour**
+
+    Le même pour tous les utilisateurs toute la journée (sans alcool pour un mineur connecté).
+    """
+    langue = utilisateur.langue if utilisateur else "ENG"
+    est_majeur = utilisateur.est_majeur if utilisateur else None
+
+    cocktail = service_cocktail.cocktail_du_jour(est_majeur=est_majeur, langue=langue)
+    if cocktail is None:
+        raise HTTPException(status_code=404, detail="Aucun cocktail du jour")
+    return cocktail.__dict__
+
+
+# ------------------- Endpoint: /cocktails/autocomplete -----------------------------
+
+
+@router.get(
+    "/autocomplete",
+    responses={
+        200: {"description": "Noms de cocktails qui complètent la saisie."},
+        400: {"description": "Nombre de propositions invalide (1-20)."},
+    },
+)
+def autocompleter_cocktail(
+    prefixe: str,
+    limit: int = 10,
+    sans_alcool: bool = False,
+    utilisateur: Optional[Utilisateur] = Depends(get_current_user_optional),
+):
+    """
+    **Compléter le nom d'un cocktail pendant la saisie**
+
+    Réponse lue en mémoire, sans requête en base : peut être appelé à chaque frappe.
+    Un mineur connecté ne se voit proposer que des cocktails sans alcool.
+
+    ### Paramètres
+    - **prefixe** *(str)* : Début du nom saisi (insensible à la casse).
+    - **limit** *(int, optionnel)* : Nombre maximal de propositions (1 à 20, défaut 10).
+    - **sans_alcool** *(bool, optionnel)* : Ne proposer que les cocktails sans alcool
+      (restreint les propositions, ne lève jamais la restriction d'un mineur).
+
+    ### Réponse
+    - Les noms qui commencent par le préfixe (ordre alphabétique), puis ceux dont
+      un autre mot commence par lui : `[{"id": 11000, "nom": "Mojito"}, ...]`.
+    """
+    # Si pas connecté → pas de restriction (None)
+    est_majeur = utilisateur.est_majeur if utilisateur else None
+
+    try:
+        propositions = service_cocktail.completer_nom(
+            prefixe, est_majeur=est_majeur, limit=limit, sans_alcool=sans_alcool
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return [{"id": id_cocktail, "nom": nom} for id_cocktail, nom in propositions]
+
+
 # ------------------- Endpoint: /cocktails/categories -----------------------------
 
 
@@ -357,3 +672,27 @@ def lister_verres():
     """
     verres = service_cocktail.lister_verres()
     return {"verres": verres}
+
+
+# ------------------- Endpoint: /cocktails/export -----------------------------
+
+
+@router.get("/export")
+def exporter_catalogue(utilisateur: Optional[Utilisateur] = Depends(get_current_user_optional)):
+    """
+    **Exporter tout le catalogue de cocktails**
+
+    Réponse au format NDJSON : un cocktail (objet JSON) par ligne.
+    Le catalogue est lu par lots et envoyé au fil de l'eau : la mémoire
+    utilisée ne dépend pas du nombre de cocktails.
+    """
+    langue = utilisateur.langue if utilisateur else "ENG"
+    est_majeur = utilisateur.est_majeur if utilisateur else None
+    cocktails = service_cocktail.exporter_catalogue(est_majeur=est_majeur, langue=langue)
+
+    def lignes():
+        # Un morceau de réponse par paquet de 500 cocktails plutôt qu'un par cocktail
+        for paquet in batched(cocktails, 500):
+            yield "".join(json.dumps(c.__dict__, ensure_ascii=False) + "\n" for c in paquet)
+
+    return StreamingResponse(lignes(), media_type="application/x-ndjson")
@@ -0,0 +1,280 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from app.api.endpoints.cocktails import CocktailFilter, bloc_pagination
+from app.core.mesures import RouteMesuree
+from app.core.security import get_current_user_async, get_current_user_optional_async
+from business_object.utilisateur import Utilisateur
+from dao.cocktail_dao_async import CocktailDaoAsync
+from dao.donnees_reference import DonneesReference
+from dao.utilisateur_dao_async import UtilisateurDaoAsync
+
+router = APIRouter(tags=["Cocktails (async)"], route_class=RouteMesuree)
+
+ALCOOLS_VALIDES = ["alcoholic", "non alcoholic", "optional alcohol"]
+
+
+# ------------------- Endpoint: /async/cocktails/realiser_cocktail -----------------------------
+
+
+@router.post("/realiser_cocktail")
+async def realiser_cocktail(
+    id_cocktail: Optional[int] = None,
+    nom_cocktail: Optional[str] = None,
+    utilisateur: Optional[Utilisateur] = Depends(get_current_user_optional_async),
+):
+    """
+    ## 🍸 Obtenir la recette complète d'un cocktail (version asynchrone)
+
+    Mêmes paramètres et même réponse que `/cocktails/realiser_cocktail`.
+    """
+    if not id_cocktail and not nom_cocktail:
+        raise HTTPException(
+            status_code=400,
+            detail="Veuillez fournir soit un 'id_cocktail' (nombre entier), soit un 'nom_cocktail' pour rechercher un cocktail.",
+        )
+
+    langue = utilisateur.langue if utilisateur else "ENG"
+
+    cocktail = await CocktailDaoAsync().realiser_cocktail(
+        id_cocktail=id_cocktail, nom_cocktail=nom_cocktail, langue=langue
+    )
+    if not cocktail:
+        raise HTTPException(
+            status_code=404,
+            detail="😔 Désolé, nous n'avons pas trouvé ce cocktail. Vérifiez l'id , l'orthographe du nom ou essayez un autre chose !",
+        )
+
+    if utilisateur:
+        await UtilisateurDaoAsync().ajout_cocktail_realise(utilisateur)
+
+    return {
+        "cocktail": {
+            "id": cocktail.id_cocktail,
+            "nom": cocktail.nom_cocktail,
+            "ingredients": cocktail.ingredients_detailles,
+            "instructions": cocktail.instruc_cocktail,
+            "categorie": cocktail.categ_cocktail,
+            "verre": cocktail.verre,
+            "alcoolise": cocktail.alcoolise_cocktail,
+            "image": cocktail.image_cocktail,
+        },
+        "message": f"🍹 Voici comment préparer un délicieux {cocktail.nom_cocktail} ☝️🤤!",
+    }
+
+
+# ------------------- Endpoint: /async/cocktails/recherche -----------------------------
+
+
+@router.post("/recherche")
+async def rechercher_cocktails(
+    filtres: CocktailFilter,
+    request: Request,
+    response: Response,
+    limit: int = 10,
+    offset: int = 0,
+    apres: Optional[str] = None,
+    avant: Optional[str] = None,
+    utilisateur: Optional[Utilisateur] = Depends(get_current_user_optional_async),
+):
+    """
+    **Rechercher des cocktails selon vos préférences (version asynchrone)**
+
+    Mêmes filtres (nom tolérant aux fautes de frappe, `similarite_min`
+    compris), même pagination (curseurs **apres** / **avant**) et même
+    réponse que `/cocktails/recherche`.
+    """
+    est_majeur = utilisateur.est_majeur if utilisateur else None
+    langue = utilisateur.langue if utilisateur else "ENG"
+    dao = CocktailDaoAsync()
+
+    if filtres.alcool and filtres.alcool.lower() not in ALCOOLS_VALIDES:
+        raise HTTPException(
+            status_code=400,
+            detail="Le type d'alcool doit être 'Alcoholic', 'Non alcoholic' ou 'Optional alcohol'",
+        )
+    if filtres.similarite_min is not None and not 0 <= filtres.similarite_min <= 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Le seuil de similarité doit être compris entre 0 et 1",
+        )
+    # Listes de référence gardées en mémoire (voir DonneesReference)
+    if filtres.categorie and not DonneesReference().categorie_existe(filtres.categorie):
+        raise HTTPException(
+            status_code=400,
+            detail=f"La catégorie '{filtres.categorie}' n'existe pas. "
+            f"Utilisez GET /cocktails/categories pour voir les catégories disponibles.",
+        )
+    if filtres.verre and not DonneesReference().verre_existe(filtres.verre):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Le verre '{filtres.verre}' n'existe pas. "
+            f"Utilisez GET /cocktails/verres pour voir les verres disponibles.",
+        )
+    if est_majeur is False and filtres.alcool == "Alcoholic":
+        raise HTTPException(
+            status_code=400,
+            detail=" Zéro alcool pour les mineurs ici, mais 100% fun garanti avec nos cocktails non alcolisé 😎🍹",
+        )
+
+    try:
+        cocktails = await dao.rechercher_cocktails(
+            filtres.nom_cocktail,
+            filtres.categorie,
+            filtres.verre,
+            filtres.alcool,
+            filtres.ingredients,
+            langue,
+            limit,
+            offset,
+            apres=apres,
+            avant=avant,
+            sans_alcool=est_majeur is False,
+            seuil_similarite=filtres.similarite_min,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not cocktails and not cocktails.suivant:
+        raise HTTPException(
+            status_code=404,
+            detail="Désolé, aucun cocktail n'a pu être trouvé avec vos filtres.",
+        )
+
+    return {
+        "pagination": bloc_pagination(cocktails, limit, offset, request, response),
+        "resultats": [c.__dict__ for c in cocktails],
+    }
+
+
+# ------------------- Endpoint: /async/cocktails/complets -----------------------------
+
+
+@router.get("/complets")
+async def lister_cocktails_complets(
+    request: Request,
+    response: Response,
+    limit: int = 10,
+    offset: int = 0,
+    apres: Optional[str] = None,
+    avant: Optional[str] = None,
+    utilisateur: Utilisateur = Depends(get_current_user_async),
+):
+    """**Lister les cocktails que vous pouvez réaliser complètement (version asynchrone)**
+
+    Mêmes paramètres (curseurs **apres** / **avant** compris) et même réponse que `/cocktails/complets`.
+    """
+    try:
+        cocktails = await CocktailDaoAsync().cocktail_complet(
+            utilisateur.id_utilisateur,
+            utilisateur.langue,
+            limit,
+            offset,
+            apres=apres,
+            avant=avant,
+            sans_alcool=utilisateur.est_majeur is False,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not cocktails and not cocktails.suivant:
+        raise HTTPException(
+            status_code=404,
+            detail="Désolée, mais nous n'avons pas trouvé de cocktail en fonction de votre inventaire. "
+            "Nous vous suggérons de rajouter des ingrédients pour plus de choix.",
+        )
+    return {
+        "pagination": bloc_pagination(cocktails, limit, offset, request, response),
+        "resultats": [c.__dict__ for c in cocktails],
+    }
+
+
+# ------------------- Endpoint: /async/cocktails/partiels -----------------------------
+
+
+@router.get("/partiels")
+async def lister_cocktails_partiels(
+    nb_manquants: int,
+    request: Request,
+    response: Response,
+    limit: int = 10,
+    offset: int = 0,
+    apres: Optional[str] = None,
+    avant: Optional[str] = None,
+    utilisateur: Utilisateur = Depends(get_current_user_async),
+):
+    """**Lister les cocktails presque réalisables (version asynchrone)**
+
+    Mêmes paramètres (curseurs **apres** / **avant** compris) et même réponse que `/cocktails/partiels`.
+    """
+    if nb_manquants < 0 or nb_manquants > 5:
+        raise HTTPException(
+            status_code=400,
+            detail="Le nombre d'ingrédients manquants doit être compris entre 0 et 5",
+        )
+
+    try:
+        cocktails = await CocktailDaoAsync().cocktail_partiel(
+            utilisateur.id_utilisateur,
+            nb_manquants,
+            utilisateur.langue,
+            limit,
+            offset,
+            apres=apres,
+            avant=avant,
+            sans_alcool=utilisateur.est_majeur is False,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not cocktails and not cocktails.suivant:
+        raise HTTPException(
+            status_code=404,
+            detail="Désolée, aucun cocktail partiellement réalisable n'a été trouvé en fonction de votre inventaire. "
+            "Nous vous suggérons de rajouter des ingrédients pour plus de choix.",
+        )
+    return {
+        "pagination": bloc_pagination(cocktails, limit, offset, request, response),
+        "resultats": [c.__dict__ for c in cocktails],
+    }
+
+
+# ------------------- Endpoint: /async/cocktails/aleatoires -----------------------------
+
+
+@router.get("/aleatoires")
+async def cocktails_aleatoires(
+    nb: int = 5,
+    utilisateur: Optional[Utilisateur] = Depends(get_current_user_optional_async),
+):
+    """**Obtenir une sélection aléatoire de cocktails (version asynchrone)**"""
+    if nb < 1 or nb > 5:
+        raise HTTPException(
+            status_code=400, detail="Le nombre de cocktails doit être entre 1 et 5"
+        )
+
+    langue = utilisateur.langue if utilisateur else "ENG"
+    cocktails = await CocktailDaoAsync().cocktails_aleatoires(
+        nb, langue, sans_alcool=bool(utilisateur) and utilisateur.est_majeur is False
+    )
+
+    return {
+        "total": len(cocktails),
+        "resultats": [c.__dict__ for c in cocktails],
+    }
+
+
+# ------------------- Endpoints: /async/cocktails/categories et /verres ----------------------
+
+
+@router.get("/categories")
+async def lister_categories():
+    """**Lister les catégories de cocktails (version asynchrone)**"""
+    return {"categories": await CocktailDaoAsync().lister_categories()}
+
+
+@router.get("/verres")
+async def lister_verres():
+    """**Lister les types de verres (version asynchrone)**"""
+    return {"verres": await CocktailDaoAsync().lister_verres()}
@@ -4,9 +4,10 @@ from typing import Optional
 from business_object.utilisateur import Utilisateur
 from service.commentaire_service import CommentaireService
 from service.cocktail_service import CocktailService
+from app.core.mesures import RouteMesuree
 from app.core.security import get_current_user
 
-router = APIRouter(tags=["Commentaires"])
+router = APIRouter(tags=["Commentaires"], route_class=RouteMesuree)
 
 commentaire_service = CommentaireService()
 cocktail_service = CocktailService()
@@ -98,24 +99,22 @@ def lister_commentaires_cocktail(
     """
     try:
 
-        # On recupère les infos du cocktail
-        cocktail = cocktail_service.obtenir_cocktail_par_id(id_cocktail)
+        # Cocktail, commentaires et note moyenne en un seul aller-retour avec la base
+        cocktail, commentaires, note_moyenne = commentaire_service.consulter_commentaires_cocktail(
+            id_cocktail
+        )
         if not cocktail:
             raise HTTPException(
                 status_code=404,
                 detail="Cocktail non trouvé"
             )
 
-        # On recupère le commentaire
-        commentaires = commentaire_service.lister_commentaires_cocktail(id_cocktail)
         # Eventuel message d'erreur si pas de commentaires pour le cocktail
         if not commentaires:
             raise HTTPException(
                 status_code=404,
                 detail=f"Aucun commentaire pour l'instant pour ce cocktail : {cocktail.nom_cocktail}"
             )
-        note_moyenne = commentaire_service.calculer_note_moyenne(id_cocktail)
-
         # Formatage de la réponse côté utilisateur
         response = {
             "cocktail": {
@@ -0,0 +1,131 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.endpoints.commentaire import CommentaireCreate
+from app.core.mesures import RouteMesuree
+from app.core.security import get_current_user_async
+from business_object.commentaire import Commentaire
+from business_object.utilisateur import Utilisateur
+from dao.cocktail_dao_async import CocktailDaoAsync
+from dao.commentaire_dao_async import CommentaireDaoAsync
+
+router = APIRouter(tags=["Commentaires (async)"], route_class=RouteMesuree)
+
+
+@router.post("/ajouter_com/{id_cocktail}")
+async def ajouter_commentaire(
+    id_cocktail: int,
+    donnee: CommentaireCreate,
+    utilisateur: Utilisateur = Depends(get_current_user_async),
+):
+    """**Ajouter un commentaire sur un cocktail (version asynchrone)**"""
+    if not donnee.texte.strip():
+        raise HTTPException(status_code=400, detail="Le commentaire ne peut pas être vide")
+
+    dao = CommentaireDaoAsync()
+    if await dao.trouver_par_utilisateur_et_cocktail(utilisateur.id_utilisateur, id_cocktail):
+        raise HTTPException(status_code=400, detail="Vous avez déjà commenté ce cocktail")
+
+    commentaire = Commentaire(
+        id_utilisateur=utilisateur.id_utilisateur,
+        id_cocktail=id_cocktail,
+        texte=donnee.texte.strip(),
+        note=donnee.note,
+    )
+    if await dao.creer(commentaire):
+        return {"message": "Commentaire ajouté avec succès"}
+    raise HTTPException(status_code=400, detail="Erreur lors de l'ajout du commentaire")
+
+
+@router.delete("/supprimer_com/{id_cocktail}")
+async def supprimer_mon_commentaire(
+    id_cocktail: int, utilisateur: Utilisateur = Depends(get_current_user_async)
+):
+    """**Supprimer votre commentaire sur un cocktail (version asynchrone)**"""
+    dao = CommentaireDaoAsync()
+    commentaire = await dao.trouver_par_utilisateur_et_cocktail(
+        utilisateur.id_utilisateur, id_cocktail
+    )
+    if not commentaire:
+        raise HTTPException(
+            status_code=404, detail="Vous n'avez pas de commentaire sur ce cocktail"
+        )
+
+    if await dao.supprimer(commentaire.id_commentaire, utilisateur.id_utilisateur):
+        return {"message": "Votre commentaire a été supprimé avec succès"}
+    raise HTTPException(status_code=500, detail="Erreur lors de la suppression du commentaire")
+
+
+@router.get("/liste_com/{id_cocktail}")
+async def lister_commentaires_cocktail(id_cocktail: int):
+    """**Lister tous les commentaires d'un cocktail (version asynchrone)**
+
+    Le cocktail et ses commentaires sont lus en parallèle.
+    """
+    cocktail, commentaires = await asyncio.gather(
+        CocktailDaoAsync().trouver_par_id(id_cocktail),
+        CommentaireDaoAsync().trouver_par_cocktail(id_cocktail),
+    )
+    if not cocktail:
+        raise HTTPException(status_code=404, detail="Cocktail non trouvé")
+    if not commentaires:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Aucun commentaire pour l'instant pour ce cocktail : {cocktail.nom_cocktail}",
+        )
+
+    note_moyenne = sum(com.note for com in commentaires) / len(commentaires)
+
+    return {
+        "cocktail": {
+            "id_cocktail": cocktail.id_cocktail,
+            "nom_cocktail": cocktail.nom_cocktail,
+            "note_moyenne": round(note_moyenne, 1),
+            "nombre_commentaires": len(commentaires),
+        },
+        "commentaires": [
+            {
+                "pseudo_utilisateur": commentaire.pseudo_utilisateur,
+                "date_creation": commentaire.date_creation.strftime("%d/%m/%Y"),
+                "note": commentaire.note,
+                "texte": commentaire.texte,
+            }
+            for commentaire in commentaires
+        ],
+    }
+
+
+@router.get("/mes_commentaires")
+async def lister_mes_commentaires(utilisateur: Utilisateur = Depends(get_current_user_async)):
+    """**Lister tous mes commentaires (version asynchrone)**
+
+    Les cocktails associés sont lus en parallèle.
+    """
+    mes_commentaires = await CommentaireDaoAsync().trouver_par_utilisateur_et_cocktail(
+        utilisateur.id_utilisateur
+    )
+    if not mes_commentaires:
+        raise HTTPException(
+            status_code=404, detail="Vous n'avez posté aucun commentaire pour le moment"
+        )
+
+    cocktails = await asyncio.gather(
+        *(CocktailDaoAsync().trouver_par_id(c.id_cocktail) for c in mes_commentaires)
+    )
+
+    return {
+        "utilisateur": {"nombre_total_commentaires": len(mes_commentaires)},
+        "mes_commentaires": [
+            {
+                "cocktail": {
+                    "id_cocktail": cocktail.id_cocktail if cocktail else None,
+                    "nom_cocktail": cocktail.nom_cocktail if cocktail else "Cocktail inconnu",
+                },
+                "date_creation": commentaire.date_creation.strftime("%d/%m/%Y"),
+                "note": commentaire.note,
+                "texte": commentaire.texte,
+            }
+            for commentaire, cocktail in zip(mes_commentaires, cocktails)
+        ],
+    }
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
+from app.core.mesures import RouteMesuree
 from app.core.security import get_current_user
+from business_object.ingredient import Ingredient
 from business_object.utilisateur import Utilisateur
 from service.inventaire_service import InventaireService
 from service.utilisateur_service import UtilisateurService
 
-router = APIRouter(tags=["Inventaire"])
+router = APIRouter(tags=["Inventaire"], route_class=RouteMesuree)
 service_inventaire = InventaireService()
 service_utilisateur = UtilisateurService()
 
@@ -48,17 +50,66 @@ def suggestion_ingredients(n: int = 5):
     return [ing.nom_ingredient for ing in suggestions]
 
 
-@router.put("/ajouter")
+@router.get(
+    "/autocomplete",
+    responses={
+        200: {"description": "Noms d'ingrédients qui complètent la saisie."},
+        400: {"description": "Nombre de propositions invalide (1-20)."},
+    },
+)
+def autocompleter_ingredient(prefixe: str, limit: int = 10):
+    """
+    **Compléter le nom d'un ingrédient pendant la saisie**
+
+    Réponse lue en mémoire, sans requête en base : peut être appelé à chaque frappe,
+    avant d'ajouter l'ingrédient à l'inventaire.
+    """
+    try:
+        return service_inventaire.completer_ingredient(prefixe, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def trouver_ingredient(demande_ingredient: str) -> Ingredient:
+    """Ingrédient désigné par le nom saisi, malgré quelques fautes de frappe
+
+    404 si aucun ingrédient n'est assez proche, 409 avec les ingrédients
+    proposés si plusieurs le sont autant.
+    """
+    ingredient, suggestions = service_inventaire.resoudre_ingredient(demande_ingredient)
+    if ingredient is not None:
+        return ingredient
+    if not suggestions:
+        raise HTTPException(status_code=404, detail=f"L'ingrédient '{demande_ingredient}' n'existe pas")
+    raise HTTPException(
+        status_code=409,
+        detail={
+            "message": f"Plusieurs ingrédients correspondent à '{demande_ingredient}', précisez le nom",
+            "suggestions": [ing.nom_ingredient for ing in suggestions],
+        },
+    )
+
+
+@router.put(
+    "/ajouter",
+    responses={
+        200: {"description": "Succès de l'ajout (booléen)."},
+        404: {"description": "Aucun ingrédient ne correspond au nom."},
+        409: {"description": "Nom ambigu : ingrédients proposés, du plus au moins proche."},
+    },
+)
 def ajoute_ingredient(
     demande_ingredient: str, utilisateur: Utilisateur = Depends(get_current_user)
 ):
     """**Ajoute un ingrédient à l'inventaire de l'utilisateur**
 
-    Vous pouvez consulter les ingrédients disponibles via la méthode de suggestion d'ingrédients
+    Vous pouvez consulter les ingrédients disponibles via la méthode de suggestion d'ingrédients.
+    Les fautes de frappe sont corrigées ("vodak" -> Vodka) ; si le nom est ambigu,
+    la réponse 409 propose les ingrédients les plus proches.
     """
+    ingredient = trouver_ingredient(demande_ingredient)
     try:
-        requete = service_inventaire.recherche_ingredient(demande_ingredient)
-        return service_inventaire.ajouter(utilisateur.id_utilisateur, requete)
+        return service_inventaire.ajouter(utilisateur.id_utilisateur, ingredient)
 
     except Exception as e:
         print("DEBUG /inventaire/vue: exception", e)
@@ -68,14 +119,24 @@ def ajoute_ingredient(
         )
 
 
-@router.delete("/supprimer_ingredient")
+@router.delete(
+    "/supprimer_ingredient",
+    responses={
+        200: {"description": "Succès de la suppression (booléen)."},
+        404: {"description": "Aucun ingrédient ne correspond au nom."},
+        409: {"description": "Nom ambigu : ingrédients proposés, du plus au moins proche."},
+    },
+)
 def supprime_ingredient(
     demande_ingredient: str, utilisateur: Utilisateur = Depends(get_current_user)
 ):
-    """**Supprime un ingrédient à l'inventaire de l'utilisateur**"""
+    """**Supprime un ingrédient à l'inventaire de l'utilisateur**
+
+    Les fautes de frappe sont corrigées comme pour l'ajout.
+    """
+    ingredient = trouver_ingredient(demande_ingredient)
     try:
-        requete = service_inventaire.recherche_ingredient(demande_ingredient)
-        return service_inventaire.supprimer(utilisateur.id_utilisateur, requete.id_ingredient)
+        return service_inventaire.supprimer(utilisateur.id_utilisateur, ingredient.id_ingredient)
 
     except Exception as e:
         print("DEBUG /inventaire/vue: exception", e)
@@ -85,6 +146,21 @@ def supprime_ingredient(
         )
 
 
+@router.put("/partage")
+def partage_inventaire(autorise: bool = True, utilisateur: Utilisateur = Depends(get_current_user)):
+    """**Accepte (ou refuse, avec autorise=false) que votre inventaire serve aux soirées**
+
+    Un autre utilisateur peut alors vous inviter à /cocktails/soiree : les cocktails
+    proposés tiennent compte de vos ingrédients.
+    """
+    if not service_inventaire.partager(utilisateur.id_utilisateur, autorise):
+        raise HTTPException(
+            status_code=500,
+            detail="Erreur interne lors de la modification du partage de l'inventaire",
+        )
+    return {"partage": autorise}
+
+
 @router.delete("/supprimer_tout")
 def supprimer_mon_inventaire(
     reponse: Reponse, utilisateur: Utilisateur = Depends(get_current_user)
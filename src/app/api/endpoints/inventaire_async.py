@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.endpoints.inventaire import trouver_ingredient
+from app.core.mesures import RouteMesuree
+from app.core.security import get_current_user_async
+from business_object.utilisateur import Utilisateur
+from dao.inventaire_dao_async import InventaireDaoAsync
+
+router = APIRouter(tags=["Inventaire (async)"], route_class=RouteMesuree)
+
+
+@router.get("/vue")
+async def consulte_inventaire(utilisateur: Utilisateur = Depends(get_current_user_async)):
+    """**Montre l'inventaire de l'utilisateur (version asynchrone)**"""
+    inventaire = await InventaireDaoAsync().consulter_inventaire(utilisateur.id_utilisateur)
+    if not inventaire:
+        raise HTTPException(
+            status_code=400, detail="Votre inventaire est vide, allez le remplir au plus vite !!"
+        )
+    return inventaire
+
+
+@router.get("/suggestion")
+async def suggestion_ingredients(n: int = 5):
+    """**Retourne jusqu'à n ingrédients au hasard (entre 1 et 10, version asynchrone)**"""
+    suggestions = await InventaireDaoAsync().ingredients_aleatoires(n)
+    return [ing.nom_ingredient for ing in suggestions]
+
+
+@router.put("/ajouter")
+async def ajoute_ingredient(
+    demande_ingredient: str, utilisateur: Utilisateur = Depends(get_current_user_async)
+):
+    """**Ajoute un ingrédient à l'inventaire de l'utilisateur (version asynchrone)**"""
+    dao = InventaireDaoAsync()
+    # Nom résolu en mémoire, fautes de frappe comprises (sans requête en base)
+    ingredient = trouver_ingredient(demande_ingredient)
+    return await dao.ajouter_ingredient_inventaire(utilisateur.id_utilisateur, ingredient)
+
+
+@router.delete("/supprimer_ingredient")
+async def supprime_ingredient(
+    demande_ingredient: str, utilisateur: Utilisateur = Depends(get_current_user_async)
+):
+    """**Supprime un ingrédient de l'inventaire de l'utilisateur (version asynchrone)**"""
+    dao = InventaireDaoAsync()
+    # Nom résolu en mémoire, fautes de frappe comprises (sans requête en base)
+    ingredient = trouver_ingredient(demande_ingredient)
+    return await dao.supprimer_ingredient(utilisateur.id_utilisateur, ingredient.id_ingredient)
@@ -4,11 +4,12 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 
+from app.core.mesures import RouteMesuree
 from app.core.security import get_current_user
 from business_object.utilisateur import Utilisateur
 from service.utilisateur_service import UtilisateurService
 
-router = APIRouter(tags=["Utilisateur"])
+router = APIRouter(tags=["Utilisateur"], route_class=RouteMesuree)
 service_utilisateur = UtilisateurService()
 
 
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+
+from app.core.mesures import RouteMesuree
+from app.core.security import get_current_user_async
+from business_object.utilisateur import Utilisateur
+
+router = APIRouter(tags=["Utilisateur (async)"], route_class=RouteMesuree)
+
+
+@router.get("/informations")
+async def mes_informations(utilisateur: Utilisateur = Depends(get_current_user_async)):
+    """**Visualiser les informations de votre compte (version asynchrone)**"""
+    return {
+        "pseudo": utilisateur.pseudo,
+        "age": utilisateur.age,
+        "langue": utilisateur.langue,
+        "date_creation": utilisateur.date_creation.strftime("%d/%m/%Y"),
+        "cocktails_realises": utilisateur.cocktails_realises,
+    }
@@ -0,0 +1,76 @@
+import os
+
+from starlette.responses import JSONResponse
+
+from dao.echeance import demarrer_echeance, terminer_echeance
+
+# Réponse renvoyée à la place de celle de l'endpoint selon l'état de l'échéance
+REPONSES_ECHEANCE = {
+    "epuise": (503, "Service momentanément surchargé, veuillez réessayer"),
+    "annulee": (504, "La requête a pris trop de temps et a été annulée"),
+}
+
+
+class EcheanceMiddleware:
+    """
+    Middleware ASGI donnant à chaque requête HTTP un budget de latence
+
+    Le budget vaut BUDGET_REQUETE_MS (10 000 ms par défaut) ; un client peut
+    demander moins avec l'en-tête X-Budget-Ms. Chaque requête SQL reçoit en
+    statement_timeout ce qu'il reste du budget (plafonné par la méthode de DAO).
+
+    Les DAO interceptent les erreurs SQL : quand une requête a été annulée
+    (504) ou n'a pas pu partir faute de temps (503), la réponse de l'endpoint
+    est remplacée par une erreur claire.
+    """
+
+    def __init__(self, app, budget_ms: float | None = None):
+        """Constructeur"""
+        self.app = app
+        self.budget_ms = budget_ms or float(os.environ.get("BUDGET_REQUETE_MS", 10000))
+
+    def budget_requete(self, scope) -> float:
+        """Budget de la requête : celui du serveur, ou moins si le client le demande"""
+        for nom, valeur in scope.get("headers", []):
+            if nom == b"x-budget-ms":
+                try:
+                    demande = float(valeur)
+                except ValueError:
+                    break
+                if demande > 0:
+                    return min(demande, self.budget_ms)
+        return self.budget_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        echeance, jeton = demarrer_echeance(self.budget_requete(scope))
+        etat = {"demarree": False, "remplacee": False}
+
+        async def repondre_erreur():
+            etat["remplacee"] = True
+            statut, detail = REPONSES_ECHEANCE[echeance.etat]
+            await JSONResponse({"detail": detail}, status_code=statut)(scope, receive, send)
+
+        async def send_echeance(message):
+            if message["type"] == "http.response.start":
+                etat["demarree"] = True
+                if echeance.etat:
+                    await repondre_erreur()
+                    return
+            if etat["remplacee"]:
+                # Corps de la réponse d'origine : ignoré
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_echeance)
+        except Exception:
+            # Une exception remontée par l'endpoint après l'annulation d'une requête SQL
+            if not echeance.etat or etat["demarree"]:
+                raise
+            await repondre_erreur()
+        finally:
+            terminer_echeance(jeton)
@@ -0,0 +1,126 @@
+import inspect
+import json
+import logging
+import os
+import time
+from functools import wraps
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+
+from dao.mesure_requetes import demarrer_mesure, mesure_courante, terminer_mesure
+
+
+def _noter_fin_endpoint():
+    mesure = mesure_courante()
+    if mesure is not None:
+        mesure.fin_endpoint = time.perf_counter()
+
+
+class RouteMesuree(APIRoute):
+    """Route notant l'instant où l'endpoint rend la main : le temps qui suit,
+    jusqu'à l'envoi des en-têtes, est le temps de sérialisation de la réponse
+
+    Utilisation : APIRouter(route_class=RouteMesuree)
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        if not getattr(endpoint, "_fin_notee", False):
+            endpoint = self._noter_fin(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _noter_fin(endpoint):
+        # FastAPI exécute les endpoints synchrones dans un thread : le wrapper
+        # doit rester synchrone (et asynchrone pour les endpoints async)
+        if inspect.iscoroutinefunction(endpoint):
+
+            @wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                try:
+                    return await endpoint(*args, **kwargs)
+                finally:
+                    _noter_fin_endpoint()
+
+        else:
+
+            @wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                try:
+                    return endpoint(*args, **kwargs)
+                finally:
+                    _noter_fin_endpoint()
+
+        wrapper._fin_notee = True
+        return wrapper
+
+
+def entete_server_timing(mesure, fin: float) -> str:
+    """En-tête Server-Timing : temps en base (et nombre de requêtes SQL),
+    sérialisation de la réponse et durée totale, en millisecondes"""
+    serialisation = fin - mesure.fin_endpoint if mesure.fin_endpoint else 0.0
+    return (
+        f'db;dur={mesure.duree_bd * 1000:.2f};desc="{mesure.nb_requetes} requetes", '
+        f"serialisation;dur={serialisation * 1000:.2f}, "
+        f"total;dur={(fin - mesure.debut) * 1000:.2f}"
+    )
+
+
+class MesureRequetesMiddleware:
+    """
+    Middleware ASGI mesurant chaque requête HTTP :
+    nombre de requêtes SQL, temps passé en base et temps de sérialisation
+
+    Les mesures sont renvoyées dans l'en-tête Server-Timing et écrites dans
+    les logs sur une ligne JSON. Au-delà de BUDGET_REQUETES_SQL requêtes SQL
+    (20 par défaut) la ligne passe en WARNING : signe d'un motif N+1.
+    """
+
+    def __init__(self, app, budget_requetes: int | None = None):
+        """Constructeur"""
+        self.app = app
+        self.budget_requetes = budget_requetes or int(os.environ.get("BUDGET_REQUETES_SQL", 20))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mesure, jeton = demarrer_mesure()
+        reponse = {"statut": 500, "serialisation": 0.0, "total": 0.0}
+
+        async def send_mesure(message):
+            if message["type"] == "http.response.start":
+                fin = time.perf_counter()
+                reponse["statut"] = message["status"]
+                reponse["total"] = fin - mesure.debut
+                if mesure.fin_endpoint:
+                    reponse["serialisation"] = fin - mesure.fin_endpoint
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", entete_server_timing(mesure, fin)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_mesure)
+        finally:
+            terminer_mesure(jeton)
+            self.journaliser(scope, mesure, reponse)
+
+    def journaliser(self, scope, mesure, reponse: dict):
+        """Ligne de log JSON décrivant la requête HTTP"""
+        ligne = {
+            "evenement": "requete_http",
+            "methode": scope.get("method"),
+            "chemin": scope.get("path"),
+            "statut": reponse["statut"],
+            "nb_requetes_sql": mesure.nb_requetes,
+            "duree_bd_ms": round(mesure.duree_bd * 1000, 2),
+            "duree_serialisation_ms": round(reponse["serialisation"] * 1000, 2),
+            "duree_totale_ms": round(reponse["total"] * 1000, 2),
+        }
+        if mesure.nb_requetes > self.budget_requetes:
+            ligne["budget_requetes_depasse"] = True
+            logging.warning(json.dumps(ligne, ensure_ascii=False))
+        else:
+            logging.info(json.dumps(ligne, ensure_ascii=False))
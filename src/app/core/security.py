@@ -1,3 +1,4 @@
+import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -6,6 +7,7 @@ from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 
 from business_object.utilisateur import Utilisateur
+from dao.utilisateur_dao_async import UtilisateurDaoAsync
 from service.utilisateur_service import UtilisateurService
 
 from .config import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
@@ -52,3 +54,46 @@ def get_current_user_optional(token: str = Depends(oauth2_scheme)) -> Utilisateu
         return service_utilisateur.trouver_par_id(user_id)
     except Exception:
         return None
+
+
+def get_current_admin(utilisateur: Utilisateur = Depends(get_current_user)) -> Utilisateur:
+    """Utilisateur connecté dont le pseudo figure dans ADMIN_PSEUDOS (séparés par des virgules)"""
+    admins = {pseudo.strip() for pseudo in os.environ.get("ADMIN_PSEUDOS", "").split(",") if pseudo.strip()}
+    if utilisateur.pseudo not in admins:
+        raise HTTPException(status_code=403, detail="Fonctionnalité réservée aux administrateurs.")
+    return utilisateur
+
+
+# ----------------------------- Endpoints asynchrones -----------------------------------
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme)) -> Utilisateur:
+    """Équivalent de get_current_user pour les endpoints async (lecture via asyncpg)"""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = int(payload.get("sub"))
+        utilisateur = await UtilisateurDaoAsync().trouver_par_id(user_id)
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token expiré")
+    except Exception:
+        raise HTTPException(
+            status_code=401,
+            detail="Veuillez vous connecter pour pouvoir accéder à cette fonctionnalité.",
+        )
+    if not utilisateur:
+        raise HTTPException(status_code=404, detail="Utilisateur introuvable")
+    return utilisateur
+
+
+async def get_current_user_optional_async(
+    token: str = Depends(oauth2_scheme),
+) -> Utilisateur | None:
+    """Équivalent de get_current_user_optional pour les endpoints async"""
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = int(payload.get("sub"))
+        return await UtilisateurDaoAsync().trouver_par_id(user_id)
+    except Exception:
+        return None
@@ -0,0 +1,75 @@
+"""Statistiques de réalisabilité de tous les utilisateurs : durée d'AnalyseRealisabilite
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_analyse_realisabilite.py
+
+Catalogue de 1 000 cocktails (la taille d'un vrai catalogue) et 1 000 000
+d'utilisateurs de 10 à 40 ingrédients, dans le schéma projet_bench_analyse
+(voir catalogue_synthetique ; la première génération prend plusieurs minutes).
+Mesure séparément la lecture des inventaires (COPY binaire), le produit
+creux par lots et l'écriture de la table statistiques_realisabilite, puis
+vérifie un échantillon d'utilisateurs avec le moteur en mémoire.
+"""
+
+import random
+
+import numpy as np
+from tabulate import tabulate
+
+from benchmarks.catalogue_synthetique import preparer_catalogue
+
+NB_COCKTAILS = 1_000
+NB_UTILISATEURS = 1_000_000
+TAILLES_LOT = [5_000, 20_000, 50_000]
+NB_VERIFIES = 200
+
+
+def main():
+    preparer_catalogue(nb_cocktails=NB_COCKTAILS, nb_utilisateurs=NB_UTILISATEURS, schema="projet_bench_analyse")
+
+    from dao.analyse_realisabilite import AnalyseRealisabilite
+    from dao.db_connection import DBConnection
+    from dao.inventaire_dao import InventaireDao
+    from dao.moteur_realisabilite import MoteurRealisabilite
+
+    lignes = []
+    for taille_lot in TAILLES_LOT:
+        mesures = AnalyseRealisabilite().lancer(taille_lot=taille_lot)
+        lignes.append(
+            [
+                taille_lot,
+                mesures["utilisateurs"],
+                round(mesures["lecture"], 1),
+                round(mesures["calcul"], 1),
+                round(mesures["ecriture"], 1),
+                round(mesures["lecture"] + mesures["calcul"] + mesures["ecriture"], 1),
+            ]
+        )
+    print(
+        tabulate(
+            lignes,
+            headers=["taille du lot", "utilisateurs", "lecture (s)", "calcul (s)", "écriture (s)", "total (s)"],
+        )
+    )
+
+    relation = MoteurRealisabilite().relation()
+    echantillon = random.Random(0).sample(range(1, NB_UTILISATEURS + 1), NB_VERIFIES)
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT id_utilisateur, nb_complets, nb_un_manquant, nb_deux_manquants "
+                "  FROM statistiques_realisabilite WHERE id_utilisateur = ANY(%(ids)s);",
+                {"ids": echantillon},
+            )
+            enregistrees = cursor.fetchall()
+    ecarts = 0
+    for ligne in enregistrees:
+        manquants = relation.manquants(InventaireDao().ids_inventaire(ligne["id_utilisateur"]))
+        manquants = manquants[relation.totaux > 0]
+        attendu = [int(np.count_nonzero(manquants == k)) for k in range(3)]
+        ecarts += attendu != [ligne["nb_complets"], ligne["nb_un_manquant"], ligne["nb_deux_manquants"]]
+    print(f"\n{len(enregistrees)} utilisateurs vérifiés avec le moteur en mémoire, {ecarts} écarts")
+
+
+if __name__ == "__main__":
+    main()
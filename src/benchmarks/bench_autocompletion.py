@@ -0,0 +1,110 @@
+"""Autocomplétion : ILIKE 'x%' en base contre index des préfixes en mémoire (IndexPrefixes)
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_autocompletion.py
+
+Sur le catalogue de 100 000 cocktails (schéma projet_bench, voir
+catalogue_synthetique), latence médiane et 99e centile d'une complétion
+(10 propositions) pour des débuts de noms tirés au hasard, de 1 à 6
+caractères, comme les frappes successives d'un client. La requête SQL
+(ILIKE 'x%' ORDER BY nom LIMIT 10) ne cherche que le début du nom ;
+l'index en mémoire propose en plus les noms dont un autre mot commence par
+la saisie.
+"""
+
+import random
+import statistics
+import time
+
+from tabulate import tabulate
+
+from benchmarks.catalogue_synthetique import preparer_catalogue
+
+NB_COCKTAILS = 100_000
+NB_SAISIES = 2_000
+LIMIT = 10
+
+
+def latences_ms(fonction, saisies) -> tuple[float, float]:
+    durees = []
+    for saisie in saisies:
+        debut = time.perf_counter()
+        fonction(saisie)
+        durees.append(time.perf_counter() - debut)
+    centiles = statistics.quantiles(durees, n=100)
+    return statistics.median(durees) * 1000, centiles[98] * 1000
+
+
+def main():
+    preparer_catalogue(nb_cocktails=NB_COCKTAILS)
+
+    from dao.db_connection import CurseurTuple, DBConnection
+    from dao.index_prefixes import IndexPrefixes
+
+    def ilike(table, colonne):
+        def completer(prefixe):
+            with DBConnection().connection as connection:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                    cursor.execute(
+                        f"SELECT id_{table}, {colonne} FROM {table} WHERE {colonne} ILIKE %(motif)s "
+                        f"ORDER BY {colonne} LIMIT {LIMIT};",
+                        {"motif": prefixe.replace("%", r"\%").replace("_", r"\_") + "%"},
+                    )
+                    return cursor.fetchall()
+
+        return completer
+
+    def noms(requete):
+        with DBConnection().connection as connection:
+            with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                cursor.execute(requete)
+                return [row[0] for row in cursor.fetchall()]
+
+    debut = time.perf_counter()
+    IndexPrefixes().charger()
+    construction = time.perf_counter() - debut
+
+    generateur = random.Random(2)
+    lignes = []
+    for libelle, table, colonne, requete, en_memoire in [
+        (
+            "cocktails",
+            "cocktail",
+            "nom_cocktail",
+            "SELECT nom_cocktail FROM cocktail;",
+            lambda p: IndexPrefixes().cocktails(p, LIMIT),
+        ),
+        (
+            "cocktails sans alcool",
+            None,
+            None,
+            "SELECT nom_cocktail FROM cocktail WHERE alcool = 'Non alcoholic';",
+            lambda p: IndexPrefixes().cocktails(p, LIMIT, sans_alcool=True),
+        ),
+        (
+            "ingrédients",
+            "ingredient",
+            "nom_ingredient",
+            "SELECT nom_ingredient FROM ingredient;",
+            lambda p: IndexPrefixes().ingredients(p, LIMIT),
+        ),
+    ]:
+        tous = noms(requete)
+        saisies = [nom[: generateur.randint(1, 6)] for nom in generateur.choices(tous, k=NB_SAISIES)]
+        methodes = [("index des préfixes", en_memoire)]
+        if table is not None:
+            methodes.insert(0, ("ILIKE 'x%'", ilike(table, colonne)))
+        for methode, completer in methodes:
+            mediane, p99 = latences_ms(completer, saisies[: NB_SAISIES // 10] if methode.startswith("ILIKE") else saisies)
+            lignes.append([libelle, len(tous), methode, mediane, p99])
+
+    print(f"Construction des index : {construction:.2f} s")
+    print(
+        tabulate(
+            lignes, headers=["noms", "nombre", "méthode", "médiane (ms)", "p99 (ms)"], floatfmt=".3f"
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
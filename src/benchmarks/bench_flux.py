@@ -0,0 +1,63 @@
+"""Mémoire d'un parcours complet : fetchall contre curseur serveur (DBConnection.flux)
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_flux.py
+
+La requête génère des lignes de la forme d'un utilisateur avec generate_series,
+sans avoir besoin d'une grosse table. Pour chaque volume, on mesure le pic de
+mémoire Python (tracemalloc) et la durée du parcours. tracemalloc ne voit pas
+le tampon de libpq, lui aussi borné par la taille de lot avec un curseur serveur.
+"""
+
+import time
+import tracemalloc
+
+from tabulate import tabulate
+
+from dao.db_connection import DBConnection
+
+VOLUMES = [10_000, 100_000, 300_000]
+
+REQUETE = """
+SELECT n AS id_utilisateur, 'pseudo_' || n AS pseudo, md5(n::text) AS mdp, 20 + n %% 50 AS age,
+       'FRA' AS langue, TRUE AS est_majeur, 0 AS cocktails_realises, now() AS date_creation
+FROM generate_series(1, %(volume)s) AS n;
+"""
+
+
+def mesurer(parcours) -> tuple:
+    """(pic mémoire en Mo, durée en s, nombre de lignes) d'un parcours"""
+    tracemalloc.start()
+    debut = time.perf_counter()
+    nb = parcours()
+    duree = time.perf_counter() - debut
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pic / 1e6, duree, nb
+
+
+def avec_fetchall(volume: int) -> int:
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(REQUETE, {"volume": volume})
+            return sum(1 for _ in cursor.fetchall())
+
+
+def avec_flux(volume: int) -> int:
+    return sum(1 for _ in DBConnection().flux(REQUETE, {"volume": volume}))
+
+
+def main():
+    lignes = []
+    for volume in VOLUMES:
+        for nom, parcours in [("fetchall", avec_fetchall), ("flux", avec_flux)]:
+            pic, duree, nb = mesurer(lambda parcours=parcours, volume=volume: parcours(volume))
+            assert nb == volume
+            lignes.append([volume, nom, round(pic, 2), round(duree, 2)])
+
+    print(f"taille de lot : {DBConnection().taille_lot}")
+    print(tabulate(lignes, headers=["lignes", "mode", "pic mémoire (Mo)", "durée (s)"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Latence des endpoints à plusieurs requêtes : requêtes séparées contre LotRequetes
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_lot_requetes.py
+
+Sur une base locale un aller-retour ne coûte presque rien : un petit proxy TCP
+est placé entre l'application et Postgres et retarde chaque paquet de
+LATENCE_MS / 2 dans chaque sens, comme un serveur distant. On compare, pour
+chaque latence simulée, le temps médian des deux endpoints concernés :
+- realiser_cocktail (connecté) : détails du cocktail puis compteur de
+  l'utilisateur, contre realiser_cocktail_et_compter ;
+- /commentaires/liste_com : cocktail, commentaires puis note moyenne (qui
+  relit les commentaires), contre consulter_commentaires_cocktail.
+Les données sont celles du schéma de test (projet_test_dao, réinitialisé).
+"""
+
+import os
+import socket
+import statistics
+import threading
+import time
+
+import dotenv
+from tabulate import tabulate
+
+LATENCES_MS = [0, 1, 5, 20]
+PASSES = 30
+
+
+class ProxyLatence:
+    """Proxy TCP local retardant chaque paquet de `delai` secondes, dans chaque sens"""
+
+    def __init__(self, hote: str, port: int):
+        """Constructeur"""
+        self.cible = (hote, port)
+        self.delai = 0.0
+        self.ecoute = socket.create_server(("127.0.0.1", 0))
+        self.port = self.ecoute.getsockname()[1]
+        threading.Thread(target=self._accepter, daemon=True).start()
+
+    def _accepter(self):
+        while True:
+            client, _ = self.ecoute.accept()
+            serveur = socket.create_connection(self.cible)
+            for s in (client, serveur):
+                s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._relayer, args=(client, serveur), daemon=True).start()
+            threading.Thread(target=self._relayer, args=(serveur, client), daemon=True).start()
+
+    def _relayer(self, source, destination):
+        try:
+            while donnees := source.recv(65536):
+                if self.delai:
+                    time.sleep(self.delai)
+                destination.sendall(donnees)
+        except OSError:
+            pass
+        finally:
+            destination.close()
+
+
+def mediane_ms(fonction) -> float:
+    durees = []
+    for _ in range(PASSES):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return statistics.median(durees) * 1000
+
+
+def main():
+    dotenv.load_dotenv()
+    proxy = ProxyLatence(os.environ["POSTGRES_HOST"], int(os.environ["POSTGRES_PORT"]))
+    # Les connexions du pool passent désormais par le proxy
+    os.environ["POSTGRES_HOST"] = "127.0.0.1"
+    os.environ["POSTGRES_PORT"] = str(proxy.port)
+
+    from dao.cocktail_dao import CocktailDao
+    from dao.utilisateur_dao import UtilisateurDao
+    from service.commentaire_service import CommentaireService
+    from utils.reset_database import ResetDatabase
+
+    ResetDatabase().lancer(test_dao=True)
+    utilisateur = UtilisateurDao().trouver_par_id(2)
+
+    def realiser_separe():
+        CocktailDao().realiser_cocktail(id_cocktail=1)
+        UtilisateurDao().ajout_cocktail_realise(utilisateur)
+
+    def realiser_lot():
+        CocktailDao().realiser_cocktail_et_compter(2, id_cocktail=1)
+
+    def commentaires_separe():
+        CocktailDao().trouver_par_id(1)
+        CommentaireService().lister_commentaires_cocktail(1)
+        CommentaireService().calculer_note_moyenne(1)
+
+    def commentaires_lot():
+        CommentaireService().consulter_commentaires_cocktail(1)
+
+    lignes = []
+    for latence in LATENCES_MS:
+        proxy.delai = latence / 2000
+        for endpoint, separe, lot in [
+            ("realiser_cocktail", realiser_separe, realiser_lot),
+            ("liste_com", commentaires_separe, commentaires_lot),
+        ]:
+            # Un premier appel prépare les requêtes et ouvre les connexions
+            separe(), lot()
+            duree_separe, duree_lot = mediane_ms(separe), mediane_ms(lot)
+            lignes.append(
+                [
+                    latence,
+                    endpoint,
+                    round(duree_separe, 2),
+                    round(duree_lot, 2),
+                    round(duree_separe / duree_lot, 1),
+                ]
+            )
+
+    print(
+        tabulate(
+            lignes,
+            headers=["aller-retour simulé (ms)", "endpoint", "séparées (ms)", "lot (ms)", "gain"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
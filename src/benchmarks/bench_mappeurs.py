@@ -0,0 +1,99 @@
+"""RealDictCursor + lectures par nom contre curseur tuple + Mappeur compilé
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_mappeurs.py
+
+Une page de 10 000 lignes ayant la forme d'un cocktail est générée par la base
+(generate_series). La requête est exécutée à l'identique dans les deux modes ;
+on mesure uniquement la partie Python : fetchall (création des lignes) puis
+construction des objets Cocktail. Coût CPU par ligne (médiane sur plusieurs
+passes) et allocations (pic tracemalloc, nombre de blocs alloués par ligne).
+"""
+
+import statistics
+import sys
+import time
+import tracemalloc
+
+from tabulate import tabulate
+
+from business_object.cocktail import Cocktail
+from dao.cocktail_dao import MAPPEUR_COCKTAIL
+from dao.db_connection import CurseurDict, CurseurTuple, DBConnection
+
+NB_LIGNES = 10_000
+PASSES = 15
+
+REQUETE = """
+SELECT n AS id_cocktail, 'Cocktail ' || n AS nom_cocktail, 'Ordinary Drink' AS categorie,
+       'Alcoholic' AS alcool, 'https://exemple.org/' || n || '.jpg' AS image_url,
+       'Highball glass' AS verre, repeat('Mélanger. ', 8) AS instructions
+FROM generate_series(1, %(nb)s) AS n;
+"""
+
+
+def avec_dictionnaires(cursor) -> list:
+    rows = cursor.fetchall()
+    return [
+        Cocktail(
+            id_cocktail=row["id_cocktail"],
+            nom_cocktail=row["nom_cocktail"],
+            categ_cocktail=row["categorie"],
+            image_cocktail=row.get("image_url"),
+            alcoolise_cocktail=row.get("alcool"),
+            instruc_cocktail=row.get("instructions"),
+            verre=row.get("verre"),
+        )
+        for row in rows
+    ]
+
+
+def avec_mappeur(cursor) -> list:
+    return MAPPEUR_COCKTAIL.tous(cursor)
+
+
+def mesurer(connection, curseur, construire) -> list:
+    """[µs par ligne (médiane), pic mémoire (Mo), blocs alloués par ligne]"""
+    durees = []
+    with connection.cursor(cursor_factory=curseur) as cursor:
+        for _ in range(PASSES):
+            cursor.execute(REQUETE, {"nb": NB_LIGNES})
+            debut = time.perf_counter()
+            objets = construire(cursor)
+            durees.append(time.perf_counter() - debut)
+            assert len(objets) == NB_LIGNES
+            del objets
+
+        cursor.execute(REQUETE, {"nb": NB_LIGNES})
+        tracemalloc.start()
+        blocs_avant = sys.getallocatedblocks()
+        objets = construire(cursor)
+        blocs = sys.getallocatedblocks() - blocs_avant
+        _, pic = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del objets
+
+    return [
+        round(statistics.median(durees) * 1e6 / NB_LIGNES, 3),
+        round(pic / 1e6, 2),
+        round(blocs / NB_LIGNES, 1),
+    ]
+
+
+def main():
+    with DBConnection().connection as connection:
+        dictionnaires = mesurer(connection, CurseurDict, avec_dictionnaires)
+        mappeur = mesurer(connection, CurseurTuple, avec_mappeur)
+
+    print(f"{NB_LIGNES} lignes, médiane sur {PASSES} passes")
+    print(
+        tabulate(
+            [["RealDictCursor + row[...]"] + dictionnaires, ["tuple + Mappeur"] + mappeur],
+            headers=["mode", "µs / ligne", "pic mémoire (Mo)", "blocs / ligne"],
+        )
+    )
+    print(f"gain CPU : {(1 - mappeur[0] / dictionnaires[0]) * 100:.0f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Cocktails complets / partiels : requêtes SQL contre MoteurRealisabilite (bits en mémoire)
+et IndexManquants (manquants par utilisateur, tenus à jour par delta)
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_moteur_realisabilite.py
+
+Le catalogue est généré dans le schéma projet_bench (100 000 cocktails, voir
+catalogue_synthetique). Pour un échantillon d'utilisateurs, on mesure le temps
+médian :
+- des requêtes SQL d'origine (page de 10 et total, exécutées telles quelles) ;
+- du calcul seul du moteur (inventaire déjà lu) ;
+- de la lecture seule de l'index (entrée déjà construite) ;
+- des méthodes de DAO complètes (lecture de l'inventaire, index, page de 10) ;
+- d'un ajout suivi d'une suppression d'ingrédient dans l'index.
+"""
+
+import statistics
+import time
+
+import numpy as np
+from tabulate import tabulate
+
+from benchmarks.catalogue_synthetique import preparer_catalogue
+
+NB_COCKTAILS = 100_000
+UTILISATEURS = range(1, 21)
+NB_MANQUANTS = 2
+
+# Requêtes d'avant l'index, qui servent aussi de référence aux résultats du DAO
+CORRESPONDANCES = """
+    WITH cocktail_matching_ingredients AS (
+        SELECT ci.id_cocktail, COUNT(*) AS matching_ingredients
+        FROM inventaire_ingredient ui
+        JOIN cocktail_ingredient ci ON ci.id_ingredient = ui.id_ingredient
+        WHERE ui.id_utilisateur = %(id_utilisateur)s
+        GROUP BY ci.id_cocktail
+    )
+"""
+COLONNES = "c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.instructions, COUNT(*) OVER () AS total"
+REQUETE_COMPLETS = f"""{CORRESPONDANCES}
+    SELECT {COLONNES}
+    FROM cocktail c
+    JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+    WHERE c.nb_ingredients = cmi.matching_ingredients
+    ORDER BY c.nom_cocktail, c.id_cocktail
+    LIMIT %(limit)s;
+"""
+REQUETE_PARTIELS = f"""{CORRESPONDANCES}
+    SELECT {COLONNES}
+    FROM cocktail c
+    LEFT JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+    WHERE c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0) BETWEEN 1 AND %(nb_manquants)s
+    ORDER BY c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0), c.nom_cocktail, c.id_cocktail
+    LIMIT %(limit)s;
+"""
+
+
+def mediane_ms(fonction, passes: int = 1) -> float:
+    durees = []
+    for id_utilisateur in UTILISATEURS:
+        for _ in range(passes):
+            debut = time.perf_counter()
+            fonction(id_utilisateur)
+            durees.append(time.perf_counter() - debut)
+    return statistics.median(durees) * 1000
+
+
+def main():
+    preparer_catalogue(nb_cocktails=NB_COCKTAILS)
+
+    from dao.cocktail_dao import CocktailDao
+    from dao.db_connection import CurseurTuple, DBConnection
+    from dao.index_manquants import IndexManquants
+    from dao.inventaire_dao import InventaireDao
+    from dao.moteur_realisabilite import MoteurRealisabilite
+
+    def sql(requete, id_utilisateur, limit=10):
+        with DBConnection().connection as connection:
+            with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                cursor.execute(
+                    requete, {"id_utilisateur": id_utilisateur, "nb_manquants": NB_MANQUANTS, "limit": limit}
+                )
+                return cursor.fetchall()
+
+    dao = CocktailDao()
+    moteur = MoteurRealisabilite()
+    index = IndexManquants()
+
+    debut = time.perf_counter()
+    moteur.charger()
+    chargement = time.perf_counter() - debut
+    relation = moteur.relation()
+    inventaires = {u: InventaireDao().ids_inventaire(u) for u in UTILISATEURS}
+
+    # Les résultats des deux calculs sont identiques
+    for u in UTILISATEURS:
+        assert [c.id_cocktail for c in dao.cocktail_complet(u, limit=50)] == [
+            row[0] for row in sql(REQUETE_COMPLETS, u, limit=50)
+        ]
+        assert [c.id_cocktail for c in dao.cocktail_partiel(u, NB_MANQUANTS, limit=50)] == [
+            row[0] for row in sql(REQUETE_PARTIELS, u, limit=50)
+        ]
+
+    lignes = [
+        [
+            "complets",
+            mediane_ms(lambda u: sql(REQUETE_COMPLETS, u)),
+            mediane_ms(lambda u: moteur.complets(inventaires[u]), passes=20),
+            mediane_ms(lambda u: index.complets(u, inventaires[u]), passes=20),
+            mediane_ms(lambda u: dao.cocktail_complet(u)),
+        ],
+        [
+            f"partiels (<= {NB_MANQUANTS} manquants)",
+            mediane_ms(lambda u: sql(REQUETE_PARTIELS, u)),
+            mediane_ms(lambda u: moteur.partiels(inventaires[u], NB_MANQUANTS), passes=20),
+            mediane_ms(lambda u: index.partiels(u, inventaires[u], NB_MANQUANTS), passes=20),
+            mediane_ms(lambda u: dao.cocktail_partiel(u, NB_MANQUANTS)),
+        ],
+    ]
+
+    # Ingrédient le plus fréquent absent de l'inventaire : le pire cas d'un delta
+    def ajout_retrait(u):
+        id_ingredient = next(
+            int(i) for i in relation.ids_ingredients[np.argsort(relation.colonne_de)] if i not in inventaires[u]
+        )
+        index.ajouter(u, id_ingredient)
+        index.retirer(u, id_ingredient)
+
+    delta = mediane_ms(ajout_retrait, passes=5)
+
+    print(
+        f"{len(relation.ids_cocktails)} cocktails, {len(relation.ids_ingredients)} ingrédients "
+        f"utilisés : matrice de {relation.bits.nbytes / 1e6:.1f} Mo chargée en {chargement:.2f} s"
+    )
+    print(
+        tabulate(
+            [[nom] + [round(v, 3) for v in valeurs] for nom, *valeurs in lignes],
+            headers=[
+                "requête",
+                "SQL (ms)",
+                "moteur, calcul seul (ms)",
+                "index, lecture seule (ms)",
+                "DAO avec index (ms)",
+            ],
+        )
+    )
+    print(f"Ajout puis retrait de l'ingrédient le plus fréquent dans l'index : {delta:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
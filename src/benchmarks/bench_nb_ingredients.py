@@ -0,0 +1,159 @@
+"""Cocktails complets / partiels en SQL : nombre d'ingrédients recalculé contre stocké
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_nb_ingredients.py
+
+Sur le catalogue de 100 000 cocktails (schéma projet_bench, voir
+catalogue_synthetique), on lance EXPLAIN ANALYZE sur les requêtes
+_cocktail_complet_sql / _cocktail_partiel_sql :
+- avant : cocktail_ingredient_count refait un GROUP BY sur toute la table
+  cocktail_ingredient à chaque appel ;
+- après : cocktail.nb_ingredients, tenu à jour par trigger, et une seule
+  jointure avec l'inventaire de l'utilisateur.
+On affiche le temps d'exécution médian et le plan du premier utilisateur.
+"""
+
+import statistics
+import sys
+
+from tabulate import tabulate
+
+from benchmarks.catalogue_synthetique import preparer_catalogue
+
+NB_COCKTAILS = 100_000
+UTILISATEURS = range(1, 11)
+NB_MANQUANTS = 2
+
+COMPLET_AVANT = """
+WITH user_ingredients AS (
+    SELECT id_ingredient FROM inventaire_ingredient WHERE id_utilisateur = %(id_utilisateur)s
+),
+cocktail_ingredient_count AS (
+    SELECT id_cocktail, COUNT(*) AS total_ingredients FROM cocktail_ingredient GROUP BY id_cocktail
+),
+cocktail_matching_ingredients AS (
+    SELECT ci.id_cocktail, COUNT(*) AS matching_ingredients
+    FROM cocktail_ingredient ci
+    JOIN user_ingredients ui ON ci.id_ingredient = ui.id_ingredient
+    GROUP BY ci.id_cocktail
+)
+SELECT c.id_cocktail, c.nom_cocktail
+FROM cocktail c
+JOIN cocktail_ingredient_count cic ON c.id_cocktail = cic.id_cocktail
+JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+WHERE cic.total_ingredients = cmi.matching_ingredients
+ORDER BY c.nom_cocktail
+LIMIT 10;
+"""
+
+COMPLET_APRES = """
+WITH cocktail_matching_ingredients AS (
+    SELECT ci.id_cocktail, COUNT(*) AS matching_ingredients
+    FROM inventaire_ingredient ui
+    JOIN cocktail_ingredient ci ON ci.id_ingredient = ui.id_ingredient
+    WHERE ui.id_utilisateur = %(id_utilisateur)s
+    GROUP BY ci.id_cocktail
+)
+SELECT c.id_cocktail, c.nom_cocktail
+FROM cocktail c
+JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+WHERE c.nb_ingredients = cmi.matching_ingredients
+ORDER BY c.nom_cocktail
+LIMIT 10;
+"""
+
+PARTIEL_AVANT = """
+WITH cocktail_ingredient_count AS (
+    SELECT id_cocktail, COUNT(*) AS total_ingredients FROM cocktail_ingredient GROUP BY id_cocktail
+),
+cocktail_matching_ingredients AS (
+    SELECT c.id_cocktail, COUNT(ui.id_ingredient) AS matching_ingredients
+    FROM cocktail c
+    LEFT JOIN cocktail_ingredient ci ON c.id_cocktail = ci.id_cocktail
+    LEFT JOIN inventaire_ingredient ui
+        ON ci.id_ingredient = ui.id_ingredient AND ui.id_utilisateur = %(id_utilisateur)s
+    GROUP BY c.id_cocktail
+)
+SELECT c.id_cocktail, c.nom_cocktail
+FROM cocktail c
+JOIN cocktail_ingredient_count cic ON c.id_cocktail = cic.id_cocktail
+JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+WHERE (cic.total_ingredients - cmi.matching_ingredients) <= %(nb_manquants)s
+AND (cic.total_ingredients - cmi.matching_ingredients) >= 1
+ORDER BY (cic.total_ingredients - cmi.matching_ingredients) ASC, c.nom_cocktail
+LIMIT 10;
+"""
+
+PARTIEL_APRES = """
+WITH cocktail_matching_ingredients AS (
+    SELECT ci.id_cocktail, COUNT(*) AS matching_ingredients
+    FROM inventaire_ingredient ui
+    JOIN cocktail_ingredient ci ON ci.id_ingredient = ui.id_ingredient
+    WHERE ui.id_utilisateur = %(id_utilisateur)s
+    GROUP BY ci.id_cocktail
+)
+SELECT c.id_cocktail, c.nom_cocktail
+FROM cocktail c
+LEFT JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+WHERE c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0) BETWEEN 1 AND %(nb_manquants)s
+ORDER BY c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0), c.nom_cocktail
+LIMIT 10;
+"""
+
+
+def expliquer(cursor, requete: str, id_utilisateur: int) -> tuple[float, str]:
+    """(durée d'exécution en ms, plan) d'EXPLAIN ANALYZE"""
+    cursor.execute(
+        f"EXPLAIN (ANALYZE, TIMING OFF, FORMAT JSON) {requete}",
+        {"id_utilisateur": id_utilisateur, "nb_manquants": NB_MANQUANTS},
+    )
+    plan = cursor.fetchone()[0][0]
+    cursor.execute(
+        f"EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF, SUMMARY OFF) {requete}",
+        {"id_utilisateur": id_utilisateur, "nb_manquants": NB_MANQUANTS},
+    )
+    return plan["Execution Time"], "\n".join(ligne[0] for ligne in cursor.fetchall())
+
+
+def main():
+    preparer_catalogue(nb_cocktails=NB_COCKTAILS)
+
+    from dao.db_connection import CurseurTuple, DBConnection
+
+    lignes = []
+    plans = []
+    with DBConnection().connection as connection:
+        with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+            for nom, avant, apres in [
+                ("complets", COMPLET_AVANT, COMPLET_APRES),
+                (f"partiels (<= {NB_MANQUANTS} manquants)", PARTIEL_AVANT, PARTIEL_APRES),
+            ]:
+                for u in UTILISATEURS:
+                    cursor.execute(avant, {"id_utilisateur": u, "nb_manquants": NB_MANQUANTS})
+                    attendus = cursor.fetchall()
+                    cursor.execute(apres, {"id_utilisateur": u, "nb_manquants": NB_MANQUANTS})
+                    assert cursor.fetchall() == attendus, (nom, u)
+
+                durees_avant = [expliquer(cursor, avant, u)[0] for u in UTILISATEURS]
+                durees_apres = [expliquer(cursor, apres, u)[0] for u in UTILISATEURS]
+                lignes.append(
+                    [nom, statistics.median(durees_avant), statistics.median(durees_apres)]
+                )
+                plans += [
+                    (f"{nom}, avant", expliquer(cursor, avant, UTILISATEURS[0])[1]),
+                    (f"{nom}, après", expliquer(cursor, apres, UTILISATEURS[0])[1]),
+                ]
+
+    print(
+        tabulate(
+            [[nom, round(a, 1), round(b, 1), f"x{a / b:.1f}"] for nom, a, b in lignes],
+            headers=["requête", "avant (ms)", "après (ms)", "gain"],
+        )
+    )
+    if "--plans" in sys.argv:
+        for titre, plan in plans:
+            print(f"\n--- {titre}\n{plan}")
+
+
+if __name__ == "__main__":
+    main()
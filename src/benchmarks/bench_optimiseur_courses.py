@@ -0,0 +1,105 @@
+"""Liste de courses optimale : latence d'OptimiseurCourses et écart à la recherche exhaustive
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_optimiseur_courses.py
+
+- Latence : sur le catalogue de 100 000 cocktails (schéma projet_bench, voir
+  catalogue_synthetique), temps médian et maximal de meilleurs_achats pour
+  k = 1 à 10 sur un échantillon d'utilisateurs (inventaire déjà lu). Le
+  délai DELAI_MS est levé pour mesurer la recherche complète ; la colonne
+  "tronquées" compte les recherches qui l'auraient dépassé.
+- Qualité : sur des catalogues aléatoires assez petits pour énumérer toutes
+  les combinaisons de k ingrédients (k = 1 à 3), rapport entre le nombre de
+  cocktails débloqués par le glouton et l'optimum.
+"""
+
+import itertools
+import random
+import statistics
+import time
+
+from tabulate import tabulate
+
+from benchmarks.catalogue_synthetique import preparer_catalogue
+
+NB_COCKTAILS = 100_000
+UTILISATEURS = range(1, 21)
+NB_CATALOGUES_QUALITE = 20
+
+
+def latences(relation, inventaires: dict) -> list[list]:
+    from dao.optimiseur_courses import DELAI_MS, K_MAX, meilleurs_achats
+
+    lignes = []
+    for k in range(1, K_MAX + 1):
+        durees, gains = [], []
+        for inventaire in inventaires.values():
+            debut = time.perf_counter()
+            _, nb_cocktails = meilleurs_achats(relation, inventaire, k, delai_ms=10**6)
+            durees.append((time.perf_counter() - debut) * 1000)
+            gains.append(nb_cocktails)
+        lignes.append(
+            [
+                k,
+                round(statistics.median(durees), 1),
+                round(max(durees), 1),
+                sum(d > DELAI_MS for d in durees),
+                statistics.median(gains),
+            ]
+        )
+    return lignes
+
+
+def qualite() -> list[list]:
+    from dao.moteur_realisabilite import RelationBits
+    from dao.optimiseur_courses import meilleurs_achats
+
+    generateur = random.Random(0)
+    ratios = {k: [] for k in (1, 2, 3)}
+    for _ in range(NB_CATALOGUES_QUALITE):
+        recettes = {c: set(generateur.sample(range(40), generateur.randint(2, 6))) for c in range(1000)}
+        relation = RelationBits(list(recettes), [(c, i) for c, ingr in recettes.items() for i in ingr])
+        inventaire = set(generateur.sample(range(40), 12))
+        candidats = sorted(set(range(40)) - inventaire)
+
+        def gain(achats, recettes=recettes, inventaire=inventaire):
+            return sum(1 for ingr in recettes.values() if ingr - inventaire and ingr <= inventaire | set(achats))
+
+        for k in ratios:
+            _, nb_cocktails = meilleurs_achats(relation, list(inventaire), k, delai_ms=10**6)
+            optimum = max(gain(c) for c in itertools.combinations(candidats, k))
+            ratios[k].append(nb_cocktails / optimum if optimum else 1)
+    return [
+        [k, round(min(r), 3), round(statistics.mean(r), 3), f"{sum(x == 1 for x in r)}/{len(r)}"]
+        for k, r in ratios.items()
+    ]
+
+
+def main():
+    preparer_catalogue(nb_cocktails=NB_COCKTAILS)
+
+    from dao.inventaire_dao import InventaireDao
+    from dao.moteur_realisabilite import MoteurRealisabilite
+    from dao.optimiseur_courses import DELAI_MS
+
+    relation = MoteurRealisabilite().relation()
+    inventaires = {u: InventaireDao().ids_inventaire(u) for u in UTILISATEURS}
+
+    print(f"{len(relation.ids_cocktails)} cocktails, {len(relation.ids_ingredients)} ingrédients utilisés")
+    print(
+        tabulate(
+            latences(relation, inventaires),
+            headers=["k", "médiane (ms)", "max (ms)", f"tronquées (> {DELAI_MS} ms)", "cocktails débloqués"],
+        )
+    )
+    print()
+    print(
+        tabulate(
+            qualite(),
+            headers=["k", "pire rapport à l'optimum", "rapport moyen", "optimum atteint"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Pagination OFFSET contre pagination par curseur (clé du dernier cocktail)
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_pagination.py
+
+Sur le catalogue de 100 000 cocktails (schéma projet_bench, voir
+catalogue_synthetique), temps médian de la page 1 et de la page 500 (pages de
+10 cocktails) de rechercher_cocktails sans filtre (requête SQL), lue avec
+OFFSET 4990 ou avec le curseur de la page précédente. Les listes
+cocktail_complet / cocktail_partiel, servies par IndexManquants, sont mesurées
+de la même façon pour un échantillon d'utilisateurs ; si un utilisateur a
+moins de 5 000 cocktails, sa dernière page pleine est mesurée à la place.
+"""
+
+import statistics
+import time
+
+from tabulate import tabulate
+
+from benchmarks.catalogue_synthetique import preparer_catalogue
+
+NB_COCKTAILS = 100_000
+UTILISATEURS = range(1, 21)
+LIMIT = 10
+PAGE = 500
+NB_MANQUANTS = 5
+PASSES = 5
+
+
+def mediane_ms(fonction) -> float:
+    durees = []
+    for _ in range(PASSES):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return statistics.median(durees) * 1000
+
+
+def mesurer(lire, lire_apres) -> list:
+    """Page 1, page profonde par OFFSET, page profonde par curseur ; lire(limit, offset), lire_apres(limit, curseur)"""
+    profondeur = max(0, len(lire(PAGE * LIMIT, 0)) - LIMIT)
+    precedentes = lire(profondeur, 0)
+    curseur = precedentes.suivant if precedentes else None
+    assert [c.id_cocktail for c in lire(LIMIT, profondeur)] == [c.id_cocktail for c in lire_apres(LIMIT, curseur)]
+    return [
+        profondeur // LIMIT + 1,
+        mediane_ms(lambda: lire(LIMIT, 0)),
+        mediane_ms(lambda: lire(LIMIT, profondeur)),
+        mediane_ms(lambda: lire_apres(LIMIT, curseur)),
+    ]
+
+
+def main():
+    preparer_catalogue(nb_cocktails=NB_COCKTAILS)
+
+    from dao.cocktail_dao import CocktailDao
+
+    dao = CocktailDao()
+
+    lignes = [
+        ["rechercher_cocktails (SQL)"]
+        + mesurer(
+            lambda limit, offset: dao.rechercher_cocktails(limit=limit, offset=offset),
+            lambda limit, curseur: dao.rechercher_cocktails(limit=limit, apres=curseur),
+        )
+    ]
+    for nom, lire, lire_apres in [
+        (
+            "cocktail_complet (index)",
+            lambda u, limit, offset: dao.cocktail_complet(u, limit=limit, offset=offset),
+            lambda u, limit, curseur: dao.cocktail_complet(u, limit=limit, apres=curseur),
+        ),
+        (
+            f"cocktail_partiel {NB_MANQUANTS} (index)",
+            lambda u, limit, offset: dao.cocktail_partiel(u, NB_MANQUANTS, limit=limit, offset=offset),
+            lambda u, limit, curseur: dao.cocktail_partiel(u, NB_MANQUANTS, limit=limit, apres=curseur),
+        ),
+    ]:
+        mesures = [
+            mesurer(
+                lambda limit, offset, u=u, lire=lire: lire(u, limit, offset),
+                lambda limit, curseur, u=u, lire_apres=lire_apres: lire_apres(u, limit, curseur),
+            )
+            for u in UTILISATEURS
+        ]
+        pages, *durees = zip(*mesures)
+        lignes.append([nom, int(statistics.median(pages))] + [statistics.median(colonne) for colonne in durees])
+
+    print(
+        tabulate(
+            lignes,
+            headers=["liste", "page profonde", "page 1 (ms)", "OFFSET (ms)", "curseur (ms)"],
+            floatfmt=".2f",
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Débit du pool de connexions en fonction du nombre de clients simultanés
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_pool_connexions.py
+
+Chaque client est un thread qui enchaîne des requêtes pendant DUREE secondes.
+La requête attend LATENCE_MS côté serveur pour simuler le temps d'exécution
+d'une vraie requête du catalogue. La ligne "connexion unique" reproduit
+l'ancien DBConnection (un pool de taille 1).
+"""
+
+import threading
+import time
+
+from tabulate import tabulate
+
+from dao.db_connection import parametres_connexion
+from dao.pool_connexions import PoolConnexions
+
+DUREE = 2.0
+LATENCE_MS = 5
+CLIENTS = [1, 2, 4, 8, 16, 32]
+REQUETE = "SELECT pg_sleep(%(latence)s), COUNT(*) AS nb FROM cocktail;"
+
+
+def mesurer_debit(pool: PoolConnexions, nb_clients: int) -> float:
+    """Nombre de requêtes par seconde obtenu avec nb_clients threads"""
+    compteurs = [0] * nb_clients
+    fin = time.perf_counter() + DUREE
+
+    def client(i):
+        while time.perf_counter() < fin:
+            with pool.connexion() as connexion:
+                with connexion.cursor() as cursor:
+                    cursor.execute(REQUETE, {"latence": LATENCE_MS / 1000})
+                    cursor.fetchone()
+            compteurs[i] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(nb_clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return sum(compteurs) / DUREE
+
+
+def main():
+    parametres = parametres_connexion()
+    lignes = []
+    for nb_clients in CLIENTS:
+        unique = PoolConnexions(1, 1, delai_attente=60, **parametres)
+        pool = PoolConnexions(1, nb_clients, delai_attente=60, **parametres)
+        debit_unique = mesurer_debit(unique, nb_clients)
+        debit_pool = mesurer_debit(pool, nb_clients)
+        metriques = pool.metriques()
+        lignes.append(
+            [
+                nb_clients,
+                round(debit_unique),
+                round(debit_pool),
+                round(debit_pool / debit_unique, 1),
+                metriques["taille"],
+                metriques["attente_max_ms"],
+            ]
+        )
+        unique.fermer()
+        pool.fermer()
+
+    print(
+        tabulate(
+            lignes,
+            headers=[
+                "clients",
+                "connexion unique (req/s)",
+                "pool (req/s)",
+                "gain",
+                "taille pool",
+                "attente max (ms)",
+            ],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Recherche par nom : ILIKE '%nom%' contre index des trigrammes (IndexTrigrammes)
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_recherche_floue.py
+
+Sur le catalogue de 100 000 cocktails (schéma projet_bench, voir
+catalogue_synthetique), temps médian de la première page (10 cocktails, avec
+le total) de rechercher_cocktails pour quelques recherches : un nom exact, le
+même avec une faute de frappe, une partie de nom fréquente, puis la faute de
+frappe avec un filtre de catégorie (classement en mémoire puis filtre en
+SQL ; sans autre filtre, la page est lue dans le classement). L'ancienne
+requête (ILIKE, tri par nom, total compté par COUNT(*) OVER ()) est exécutée
+telle quelle. La colonne "trouvé" indique si le cocktail visé est en tête
+des résultats.
+"""
+
+import statistics
+import time
+
+from tabulate import tabulate
+
+from benchmarks.catalogue_synthetique import preparer_catalogue
+
+NB_COCKTAILS = 100_000
+LIMIT = 10
+PASSES = 7
+
+
+def mediane_ms(fonction) -> float:
+    durees = []
+    for _ in range(PASSES):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return statistics.median(durees) * 1000
+
+
+def main():
+    preparer_catalogue(nb_cocktails=NB_COCKTAILS)
+
+    from dao.cocktail_dao import CocktailDao
+    from dao.db_connection import CurseurTuple, DBConnection
+    from dao.index_trigrammes import IndexTrigrammes
+
+    dao = CocktailDao()
+
+    def ilike(nom, categorie=None):
+        filtre = "" if categorie is None else " AND LOWER(categorie) = LOWER(%(categorie)s)"
+        with DBConnection().connection as connection:
+            with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                cursor.execute(
+                    "SELECT c.id_cocktail, COUNT(*) OVER () FROM cocktail c "
+                    f"WHERE nom_cocktail ILIKE %(nom_cocktail)s{filtre} "
+                    "ORDER BY nom_cocktail, id_cocktail LIMIT %(limit)s;",
+                    {"nom_cocktail": f"%{nom}%", "categorie": categorie, "limit": LIMIT},
+                )
+                lignes = cursor.fetchall()
+        return [row[0] for row in lignes], str(lignes[0][1] if lignes else 0)
+
+    def trigrammes(nom, categorie=None):
+        page = dao.rechercher_cocktails(nom, categorie=categorie, limit=LIMIT)
+        return [c.id_cocktail for c in page], f"{page.total}{'' if page.total_exact else '+'}"
+
+    debut = time.perf_counter()
+    IndexTrigrammes().noms()
+    construction = time.perf_counter() - debut
+
+    cocktail = dao.trouver_par_id(4242)
+    vise = cocktail.nom_cocktail
+    nom, suffixe = vise.split(" ", 1)
+    faute = nom[:2] + nom[3] + nom[2] + nom[4:] + " " + suffixe[:-1]
+    lignes = []
+    for libelle, recherche, categorie in [
+        ("nom exact", vise, None),
+        ("faute de frappe", faute, None),
+        ("début du nom", nom[:4], None),
+        ("partie fréquente", "Sour", None),
+        ("faute de frappe + catégorie", faute, cocktail.categ_cocktail),
+    ]:
+        for methode, lire in [("ILIKE", ilike), ("trigrammes", trigrammes)]:
+            ids, total = lire(recherche, categorie)
+            lignes.append(
+                [
+                    f"{libelle} ({recherche!r})",
+                    methode,
+                    total,
+                    ids[:1] == [4242],
+                    mediane_ms(lambda lire=lire, recherche=recherche, categorie=categorie: lire(recherche, categorie)),
+                ]
+            )
+    lignes.append(
+        ["classement seul (faute de frappe)", "trigrammes", "", "", mediane_ms(lambda: IndexTrigrammes().rechercher(faute))]
+    )
+
+    print(f"Construction de l'index des trigrammes : {construction:.2f} s")
+    print(tabulate(lignes, headers=["recherche", "méthode", "résultats", "trouvé", "page 1 (ms)"], floatfmt=".2f"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Requêtes préparées contre requêtes envoyées en texte à chaque appel
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_requetes_preparees.py
+
+Pour chaque requête chaude de CocktailDao, on mesure le temps moyen d'un
+appel avec cursor.execute (analyse + planification à chaque fois) puis via
+RegistreRequetesPreparees, sur la même connexion du pool.
+"""
+
+import time
+
+from tabulate import tabulate
+
+from dao.cocktail_dao import CocktailDao
+from dao.db_connection import DBConnection
+from dao.requetes_preparees import RegistreRequetesPreparees
+
+ITERATIONS = 300
+
+
+def requetes_chaudes():
+    """(nom, requête, paramètres) des requêtes préparées par CocktailDao"""
+    col = CocktailDao().instruction_column("FRA")
+    return [
+        (
+            "realiser_cocktail",
+            f"""
+            SELECT c.id_cocktail, c.nom_cocktail, c.{col} AS instructions,
+                   STRING_AGG(i.nom_ingredient, ', ' ORDER BY i.nom_ingredient) AS ingredients
+            FROM cocktail c
+            JOIN cocktail_ingredient ci ON c.id_cocktail = ci.id_cocktail
+            JOIN ingredient i ON ci.id_ingredient = i.id_ingredient
+            WHERE LOWER(c.nom_cocktail) = LOWER(%(nom_cocktail)s)
+            GROUP BY c.id_cocktail, c.nom_cocktail, c.{col}
+            """,
+            {"nom_cocktail": "Mojito"},
+        ),
+        (
+            "cocktail_partiel",
+            f"""
+            WITH cocktail_matching_ingredients AS (
+                SELECT ci.id_cocktail, COUNT(*) AS matching_ingredients
+                FROM inventaire_ingredient ui
+                JOIN cocktail_ingredient ci ON ci.id_ingredient = ui.id_ingredient
+                WHERE ui.id_utilisateur = %(id_utilisateur)s
+                GROUP BY ci.id_cocktail
+            )
+            SELECT c.id_cocktail, c.nom_cocktail, c.{col} AS instructions
+            FROM cocktail c
+            LEFT JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+            WHERE c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0) BETWEEN 1 AND %(nb_manquants)s
+            ORDER BY c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0), c.nom_cocktail
+            LIMIT %(limit)s OFFSET %(offset)s;
+            """,
+            {"id_utilisateur": 3, "nb_manquants": 2, "limit": 10, "offset": 0},
+        ),
+        (
+            "rechercher_cocktails",
+            f"""
+            SELECT c.id_cocktail, c.nom_cocktail, c.{col} AS instructions
+            FROM cocktail c
+            WHERE nom_cocktail ILIKE %(nom_cocktail)s AND LOWER(categorie) = LOWER(%(categorie)s)
+            ORDER BY nom_cocktail LIMIT %(limit)s OFFSET %(offset)s;
+            """,
+            {"nom_cocktail": "%gin%", "categorie": "cocktail", "limit": 10, "offset": 0},
+        ),
+    ]
+
+
+def chronometrer(fonction) -> float:
+    """Durée moyenne d'un appel en millisecondes"""
+    debut = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fonction()
+    return (time.perf_counter() - debut) * 1000 / ITERATIONS
+
+
+def main():
+    registre = RegistreRequetesPreparees()
+    lignes = []
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            for nom, requete, parametres in requetes_chaudes():
+
+                def texte(requete=requete, parametres=parametres):
+                    cursor.execute(requete, parametres)
+                    cursor.fetchall()
+
+                def preparee(nom=nom, requete=requete, parametres=parametres):
+                    registre.executer(cursor, nom, requete, parametres)
+                    cursor.fetchall()
+
+                texte()
+                preparee()
+                ms_texte = chronometrer(texte)
+                ms_preparee = chronometrer(preparee)
+                lignes.append(
+                    [nom, round(ms_texte, 3), round(ms_preparee, 3),
+                     f"{(1 - ms_preparee / ms_texte) * 100:.0f} %"]
+                )
+            plans = registre.plans(cursor)
+
+    print(tabulate(lignes, headers=["requête", "texte (ms)", "préparée (ms)", "gain"]))
+    print()
+    print(tabulate(registre.statistiques(), headers="keys"))
+    print()
+    print(tabulate(plans, headers="keys"))
+
+
+if __name__ == "__main__":
+    main()
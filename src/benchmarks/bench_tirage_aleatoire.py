@@ -0,0 +1,81 @@
+"""Tirage aléatoire : ORDER BY RANDOM() LIMIT n contre tirage en mémoire (TirageCocktails)
+
+Lancement (depuis la racine du projet, avec le .env configuré) :
+    PYTHONPATH=src python src/benchmarks/bench_tirage_aleatoire.py
+
+Sur le catalogue de 100 000 cocktails (schéma projet_bench, voir
+catalogue_synthetique), temps médian d'un tirage de 5 cocktails (tous, puis
+les seuls cocktails sans alcool d'un mineur) et de 10 ingrédients :
+l'ancienne requête (ORDER BY RANDOM() LIMIT n, tri de toute la table) contre
+cocktails_aleatoires / ingredients_aleatoires (positions tirées en mémoire,
+cocktails lus par clé primaire, ingrédients sans requête). Puis le cocktail
+du jour, lu une fois puis gardé en mémoire.
+"""
+
+import statistics
+import time
+
+from tabulate import tabulate
+
+from benchmarks.catalogue_synthetique import preparer_catalogue
+
+NB_COCKTAILS = 100_000
+PASSES = 21
+
+
+def mediane_ms(fonction) -> float:
+    durees = []
+    for _ in range(PASSES):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return statistics.median(durees) * 1000
+
+
+def main():
+    preparer_catalogue(nb_cocktails=NB_COCKTAILS)
+
+    from dao.cocktail_dao import CocktailDao
+    from dao.db_connection import CurseurTuple, DBConnection
+    from dao.index_ingredients import IndexIngredients
+    from dao.inventaire_dao import InventaireDao
+    from dao.tirage_cocktails import TirageCocktails
+
+    def order_by_random(requete, limit):
+        with DBConnection().connection as connection:
+            with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                cursor.execute(requete + " ORDER BY RANDOM() LIMIT %(limit)s;", {"limit": limit})
+                return cursor.fetchall()
+
+    colonnes = "SELECT id_cocktail, nom_cocktail, categorie, alcool, image_url, verre, instructions FROM cocktail c"
+
+    debut = time.perf_counter()
+    TirageCocktails().tirer(1)
+    IndexIngredients().aleatoires(1)
+    construction = time.perf_counter() - debut
+
+    dao = CocktailDao()
+    lignes = [
+        ["5 cocktails", "ORDER BY RANDOM()", mediane_ms(lambda: order_by_random(colonnes, 5))],
+        ["5 cocktails", "tirage en mémoire", mediane_ms(lambda: dao.cocktails_aleatoires(5))],
+        [
+            "5 cocktails sans alcool",
+            "ORDER BY RANDOM()",
+            mediane_ms(lambda: order_by_random(colonnes + " WHERE c.alcool = 'Non alcoholic'", 5)),
+        ],
+        [
+            "5 cocktails sans alcool",
+            "tirage en mémoire",
+            mediane_ms(lambda: dao.cocktails_aleatoires(5, sans_alcool=True)),
+        ],
+        ["10 ingrédients", "ORDER BY RANDOM()", mediane_ms(lambda: order_by_random("SELECT * FROM ingredient", 10))],
+        ["10 ingrédients", "tirage en mémoire", mediane_ms(lambda: InventaireDao().ingredients_aleatoires(10))],
+        ["cocktail du jour", "gardé en mémoire", mediane_ms(lambda: dao.cocktail_du_jour())],
+    ]
+
+    print(f"Lecture des identifiants (cocktails et ingrédients) : {construction * 1000:.0f} ms")
+    print(tabulate(lignes, headers=["tirage", "méthode", "médiane (ms)"], floatfmt=".3f"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Catalogue généré pour les benchmarks à grande échelle (schéma projet_bench)
+
+Utilisation, au début d'un benchmark et avant tout accès à la base :
+    from benchmarks.catalogue_synthetique import preparer_catalogue
+    preparer_catalogue(nb_cocktails=100_000)
+
+Le schéma est créé avec data/init_db.sql puis rempli par generate_series :
+des noms variés, des recettes de 3 à 8 ingrédients (les premiers ingrédients
+étant bien plus fréquents, comme le citron ou la vodka d'un vrai catalogue),
+un cocktail sur cinq sans alcool, et des utilisateurs ayant 10 à 40
+ingrédients. La génération est déterministe (setseed) ; si le schéma a été
+généré avec les mêmes paramètres et le même init_db.sql (empreinte gardée en
+commentaire du schéma), il est gardé tel quel.
+"""
+
+import hashlib
+import os
+
+import dotenv
+
+SCHEMA = "projet_bench"
+
+REMPLISSAGE = """
+SELECT setseed(0.42);
+
+INSERT INTO ingredient (id_ingredient, nom_ingredient, desc_ingredient)
+SELECT n, 'Ingredient ' || n, NULL FROM generate_series(1, %(nb_ingredients)s) AS n;
+
+INSERT INTO cocktail (id_cocktail, nom_cocktail, categorie, alcool, image_url, verre,
+                      instructions, instructions_fr)
+SELECT n,
+       initcap(substr(md5(n::text), 1, 4 + n %% 5)) || ' '
+           || (ARRAY['Sour', 'Fizz', 'Punch', 'Mule', 'Spritz', 'Tonic', 'Collins', 'Smash'])[1 + n %% 8],
+       (ARRAY['Cocktail', 'Ordinary Drink', 'Shot', 'Punch / Party Drink', 'Coffee / Tea'])[1 + n %% 5],
+       CASE WHEN n %% 5 = 0 THEN 'Non alcoholic' ELSE 'Alcoholic' END,
+       'https://exemple.org/' || n || '.jpg',
+       (ARRAY['Highball glass', 'Cocktail glass', 'Old-fashioned glass', 'Shot glass'])[1 + n %% 4],
+       'Mix and serve.', 'Mélanger et servir.'
+FROM generate_series(1, %(nb_cocktails)s) AS n;
+
+INSERT INTO cocktail_ingredient (id_cocktail, id_ingredient, quantite)
+SELECT DISTINCT c, 1 + floor(power(random(), 2) * %(nb_ingredients)s)::int, '1 oz'
+FROM generate_series(1, %(nb_cocktails)s) AS c, generate_series(1, 3 + c %% 6) AS k;
+
+INSERT INTO utilisateur (id_utilisateur, pseudo, mdp, age, langue, est_majeur, cocktails_realises)
+SELECT n, 'bench_' || n, 'x', 18 + n %% 50, 'ENG', TRUE, 0
+FROM generate_series(1, %(nb_utilisateurs)s) AS n;
+
+INSERT INTO inventaire_ingredient (id_utilisateur, id_ingredient)
+SELECT DISTINCT u, 1 + floor(power(random(), 2) * %(nb_ingredients)s)::int
+FROM generate_series(1, %(nb_utilisateurs)s) AS u, generate_series(1, 10 + u %% 31) AS k;
+
+ANALYZE;
+"""
+
+
+def preparer_catalogue(
+    nb_cocktails: int = 100_000,
+    nb_ingredients: int = 600,
+    nb_utilisateurs: int = 200,
+    schema: str = SCHEMA,
+):
+    """Pointer l'application sur le schéma (projet_bench par défaut) et y générer le catalogue
+
+    Un autre schéma permet de garder côte à côte des catalogues de tailles
+    différentes sans les régénérer à chaque benchmark.
+    """
+    dotenv.load_dotenv()
+    os.environ["POSTGRES_SCHEMA"] = schema
+
+    from dao.db_connection import DBConnection
+    from dao.requetes_preparees import RegistreRequetesPreparees
+    from utils.catalogue import notifier_rechargement
+
+    with open("data/init_db.sql", encoding="utf-8") as fichier:
+        init_db = fichier.read()
+    parametres = {
+        "nb_cocktails": nb_cocktails,
+        "nb_ingredients": nb_ingredients,
+        "nb_utilisateurs": nb_utilisateurs,
+    }
+    empreinte = hashlib.md5(f"{init_db}{REMPLISSAGE}{sorted(parametres.items())}".encode()).hexdigest()
+
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT obj_description(oid, 'pg_namespace') AS empreinte "
+                "FROM pg_namespace WHERE nspname = %(schema)s;",
+                {"schema": schema},
+            )
+            existant = cursor.fetchone()
+            if existant and existant["empreinte"] == empreinte:
+                return
+
+            print(f"Génération de {nb_cocktails} cocktails dans le schéma {schema}...")
+            cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE; CREATE SCHEMA {schema};")
+            cursor.execute(init_db)
+            cursor.execute(REMPLISSAGE, parametres)
+            cursor.execute(f"COMMENT ON SCHEMA {schema} IS %(empreinte)s;", {"empreinte": empreinte})
+
+    RegistreRequetesPreparees().reinitialiser()
+    notifier_rechargement()
@@ -16,10 +16,12 @@ class CocktailComplet:
         indiqque si le cocktail est alcoolisé ou non ou optionnel
     instruc_cocktail : str
         instruction pour la réalisation du cocktail
-    ingredients : str, optional
-        liste des ingrédients (séparés par des virgules)
-    quantites : str, optional
-        liste des quantités correspondantes (séparées par des virgules)
+    ingredients : list[str], optional
+        noms des ingrédients, dans l'ordre alphabétique
+    quantites : list[str], optional
+        quantités correspondantes, dans le même ordre (None si non précisée)
+    ingredients_detailles : list[dict]
+        paires {"ingredient": nom, "quantite": quantité}, dans le même ordre
     """
 
     def __init__(
@@ -42,5 +44,9 @@ class CocktailComplet:
         self.alcoolise_cocktail = alcoolise_cocktail
         self.instruc_cocktail = instruc_cocktail
         self.verre = verre
-        self.ingredients = ingredients
-        self.quantites = quantites
+        self.ingredients = list(ingredients or [])
+        self.quantites = list(quantites or [])
+        self.ingredients_detailles = [
+            {"ingredient": ingredient, "quantite": quantite}
+            for ingredient, quantite in zip(self.ingredients, self.quantites)
+        ]
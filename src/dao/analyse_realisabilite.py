@@ -0,0 +1,179 @@
+import io
+import logging
+import time
+
+import numpy as np
+from scipy import sparse
+
+from dao.db_connection import DBConnection
+from dao.moteur_realisabilite import MoteurRealisabilite, RelationBits
+from utils.singleton import Singleton
+
+# Utilisateurs traités par produit matriciel (borne la mémoire du résultat)
+TAILLE_LOT = 20_000
+# En-tête et fin d'un COPY au format binaire de Postgres
+_SIGNATURE_COPY = b"PGCOPY\n\xff\r\n\x00"
+_FIN_COPY = b"\xff\xff"
+
+
+class AnalyseRealisabilite(metaclass=Singleton):
+    """
+    Nombre de cocktails réalisables (et presque réalisables) de tous les utilisateurs
+
+    Calcul par lots pour les statistiques : appeler cocktail_complet pour
+    chacun des utilisateurs est hors de portée. Avec
+        U : utilisateurs × ingrédients (1 si l'ingrédient est dans l'inventaire)
+        R : ingrédients × cocktails (1 si la recette utilise l'ingrédient)
+    le produit creux U @ R donne, pour chaque couple (utilisateur, cocktail)
+    ayant au moins un ingrédient en commun, le nombre d'ingrédients possédés ;
+    le nombre de manquants est le nombre d'ingrédients de la recette moins
+    ce produit. Un cocktail sans aucun ingrédient possédé est absent du
+    produit : il ne compte que pour les presque réalisables, si sa recette
+    n'a qu'un ou deux ingrédients (ajouté par différence).
+
+    Les inventaires sont lus et les résultats écrits par COPY au format
+    binaire (un seul aller-retour, sans conversion ligne à ligne) ; le
+    produit est fait par lots de TAILLE_LOT utilisateurs.
+
+    Le résultat remplace le contenu de la table statistiques_realisabilite
+    (une ligne par utilisateur) dans une seule transaction.
+
+    Lancement (depuis la racine du projet) :
+        PYTHONPATH=src python src/dao/analyse_realisabilite.py
+    """
+
+    def lancer(self, taille_lot: int = TAILLE_LOT) -> dict:
+        """Calculer les statistiques de tous les utilisateurs et les enregistrer
+
+        Returns
+        -------
+        dict
+            Nombre d'utilisateurs et durées (en secondes) de la lecture, du
+            calcul et de l'écriture
+        """
+        debut = time.perf_counter()
+        relation = MoteurRealisabilite().relation()
+        with DBConnection().connection as connection:
+            with connection.cursor() as cursor:
+                ids_utilisateurs = _copier_vers(cursor, "SELECT id_utilisateur FROM utilisateur", 1)[:, 0]
+                inventaires = _copier_vers(
+                    cursor, "SELECT id_utilisateur, id_ingredient FROM inventaire_ingredient", 2
+                )
+        lecture = time.perf_counter()
+
+        statistiques = statistiques_realisabilite(relation, ids_utilisateurs, inventaires, taille_lot)
+        calcul = time.perf_counter()
+
+        with DBConnection().connection as connection:
+            with connection.cursor() as cursor:
+                cursor.execute("TRUNCATE statistiques_realisabilite;")
+                cursor.copy_expert(
+                    "COPY statistiques_realisabilite "
+                    "(id_utilisateur, nb_complets, nb_un_manquant, nb_deux_manquants) "
+                    "FROM STDIN (FORMAT binary);",
+                    io.BytesIO(_format_copie(np.column_stack([ids_utilisateurs, statistiques]))),
+                )
+        fin = time.perf_counter()
+
+        mesures = {
+            "utilisateurs": len(ids_utilisateurs),
+            "lecture": lecture - debut,
+            "calcul": calcul - lecture,
+            "ecriture": fin - calcul,
+        }
+        logging.info("Statistiques de réalisabilité : %s", mesures)
+        return mesures
+
+
+def statistiques_realisabilite(
+    relation: RelationBits, ids_utilisateurs: np.ndarray, inventaires: np.ndarray, taille_lot: int = TAILLE_LOT
+) -> np.ndarray:
+    """Cocktails complets, à un et à deux ingrédients manquants de chaque utilisateur
+
+    Parameters
+    ----------
+    relation : RelationBits
+        Catalogue
+    ids_utilisateurs : np.ndarray
+        Identifiants des utilisateurs
+    inventaires : np.ndarray
+        Couples (id_utilisateur, id_ingredient), dans n'importe quel ordre
+
+    Returns
+    -------
+    np.ndarray
+        Une ligne par utilisateur (ordre de ids_utilisateurs) : nombre de
+        cocktails réalisables, auxquels il manque un ingrédient, deux ingrédients
+    """
+    nb_colonnes = len(relation.ids_ingredients)
+    totaux = relation.totaux.astype(np.int16)
+    recettes = sparse.csr_matrix(
+        (np.ones(len(relation.paires_positions), dtype=np.int16), (relation.paires_colonnes, relation.paires_positions)),
+        shape=(nb_colonnes, len(totaux)),
+    )
+
+    # Lignes : rang de l'utilisateur ; colonnes : celles de la relation (ingrédients inutilisés écartés)
+    tri = np.argsort(ids_utilisateurs)
+    lignes = tri[np.searchsorted(ids_utilisateurs, inventaires[:, 0], sorter=tri)]
+    rangs = np.minimum(np.searchsorted(relation.ids_ingredients, inventaires[:, 1]), max(0, nb_colonnes - 1))
+    utiles = (nb_colonnes > 0) & (relation.ids_ingredients[rangs] == inventaires[:, 1])
+    possedes = sparse.csr_matrix(
+        (np.ones(np.count_nonzero(utiles), dtype=np.int16), (lignes[utiles], relation.colonne_de[rangs[utiles]])),
+        shape=(len(ids_utilisateurs), nb_colonnes),
+    )
+
+    # Cocktails d'un ou deux ingrédients : presque réalisables même sans ingrédient en commun
+    par_total = np.bincount(totaux, minlength=3)
+    resultat = np.zeros((len(ids_utilisateurs), 3), dtype=np.int32)
+    resultat[:, 1:] = par_total[1:3]
+    for debut in range(0, len(ids_utilisateurs), taille_lot):
+        communs = possedes[debut : debut + taille_lot] @ recettes
+        lignes = np.repeat(np.arange(communs.shape[0]), np.diff(communs.indptr))
+        manquants = totaux[communs.indices] - communs.data
+        lot = resultat[debut : debut + taille_lot]
+        lot[:, 0] += np.bincount(lignes[manquants == 0], minlength=len(lot))
+        for k in (1, 2):
+            # Comptés par différence ci-dessus ; ceux qui ont un ingrédient en commun sont recomptés ici
+            lot[:, k] += np.bincount(lignes[manquants == k], minlength=len(lot))
+            lot[:, k] -= np.bincount(lignes[totaux[communs.indices] == k], minlength=len(lot))
+    return resultat
+
+
+def _copier_vers(cursor, requete: str, nb_colonnes: int) -> np.ndarray:
+    """Résultat d'une requête de colonnes INTEGER non nulles, lu par COPY binaire"""
+    tampon = io.BytesIO()
+    cursor.copy_expert(f"COPY ({requete}) TO STDOUT (FORMAT binary);", tampon)
+    donnees = tampon.getbuffer()
+    # Signature, drapeaux, longueur de l'extension d'en-tête puis l'extension
+    debut = 19 + int.from_bytes(donnees[15:19], "big")
+    ligne = _ligne_copie(nb_colonnes)
+    valeurs = np.frombuffer(donnees, dtype=ligne, count=(len(donnees) - debut - 2) // ligne.itemsize, offset=debut)
+    return np.column_stack([valeurs[f"v{j}"].astype(np.int64) for j in range(nb_colonnes)]).reshape(
+        -1, nb_colonnes
+    )
+
+
+def _format_copie(lignes: np.ndarray) -> bytes:
+    """Lignes d'entiers au format d'un COPY binaire"""
+    valeurs = np.empty(len(lignes), dtype=_ligne_copie(lignes.shape[1]))
+    valeurs["n"] = lignes.shape[1]
+    for j in range(lignes.shape[1]):
+        valeurs[f"l{j}"] = 4
+        valeurs[f"v{j}"] = lignes[:, j]
+    return _SIGNATURE_COPY + bytes(8) + valeurs.tobytes() + _FIN_COPY
+
+
+def _ligne_copie(nb_colonnes: int) -> np.dtype:
+    """Une ligne d'un COPY binaire : nombre de champs, puis (longueur, valeur) par champ INTEGER"""
+    champs = [("n", ">i2")]
+    for j in range(nb_colonnes):
+        champs += [(f"l{j}", ">i4"), (f"v{j}", ">i4")]
+    return np.dtype(champs)
+
+
+if __name__ == "__main__":
+    mesures = AnalyseRealisabilite().lancer()
+    print(
+        f"{mesures['utilisateurs']} utilisateurs : lecture {mesures['lecture']:.1f} s, "
+        f"calcul {mesures['calcul']:.1f} s, écriture {mesures['ecriture']:.1f} s"
+    )
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+import asyncpg
+import dotenv
+
+from dao.echeance import delai_restant_ms, signaler_annulation
+from dao.mesure_requetes import mesure_courante
+from dao.sql_utils import convertir_requete
+from utils.singleton import Singleton
+
+
+class ConnexionAsync:
+    """Connexion asyncpg acceptant les paramètres nommés des DAO"""
+
+    def __init__(self, connexion: asyncpg.Connection):
+        self.brute = connexion
+
+    async def fetch(self, requete: str, parametres: dict | None = None) -> list:
+        return await self._appeler(self.brute.fetch, requete, parametres)
+
+    async def fetchrow(self, requete: str, parametres: dict | None = None):
+        return await self._appeler(self.brute.fetchrow, requete, parametres)
+
+    async def execute(self, requete: str, parametres: dict | None = None) -> int:
+        """Exécute une requête et renvoie le nombre de lignes affectées"""
+        statut = await self._appeler(self.brute.execute, requete, parametres)
+        # asyncpg renvoie le statut texte de Postgres, ex : "DELETE 1"
+        dernier = statut.split()[-1] if statut else "0"
+        return int(dernier) if dernier.isdigit() else 0
+
+    async def _appeler(self, methode, requete, parametres):
+        """Exécute la requête dans le budget de latence de la requête HTTP
+        (annulée par asyncpg au-delà) et la compte dans la mesure en cours"""
+        restant_ms = delai_restant_ms()
+        options = {} if restant_ms is None else {"timeout": restant_ms / 1000}
+        mesure = mesure_courante()
+        debut = time.perf_counter()
+        try:
+            return await methode(*self._preparer(requete, parametres), **options)
+        except asyncio.TimeoutError:
+            signaler_annulation()
+            raise
+        finally:
+            if mesure is not None:
+                mesure.enregistrer(time.perf_counter() - debut)
+
+    @staticmethod
+    def _preparer(requete, parametres):
+        sql, valeurs = convertir_requete(requete, parametres)
+        return (sql, *valeurs)
+
+
+class AsyncDBConnection(metaclass=Singleton):
+    """
+    Pool de connexions asyncpg pour les endpoints asynchrones
+
+    Le pool est créé à la première utilisation dans la boucle d'événements
+    courante (un pool asyncpg ne peut pas changer de boucle).
+    Mêmes variables d'environnement que DBConnection.
+    """
+
+    def __init__(self):
+        """Lecture de la configuration, le pool est créé à la demande"""
+        dotenv.load_dotenv()
+
+        self.min_connexions = int(os.environ.get("POSTGRES_POOL_MIN", 1))
+        self.max_connexions = int(os.environ.get("POSTGRES_POOL_MAX", 10))
+        self.delai_attente = float(os.environ.get("POSTGRES_POOL_TIMEOUT", 5))
+        self.__boucle = None
+        self.__pool = None
+
+    async def pool(self) -> asyncpg.Pool:
+        """Pool asyncpg attaché à la boucle d'événements courante"""
+        boucle = asyncio.get_running_loop()
+        if self.__boucle is not boucle:
+            self.__boucle = boucle
+            # Tâche partagée : des appels concurrents attendent le même pool
+            self.__pool = asyncio.ensure_future(
+                asyncpg.create_pool(
+                    host=os.environ["POSTGRES_HOST"],
+                    port=os.environ["POSTGRES_PORT"],
+                    database=os.environ["POSTGRES_DATABASE"],
+                    user=os.environ["POSTGRES_USER"],
+                    password=os.environ["POSTGRES_PASSWORD"],
+                    server_settings={"search_path": os.environ["POSTGRES_SCHEMA"]},
+                    min_size=self.min_connexions,
+                    max_size=self.max_connexions,
+                )
+            )
+        return await self.__pool
+
+    @property
+    def connection(self):
+        """Contexte asynchrone donnant une connexion dans une transaction"""
+        return self._connexion()
+
+    @asynccontextmanager
+    async def _connexion(self):
+        pool = await self.pool()
+        async with pool.acquire(timeout=self.delai_attente) as connexion:
+            async with connexion.transaction():
+                yield ConnexionAsync(connexion)
+
+    async def fermer(self):
+        """Fermer le pool de la boucle courante"""
+        if self.__pool is not None and self.__boucle is asyncio.get_running_loop():
+            pool = await self.__pool
+            await pool.close()
+        self.__boucle = None
+        self.__pool = None
@@ -1,17 +1,58 @@
 import logging
+from datetime import date
+from typing import Iterator
 
 from business_object.cocktail import Cocktail
 from business_object.cocktail_complet import CocktailComplet
-from dao.db_connection import DBConnection
+from business_object.ingredient import Ingredient
+from dao.db_connection import CurseurTuple, DBConnection
+from dao.echeance import delai_maximal
+from dao.index_manquants import IndexManquants
+from dao.index_trigrammes import LONGUEUR_MIN, IndexTrigrammes
+from dao.inventaire_dao import InventaireDao
+from dao.lot_requetes import LotRequetes
+from dao.mappeur import Mappeur
+from dao.moteur_realisabilite import MoteurRealisabilite
+from dao.optimiseur_courses import OptimiseurCourses
+from dao.pagination import Page, cle_des_curseurs, construire_page, lire_page, rang, requete_page, tranche
+from dao.requetes_preparees import RegistreRequetesPreparees
+from dao.routage import lecture_seule
+from dao.tirage_cocktails import TirageCocktails
 from utils.log_decorator import log
 from utils.singleton import Singleton
 
+# Colonnes SQL -> paramètres du constructeur (voir Mappeur)
+CHAMPS_COCKTAIL = {
+    "id_cocktail": "id_cocktail",
+    "nom_cocktail": "nom_cocktail",
+    "categ_cocktail": "categorie",
+    "image_cocktail": "image_url",
+    "alcoolise_cocktail": "alcool",
+    "instruc_cocktail": "instructions",
+    "verre": "verre",
+}
+MAPPEUR_COCKTAIL = Mappeur(Cocktail, CHAMPS_COCKTAIL)
+MAPPEUR_COCKTAIL_COMPLET = Mappeur(
+    CocktailComplet, {**CHAMPS_COCKTAIL, "ingredients": "ingredients", "quantites": "quantites"}
+)
+# Restriction des mineurs, écrite en littéral (et non en paramètre) pour que le
+# planificateur reconnaisse le prédicat de l'index partiel idx_cocktail_sans_alcool
+FILTRE_SANS_ALCOOL = " AND c.alcool = 'Non alcoholic'"
+
 
 class CocktailDao(metaclass=Singleton):
-    """Classe contenant les méthodes pour accéder aux Cocktails de la base de données."""
+    """Classe contenant les méthodes pour accéder aux Cocktails de la base de données.
+
+    Les requêtes les plus fréquentes passent par RegistreRequetesPreparees :
+    elles sont préparées une fois par connexion du pool puis réexécutées.
+    Les cocktails sont construits depuis des lignes en tuples par un Mappeur.
+    Chaque lecture a une durée maximale (@delai_maximal, en millisecondes).
+    """
 
     # --------------------------  Méthode realiser_cocktail   ---------------------------------
 
+    @lecture_seule
+    @delai_maximal(2000)
     @log
     def realiser_cocktail(
         self, id_cocktail: int = None, nom_cocktail: str = None, langue: str = "ENG"
@@ -41,75 +82,150 @@ class CocktailDao(metaclass=Singleton):
             raise ValueError("Vous devez fournir soit un ID, soit un nom de cocktail")
 
         col_instructions = self.instruction_column(langue)
+        where_clause, params = self._filtre_realiser(id_cocktail, nom_cocktail)
 
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
-                    where_clause = ""
-                    params = {}
-
-                    if id_cocktail:
-                        where_clause = "WHERE c.id_cocktail = %(id_cocktail)s"
-                        params["id_cocktail"] = id_cocktail
-                    else:
-                        where_clause = "WHERE LOWER(c.nom_cocktail) = LOWER(%(nom_cocktail)s)"
-                        params["nom_cocktail"] = nom_cocktail
-
-                    cursor.execute(
-                        f"""
-                            SELECT
-                                c.id_cocktail,
-                                c.nom_cocktail,
-                                c.categorie,
-                                c.alcool,
-                                c.image_url,
-                                c.verre,
-                                c.{col_instructions} AS instructions,
-                                STRING_AGG(i.nom_ingredient, ', ' ORDER BY i.nom_ingredient) AS ingredients,
-                                STRING_AGG(ci.quantite, ', ' ORDER BY i.nom_ingredient) AS quantites
-                            FROM cocktail c
-                            JOIN cocktail_ingredient ci ON c.id_cocktail = ci.id_cocktail
-                            JOIN ingredient i ON ci.id_ingredient = i.id_ingredient
-                            {where_clause}
-                            GROUP BY
-                                c.id_cocktail, c.nom_cocktail, c.categorie,
-                                c.alcool, c.image_url, c.verre, c.{col_instructions}
-                            """,
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                    RegistreRequetesPreparees().executer(
+                        cursor,
+                        "realiser_cocktail",
+                        self._requete_realiser(col_instructions, where_clause),
                         params,
                     )
 
                     # On ne renvoi qu'un seul
-                    row = cursor.fetchone()
-
-                    if not row:
-                        return None
-
-                    cocktail = CocktailComplet(
-                        id_cocktail=row["id_cocktail"],
-                        nom_cocktail=row["nom_cocktail"],
-                        categ_cocktail=row["categorie"],
-                        image_cocktail=row.get("image_url"),
-                        alcoolise_cocktail=row.get("alcool"),
-                        instruc_cocktail=row.get("instructions"),
-                        verre=row.get("verre"),
-                        ingredients=row.get("ingredients"),
-                        quantites=row.get("quantites"),
-                    )
-
-                    return cocktail
+                    return MAPPEUR_COCKTAIL_COMPLET.un(cursor)
 
         except Exception:
             logging.exception("Erreur lors dde la récupération du cocktail")
             raise
 
+    @staticmethod
+    def _filtre_realiser(id_cocktail: int = None, nom_cocktail: str = None) -> tuple:
+        """(clause WHERE, paramètres) désignant le cocktail par son ID ou son nom"""
+        if id_cocktail:
+            return "WHERE c.id_cocktail = %(id_cocktail)s", {"id_cocktail": id_cocktail}
+        return "WHERE LOWER(c.nom_cocktail) = LOWER(%(nom_cocktail)s)", {"nom_cocktail": nom_cocktail}
+
+    @staticmethod
+    def _requete_realiser(col_instructions: str, where_clause: str) -> str:
+        """Requête des détails complets d'un cocktail
+
+        Ingrédients et quantités sont agrégés en deux tableaux triés de la
+        même façon : la i-ème quantité est celle du i-ème ingrédient, même si
+        un nom ou une quantité contient une virgule ou si une quantité est NULL.
+        """
+        return f"""
+            SELECT
+                c.id_cocktail,
+                c.nom_cocktail,
+                c.categorie,
+                c.alcool,
+                c.image_url,
+                c.verre,
+                c.{col_instructions} AS instructions,
+                ARRAY_AGG(i.nom_ingredient ORDER BY i.nom_ingredient, ci.id_ingredient) AS ingredients,
+                ARRAY_AGG(ci.quantite ORDER BY i.nom_ingredient, ci.id_ingredient) AS quantites
+            FROM cocktail c
+            JOIN cocktail_ingredient ci ON c.id_cocktail = ci.id_cocktail
+            JOIN ingredient i ON ci.id_ingredient = i.id_ingredient
+            {where_clause}
+            GROUP BY
+                c.id_cocktail, c.nom_cocktail, c.categorie,
+                c.alcool, c.image_url, c.verre, c.{col_instructions}
+            """
+
+    # --------------------------  Méthode realiser_cocktail_et_compter   ----------------------
+
+    @delai_maximal(2000)
+    @log
+    def realiser_cocktail_et_compter(
+        self,
+        id_utilisateur: int,
+        id_cocktail: int = None,
+        nom_cocktail: str = None,
+        langue: str = "ENG",
+    ) -> CocktailComplet:
+        """Récupérer les détails d'un cocktail et l'ajouter aux cocktails réalisés
+        de l'utilisateur, en un seul aller-retour avec la base (LotRequetes).
+
+        Le compteur n'est incrémenté que si les détails sont trouvés : la
+        garde de l'UPDATE reprend la jointure cocktail / cocktail_ingredient
+        de la requête des détails (un cocktail sans ingrédient n'est pas compté).
+
+        Parameters
+        ----------
+        id_utilisateur : int
+            Identifiant de l'utilisateur qui réalise le cocktail.
+        id_cocktail : int, optional
+            Identifiant du cocktail.
+        nom_cocktail : str, optional
+            Nom du cocktail (insensible à la casse).
+        langue : str
+            Langue des instructions.
+
+        Returns
+        -------
+        CocktailComplet
+            Le cocktail trouvé, None s'il n'existe pas.
+
+        Raises
+        ------
+        ValueError
+            Si aucun identifiant de cocktail n'est fourni.
+        """
+        if not id_cocktail and not nom_cocktail:
+            raise ValueError("Vous devez fournir soit un ID, soit un nom de cocktail")
+
+        col_instructions = self.instruction_column(langue)
+        where_clause, params = self._filtre_realiser(id_cocktail, nom_cocktail)
+
+        lot = LotRequetes()
+        details = lot.ajouter(self._requete_realiser(col_instructions, where_clause), params)
+        lot.ajouter(
+            f"""
+            UPDATE utilisateur
+            SET cocktails_realises = COALESCE(cocktails_realises, 0) + 1
+            WHERE id_utilisateur = %(id_utilisateur)s
+              AND EXISTS (
+                  SELECT 1
+                  FROM cocktail c
+                  JOIN cocktail_ingredient ci ON c.id_cocktail = ci.id_cocktail
+                  {where_clause}
+              )
+            """,
+            {**params, "id_utilisateur": id_utilisateur},
+        )
+
+        try:
+            cocktails = MAPPEUR_COCKTAIL_COMPLET.depuis_dicts(lot.executer()[details])
+        except Exception:
+            logging.exception("Erreur lors de la réalisation du cocktail")
+            raise
+        return cocktails[0] if cocktails else None
+
     # --------------------------  Méthode cocktail_partiel   ---------------------------------
 
+    @lecture_seule(cle_utilisateur="id_utilisateur")
+    @delai_maximal(3000)
     @log
     def cocktail_complet(
-        self, id_utilisateur: int, langue: str = "ENG", limit: int = 10, offset: int = 0
-    ) -> list[Cocktail]:
+        self,
+        id_utilisateur: int,
+        langue: str = "ENG",
+        limit: int = 10,
+        offset: int = 0,
+        apres: str | None = None,
+        avant: str | None = None,
+        sans_alcool: bool = False,
+    ) -> Page:
         """Lister tous les cocktails que l'utilisateur peut préparer à partir de son inventaire.
 
+        La page est lue dans IndexManquants (cocktails de l'utilisateur rangés
+        par nombre de manquants) ; la base ne sert qu'à lire l'inventaire puis
+        la page de cocktails.
+
         Parameters
         ----------
         id_utilisateur : int
@@ -120,11 +236,68 @@ class CocktailDao(metaclass=Singleton):
             Nombre maximal de résultats retournés (pagination). Par défaut 10.
         offset : int, optional
             Décalage pour la pagination. Par défaut 0.
+        apres : str, optional
+            Curseur Page.suivant : la page commence après ce cocktail (nom, id),
+            quelle que soit sa profondeur.
+        avant : str, optional
+            Curseur Page.precedent : la page se termine avant ce cocktail.
+        sans_alcool : bool, optional
+            Ne garder que les cocktails non alcoolisés (utilisateur mineur) ;
+            le filtre est appliqué avant la pagination, les pages restent pleines.
 
         Returns
         -------
-        list[Cocktail]
-            Liste des cocktails préparables avec l'inventaire complet.
+        Page
+            Liste des cocktails préparables avec l'inventaire complet, par nom,
+            avec le nombre total de cocktails et les curseurs des pages voisines.
+
+        Raises
+        ------
+        ValueError
+            Si le curseur est invalide.
+        """
+        cle, en_arriere = cle_des_curseurs(apres, avant, (str, int))
+        try:
+            resultat = IndexManquants().page(
+                id_utilisateur,
+                InventaireDao().ids_inventaire(id_utilisateur),
+                range(0, 1),
+                limit=limit,
+                offset=offset,
+                cle=None if cle is None else (0, cle[1]),
+                avant=en_arriere,
+                sans_alcool=sans_alcool,
+            )
+        except Exception:
+            logging.exception("Index des manquants indisponible, calcul en SQL")
+            resultat = None
+        if resultat is None:
+            return self._cocktail_complet_sql(id_utilisateur, langue, limit, offset, cle, en_arriere, sans_alcool)
+        page, total, encore = resultat
+        cocktails = self.trouver_par_ids([id_cocktail for id_cocktail, _ in page], langue)
+        return construire_page(
+            cocktails,
+            [(c.nom_cocktail, c.id_cocktail) for c in cocktails],
+            total,
+            encore,
+            en_arriere,
+            depuis_debut=cle is None and offset == 0,
+        )
+
+    def _cocktail_complet_sql(
+        self,
+        id_utilisateur: int,
+        langue: str = "ENG",
+        limit: int = 10,
+        offset: int = 0,
+        cle: tuple | None = None,
+        avant: bool = False,
+        sans_alcool: bool = False,
+    ) -> Page:
+        """Version SQL de cocktail_complet (secours de l'index en mémoire et référence de ses tests).
+
+        cle : (nom_cocktail, id_cocktail) du cocktail de bord de la page voisine,
+        la page est lue avant lui si avant est vrai.
         """
 
         # --- Choix de la colonne instructions selon la langue ---
@@ -132,65 +305,100 @@ class CocktailDao(metaclass=Singleton):
 
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
-                    # Requête unique utilisant des CTE (Pour réduire le nombre d'aller-retour DB ):
-                    # 1) user_ingredients : ingrédients de l'utilisateur
-                    # 2) cocktail_ingredient_count : nombre d'ingrédients requis par cocktail
-                    # 3) cocktail_matching_ingredients : nombre d'ingrédients disponibles pour chaque cocktail dans l'inventaire
-                    # On sélectionne les cocktails dont total_ingredients == matching_ingredients
-                    cursor.execute(
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                    # Requête unique utilisant une CTE (Pour réduire le nombre d'aller-retour DB ):
+                    # cocktail_matching_ingredients : nombre d'ingrédients de l'inventaire dans chaque cocktail
+                    # (jointure depuis l'inventaire, index idx_cocktail_ingredient_ingredient)
+                    # On sélectionne les cocktails dont nb_ingredients (tenu à jour par trigger) == matching_ingredients
+                    # La page et le total sont lus ensemble (voir _executer_page)
+                    return self._executer_page(
+                        cursor,
+                        "cocktail_complet",
                         f"""
-                        WITH user_ingredients AS (
-                            SELECT id_ingredient
-                            FROM inventaire_ingredient
-                            WHERE id_utilisateur = %(id_utilisateur)s
-                        ),
-                        cocktail_ingredient_count AS (
-                            SELECT id_cocktail, COUNT(*) AS total_ingredients
-                            FROM cocktail_ingredient
-                            GROUP BY id_cocktail
-                        ),
-                        cocktail_matching_ingredients AS (
+                        WITH cocktail_matching_ingredients AS (
                             SELECT ci.id_cocktail, COUNT(*) AS matching_ingredients
-                            FROM cocktail_ingredient ci
-                            JOIN user_ingredients ui ON ci.id_ingredient = ui.id_ingredient
+                            FROM inventaire_ingredient ui
+                            JOIN cocktail_ingredient ci ON ci.id_ingredient = ui.id_ingredient
+                            WHERE ui.id_utilisateur = %(id_utilisateur)s
                             GROUP BY ci.id_cocktail
                         )
                         SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.{col_instructions} AS instructions
                         FROM cocktail c
-                        JOIN cocktail_ingredient_count cic ON c.id_cocktail = cic.id_cocktail
                         JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
-                        WHERE cic.total_ingredients = cmi.matching_ingredients
-                        ORDER BY c.nom_cocktail
-                        LIMIT %(limit)s OFFSET %(offset)s;
+                        WHERE c.nb_ingredients = cmi.matching_ingredients
+                        {FILTRE_SANS_ALCOOL if sans_alcool else ""}
                         """,
-                        {
-                            "id_utilisateur": id_utilisateur,
-                            "limit": limit,
-                            "offset": offset,
-                        },
+                        ("nom_cocktail", "id_cocktail"),
+                        {"id_utilisateur": id_utilisateur},
+                        limit,
+                        offset,
+                        cle,
+                        avant,
+                        materialiser=True,
                     )
-                    rows = cursor.fetchall()
-
-                    return [
-                        Cocktail(
-                            id_cocktail=row["id_cocktail"],
-                            nom_cocktail=row["nom_cocktail"],
-                            categ_cocktail=row["categorie"],
-                            image_cocktail=row.get("image_url"),
-                            alcoolise_cocktail=row.get("alcool"),
-                            instruc_cocktail=row.get("instructions"),
-                            verre=row.get("verre"),
-                        )
-                        for row in rows
-                    ]
 
         except Exception:
             logging.exception("Erreur cocktail_complet pour user %s", id_utilisateur)
             raise
 
+    @staticmethod
+    def _executer_page(
+        cursor,
+        prefixe: str,
+        requete: str,
+        colonnes_cle: tuple,
+        params: dict,
+        limit: int,
+        offset: int,
+        cle: tuple | None,
+        avant: bool,
+        materialiser: bool = False,
+        colonne_jointe: str | None = None,
+    ) -> Page:
+        """Lire une page de cocktails et le nombre total de résultats en une seule requête
+
+        Voir requete_page ; la requête est préparée une fois par connexion.
+
+        Parameters
+        ----------
+        requete : str
+            Requête de base ; ses colonnes comprennent celles de colonnes_cle
+        colonnes_cle : tuple
+            Colonnes de la clé de tri (la dernière doit être unique : id_cocktail)
+        materialiser : bool
+            Calculer la requête de base une seule fois (voir requete_page)
+        colonne_jointe : str, optional
+            Colonne renvoyée avec chaque cocktail : la page contient alors des
+            couples (cocktail, valeur de la colonne)
+        """
+        RegistreRequetesPreparees().executer(
+            cursor,
+            prefixe,
+            requete_page(requete, colonnes_cle, params, limit, offset, cle, avant, materialiser),
+            params,
+        )
+        construire = MAPPEUR_COCKTAIL.compiler(cursor.description)
+        noms = [colonne.name for colonne in cursor.description]
+        positions_cle = [noms.index(colonne) for colonne in colonnes_cle]
+        position = None if colonne_jointe is None else noms.index(colonne_jointe)
+
+        def element(row):
+            cocktail = construire(row)
+            return cocktail if position is None else (cocktail, row[position])
+
+        return lire_page(
+            cursor.fetchall(),
+            element,
+            lambda row: tuple(row[i] for i in positions_cle),
+            limit,
+            avant,
+            depuis_debut=cle is None and offset == 0,
+        )
+
     # -------------------------- Méthode: cocktail_partiel -----------------------------
 
+    @lecture_seule(cle_utilisateur="id_utilisateur")
+    @delai_maximal(3000)
     @log
     def cocktail_partiel(
         self,
@@ -199,21 +407,95 @@ class CocktailDao(metaclass=Singleton):
         langue: str = "ENG",
         limit: int = 10,
         offset: int = 0,
-    ) -> list[Cocktail]:
+        apres: str | None = None,
+        avant: str | None = None,
+        sans_alcool: bool = False,
+    ) -> Page:
         """Lister tous les cocktails préparables avec au plus nb_manquants ingrédients manquants.
 
+        La page est lue dans IndexManquants (cocktails de l'utilisateur rangés
+        par nombre de manquants) ; la base ne sert qu'à lire l'inventaire puis
+        la page de cocktails.
+
         Parameters
         ----------
         id_utilisateur : int
             Identifiant de l'utilisateur.
         nb_manquants : int
-            Nombre maximal d'ingrédients manquants autorisés.
+            Nombre maximal d'ingrédients manquants autorisés (5 au plus).
         langue : str
             Langue de l'utilisateur.
         limit : int, optional
             Pagination — nombre maximum de résultats.
         offset : int, optional
             décalage des résultats.
+        apres : str, optional
+            Curseur Page.suivant : la page commence après ce cocktail
+            (nombre de manquants, nom, id).
+        avant : str, optional
+            Curseur Page.precedent : la page se termine avant ce cocktail.
+        sans_alcool : bool, optional
+            Ne garder que les cocktails non alcoolisés (utilisateur mineur) ;
+            le filtre est appliqué avant la pagination, les pages restent pleines.
+
+        Returns
+        -------
+        Page
+            Cocktails triés par nombre d'ingrédients manquants puis par nom,
+            avec le nombre total de cocktails et les curseurs des pages voisines.
+
+        Raises
+        ------
+        ValueError
+            Si le curseur est invalide.
+        """
+        cle, en_arriere = cle_des_curseurs(apres, avant, (int, str, int))
+        nb_manquants = min(nb_manquants, 5)
+        try:
+            resultat = IndexManquants().page(
+                id_utilisateur,
+                InventaireDao().ids_inventaire(id_utilisateur),
+                range(1, nb_manquants + 1),
+                limit=limit,
+                offset=offset,
+                cle=None if cle is None else (cle[0], cle[2]),
+                avant=en_arriere,
+                sans_alcool=sans_alcool,
+            )
+        except Exception:
+            logging.exception("Index des manquants indisponible, calcul en SQL")
+            resultat = None
+        if resultat is None:
+            return self._cocktail_partiel_sql(
+                id_utilisateur, nb_manquants, langue, limit, offset, cle, en_arriere, sans_alcool
+            )
+        page, total, encore = resultat
+        manquants = dict(page)
+        cocktails = self.trouver_par_ids(list(manquants), langue)
+        return construire_page(
+            cocktails,
+            [(manquants[c.id_cocktail], c.nom_cocktail, c.id_cocktail) for c in cocktails],
+            total,
+            encore,
+            en_arriere,
+            depuis_debut=cle is None and offset == 0,
+        )
+
+    def _cocktail_partiel_sql(
+        self,
+        id_utilisateur: int,
+        nb_manquants: int,
+        langue: str = "ENG",
+        limit: int = 10,
+        offset: int = 0,
+        cle: tuple | None = None,
+        avant: bool = False,
+        sans_alcool: bool = False,
+    ) -> Page:
+        """Version SQL de cocktail_partiel (secours de l'index en mémoire et référence de ses tests).
+
+        cle : (nombre de manquants, nom_cocktail, id_cocktail) du cocktail de bord
+        de la page voisine, la page est lue avant lui si avant est vrai.
         """
 
         # --- Choix de la colonne instructions selon la langue ---
@@ -224,67 +506,362 @@ class CocktailDao(metaclass=Singleton):
 
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
-                    # Requête unique utilisant des CTE (même principe que la première) :
-                    # 1) cocktail_ingredient_count : nombre total d'ingrédients requis pour chaque cocktail
-                    # 2) cocktail_matching_ingredients : nombre d'ingrédients déjà présents dans l'inventaire de l'utilisateur (LEFT JOIN )
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                    # Requête unique utilisant une CTE (même principe que la première) :
+                    # 1) cocktail_matching_ingredients : nombre d'ingrédients déjà présents dans l'inventaire de l'utilisateur
+                    # 2) Sélection finale (LEFT JOIN) : un cocktail sans aucun ingrédient de l'inventaire est gardé avec 0
                     # ex: Mojito 5 ingrédients, utilisateur n'a que "eau" -> avec INNER JOIN il disparaît, LEFT JOIN permet de le garder
-                    # 3) Sélection finale : cocktails avec <= nb_manquants ingrédients manquants, triés par nombre d'ingrédients manquants puis par nom, avec pagination LIMIT/OFFSET
+                    # On garde les cocktails avec 1 à nb_manquants ingrédients manquants (nb_ingredients - matching_ingredients),
+                    # triés par nombre d'ingrédients manquants puis par nom ; page et total lus ensemble (voir _executer_page)
+                    return self._executer_page(
+                        cursor,
+                        "cocktail_partiel",
+                        f"""
+                        WITH cocktail_matching_ingredients AS (
+                            SELECT ci.id_cocktail, COUNT(*) AS matching_ingredients
+                            FROM inventaire_ingredient ui
+                            JOIN cocktail_ingredient ci ON ci.id_ingredient = ui.id_ingredient
+                            WHERE ui.id_utilisateur = %(id_utilisateur)s
+                            GROUP BY ci.id_cocktail
+                        )
+                        SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.{col_instructions} AS instructions, c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0) AS manquants
+                        FROM cocktail c
+                        LEFT JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+                        WHERE c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0) BETWEEN 1 AND %(nb_manquants)s
+                        {FILTRE_SANS_ALCOOL if sans_alcool else ""}
+                        """,
+                        ("manquants", "nom_cocktail", "id_cocktail"),
+                        {"id_utilisateur": id_utilisateur, "nb_manquants": nb_manquants},
+                        limit,
+                        offset,
+                        cle,
+                        avant,
+                        materialiser=True,
+                    )
+        except Exception:
+            logging.exception("Erreur cocktail_partiel pour user %s", id_utilisateur)
+            raise
 
+    # -------------------------- Méthode: ingredients_debloquants -----------------------------
+
+    @lecture_seule(cle_utilisateur="id_utilisateur")
+    @delai_maximal(3000)
+    @log
+    def ingredients_debloquants(
+        self,
+        id_utilisateur: int,
+        sans_alcool: bool = False,
+        limit: int = 10,
+        offset: int = 0,
+        apres: str | None = None,
+        avant: str | None = None,
+    ) -> Page:
+        """Classer les ingrédients que l'utilisateur n'a pas par nombre de cocktails
+        qu'ils lui permettraient de réaliser complètement.
+
+        Le classement est calculé en une passe sur la relation en bits
+        (IndexManquants.debloquants), sans requête par ingrédient candidat.
+
+        Parameters
+        ----------
+        id_utilisateur : int
+            Identifiant de l'utilisateur.
+        sans_alcool : bool, optional
+            Ne compter que les cocktails non alcoolisés (utilisateur mineur).
+        limit : int, optional
+            Pagination — nombre maximum de résultats.
+        offset : int, optional
+            décalage des résultats.
+        apres : str, optional
+            Curseur Page.suivant : la page commence après cet ingrédient
+            (nombre de cocktails débloqués, id).
+        avant : str, optional
+            Curseur Page.precedent : la page se termine avant cet ingrédient.
+
+        Returns
+        -------
+        Page
+            (ingrédient, nombre de cocktails débloqués), par nombre décroissant
+            puis par identifiant, avec le nombre total d'ingrédients classés et
+            les curseurs des pages voisines ; les ingrédients qui ne débloquent
+            rien sont exclus.
+
+        Raises
+        ------
+        ValueError
+            Si le curseur est invalide.
+        """
+        cle, en_arriere = cle_des_curseurs(apres, avant, (int, int))
+        try:
+            classement, total, encore = IndexManquants().debloquants(
+                id_utilisateur,
+                InventaireDao().ids_inventaire(id_utilisateur),
+                sans_alcool=sans_alcool,
+                limit=limit,
+                offset=offset,
+                cle=cle,
+                avant=en_arriere,
+            )
+        except Exception:
+            logging.exception("Index des manquants indisponible, calcul en SQL")
+            return self._ingredients_debloquants_sql(id_utilisateur, sans_alcool, limit, offset, cle, en_arriere)
+        ingredients = InventaireDao().trouver_par_ids([id_ingredient for id_ingredient, _ in classement])
+        return construire_page(
+            list(zip(ingredients, [nb for _, nb in classement])),
+            [(nb, id_ingredient) for id_ingredient, nb in classement],
+            total,
+            encore,
+            en_arriere,
+            depuis_debut=cle is None and offset == 0,
+        )
+
+    def _ingredients_debloquants_sql(
+        self,
+        id_utilisateur: int,
+        sans_alcool: bool = False,
+        limit: int = 10,
+        offset: int = 0,
+        cle: tuple | None = None,
+        avant: bool = False,
+    ) -> Page:
+        """Version SQL de ingredients_debloquants (secours de l'index en mémoire et référence de ses tests).
+
+        Le classement entier est lu (au plus un ingrédient par ligne) puis
+        découpé comme celui de l'index ; cle : (nombre de cocktails
+        débloqués, id_ingredient) de l'ingrédient de bord de la page voisine.
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                    # 1) cocktail_matching_ingredients : ingrédients de l'inventaire présents dans chaque cocktail
+                    # 2) presque : cocktails auxquels il manque exactement un ingrédient
+                    # 3) l'ingrédient manquant de chacun est celui absent de l'inventaire ; on compte par ingrédient
                     cursor.execute(
-                        f"""
-                        WITH cocktail_ingredient_count AS (
-                            SELECT id_cocktail, COUNT(*) AS total_ingredients
-                            FROM cocktail_ingredient
-                            GROUP BY id_cocktail
+                        """
+                        WITH inventaire AS (
+                            SELECT id_ingredient
+                            FROM inventaire_ingredient
+                            WHERE id_utilisateur = %(id_utilisateur)s
                         ),
                         cocktail_matching_ingredients AS (
-                            SELECT c.id_cocktail, COUNT(ui.id_ingredient) AS matching_ingredients
+                            SELECT ci.id_cocktail, COUNT(*) AS matching_ingredients
+                            FROM inventaire ui
+                            JOIN cocktail_ingredient ci ON ci.id_ingredient = ui.id_ingredient
+                            GROUP BY ci.id_cocktail
+                        ),
+                        presque AS (
+                            SELECT c.id_cocktail
                             FROM cocktail c
-                            LEFT JOIN cocktail_ingredient ci ON c.id_cocktail = ci.id_cocktail
-                            LEFT JOIN inventaire_ingredient ui
-                                ON ci.id_ingredient = ui.id_ingredient
-                                AND ui.id_utilisateur = %(id_utilisateur)s
-                            GROUP BY c.id_cocktail
+                            LEFT JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+                            WHERE c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0) = 1
+                            AND (NOT %(sans_alcool)s OR c.alcool = 'Non alcoholic')
                         )
-                        SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.{col_instructions} AS instructions, cic.total_ingredients, cmi.matching_ingredients
-                        FROM cocktail c
-                        JOIN cocktail_ingredient_count cic ON c.id_cocktail = cic.id_cocktail
-                        JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
-                        WHERE (cic.total_ingredients - cmi.matching_ingredients) <= %(nb_manquants)s
-                        AND (cic.total_ingredients - cmi.matching_ingredients) >= 1
-                        ORDER BY
-                            (cic.total_ingredients - cmi.matching_ingredients) ASC,
-                            c.nom_cocktail
-                        LIMIT %(limit)s OFFSET %(offset)s;
+                        SELECT i.id_ingredient, i.nom_ingredient, i.desc_ingredient, COUNT(*) AS nb
+                        FROM presque p
+                        JOIN cocktail_ingredient ci ON ci.id_cocktail = p.id_cocktail
+                        JOIN ingredient i ON i.id_ingredient = ci.id_ingredient
+                        WHERE ci.id_ingredient NOT IN (SELECT id_ingredient FROM inventaire)
+                        GROUP BY i.id_ingredient
+                        ORDER BY nb DESC, i.id_ingredient;
                         """,
-                        {
-                            "id_utilisateur": id_utilisateur,
-                            "nb_manquants": nb_manquants,
-                            "limit": limit,
-                            "offset": offset,
-                        },
+                        {"id_utilisateur": id_utilisateur, "sans_alcool": sans_alcool},
                     )
-                    rows = cursor.fetchall()
+                    lignes = cursor.fetchall()
+        except Exception:
+            logging.exception("Erreur ingredients_debloquants pour user %s", id_utilisateur)
+            raise
+        debut = rang([(-row[3], row[0]) for row in lignes], None if cle is None else (-cle[0], cle[1]), avant)
+        debut, fin, encore = tranche(len(lignes), debut, limit, offset, avant)
+        page = lignes[debut:fin]
+        return construire_page(
+            [(Ingredient(*row[:3]), row[3]) for row in page],
+            [(row[3], row[0]) for row in page],
+            len(lignes),
+            encore,
+            avant,
+            depuis_debut=cle is None and offset == 0,
+        )
+
+    # -------------------------- Méthode: optimiser_courses -----------------------------
+
+    @lecture_seule(cle_utilisateur="id_utilisateur")
+    @delai_maximal(3000)
+    @log
+    def optimiser_courses(
+        self, id_utilisateur: int, k: int, sans_alcool: bool = False
+    ) -> tuple[list[Ingredient], int]:
+        """Choisir les k ingrédients à acheter qui rendent réalisables le plus de
+        cocktails, ensemble.
+
+        Contrairement à ingredients_debloquants, les ingrédients sont choisis
+        ensemble : deux ingrédients qui ne débloquent rien seuls peuvent
+        compléter des cocktails à eux deux. La recherche (gloutonne, bornée
+        dans le temps) est faite par OptimiseurCourses sur la relation en bits.
+
+        Parameters
+        ----------
+        id_utilisateur : int
+            Identifiant de l'utilisateur.
+        k : int
+            Nombre maximal d'ingrédients à acheter (1 à K_MAX).
+        sans_alcool : bool, optional
+            Ne compter que les cocktails non alcoolisés (utilisateur mineur).
+
+        Returns
+        -------
+        tuple[list[Ingredient], int]
+            (ingrédients à acheter, dans l'ordre du choix ; nombre de cocktails
+            supplémentaires réalisables une fois tous achetés).
+        """
+        ids_ingredients, nb_cocktails = OptimiseurCourses().meilleurs_achats(
+            InventaireDao().ids_inventaire(id_utilisateur), k, sans_alcool=sans_alcool
+        )
+        return InventaireDao().trouver_par_ids(ids_ingredients), nb_cocktails
+
+    # -------------------------- Méthode: cocktails_soiree -----------------------------
 
-                    return [
-                        Cocktail(
-                            id_cocktail=row["id_cocktail"],
-                            nom_cocktail=row["nom_cocktail"],
-                            categ_cocktail=row["categorie"],
-                            image_cocktail=row.get("image_url"),
-                            alcoolise_cocktail=row.get("alcool"),
-                            instruc_cocktail=row.get("instructions"),
-                            verre=row.get("verre"),
+    @lecture_seule
+    @delai_maximal(3000)
+    @log
+    def cocktails_soiree(
+        self,
+        ids_ingredients: list[int],
+        nb_manquants: int,
+        sans_alcool: bool = False,
+        langue: str = "ENG",
+        limit: int = 10,
+        offset: int = 0,
+        apres: str | None = None,
+        avant: str | None = None,
+    ) -> Page:
+        """Lister les cocktails préparables avec des inventaires réunis
+        (InventaireDao.inventaire_commun), avec au plus nb_manquants ingrédients manquants.
+
+        Le classement est calculé en une passe sur la relation en bits
+        (MoteurRealisabilite), quel que soit le nombre de participants.
+
+        Parameters
+        ----------
+        ids_ingredients : list[int]
+            Ingrédients possédés par au moins un participant.
+        nb_manquants : int
+            Nombre maximal d'ingrédients manquants autorisés (5 au plus).
+        sans_alcool : bool, optional
+            Ne garder que les cocktails non alcoolisés.
+        langue : str
+            Langue des instructions.
+        limit : int, optional
+            Pagination — nombre maximum de résultats.
+        offset : int, optional
+            décalage des résultats.
+        apres : str, optional
+            Curseur Page.suivant : la page commence après ce cocktail
+            (nombre de manquants, nom, id).
+        avant : str, optional
+            Curseur Page.precedent : la page se termine avant ce cocktail.
+
+        Returns
+        -------
+        Page
+            (cocktail, nombre d'ingrédients manquants), les cocktails réalisables
+            d'abord, puis par nombre d'ingrédients manquants et par nom, avec le
+            nombre total de cocktails et les curseurs des pages voisines.
+
+        Raises
+        ------
+        ValueError
+            Si le curseur est invalide.
+        """
+        cle, en_arriere = cle_des_curseurs(apres, avant, (int, str, int))
+        nb_manquants = min(nb_manquants, 5)
+        try:
+            resultat = MoteurRealisabilite().par_manquants(
+                ids_ingredients,
+                nb_manquants,
+                sans_alcool=sans_alcool,
+                limit=limit,
+                offset=offset,
+                cle=None if cle is None else (cle[0], cle[2]),
+                avant=en_arriere,
+            )
+        except Exception:
+            logging.exception("Moteur de réalisabilité indisponible, calcul en SQL")
+            resultat = None
+        if resultat is None:
+            return self._cocktails_soiree_sql(
+                ids_ingredients, nb_manquants, sans_alcool, langue, limit, offset, cle, en_arriere
+            )
+        classement, total, encore = resultat
+        manquants = dict(classement)
+        cocktails = self.trouver_par_ids(list(manquants), langue)
+        return construire_page(
+            [(c, manquants[c.id_cocktail]) for c in cocktails],
+            [(manquants[c.id_cocktail], c.nom_cocktail, c.id_cocktail) for c in cocktails],
+            total,
+            encore,
+            en_arriere,
+            depuis_debut=cle is None and offset == 0,
+        )
+
+    def _cocktails_soiree_sql(
+        self,
+        ids_ingredients: list[int],
+        nb_manquants: int,
+        sans_alcool: bool = False,
+        langue: str = "ENG",
+        limit: int = 10,
+        offset: int = 0,
+        cle: tuple | None = None,
+        avant: bool = False,
+    ) -> Page:
+        """Version SQL de cocktails_soiree (secours du moteur en mémoire et référence de ses tests).
+
+        cle : (nombre de manquants, nom_cocktail, id_cocktail) du cocktail de bord
+        de la page voisine, la page est lue avant lui si avant est vrai.
+        """
+        col_instructions = self.instruction_column(langue)
+
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                    # Même requête que cocktail_partiel, l'inventaire étant un tableau d'ingrédients
+                    # et les cocktails réalisables (0 manquant) gardés en tête
+                    return self._executer_page(
+                        cursor,
+                        "cocktails_soiree",
+                        f"""
+                        WITH cocktail_matching_ingredients AS (
+                            SELECT ci.id_cocktail, COUNT(*) AS matching_ingredients
+                            FROM cocktail_ingredient ci
+                            WHERE ci.id_ingredient = ANY(%(ids)s)
+                            GROUP BY ci.id_cocktail
                         )
-                        for row in rows
-                    ]
+                        SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre,
+                               c.{col_instructions} AS instructions,
+                               c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0) AS manquants
+                        FROM cocktail c
+                        LEFT JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+                        WHERE c.nb_ingredients > 0
+                        AND c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0) <= %(nb_manquants)s
+                        {FILTRE_SANS_ALCOOL if sans_alcool else ""}
+                        """,
+                        ("manquants", "nom_cocktail", "id_cocktail"),
+                        {"ids": list(ids_ingredients), "nb_manquants": nb_manquants},
+                        limit,
+                        offset,
+                        cle,
+                        avant,
+                        materialiser=True,
+                        colonne_jointe="manquants",
+                    )
         except Exception:
-            logging.exception("Erreur cocktail_partiel pour user %s", id_utilisateur)
+            logging.exception("Erreur cocktails_soiree")
             raise
 
     # ------------------------  Méthode: rechercher_cocktails -----------------------------
 
+    @lecture_seule
+    @delai_maximal(2000)
     @log
     def rechercher_cocktails(
         self,
@@ -296,13 +873,24 @@ class CocktailDao(metaclass=Singleton):
         langue: str = "ENG",
         limit: int = 10,
         offset: int = 0,
-    ) -> list[Cocktail]:
+        apres: str | None = None,
+        avant: str | None = None,
+        sans_alcool: bool = False,
+        seuil_similarite: float | None = None,
+    ) -> Page:
         """Recherche de cocktails avec filtres et pagination (VERSION OPTIMALE).
 
+        Avec un nom d'au moins LONGUEUR_MIN caractères, la recherche tolère les
+        fautes de frappe : IndexTrigrammes donne les cocktails dont le nom
+        ressemble à la recherche, du plus au moins semblable. Sans autre
+        filtre, la page est lue dans cette liste ; sinon la requête ne garde
+        que ceux qui passent les autres filtres, dans cet ordre.
+        Sinon, les résultats sont triés par nom.
+
         Parameters
         ----------
         nom_cocktail : str, optional
-            Filtre sur le nom du cocktail (insensible à la casse).
+            Filtre sur le nom du cocktail (insensible à la casse, tolérant aux fautes de frappe).
         categorie : str, optional
             Filtre sur la catégorie du cocktail.
         verre : str, optional
@@ -317,20 +905,57 @@ class CocktailDao(metaclass=Singleton):
             Nombre maximal de cocktails retournés
         offset : int, optional
             Décalage du résultat pour la pagination
+        apres : str, optional
+            Curseur Page.suivant : la page commence après ce cocktail (nom, id),
+            par l'index idx_cocktail_nom.
+        avant : str, optional
+            Curseur Page.precedent : la page se termine avant ce cocktail.
+        sans_alcool : bool, optional
+            Ne garder que les cocktails non alcoolisés (utilisateur mineur) ;
+            le filtre est appliqué avant la pagination, les pages restent pleines.
+        seuil_similarite : float, optional
+            Similarité minimale (entre 0 et 1) des noms retenus, par défaut
+            celle de IndexTrigrammes ; les noms qui contiennent nom_cocktail
+            sont toujours retenus.
 
         Returns
         -------
-        list[Cocktail]
-            Liste des cocktails correspondant aux filtres appliqués.
+        Page
+            Liste des cocktails correspondant aux filtres appliqués, par
+            ressemblance au nom recherché (ou par nom), avec le nombre total de
+            résultats et les curseurs des pages voisines.
+
+        Raises
+        ------
+        ValueError
+            Si le curseur est invalide.
         """
+        # Recherche approchée par nom : cocktails classés par ressemblance, puis filtrés en SQL
+        ids_noms = None
+        if nom_cocktail is not None and len(nom_cocktail.strip()) >= LONGUEUR_MIN:
+            ids_noms = IndexTrigrammes().rechercher(nom_cocktail.strip(), seuil_similarite, sans_alcool)
+        # Clé de tri : (nom, id), ou (rang de ressemblance, id)
+        cle, en_arriere = cle_des_curseurs(apres, avant, (str, int) if ids_noms is None else (int, int))
+        if ids_noms is not None and not ingredients and all(f is None for f in (categorie, verre, alcool)):
+            return self._page_classee(ids_noms, langue, limit, offset, cle, en_arriere)
 
         # --- Choix de la colonne instructions selon la langue ---
         col_instructions = self.instruction_column(langue)
 
+        colonnes_cle = ("nom_cocktail", "id_cocktail")
+        rang, jointure_noms = "", ""
+        if ids_noms is not None:
+            colonnes_cle = ("rang", "id_cocktail")
+            rang = ", n.rang"
+            jointure_noms = (
+                "JOIN unnest(%(ids_noms)s::int[]) WITH ORDINALITY AS n(id_cocktail, rang) "
+                "ON n.id_cocktail = c.id_cocktail"
+            )
+
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
-                    params = {"limit": limit, "offset": offset}
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                    params = {} if ids_noms is None else {"ids_noms": ids_noms}
                     # Mapping entre la langue saisi de l'utilisateur et la bonne colonne
 
                     # On utilise une CTE pour filtrer par ingrédients si nécessaire
@@ -346,9 +971,10 @@ class CocktailDao(metaclass=Singleton):
                                 GROUP BY c.id_cocktail
                                 HAVING COUNT(DISTINCT i.id_ingredient) = %(nb_ingredients)s
                             )
-                            SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.{col_instructions} AS instructions
+                            SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.{col_instructions} AS instructions{rang}
                             FROM cocktail c
                             JOIN cocktails_with_ingredients cwi ON c.id_cocktail = cwi.id_cocktail
+                            {jointure_noms}
                             WHERE 1=1
                         """
                         # Normaliser les noms d'ingrédients en lowercase pour éviter les problèmes de casse
@@ -357,11 +983,11 @@ class CocktailDao(metaclass=Singleton):
                     else:
                         # Pas de filtre d'ingrédients, requête simple
                         query = f"""
-                        SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.{col_instructions} AS instructions
-                        FROM cocktail c WHERE 1=1
+                        SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.{col_instructions} AS instructions{rang}
+                        FROM cocktail c {jointure_noms} WHERE 1=1
                         """
 
-                    if nom_cocktail is not None:
+                    if nom_cocktail is not None and ids_noms is None:
                         query += " AND nom_cocktail ILIKE %(nom_cocktail)s"
                         params["nom_cocktail"] = f"%{nom_cocktail}%"
 
@@ -377,86 +1003,214 @@ class CocktailDao(metaclass=Singleton):
                         query += " AND LOWER(alcool)= LOWER( %(alcool)s)"
                         params["alcool"] = alcool.lower()
 
-                    # Tri et pagination
-                    query += " ORDER BY nom_cocktail LIMIT %(limit)s OFFSET %(offset)s;"
+                    if sans_alcool:
+                        query += FILTRE_SANS_ALCOOL
 
-                    cursor.execute(query, params)
-                    rows = cursor.fetchall()
-
-                    return [
-                        Cocktail(
-                            id_cocktail=row["id_cocktail"],
-                            nom_cocktail=row["nom_cocktail"],
-                            categ_cocktail=row["categorie"],
-                            image_cocktail=row.get("image_url"),
-                            alcoolise_cocktail=row.get("alcool"),
-                            instruc_cocktail=row.get("instructions"),
-                            verre=row.get("verre"),
-                        )
-                        for row in rows
-                    ]
+                    # Tri, pagination par clé et total (voir _executer_page)
+                    return self._executer_page(
+                        cursor,
+                        "rechercher_cocktails",
+                        query,
+                        colonnes_cle,
+                        params,
+                        limit,
+                        offset,
+                        cle,
+                        en_arriere,
+                    )
         except Exception:
             logging.exception("Erreur rechercher_cocktails")
             raise
 
+    def _page_classee(
+        self,
+        ids_cocktails: list[int],
+        langue: str = "ENG",
+        limit: int = 10,
+        offset: int = 0,
+        cle: tuple | None = None,
+        avant: bool = False,
+    ) -> Page:
+        """Page d'une liste de cocktails déjà classée en mémoire (ex : par IndexTrigrammes).
+
+        cle : (rang dans la liste à partir de 1, id_cocktail) du cocktail de bord
+        de la page voisine, comme la colonne rang des requêtes de rechercher_cocktails.
+        """
+        rang = 0 if cle is None else min(max(cle[0] - avant, 0), len(ids_cocktails))
+        debut, fin, encore = tranche(len(ids_cocktails), rang, limit, offset, avant)
+        rangs = {id_cocktail: debut + i + 1 for i, id_cocktail in enumerate(ids_cocktails[debut:fin])}
+        cocktails = self.trouver_par_ids(list(rangs), langue)
+        return construire_page(
+            cocktails,
+            [(rangs[c.id_cocktail], c.id_cocktail) for c in cocktails],
+            len(ids_cocktails),
+            encore,
+            avant,
+            depuis_debut=cle is None and offset == 0,
+        )
+
     # ------------------- Méthode: cocktails_aleatoires -----------------------------
 
+    @lecture_seule
+    @delai_maximal(1000)
     @log
     def cocktails_aleatoires(
         self,
         nombre: int = 5,
         langue: str = "ENG",
+        sans_alcool: bool = False,
     ) -> list[Cocktail]:
         """Propose une liste de cocktails choisis aléatoirement.
 
+        Les identifiants sont tirés en mémoire (voir TirageCocktails), sans
+        ORDER BY RANDOM() qui trierait toute la table, puis les cocktails sont
+        lus par leur clé primaire.
+
         Parameters
         ----------
         nombre : int, optional
             Nombre de cocktails à sélectionner (par défaut 5)
         langue : str
             Langue de l'utilisateur.
+        sans_alcool : bool, optional
+            Ne tirer que parmi les cocktails non alcoolisés (utilisateur mineur).
 
         Returns
         -------
         list[Cocktail]
-            Liste de cocktails aléatoires sélectionnés directement côté base de données.
+            Liste de cocktails distincts tirés aléatoirement.
 
         """
-        # --- Choix de la colonne instructions selon la langue ---
+        nombre_limite = min(max(1, nombre), 5)
+        return self.trouver_par_ids(TirageCocktails().tirer(nombre_limite, sans_alcool), langue)
+
+    # ------------------- Méthode: cocktail_du_jour -----------------------------
+
+    @lecture_seule
+    @log
+    def cocktail_du_jour(
+        self,
+        langue: str = "ENG",
+        sans_alcool: bool = False,
+        jour: date = None,
+    ) -> Cocktail | None:
+        """Cocktail du jour : tiré au hasard avec la date pour graine, le même toute la journée.
+
+        Parameters
+        ----------
+        langue : str
+            Langue des instructions.
+        sans_alcool : bool, optional
+            Tirer parmi les cocktails non alcoolisés (utilisateur mineur).
+        jour : date, optional
+            Date du tirage (aujourd'hui par défaut).
+
+        Returns
+        -------
+        Cocktail | None
+            Le cocktail du jour (None si le catalogue est vide), lu dans la
+            base au premier appel de la journée puis gardé en mémoire.
+        """
+        jour = jour or date.today()
+
+        def lire(id_cocktail):
+            cocktails = self.trouver_par_ids([id_cocktail], langue)
+            return cocktails[0] if cocktails else None
+
+        return TirageCocktails().cocktail_du_jour(jour, sans_alcool, langue, lire)
+
+    # ------------------- Méthode: trouver_par_ids -----------------------------
+
+    @lecture_seule
+    @delai_maximal(1000)
+    @log
+    def trouver_par_ids(self, ids_cocktails: list[int], langue: str = "ENG") -> list[Cocktail]:
+        """Lire une page de cocktails désignés par leurs identifiants.
+
+        Parameters
+        ----------
+        ids_cocktails : list[int]
+            Identifiants des cocktails, dans l'ordre voulu.
+        langue : str
+            Langue des instructions.
+
+        Returns
+        -------
+        list[Cocktail]
+            Les cocktails existants, dans l'ordre de ids_cocktails.
+        """
+        if not ids_cocktails:
+            return []
         col_instructions = self.instruction_column(langue)
 
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
-                    nombre_limite = min(max(1, nombre), 5)
-
-                    cursor.execute(
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                    RegistreRequetesPreparees().executer(
+                        cursor,
+                        "trouver_par_ids",
                         f"""SELECT id_cocktail, nom_cocktail, categorie, alcool, image_url, verre, {col_instructions} AS instructions
                         FROM cocktail
-                        ORDER BY RANDOM()
-                        LIMIT %(limit)s;""",
-                        {"limit": nombre_limite},
+                        WHERE id_cocktail = ANY(%(ids)s)
+                        ORDER BY array_position(%(ids)s, id_cocktail);""",
+                        {"ids": list(ids_cocktails)},
                     )
-                    rows = cursor.fetchall()
-
-                    return [
-                        Cocktail(
-                            id_cocktail=row["id_cocktail"],
-                            nom_cocktail=row["nom_cocktail"],
-                            categ_cocktail=row["categorie"],
-                            image_cocktail=row.get("image_url"),
-                            alcoolise_cocktail=row.get("alcool"),
-                            instruc_cocktail=row.get("instructions"),
-                            verre=row.get("verre"),
-                        )
-                        for row in rows
-                    ]
+                    return MAPPEUR_COCKTAIL.tous(cursor)
         except Exception:
-            logging.exception("Erreur cocktails_aleatoires")
+            logging.exception("Erreur trouver_par_ids")
             raise
 
+    # ------------------- Méthode: iterer_catalogue -----------------------------
+
+    @log
+    def iterer_catalogue(self, langue: str = "ENG", taille_lot: int = None) -> Iterator[Cocktail]:
+        """Parcourir tout le catalogue sans le charger en mémoire
+
+        Les lignes sont lues par lots de taille_lot via un curseur serveur
+        (voir DBConnection.flux) : la mémoire utilisée ne dépend pas de la
+        taille du catalogue.
+
+        Parameters
+        ----------
+        langue : str
+            Langue des instructions.
+        taille_lot : int, optional
+            Nombre de cocktails lus par aller-retour avec la base
+
+        Returns
+        -------
+        Iterator[Cocktail]
+            Générateur des cocktails, par id croissant
+        """
+        col_instructions = self.instruction_column(langue)
+        return DBConnection().flux(
+            f"""SELECT id_cocktail, nom_cocktail, categorie, alcool, image_url, verre, {col_instructions} AS instructions
+            FROM cocktail
+            ORDER BY id_cocktail;""",
+            taille_lot=taille_lot,
+            mappeur=MAPPEUR_COCKTAIL,
+        )
+
+    @log
+    def lister_tous(self, langue: str = "ENG") -> list[Cocktail]:
+        """Liste de tous les cocktails du catalogue.
+
+        Parameters
+        ----------
+        langue : str
+            Langue des instructions.
+
+        Returns
+        -------
+        list[Cocktail]
+            Tous les cocktails, par id croissant.
+        """
+        return list(self.iterer_catalogue(langue))
+
     # ------------------- Méthode: lister_categories -----------------------------
 
+    @lecture_seule
+    @delai_maximal(1000)
     @log
     def lister_categories(self) -> list[str]:
         """Liste toutes les catégories de cocktails disponibles.
@@ -485,6 +1239,8 @@ class CocktailDao(metaclass=Singleton):
 
     # ------------------- Méthode: lister_verres -----------------------------
 
+    @lecture_seule
+    @delai_maximal(1000)
     @log
     def lister_verres(self) -> list[str]:
         """Liste tous les types de verres disponibles.
@@ -544,6 +1300,8 @@ class CocktailDao(metaclass=Singleton):
 
         # ------------------- Méthode: trouver_par_id -----------------------------
 
+    @lecture_seule
+    @delai_maximal(1000)
     @log
     def trouver_par_id(self, id_cocktail: int) -> Cocktail:
         """
@@ -561,21 +1319,11 @@ class CocktailDao(metaclass=Singleton):
             """
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
                     cursor.execute(
                         "SELECT * FROM cocktail WHERE id_cocktail = %(id_cocktail)s;",
                         {"id_cocktail": id_cocktail},
                     )
-                    row = cursor.fetchone()
-                    if row:
-                        return Cocktail(
-                            id_cocktail=row["id_cocktail"],
-                            nom_cocktail=row["nom_cocktail"],
-                            categ_cocktail=row["categorie"],
-                            image_cocktail=row.get("image_url"),
-                            alcoolise_cocktail=row.get("alcool"),
-                            instruc_cocktail=row.get("instructions"),
-                        )
-                    return None
+                    return MAPPEUR_COCKTAIL.un(cursor)
         except Exception as e:
             print(f"Erreur recherche cocktail par ID: {e}")
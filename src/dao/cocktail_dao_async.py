@@ -0,0 +1,451 @@
+import logging
+
+from business_object.cocktail import Cocktail
+from business_object.cocktail_complet import CocktailComplet
+from dao.async_db_connection import AsyncDBConnection
+from dao.cocktail_dao import FILTRE_SANS_ALCOOL, CocktailDao
+from dao.index_trigrammes import LONGUEUR_MIN, IndexTrigrammes
+from dao.pagination import Page, cle_des_curseurs, construire_page, lire_page, requete_page, tranche
+from dao.tirage_cocktails import TirageCocktails
+from utils.log_decorator import log
+from utils.singleton import Singleton
+
+
+class CocktailDaoAsync(metaclass=Singleton):
+    """Version asynchrone (asyncpg) de CocktailDao, mêmes requêtes et mêmes résultats."""
+
+    @staticmethod
+    def _cocktail(row) -> Cocktail:
+        """Construction d'un Cocktail à partir d'une ligne asyncpg"""
+        return Cocktail(
+            id_cocktail=row["id_cocktail"],
+            nom_cocktail=row["nom_cocktail"],
+            categ_cocktail=row["categorie"],
+            image_cocktail=row.get("image_url"),
+            alcoolise_cocktail=row.get("alcool"),
+            instruc_cocktail=row.get("instructions"),
+            verre=row.get("verre"),
+        )
+
+    async def _executer_page(
+        self,
+        requete: str,
+        colonnes_cle: tuple,
+        params: dict,
+        limit: int,
+        offset: int,
+        cle: tuple | None = None,
+        avant: bool = False,
+        materialiser: bool = False,
+    ) -> Page:
+        """Page de cocktails et nombre total de résultats en une requête (voir requete_page)"""
+        async with AsyncDBConnection().connection as connection:
+            rows = await connection.fetch(
+                requete_page(requete, colonnes_cle, params, limit, offset, cle, avant, materialiser), params
+            )
+        return lire_page(
+            rows,
+            self._cocktail,
+            lambda row: tuple(row[colonne] for colonne in colonnes_cle),
+            limit,
+            avant,
+            depuis_debut=cle is None and offset == 0,
+        )
+
+    # --------------------------  Méthode realiser_cocktail   ---------------------------------
+
+    @log
+    async def realiser_cocktail(
+        self, id_cocktail: int = None, nom_cocktail: str = None, langue: str = "ENG"
+    ) -> CocktailComplet:
+        """Récupérer les détails complets d'un cocktail par son ID ou son nom.
+
+        Voir CocktailDao.realiser_cocktail.
+        """
+        if not id_cocktail and not nom_cocktail:
+            raise ValueError("Vous devez fournir soit un ID, soit un nom de cocktail")
+
+        col_instructions = self.instruction_column(langue)
+
+        if id_cocktail:
+            where_clause = "WHERE c.id_cocktail = %(id_cocktail)s"
+            params = {"id_cocktail": id_cocktail}
+        else:
+            where_clause = "WHERE LOWER(c.nom_cocktail) = LOWER(%(nom_cocktail)s)"
+            params = {"nom_cocktail": nom_cocktail}
+
+        try:
+            async with AsyncDBConnection().connection as connection:
+                row = await connection.fetchrow(
+                    f"""
+                    SELECT
+                        c.id_cocktail,
+                        c.nom_cocktail,
+                        c.categorie,
+                        c.alcool,
+                        c.image_url,
+                        c.verre,
+                        c.{col_instructions} AS instructions,
+                        ARRAY_AGG(i.nom_ingredient ORDER BY i.nom_ingredient, ci.id_ingredient) AS ingredients,
+                        ARRAY_AGG(ci.quantite ORDER BY i.nom_ingredient, ci.id_ingredient) AS quantites
+                    FROM cocktail c
+                    JOIN cocktail_ingredient ci ON c.id_cocktail = ci.id_cocktail
+                    JOIN ingredient i ON ci.id_ingredient = i.id_ingredient
+                    {where_clause}
+                    GROUP BY
+                        c.id_cocktail, c.nom_cocktail, c.categorie,
+                        c.alcool, c.image_url, c.verre, c.{col_instructions}
+                    """,
+                    params,
+                )
+        except Exception:
+            logging.exception("Erreur lors de la récupération du cocktail")
+            raise
+
+        if not row:
+            return None
+
+        return CocktailComplet(
+            id_cocktail=row["id_cocktail"],
+            nom_cocktail=row["nom_cocktail"],
+            categ_cocktail=row["categorie"],
+            image_cocktail=row.get("image_url"),
+            alcoolise_cocktail=row.get("alcool"),
+            instruc_cocktail=row.get("instructions"),
+            verre=row.get("verre"),
+            ingredients=row.get("ingredients"),
+            quantites=row.get("quantites"),
+        )
+
+    # --------------------------  Méthode cocktail_complet   ---------------------------------
+
+    @log
+    async def cocktail_complet(
+        self,
+        id_utilisateur: int,
+        langue: str = "ENG",
+        limit: int = 10,
+        offset: int = 0,
+        apres: str | None = None,
+        avant: str | None = None,
+        sans_alcool: bool = False,
+    ) -> Page:
+        """Lister les cocktails que l'utilisateur peut préparer avec son inventaire.
+
+        Voir CocktailDao.cocktail_complet : page par nom, avec le nombre total
+        de cocktails et les curseurs des pages voisines (apres / avant).
+        """
+        cle, en_arriere = cle_des_curseurs(apres, avant, (str, int))
+        col_instructions = self.instruction_column(langue)
+
+        try:
+            return await self._executer_page(
+                f"""
+                WITH cocktail_matching_ingredients AS (
+                    SELECT ci.id_cocktail, COUNT(*) AS matching_ingredients
+                    FROM inventaire_ingredient ui
+                    JOIN cocktail_ingredient ci ON ci.id_ingredient = ui.id_ingredient
+                    WHERE ui.id_utilisateur = %(id_utilisateur)s
+                    GROUP BY ci.id_cocktail
+                )
+                SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.{col_instructions} AS instructions
+                FROM cocktail c
+                JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+                WHERE c.nb_ingredients = cmi.matching_ingredients
+                {FILTRE_SANS_ALCOOL if sans_alcool else ""}
+                """,
+                ("nom_cocktail", "id_cocktail"),
+                {"id_utilisateur": id_utilisateur},
+                limit,
+                offset,
+                cle,
+                en_arriere,
+                materialiser=True,
+            )
+        except Exception:
+            logging.exception("Erreur cocktail_complet pour user %s", id_utilisateur)
+            raise
+
+    # -------------------------- Méthode: cocktail_partiel -----------------------------
+
+    @log
+    async def cocktail_partiel(
+        self,
+        id_utilisateur: int,
+        nb_manquants: int,
+        langue: str = "ENG",
+        limit: int = 10,
+        offset: int = 0,
+        apres: str | None = None,
+        avant: str | None = None,
+        sans_alcool: bool = False,
+    ) -> Page:
+        """Lister les cocktails préparables avec au plus nb_manquants ingrédients manquants.
+
+        Voir CocktailDao.cocktail_partiel : page par nombre de manquants puis
+        par nom, avec le nombre total de cocktails et les curseurs des pages
+        voisines (apres / avant).
+        """
+        cle, en_arriere = cle_des_curseurs(apres, avant, (int, str, int))
+        col_instructions = self.instruction_column(langue)
+        nb_manquants = min(nb_manquants, 5)
+
+        try:
+            return await self._executer_page(
+                f"""
+                WITH cocktail_matching_ingredients AS (
+                    SELECT ci.id_cocktail, COUNT(*) AS matching_ingredients
+                    FROM inventaire_ingredient ui
+                    JOIN cocktail_ingredient ci ON ci.id_ingredient = ui.id_ingredient
+                    WHERE ui.id_utilisateur = %(id_utilisateur)s
+                    GROUP BY ci.id_cocktail
+                )
+                SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.{col_instructions} AS instructions, c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0) AS manquants
+                FROM cocktail c
+                LEFT JOIN cocktail_matching_ingredients cmi ON c.id_cocktail = cmi.id_cocktail
+                WHERE c.nb_ingredients - COALESCE(cmi.matching_ingredients, 0) BETWEEN 1 AND %(nb_manquants)s
+                {FILTRE_SANS_ALCOOL if sans_alcool else ""}
+                """,
+                ("manquants", "nom_cocktail", "id_cocktail"),
+                {"id_utilisateur": id_utilisateur, "nb_manquants": nb_manquants},
+                limit,
+                offset,
+                cle,
+                en_arriere,
+                materialiser=True,
+            )
+        except Exception:
+            logging.exception("Erreur cocktail_partiel pour user %s", id_utilisateur)
+            raise
+
+    # ------------------------  Méthode: rechercher_cocktails -----------------------------
+
+    @log
+    async def rechercher_cocktails(
+        self,
+        nom_cocktail=None,
+        categorie=None,
+        verre=None,
+        alcool=None,
+        ingredients=None,
+        langue: str = "ENG",
+        limit: int = 10,
+        offset: int = 0,
+        apres: str | None = None,
+        avant: str | None = None,
+        sans_alcool: bool = False,
+        seuil_similarite: float | None = None,
+    ) -> Page:
+        """Recherche de cocktails avec filtres et pagination.
+
+        Voir CocktailDao.rechercher_cocktails : un nom d'au moins LONGUEUR_MIN
+        caractères est cherché dans IndexTrigrammes (fautes de frappe tolérées,
+        noms les plus ressemblants d'abord) ; sinon la page est triée par nom.
+        Mêmes résultats, même nombre total et mêmes curseurs (apres / avant).
+        """
+        # Recherche approchée par nom : cocktails classés par ressemblance, puis filtrés en SQL
+        ids_noms = None
+        if nom_cocktail is not None and len(nom_cocktail.strip()) >= LONGUEUR_MIN:
+            ids_noms = IndexTrigrammes().rechercher(nom_cocktail.strip(), seuil_similarite, sans_alcool)
+        # Clé de tri : (nom, id), ou (rang de ressemblance, id)
+        cle, en_arriere = cle_des_curseurs(apres, avant, (str, int) if ids_noms is None else (int, int))
+        if ids_noms is not None and not ingredients and all(f is None for f in (categorie, verre, alcool)):
+            return await self._page_classee(ids_noms, langue, limit, offset, cle, en_arriere)
+
+        col_instructions = self.instruction_column(langue)
+        params = {} if ids_noms is None else {"ids_noms": ids_noms}
+        colonnes_cle = ("nom_cocktail", "id_cocktail")
+        rang, jointure_noms = "", ""
+        if ids_noms is not None:
+            colonnes_cle = ("rang", "id_cocktail")
+            rang = ", n.rang"
+            jointure_noms = (
+                "JOIN unnest(%(ids_noms)s::int[]) WITH ORDINALITY AS n(id_cocktail, rang) "
+                "ON n.id_cocktail = c.id_cocktail"
+            )
+
+        if ingredients and len(ingredients) > 0:
+            query = f"""
+                WITH cocktails_with_ingredients AS (
+                    SELECT c.id_cocktail
+                    FROM cocktail c
+                    JOIN cocktail_ingredient ci ON c.id_cocktail = ci.id_cocktail
+                    JOIN ingredient i ON ci.id_ingredient = i.id_ingredient
+                    WHERE LOWER(i.nom_ingredient) = ANY(%(ingredients)s)
+                    GROUP BY c.id_cocktail
+                    HAVING COUNT(DISTINCT i.id_ingredient) = %(nb_ingredients)s
+                )
+                SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.{col_instructions} AS instructions{rang}
+                FROM cocktail c
+                JOIN cocktails_with_ingredients cwi ON c.id_cocktail = cwi.id_cocktail
+                {jointure_noms}
+                WHERE 1=1
+            """
+            params["ingredients"] = [ing.lower() for ing in ingredients]
+            params["nb_ingredients"] = len(ingredients)
+        else:
+            query = f"""
+            SELECT c.id_cocktail, c.nom_cocktail, c.categorie, c.alcool, c.image_url, c.verre, c.{col_instructions} AS instructions{rang}
+            FROM cocktail c {jointure_noms} WHERE 1=1
+            """
+
+        if nom_cocktail is not None and ids_noms is None:
+            query += " AND nom_cocktail ILIKE %(nom_cocktail)s"
+            params["nom_cocktail"] = f"%{nom_cocktail}%"
+
+        if categorie is not None:
+            query += " AND LOWER(categorie) = LOWER(%(categorie)s)"
+            params["categorie"] = categorie.lower()
+
+        if verre is not None:
+            query += " AND LOWER(verre) = LOWER(%(verre)s)"
+            params["verre"] = verre.lower()
+
+        if alcool is not None:
+            query += " AND LOWER(alcool)= LOWER( %(alcool)s)"
+            params["alcool"] = alcool.lower()
+
+        if sans_alcool:
+            query += FILTRE_SANS_ALCOOL
+
+        try:
+            return await self._executer_page(query, colonnes_cle, params, limit, offset, cle, en_arriere)
+        except Exception:
+            logging.exception("Erreur rechercher_cocktails")
+            raise
+
+    async def _page_classee(
+        self,
+        ids_cocktails: list[int],
+        langue: str = "ENG",
+        limit: int = 10,
+        offset: int = 0,
+        cle: tuple | None = None,
+        avant: bool = False,
+    ) -> Page:
+        """Page d'une liste de cocktails déjà classée en mémoire (voir CocktailDao._page_classee)."""
+        rang = 0 if cle is None else min(max(cle[0] - avant, 0), len(ids_cocktails))
+        debut, fin, encore = tranche(len(ids_cocktails), rang, limit, offset, avant)
+        rangs = {id_cocktail: debut + i + 1 for i, id_cocktail in enumerate(ids_cocktails[debut:fin])}
+        cocktails = await self.trouver_par_ids(list(rangs), langue)
+        return construire_page(
+            cocktails,
+            [(rangs[c.id_cocktail], c.id_cocktail) for c in cocktails],
+            len(ids_cocktails),
+            encore,
+            avant,
+            depuis_debut=cle is None and offset == 0,
+        )
+
+    # ------------------- Méthode: cocktails_aleatoires -----------------------------
+
+    @log
+    async def cocktails_aleatoires(
+        self, nombre: int = 5, langue: str = "ENG", sans_alcool: bool = False
+    ) -> list[Cocktail]:
+        """Propose une liste de cocktails choisis aléatoirement.
+
+        Voir CocktailDao.cocktails_aleatoires : identifiants tirés en mémoire
+        (TirageCocktails), cocktails lus par leur clé primaire.
+        """
+        nombre_limite = min(max(1, nombre), 5)
+        return await self.trouver_par_ids(TirageCocktails().tirer(nombre_limite, sans_alcool), langue)
+
+    # ------------------- Méthode: trouver_par_ids -----------------------------
+
+    @log
+    async def trouver_par_ids(self, ids_cocktails: list[int], langue: str = "ENG") -> list[Cocktail]:
+        """Cocktails désignés par leurs identifiants, dans l'ordre de ids_cocktails.
+
+        Voir CocktailDao.trouver_par_ids.
+        """
+        if not ids_cocktails:
+            return []
+        col_instructions = self.instruction_column(langue)
+
+        try:
+            async with AsyncDBConnection().connection as connection:
+                rows = await connection.fetch(
+                    f"""SELECT id_cocktail, nom_cocktail, categorie, alcool, image_url, verre, {col_instructions} AS instructions
+                    FROM cocktail
+                    WHERE id_cocktail = ANY(%(ids)s)
+                    ORDER BY array_position(%(ids)s, id_cocktail);""",
+                    {"ids": list(ids_cocktails)},
+                )
+        except Exception:
+            logging.exception("Erreur trouver_par_ids")
+            raise
+
+        return [self._cocktail(row) for row in rows]
+
+    # ------------------- Méthode: lister_categories -----------------------------
+
+    @log
+    async def lister_categories(self) -> list[str]:
+        """Liste toutes les catégories de cocktails disponibles."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                rows = await connection.fetch(
+                    """
+                    SELECT DISTINCT categorie
+                    FROM cocktail
+                    WHERE categorie IS NOT NULL
+                    ORDER BY categorie;
+                    """
+                )
+        except Exception:
+            logging.exception("Erreur lister_categories")
+            raise
+        return [row["categorie"] for row in rows]
+
+    # ------------------- Méthode: lister_verres -----------------------------
+
+    @log
+    async def lister_verres(self) -> list[str]:
+        """Liste tous les types de verres disponibles."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                rows = await connection.fetch(
+                    """
+                    SELECT DISTINCT verre
+                    FROM cocktail
+                    WHERE verre IS NOT NULL
+                    ORDER BY verre;
+                    """
+                )
+        except Exception:
+            logging.exception("Erreur lister_verres")
+            raise
+        return [row["verre"] for row in rows]
+
+    # ------------------- Méthode: instruction_column -----------------------------
+
+    def instruction_column(self, langue: str) -> str:
+        """Nom de la colonne d'instructions selon la langue (voir CocktailDao)."""
+        return CocktailDao().instruction_column(langue)
+
+    # ------------------- Méthode: trouver_par_id -----------------------------
+
+    @log
+    async def trouver_par_id(self, id_cocktail: int) -> Cocktail:
+        """Trouver un cocktail par son ID, None s'il n'existe pas."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                row = await connection.fetchrow(
+                    "SELECT * FROM cocktail WHERE id_cocktail = %(id_cocktail)s;",
+                    {"id_cocktail": id_cocktail},
+                )
+        except Exception:
+            logging.exception("Erreur recherche cocktail par ID")
+            return None
+
+        if not row:
+            return None
+        return Cocktail(
+            id_cocktail=row["id_cocktail"],
+            nom_cocktail=row["nom_cocktail"],
+            categ_cocktail=row["categorie"],
+            image_cocktail=row.get("image_url"),
+            alcoolise_cocktail=row.get("alcool"),
+            instruc_cocktail=row.get("instructions"),
+        )
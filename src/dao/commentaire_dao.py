@@ -1,8 +1,29 @@
+from datetime import datetime
+
+from business_object.cocktail import Cocktail
 from business_object.commentaire import Commentaire
-from dao.db_connection import DBConnection
+from dao.cocktail_dao import MAPPEUR_COCKTAIL
+from dao.db_connection import CurseurTuple, DBConnection
+from dao.lot_requetes import LotRequetes
+from dao.mappeur import Mappeur
 from utils.singleton import Singleton
 from utils.log_decorator import log
 
+# Colonnes SQL -> paramètres du constructeur (voir Mappeur)
+MAPPEUR_COMMENTAIRE = Mappeur(
+    Commentaire,
+    {
+        "id_commentaire": "id_commentaire",
+        "id_utilisateur": "id_utilisateur",
+        "id_cocktail": "id_cocktail",
+        "texte": "texte",
+        "note": "note",
+        "date_creation": "date_creation",
+        "pseudo_utilisateur": "pseudo_utilisateur",
+    },
+)
+
+
 class CommentaireDao(metaclass=Singleton):
 
     @log
@@ -61,7 +82,7 @@ class CommentaireDao(metaclass=Singleton):
         """
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
                     cursor.execute(
                         "SELECT c.*, u.pseudo as pseudo_utilisateur "
                         "FROM commentaire c "
@@ -70,23 +91,61 @@ class CommentaireDao(metaclass=Singleton):
                         "ORDER BY c.date_creation DESC;",
                         {"id_cocktail": id_cocktail}
                     )
-                    results = cursor.fetchall()
-                    return [
-                        Commentaire(
-                            id_commentaire=row["id_commentaire"],
-                            id_utilisateur=row["id_utilisateur"],
-                            id_cocktail=row["id_cocktail"],
-                            texte=row["texte"],
-                            note=row["note"],
-                            date_creation=row["date_creation"],
-                            pseudo_utilisateur=row["pseudo_utilisateur"]
-                        )
-                        for row in results
-                    ]
+                    return MAPPEUR_COMMENTAIRE.tous(cursor)
         except Exception as e:
             print(f"Erreur recherche commentaires: {e}")
             return []
 
+    @log
+    def trouver_avec_cocktail(self, id_cocktail: int) -> tuple[Cocktail | None, list[Commentaire], float]:
+        """
+        Récupère un cocktail, ses commentaires et sa note moyenne
+        en un seul aller-retour avec la base (LotRequetes).
+
+        Paramètres
+        ----------
+        id_cocktail : int
+            Identifiant du cocktail.
+
+        Retour
+        ------
+        tuple[Cocktail | None, list[Commentaire], float]
+            (cocktail ou None s'il n'existe pas, commentaires du plus récent au
+            plus ancien, note moyenne ou 0.0 sans commentaire)
+        """
+        lot = LotRequetes()
+        cocktail = lot.ajouter(
+            "SELECT id_cocktail, nom_cocktail, categorie, alcool, image_url, verre "
+            "FROM cocktail WHERE id_cocktail = %(id_cocktail)s",
+            {"id_cocktail": id_cocktail},
+        )
+        commentaires = lot.ajouter(
+            "SELECT c.*, u.pseudo as pseudo_utilisateur "
+            "FROM commentaire c "
+            "JOIN utilisateur u ON c.id_utilisateur = u.id_utilisateur "
+            "WHERE c.id_cocktail = %(id_cocktail)s "
+            "ORDER BY c.date_creation DESC",
+            {"id_cocktail": id_cocktail},
+            conversions={"date_creation": datetime.fromisoformat},
+        )
+        note = lot.ajouter(
+            "SELECT COALESCE(AVG(note), 0)::float AS note_moyenne "
+            "FROM commentaire WHERE id_cocktail = %(id_cocktail)s",
+            {"id_cocktail": id_cocktail},
+        )
+        try:
+            resultats = lot.executer()
+        except Exception as e:
+            print(f"Erreur recherche commentaires: {e}")
+            return None, [], 0.0
+
+        cocktails = MAPPEUR_COCKTAIL.depuis_dicts(resultats[cocktail])
+        return (
+            cocktails[0] if cocktails else None,
+            MAPPEUR_COMMENTAIRE.depuis_dicts(resultats[commentaires]),
+            resultats[note][0]["note_moyenne"],
+        )
+
     @log
     def trouver_par_utilisateur_et_cocktail(
         self, id_utilisateur: int, id_cocktail: int | None = None
@@ -110,7 +169,7 @@ class CommentaireDao(metaclass=Singleton):
         """
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
 
                     # recherche par utilisateur + cocktail
                     if id_cocktail is not None:
@@ -124,17 +183,7 @@ class CommentaireDao(metaclass=Singleton):
                                 "id_cocktail": id_cocktail
                             }
                         )
-                        result = cursor.fetchone()
-                        if result:
-                            return Commentaire(
-                                id_commentaire=result["id_commentaire"],
-                                id_utilisateur=result["id_utilisateur"],
-                                id_cocktail=result["id_cocktail"],
-                                texte=result["texte"],
-                                note=result["note"],
-                                date_creation=result["date_creation"]
-                            )
-                        return None
+                        return MAPPEUR_COMMENTAIRE.un(cursor)
 
                     # recherche uniquement par utilisateur
                     cursor.execute(
@@ -145,21 +194,8 @@ class CommentaireDao(metaclass=Singleton):
                         """,
                         {"id_utilisateur": id_utilisateur}
                     )
-                    results = cursor.fetchall()
-                    if not results:
-                        return None
-
-                    return [
-                        Commentaire(
-                            id_commentaire=row["id_commentaire"],
-                            id_utilisateur=row["id_utilisateur"],
-                            id_cocktail=row["id_cocktail"],
-                            texte=row["texte"],
-                            note=row["note"],
-                            date_creation=row["date_creation"]
-                        )
-                        for row in results
-                    ]
+                    commentaires = MAPPEUR_COMMENTAIRE.tous(cursor)
+                    return commentaires if commentaires else None
 
         except Exception as e:
             print(f"Erreur recherche commentaire: {e}")
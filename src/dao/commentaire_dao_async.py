@@ -0,0 +1,117 @@
+import logging
+
+from business_object.commentaire import Commentaire
+from dao.async_db_connection import AsyncDBConnection
+from utils.log_decorator import log
+from utils.singleton import Singleton
+
+
+class CommentaireDaoAsync(metaclass=Singleton):
+    """Version asynchrone (asyncpg) de CommentaireDao."""
+
+    @staticmethod
+    def _commentaire(row, pseudo=False) -> Commentaire:
+        """Construction d'un Commentaire à partir d'une ligne asyncpg"""
+        commentaire = Commentaire(
+            id_commentaire=row["id_commentaire"],
+            id_utilisateur=row["id_utilisateur"],
+            id_cocktail=row["id_cocktail"],
+            texte=row["texte"],
+            note=row["note"],
+            date_creation=row["date_creation"],
+        )
+        if pseudo:
+            commentaire.pseudo_utilisateur = row["pseudo_utilisateur"]
+        return commentaire
+
+    @log
+    async def creer(self, commentaire: Commentaire) -> bool:
+        """Crée un nouveau commentaire (voir CommentaireDao.creer)."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                result = await connection.fetchrow(
+                    "INSERT INTO commentaire (id_utilisateur, id_cocktail, texte, note) "
+                    "VALUES (%(id_utilisateur)s, %(id_cocktail)s, %(texte)s, %(note)s) "
+                    "RETURNING id_commentaire, date_creation;",
+                    {
+                        "id_utilisateur": commentaire.id_utilisateur,
+                        "id_cocktail": commentaire.id_cocktail,
+                        "texte": commentaire.texte,
+                        "note": commentaire.note,
+                    },
+                )
+        except Exception as e:
+            logging.info("Erreur création commentaire: %s", e)
+            return False
+
+        if result:
+            commentaire.id_commentaire = result["id_commentaire"]
+            commentaire.date_creation = result["date_creation"]
+        return True
+
+    @log
+    async def trouver_par_cocktail(self, id_cocktail: int) -> list[Commentaire]:
+        """Récupère les commentaires pour un cocktail spécifique."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                results = await connection.fetch(
+                    "SELECT c.*, u.pseudo as pseudo_utilisateur "
+                    "FROM commentaire c "
+                    "JOIN utilisateur u ON c.id_utilisateur = u.id_utilisateur "
+                    "WHERE c.id_cocktail = %(id_cocktail)s "
+                    "ORDER BY c.date_creation DESC;",
+                    {"id_cocktail": id_cocktail},
+                )
+        except Exception as e:
+            logging.info("Erreur recherche commentaires: %s", e)
+            return []
+
+        return [self._commentaire(row, pseudo=True) for row in results]
+
+    @log
+    async def trouver_par_utilisateur_et_cocktail(
+        self, id_utilisateur: int, id_cocktail: int | None = None
+    ) -> Commentaire | list[Commentaire] | None:
+        """Récupère le(s) commentaire(s) d'un utilisateur, avec ou sans filtre par cocktail."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                if id_cocktail is not None:
+                    result = await connection.fetchrow(
+                        """
+                        SELECT * FROM commentaire
+                        WHERE id_utilisateur = %(id_utilisateur)s AND id_cocktail = %(id_cocktail)s;
+                        """,
+                        {"id_utilisateur": id_utilisateur, "id_cocktail": id_cocktail},
+                    )
+                    return self._commentaire(result) if result else None
+
+                results = await connection.fetch(
+                    """
+                    SELECT * FROM commentaire
+                    WHERE id_utilisateur = %(id_utilisateur)s
+                    ORDER BY date_creation DESC;
+                    """,
+                    {"id_utilisateur": id_utilisateur},
+                )
+        except Exception as e:
+            logging.info("Erreur recherche commentaire: %s", e)
+            return None
+
+        if not results:
+            return None
+        return [self._commentaire(row) for row in results]
+
+    @log
+    async def supprimer(self, id_commentaire: int, id_utilisateur: int) -> bool:
+        """Supprime un commentaire en fonction de son id et de l'utilisateur."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                supprimes = await connection.execute(
+                    "DELETE FROM commentaire "
+                    "WHERE id_commentaire = %(id_commentaire)s AND id_utilisateur = %(id_utilisateur)s;",
+                    {"id_commentaire": id_commentaire, "id_utilisateur": id_utilisateur},
+                )
+        except Exception as e:
+            logging.info("Erreur suppression commentaire: %s", e)
+            return False
+        return supprimes > 0
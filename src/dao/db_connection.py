@@ -1,31 +1,261 @@
+import itertools
+import logging
 import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
 import dotenv
 import psycopg2
+from psycopg2.extensions import parse_dsn
+from psycopg2.pool import PoolError
 
-from psycopg2.extras import RealDictCursor
+from dao.echeance import (
+    CurseurEcheance,
+    CurseurTupleEcheance,
+    delai_restant_ms,
+    signaler_epuisement,
+)
+from dao.pool_connexions import PoolConnexions, PoolConnexionsEpuise
+from dao.routage import lecture_en_cours
 from utils.singleton import Singleton
 
+# Curseurs du pool : dictionnaires par défaut, tuples pour les requêtes lues avec un Mappeur
+CurseurDict = CurseurEcheance
+CurseurTuple = CurseurTupleEcheance
+
+
+def parametres_connexion() -> dict:
+    """Paramètres psycopg2 lus dans les variables d'environnement (.env)"""
+    dotenv.load_dotenv()
+
+    return {
+        "host": os.environ["POSTGRES_HOST"],
+        "port": os.environ["POSTGRES_PORT"],
+        "database": os.environ["POSTGRES_DATABASE"],
+        "user": os.environ["POSTGRES_USER"],
+        "password": os.environ["POSTGRES_PASSWORD"],
+        "options": f"-c search_path={os.environ['POSTGRES_SCHEMA']}",
+        "cursor_factory": CurseurDict,
+    }
+
+
+def parametres_lecture(dsn: str) -> dict:
+    """Paramètres de la base de lecture : ceux de la base principale
+    surchargés par le DSN (ex : "host=replica dbname=projet")
+
+    Les transactions y sont en lecture seule, une écriture mal routée échoue.
+    """
+    parametres = parametres_connexion()
+    parametres.update(parse_dsn(dsn))
+    if "dbname" in parametres:
+        parametres["database"] = parametres.pop("dbname")
+    parametres["options"] = f"{parametres['options']} -c default_transaction_read_only=on"
+    return parametres
+
 
 class DBConnection(metaclass=Singleton):
     """
     Classe de connexion à la base de données
-    Elle permet de n'ouvrir qu'une seule et unique connexion
+    Elle gère un pool de connexions partagé par tous les DAO :
+    chaque `with DBConnection().connection as connection` emprunte
+    une connexion au pool et la rend à la sortie du bloc
+
+    Les méthodes de DAO marquées @lecture_seule empruntent leurs connexions
+    à une base de lecture (réplica) si POSTGRES_READ_DSN est renseigné.
+    Si la réplica est injoignable, la lecture bascule sur la base principale.
+    Après une modification d'inventaire, les lectures de cet utilisateur
+    restent sur la base principale pendant POSTGRES_READ_YOUR_WRITES secondes.
+
+    Pendant une requête HTTP, chaque requête SQL reçoit en statement_timeout
+    ce qu'il reste du budget de latence (voir dao.echeance).
+
+    Variables d'environnement optionnelles :
+    POSTGRES_POOL_MIN (1), POSTGRES_POOL_MAX (10), POSTGRES_POOL_TIMEOUT (5 secondes)
+    POSTGRES_READ_DSN (aucun), POSTGRES_READ_YOUR_WRITES (0 secondes, désactivé)
+    POSTGRES_TAILLE_LOT (1000 lignes par aller-retour pour DBConnection.flux)
     """
 
+    # Durée pendant laquelle une réplica en échec n'est plus sollicitée
+    PAUSE_REPLICA = 30.0
+
     def __init__(self):
-        """Ouverture de la connexion"""
+        """Création du pool de connexions"""
         dotenv.load_dotenv()
 
-        self.__connection = psycopg2.connect(
-            host=os.environ["POSTGRES_HOST"],
-            port=os.environ["POSTGRES_PORT"],
-            database=os.environ["POSTGRES_DATABASE"],
-            user=os.environ["POSTGRES_USER"],
-            password=os.environ["POSTGRES_PASSWORD"],
-            options=f"-c search_path={os.environ['POSTGRES_SCHEMA']}",
-            cursor_factory=RealDictCursor,
+        self.__pool = PoolConnexions(
+            min_connexions=int(os.environ.get("POSTGRES_POOL_MIN", 1)),
+            max_connexions=int(os.environ.get("POSTGRES_POOL_MAX", 10)),
+            delai_attente=float(os.environ.get("POSTGRES_POOL_TIMEOUT", 5)),
+            **parametres_connexion(),
         )
+        self.__pool_lecture = None
+        self.__verrou = threading.Lock()
+        self.__ecritures = {}
+        self.__replica_en_pause_jusqua = 0.0
+        self.__compteurs = {"lectures_replica": 0, "lectures_principale": 0, "bascules": 0}
+
+        self.taille_lot = int(os.environ.get("POSTGRES_TAILLE_LOT", 1000))
+        self.__numeros_curseurs = itertools.count(1)
+
+        self.delai_lecture_ecritures = float(os.environ.get("POSTGRES_READ_YOUR_WRITES", 0))
+        self.configurer_lecture(os.environ.get("POSTGRES_READ_DSN"))
+
+    def configurer_lecture(self, dsn: str | None):
+        """(Re)définir la base de lecture ; None pour tout lire sur la base principale
+
+        Le pool de lecture ne garde aucune connexion ouverte au départ :
+        une réplica indisponible n'empêche pas l'application de démarrer.
+        """
+        ancien, self.__pool_lecture = self.__pool_lecture, None
+        if ancien is not None:
+            ancien.fermer()
+        self.__replica_en_pause_jusqua = 0.0
+        if dsn:
+            self.__pool_lecture = PoolConnexions(
+                min_connexions=0,
+                max_connexions=int(os.environ.get("POSTGRES_POOL_MAX", 10)),
+                delai_attente=float(os.environ.get("POSTGRES_POOL_TIMEOUT", 5)),
+                **parametres_lecture(dsn),
+            )
+
+    def signaler_ecriture(self, id_utilisateur: int):
+        """Noter qu'un utilisateur vient de modifier ses données (inventaire)"""
+        if self.delai_lecture_ecritures > 0:
+            with self.__verrou:
+                self.__ecritures[id_utilisateur] = time.monotonic()
+
+    def _ecriture_recente(self, id_utilisateur: int) -> bool:
+        """Vrai si l'utilisateur a écrit il y a moins de delai_lecture_ecritures secondes"""
+        if not id_utilisateur or self.delai_lecture_ecritures <= 0:
+            return False
+        with self.__verrou:
+            date = self.__ecritures.get(id_utilisateur)
+            if date is None:
+                return False
+            if time.monotonic() - date < self.delai_lecture_ecritures:
+                return True
+            del self.__ecritures[id_utilisateur]
+            return False
 
     @property
     def connection(self):
-        return self.__connection
+        """Contexte donnant une connexion du pool (commit ou rollback à la sortie)"""
+        return self._emprunter()
+
+    def _lire_sur_replica(self, id_utilisateur) -> bool:
+        """Vrai pour une lecture @lecture_seule pouvant être servie par la réplica"""
+        if id_utilisateur is None:
+            return False
+        if (
+            self.__pool_lecture is None
+            or time.monotonic() < self.__replica_en_pause_jusqua
+            or self._ecriture_recente(id_utilisateur)
+        ):
+            self._compter("lectures_principale")
+            return False
+        return True
+
+    @contextmanager
+    def _emprunter(self):
+        """Connexion de la réplica pour les lectures (base principale si elle est
+        injoignable), de la base principale sinon
+
+        Dans une requête HTTP, l'attente d'une connexion libre ne dépasse pas
+        ce qu'il reste du budget de latence.
+        """
+        restant_ms = delai_restant_ms()
+        delai = None if restant_ms is None else restant_ms / 1000
+
+        with ExitStack() as pile:
+            connexion = None
+            if self._lire_sur_replica(lecture_en_cours()):
+                try:
+                    connexion = pile.enter_context(
+                        self.__pool_lecture.connexion(self._delai(self.__pool_lecture, delai))
+                    )
+                    self._compter("lectures_replica")
+                except (PoolError, psycopg2.OperationalError) as e:
+                    logging.warning(
+                        f"Réplica de lecture indisponible, bascule sur la base principale : {e}"
+                    )
+                    self.__replica_en_pause_jusqua = time.monotonic() + self.PAUSE_REPLICA
+                    self._compter("bascules")
+
+            if connexion is None:
+                try:
+                    connexion = pile.enter_context(
+                        self.__pool.connexion(self._delai(self.__pool, delai))
+                    )
+                except PoolConnexionsEpuise:
+                    if delai is not None:
+                        signaler_epuisement()
+                    raise
+            yield connexion
+
+    def flux(
+        self,
+        requete: str,
+        parametres: dict | None = None,
+        taille_lot: int | None = None,
+        mappeur=None,
+    ):
+        """Générateur des lignes d'une requête, lues par lots via un curseur serveur nommé
+
+        Seules taille_lot lignes sont en mémoire à la fois : de quoi parcourir
+        une table entière en mémoire constante. La connexion reste empruntée
+        jusqu'à la fin du parcours (ou la fermeture du générateur).
+
+        Parameters
+        ----------
+        requete : str
+            Requête SQL avec des paramètres nommés %(nom)s
+        parametres : dict, optional
+            Valeurs des paramètres
+        taille_lot : int, optional
+            Nombre de lignes par aller-retour (par défaut POSTGRES_TAILLE_LOT)
+        mappeur : Mappeur, optional
+            Si renseigné, les lignes sont lues en tuples et converties en objets
+
+        Yields
+        ------
+        dict | object
+            Une ligne de résultat, ou l'objet construit par le mappeur
+        """
+        with self.connection as connection:
+            nom = f"flux_{next(self.__numeros_curseurs)}"
+            curseur = CurseurTuple if mappeur else CurseurDict
+            with connection.cursor(name=nom, cursor_factory=curseur) as cursor:
+                cursor.itersize = taille_lot or self.taille_lot
+                cursor.execute(requete, parametres)
+                if mappeur is None:
+                    yield from cursor
+                    return
+                # La description d'un curseur nommé n'est connue qu'après le premier lot
+                construire = None
+                for ligne in cursor:
+                    if construire is None:
+                        construire = mappeur.compiler(cursor.description)
+                    yield construire(ligne)
+
+    @staticmethod
+    def _delai(pool: PoolConnexions, delai: float | None) -> float:
+        return pool.delai_attente if delai is None else min(pool.delai_attente, delai)
+
+    def _compter(self, compteur: str):
+        with self.__verrou:
+            self.__compteurs[compteur] += 1
+
+    def metriques_routage(self) -> dict:
+        """Nombre de lectures servies par la réplica, par la base principale, et de bascules"""
+        with self.__verrou:
+            return dict(self.__compteurs, replica_configuree=self.__pool_lecture is not None)
+
+    @property
+    def pool(self) -> PoolConnexions:
+        return self.__pool
+
+    @property
+    def pool_lecture(self) -> PoolConnexions | None:
+        return self.__pool_lecture
+
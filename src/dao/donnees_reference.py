@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+
+from dao.cocktail_dao import CocktailDao
+from utils.catalogue import abonner_rechargement
+from utils.singleton import Singleton
+
+# Durée de vie par défaut des listes gardées en mémoire, en secondes
+DUREE_VIE = 300
+
+
+class DonneesReference(metaclass=Singleton):
+    """
+    Listes de référence du catalogue (catégories, verres), gardées en mémoire
+
+    Chaque liste vient d'un SELECT DISTINCT sur toute la table cocktail
+    (CocktailDao.lister_categories, lister_verres). Elle est relue au plus
+    une fois par durée de vie (REFERENCE_DUREE_VIE secondes, 300 par défaut)
+    et oubliée aussitôt après un rechargement du catalogue (voir
+    utils.catalogue). Les valeurs en minuscules sont gardées dans un
+    ensemble : valider un filtre coûte une recherche dans cet ensemble.
+    """
+
+    def __init__(self, duree_vie: float | None = None):
+        """Constructeur"""
+        if duree_vie is None:
+            duree_vie = float(os.environ.get("REFERENCE_DUREE_VIE", DUREE_VIE))
+        self.duree_vie = duree_vie
+        self._verrou = threading.Lock()
+        # nom -> (échéance, valeurs, valeurs en minuscules)
+        self._listes = {}
+
+    def _liste(self, nom: str, lire) -> tuple[list[str], frozenset[str]]:
+        entree = self._listes.get(nom)
+        if entree is None or entree[0] <= time.monotonic():
+            with self._verrou:
+                entree = self._listes.get(nom)
+                if entree is None or entree[0] <= time.monotonic():
+                    listes = self._listes
+                    valeurs = lire() or []
+                    entree = (
+                        time.monotonic() + self.duree_vie,
+                        valeurs,
+                        frozenset(valeur.lower() for valeur in valeurs),
+                    )
+                    # Pas de liste relue avant un rechargement gardée après lui
+                    listes[nom] = entree
+        return entree[1], entree[2]
+
+    def invalider(self):
+        """Oublier les listes : elles seront relues au prochain appel"""
+        self._listes = {}
+
+    def categories(self) -> list[str]:
+        """Catégories de cocktails, triées alphabétiquement"""
+        return list(self._liste("categories", CocktailDao().lister_categories)[0])
+
+    def verres(self) -> list[str]:
+        """Types de verres, triés alphabétiquement"""
+        return list(self._liste("verres", CocktailDao().lister_verres)[0])
+
+    def categorie_existe(self, categorie: str) -> bool:
+        """Vrai si la catégorie existe (casse ignorée)"""
+        return categorie.lower() in self._liste("categories", CocktailDao().lister_categories)[1]
+
+    def verre_existe(self, verre: str) -> bool:
+        """Vrai si le type de verre existe (casse ignorée)"""
+        return verre.lower() in self._liste("verres", CocktailDao().lister_verres)[1]
+
+
+@abonner_rechargement
+def _invalider_listes():
+    DonneesReference().invalider()
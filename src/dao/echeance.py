@@ -0,0 +1,133 @@
+import contextvars
+import math
+import time
+from functools import wraps
+
+from psycopg2.errors import QueryCanceled
+
+from dao.mesure_requetes import CurseurDictMesure, CurseurTupleMesure
+
+
+class BudgetEpuise(Exception):
+    """Le budget de latence de la requête HTTP est écoulé avant l'envoi d'une requête SQL"""
+
+
+class Echeance:
+    """Budget de latence d'une requête HTTP
+
+    etat vaut None tant que tout va bien, "epuise" si une requête SQL n'a pas
+    pu partir faute de temps (réponse 503), "annulee" si Postgres a annulé une
+    requête SQL au bout de son statement_timeout (réponse 504).
+    """
+
+    def __init__(self, budget_ms: float):
+        """Constructeur"""
+        self.budget_ms = budget_ms
+        self.fin = time.monotonic() + budget_ms / 1000
+        self.etat = None
+
+    def restant_ms(self) -> float:
+        return (self.fin - time.monotonic()) * 1000
+
+
+_echeance = contextvars.ContextVar("echeance", default=None)
+# Plafond de la méthode de DAO en cours (@delai_maximal), en millisecondes
+_plafond_ms = contextvars.ContextVar("plafond_ms", default=None)
+
+
+def demarrer_echeance(budget_ms: float) -> tuple:
+    """Fixer le budget de la requête HTTP ; renvoie (echeance, jeton pour terminer_echeance)"""
+    echeance = Echeance(budget_ms)
+    return echeance, _echeance.set(echeance)
+
+
+def terminer_echeance(jeton):
+    _echeance.reset(jeton)
+
+
+def delai_maximal(plafond_ms: int):
+    """Décorateur fixant la durée maximale des requêtes SQL d'une méthode de DAO
+
+    Le statement_timeout appliqué est le plus petit entre ce plafond et ce
+    qu'il reste du budget de la requête HTTP.
+    """
+
+    def decorateur(fonction):
+        @wraps(fonction)
+        def wrapper(*args, **kwargs):
+            jeton = _plafond_ms.set(plafond_ms)
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                _plafond_ms.reset(jeton)
+
+        return wrapper
+
+    return decorateur
+
+
+def delai_restant_ms() -> int | None:
+    """statement_timeout à appliquer à la prochaine requête SQL (None : aucun)
+
+    Raises
+    ------
+    BudgetEpuise
+        Si le budget de la requête HTTP est déjà écoulé
+    """
+    echeance = _echeance.get()
+    plafond = _plafond_ms.get()
+    if echeance is None:
+        return plafond
+
+    restant = echeance.restant_ms()
+    if restant <= 0:
+        echeance.etat = echeance.etat or "epuise"
+        raise BudgetEpuise(f"Budget de {echeance.budget_ms:.0f} ms écoulé")
+    # statement_timeout = 0 désactiverait la limite : au moins 1 ms
+    restant = max(1, math.ceil(restant))
+    return restant if plafond is None else min(restant, plafond)
+
+
+def signaler_epuisement():
+    """Aucune connexion libre avant la fin du budget de la requête HTTP"""
+    echeance = _echeance.get()
+    if echeance is not None:
+        echeance.etat = echeance.etat or "epuise"
+
+
+def signaler_annulation():
+    """Une requête SQL a été annulée faute de temps"""
+    echeance = _echeance.get()
+    if echeance is not None:
+        echeance.etat = "annulee"
+
+
+class _EcheanceCurseur:
+    """Applique le délai restant à chaque requête d'un curseur psycopg2
+
+    SET LOCAL statement_timeout part dans le même aller-retour que la requête
+    et ne vaut que pour la transaction en cours.
+    """
+
+    def execute(self, query, vars=None):
+        delai = delai_restant_ms()
+        # Curseur nommé (DBConnection.flux) : psycopg2 enveloppe la requête dans
+        # un DECLARE, on ne peut pas la préfixer ; un export n'a pas de budget
+        if delai is None or self.name is not None:
+            return super().execute(query, vars)
+        try:
+            if isinstance(query, str):
+                return super().execute(f"SET LOCAL statement_timeout = {delai}; {query}", vars)
+            super().execute(f"SET LOCAL statement_timeout = {delai};")
+            return super().execute(query, vars)
+        except QueryCanceled:
+            signaler_annulation()
+            raise
+
+
+class CurseurEcheance(_EcheanceCurseur, CurseurDictMesure):
+    """Curseur par défaut du pool : lignes en dictionnaires, mesurées et bornées dans le temps"""
+
+
+class CurseurTupleEcheance(_EcheanceCurseur, CurseurTupleMesure):
+    """Curseur du pool renvoyant des tuples (avec un Mappeur), mesuré et borné dans le temps"""
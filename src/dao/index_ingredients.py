@@ -0,0 +1,213 @@
+import logging
+import random
+import threading
+
+from business_object.ingredient import Ingredient
+from dao.db_connection import CurseurTuple, DBConnection
+from utils.catalogue import abonner_rechargement
+from utils.singleton import Singleton
+
+
+def distance_edition(a: str, b: str, transpositions: bool = False) -> int:
+    """Distance de Levenshtein : nombre minimal d'insertions, suppressions et
+    substitutions de caractères pour passer de a à b
+
+    Avec transpositions, l'échange de deux caractères voisins compte pour une
+    seule opération (distance OSA) : "vodak" est à 1 de "vodka" au lieu de 2.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    avant_precedente, precedente = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        ligne = [i]
+        for j, cb in enumerate(b, 1):
+            cout = min(precedente[j] + 1, ligne[j - 1] + 1, precedente[j - 1] + (ca != cb))
+            if transpositions and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cout = min(cout, avant_precedente[j - 2] + 1)
+            ligne.append(cout)
+        avant_precedente, precedente = precedente, ligne
+    return precedente[-1]
+
+
+# Au-delà, un nom saisi n'est plus rapproché d'un ingrédient
+FAUTES_MAX = 2
+
+
+def tolerance(nom: str) -> int:
+    """Nombre de fautes de frappe admises pour un nom de cette longueur"""
+    if len(nom) < 3:
+        return 0
+    return 1 if len(nom) <= 6 else FAUTES_MAX
+
+
+def suppressions(mot: str, nombre: int) -> set[str]:
+    """Chaînes obtenues en supprimant au plus nombre caractères du mot"""
+    resultat = courant = {mot}
+    for _ in range(nombre):
+        courant = {m[:i] + m[i + 1 :] for m in courant for i in range(len(m))}
+        resultat = resultat | courant
+    return resultat
+
+
+class SuppressionsNoms:
+    """
+    Index des noms par suppression de caractères (méthode de SymSpell)
+
+    Deux noms à au plus k fautes de frappe (insertion, suppression,
+    substitution ou transposition de caractères) deviennent identiques en
+    supprimant au plus k caractères de chacun : "vodak" et "vodka" donnent
+    tous deux "vodk". Chaque nom est rangé sous toutes ses variantes à au
+    plus FAUTES_MAX caractères supprimés ; une recherche lit les variantes de
+    la saisie dans ce dictionnaire, puis calcule la distance des seuls noms
+    trouvés, au lieu de la calculer pour tous les noms.
+
+    Parameters
+    ----------
+    noms : list[str]
+        Noms indexés (en minuscules), désignés par leur rang dans cette liste
+    """
+
+    def __init__(self, noms: list[str]):
+        """Constructeur"""
+        self.noms = noms
+        self.par_variante = {}
+        for rang, nom in enumerate(noms):
+            for variante in suppressions(nom, FAUTES_MAX):
+                self.par_variante.setdefault(variante, []).append(rang)
+
+    def __len__(self) -> int:
+        return len(self.noms)
+
+    def proches(self, recherche: str, fautes: int) -> list[tuple[int, int]]:
+        """(distance avec transpositions, rang) des noms à au plus fautes de la recherche"""
+        candidats = set()
+        for variante in suppressions(recherche, min(fautes, FAUTES_MAX)):
+            candidats.update(self.par_variante.get(variante, ()))
+        resultat = []
+        for rang in candidats:
+            nom = self.noms[rang]
+            if abs(len(nom) - len(recherche)) <= fautes:
+                distance = distance_edition(recherche, nom, transpositions=True)
+                if distance <= fautes:
+                    resultat.append((distance, rang))
+        return resultat
+
+
+class IndexIngredients(metaclass=Singleton):
+    """
+    Recherche des ingrédients par nom, tolérante aux fautes de frappe, en mémoire
+
+    Un nom exact (à la casse près) se lit dans un dictionnaire. Sinon les
+    ingrédients à quelques fautes de frappe (voir tolerance) sont cherchés
+    dans l'index des suppressions (voir SuppressionsNoms), puis classés par
+    nombre de fautes : "vodak" trouve Vodka, "lime juce" Lime Juice, sans
+    requête en base. Les ingrédients gardés en mémoire servent aussi aux
+    tirages au hasard (voir aleatoires).
+
+    L'index est lu au démarrage de l'API (charger), relu au prochain appel
+    après un rechargement du catalogue (voir utils.catalogue) ; un ingrédient
+    créé par InventaireDao y est ajouté aussitôt.
+    """
+
+    def __init__(self):
+        """Constructeur"""
+        self._verrou = threading.Lock()
+        self._donnees = None
+
+    def charger(self):
+        """Lire les ingrédients dans la base"""
+        with DBConnection().connection as connection:
+            with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                cursor.execute(
+                    "SELECT id_ingredient, nom_ingredient, desc_ingredient FROM ingredient ORDER BY id_ingredient;"
+                )
+                lignes = cursor.fetchall()
+        self.charger_ingredients(lignes)
+
+    def charger_ingredients(self, lignes: list[tuple]):
+        """Remplacer l'index
+
+        Parameters
+        ----------
+        lignes : list[tuple]
+            (id_ingredient, nom_ingredient, desc_ingredient)
+        """
+        ingredients = [tuple(ligne) for ligne in lignes if ligne[1]]
+        minuscules = [nom.strip().lower() for _, nom, _ in ingredients]
+        par_nom = {}
+        for rang, nom in enumerate(minuscules):
+            par_nom.setdefault(nom, rang)
+        self._donnees = (ingredients, par_nom, SuppressionsNoms(minuscules))
+
+    def invalider(self):
+        """Oublier l'index : il sera relu au prochain appel"""
+        self._donnees = None
+
+    def _index(self) -> tuple:
+        donnees = self._donnees
+        if donnees is None:
+            with self._verrou:
+                if self._donnees is None:
+                    self.charger()
+                donnees = self._donnees
+        return donnees
+
+    def ajouter(self, id_ingredient: int, nom_ingredient: str, desc_ingredient: str | None = None):
+        """Ingrédient créé dans la base : l'ajouter à l'index (s'il est chargé)"""
+        with self._verrou:
+            donnees = self._donnees
+            if donnees is not None:
+                ingredients, _, _ = donnees
+                # Nouvel index remplacé d'un bloc : les lectures en cours gardent l'ancien
+                self.charger_ingredients(ingredients + [(id_ingredient, nom_ingredient, desc_ingredient)])
+
+    def aleatoires(self, nombre: int) -> list[Ingredient]:
+        """nombre ingrédients distincts tirés au hasard (sans ORDER BY RANDOM() en base)
+
+        random.sample tire des positions dans un range : le coût dépend du
+        nombre tiré, pas du nombre d'ingrédients.
+        """
+        ingredients, _, _ = self._index()
+        positions = random.sample(range(len(ingredients)), min(nombre, len(ingredients)))
+        return [Ingredient(*ingredients[position]) for position in positions]
+
+    def proches(self, nom: str, limit: int = 5) -> list[tuple[int, Ingredient]]:
+        """Ingrédients dont le nom est à quelques fautes de frappe de nom, du plus proche au plus lointain
+
+        Parameters
+        ----------
+        nom : str
+            Nom saisi (casse et espaces de bord ignorés)
+        limit : int
+            Nombre maximal d'ingrédients renvoyés
+
+        Returns
+        -------
+        list[tuple[int, Ingredient]]
+            (nombre de fautes, ingrédient) ; 0 faute : le nom exact, seul
+        """
+        ingredients, par_nom, variantes = self._index()
+        recherche = nom.strip().lower()
+        rang = par_nom.get(recherche)
+        if rang is not None:
+            return [(0, Ingredient(*ingredients[rang]))]
+        fautes = tolerance(recherche)
+        if fautes == 0:
+            return []
+        candidats = sorted(
+            (distance, variantes.noms[rang], rang) for distance, rang in variantes.proches(recherche, fautes)
+        )
+        return [(distance, Ingredient(*ingredients[rang])) for distance, _, rang in candidats[:limit]]
+
+
+def prechauffer():
+    """Construire l'index au démarrage de l'API (sinon au premier appel)"""
+    try:
+        IndexIngredients()._index()
+    except Exception:
+        logging.exception("Index des ingrédients non construit au démarrage")
+
+
+@abonner_rechargement
+def _invalider_index():
+    IndexIngredients().invalider()
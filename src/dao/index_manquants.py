@@ -0,0 +1,356 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from dao.moteur_realisabilite import MoteurRealisabilite
+from dao.pagination import rang, tranche
+from utils.catalogue import abonner_rechargement
+from utils.singleton import Singleton
+
+# Au-delà, un cocktail n'apparaît dans aucune liste (cocktail_partiel plafonne à 5)
+MAX_MANQUANTS = 5
+
+
+class _EntreeUtilisateur:
+    """Nombre d'ingrédients manquants par cocktail pour un utilisateur,
+    et positions des cocktails rangées par nombre de manquants (0 à MAX_MANQUANTS)"""
+
+    def __init__(self, relation, ids_ingredients):
+        """Constructeur"""
+        self.generation = relation.generation
+        self.inventaire = set(ids_ingredients)
+        self.manquants = relation.manquants(list(self.inventaire)).astype(np.int16)
+        self.paquets = [self._paquet(relation, k) for k in range(MAX_MANQUANTS + 1)]
+
+    def _paquet(self, relation, k: int) -> np.ndarray:
+        """Positions (croissantes) des cocktails auxquels il manque k ingrédients"""
+        # Les cocktails sans ingrédient ne sont pas réalisables (comme en SQL)
+        return np.flatnonzero((self.manquants == k) & (relation.totaux > 0)).astype(np.int32)
+
+    def appliquer(self, relation, id_ingredient: int, delta: int):
+        """Un ingrédient ajouté (delta = -1) ou retiré (delta = +1) de l'inventaire :
+        seuls les cocktails qui l'utilisent changent de paquet"""
+        positions = relation.positions_avec(id_ingredient)
+        avant = self.manquants[positions]
+        apres = avant + delta
+        self.manquants[positions] = apres
+        touches = np.union1d(avant, apres)
+        for k in touches[touches <= MAX_MANQUANTS].tolist():
+            sortants = positions[avant == k]
+            entrants = positions[apres == k]
+            paquet = self.paquets[k]
+            if len(sortants) + len(entrants) > len(paquet) // 8:
+                # Ingrédient courant : relire le paquet coûte moins que le fusionner
+                self.paquets[k] = self._paquet(relation, k)
+                continue
+            if len(sortants):
+                paquet = paquet[~np.isin(paquet, sortants, assume_unique=True)]
+            if len(entrants):
+                paquet = np.union1d(paquet, entrants).astype(np.int32)
+            self.paquets[k] = paquet
+
+
+class IndexManquants(metaclass=Singleton):
+    """
+    Index par utilisateur des cocktails complets et partiels
+
+    Pour chaque utilisateur récent, le nombre d'ingrédients manquants de
+    chaque cocktail est gardé en mémoire, avec les cocktails rangés par ce
+    nombre (un tableau trié par nom pour 0, 1, ..., MAX_MANQUANTS manquants).
+    cocktail_complet et cocktail_partiel deviennent des lectures de ces
+    tableaux.
+
+    Un ajout ou une suppression d'ingrédient ne touche que les cocktails qui
+    l'utilisent (InventaireDao appelle ajouter / retirer). Chaque lecture
+    reçoit l'inventaire lu en base : s'il diffère de celui de l'index (autre
+    processus, modification directe en base), la différence est appliquée de
+    la même façon. Après un rechargement du catalogue, les entrées sont
+    reconstruites à leur prochaine lecture.
+
+    Au plus INDEX_MANQUANTS_TAILLE utilisateurs (500 par défaut) sont gardés,
+    les moins récemment lus sortent en premier.
+
+    Reconstruction et vérification de l'index du processus de l'API :
+    POST /admin/index_manquants/reconstruire et /admin/index_manquants/verifier
+    (voir reconstruire et verifier_tout).
+    """
+
+    def __init__(self, taille: int | None = None):
+        """Constructeur"""
+        self.taille = taille or int(os.environ.get("INDEX_MANQUANTS_TAILLE", 500))
+        self._verrou = threading.Lock()
+        self._entrees = OrderedDict()
+
+    # ------------------------- Lectures -----------------------------
+
+    def complets(
+        self, id_utilisateur: int, ids_ingredients: list[int], limit: int = 10, offset: int = 0
+    ) -> list[int]:
+        """Identifiants des cocktails réalisables avec l'inventaire, par nom"""
+        page, _, _ = self.page(id_utilisateur, ids_ingredients, range(0, 1), limit, offset)
+        return [id_cocktail for id_cocktail, _ in page]
+
+    def partiels(
+        self,
+        id_utilisateur: int,
+        ids_ingredients: list[int],
+        nb_manquants: int,
+        limit: int = 10,
+        offset: int = 0,
+    ) -> list[int]:
+        """Identifiants des cocktails auxquels il manque de 1 à nb_manquants ingrédients,
+        par nombre d'ingrédients manquants puis par nom"""
+        nb_manquants = min(nb_manquants, MAX_MANQUANTS)
+        page, _, _ = self.page(id_utilisateur, ids_ingredients, range(1, nb_manquants + 1), limit, offset)
+        return [id_cocktail for id_cocktail, _ in page]
+
+    def page(
+        self,
+        id_utilisateur: int,
+        ids_ingredients: list[int],
+        nombres: range,
+        limit: int = 10,
+        offset: int = 0,
+        cle: tuple[int, int] | None = None,
+        avant: bool = False,
+        sans_alcool: bool = False,
+    ) -> tuple[list[tuple[int, int]], int, bool] | None:
+        """Cocktails auxquels il manque un nombre d'ingrédients de `nombres`,
+        par nombre d'ingrédients manquants puis par nom
+
+        Parameters
+        ----------
+        nombres : range
+            Nombres d'ingrédients manquants retenus (0 à MAX_MANQUANTS)
+        cle : tuple[int, int], optional
+            (nombre de manquants, id_cocktail) d'un cocktail de bord de la page
+            voisine : la page commence juste après lui (pagination par clé)
+        avant : bool
+            La page se termine juste avant le cocktail de `cle` (page précédente)
+        sans_alcool : bool
+            Ne garder que les cocktails "Non alcoholic" (utilisateur mineur)
+
+        Returns
+        -------
+        tuple[list[tuple[int, int]], int, bool] | None
+            (id_cocktail, nombre d'ingrédients manquants) de la page, nombre
+            total de cocktails de la liste, et s'il en reste au-delà de la page
+            dans le sens de lecture ; None si le cocktail de `cle` n'est plus
+            dans le catalogue
+        """
+        relation = MoteurRealisabilite().relation()
+        if cle is not None and relation.position(cle[1]) is None:
+            return None
+        nombres = [k for k in nombres if k <= MAX_MANQUANTS]
+        with self._verrou:
+            paquets = self._entree(relation, id_utilisateur, ids_ingredients).paquets
+            # Liste entière : positions des paquets mis bout à bout
+            tailles = np.array([len(paquets[k]) for k in nombres], dtype=np.int64)
+            sequence = np.concatenate([paquets[k] for k in nombres] + [np.empty(0, dtype=np.int32)])
+        manquants = np.repeat(np.asarray(nombres, dtype=np.int64), tailles)
+        if sans_alcool:
+            gardes = relation.sans_alcool[sequence]
+            sequence, manquants = sequence[gardes], manquants[gardes]
+        if cle is None:
+            rang = 0
+        else:
+            # Rang du cocktail de la clé dans la liste (ou de sa place s'il n'y est plus) :
+            # la liste est triée sur (manquants, position), codé en un seul entier
+            n = len(relation.totaux)
+            k = min(max(cle[0], -1), MAX_MANQUANTS + 1)
+            rang = int(
+                np.searchsorted(
+                    manquants * n + sequence,
+                    k * n + relation.position(cle[1]),
+                    side="left" if avant else "right",
+                )
+            )
+        total = len(sequence)
+        debut, fin, encore = tranche(total, rang, limit, offset, avant)
+        page = list(zip(relation.ids(sequence[debut:fin]), manquants[debut:fin].tolist()))
+        return page, total, encore
+
+    def debloquants(
+        self,
+        id_utilisateur: int,
+        ids_ingredients: list[int],
+        sans_alcool: bool = False,
+        limit: int = 10,
+        offset: int = 0,
+        cle: tuple[int, int] | None = None,
+        avant: bool = False,
+    ) -> tuple[list[tuple[int, int]], int, bool]:
+        """Ingrédients non possédés classés par nombre de cocktails qu'ils rendraient réalisables
+
+        Un ingrédient ne débloque que des cocktails auxquels il manque
+        exactement un ingrédient (paquet 1) : pour chacun, cet ingrédient est
+        retrouvé par les bits, puis compté. Ingrédients qui ne débloquent
+        rien exclus.
+
+        Parameters
+        ----------
+        sans_alcool : bool
+            Ne compter que les cocktails "Non alcoholic"
+        cle : tuple[int, int], optional
+            (nombre de cocktails débloqués, id_ingredient) d'un ingrédient de
+            bord de la page voisine : la page commence juste après lui
+        avant : bool
+            La page se termine juste avant l'ingrédient de `cle` (page précédente)
+
+        Returns
+        -------
+        tuple[list[tuple[int, int]], int, bool]
+            (id_ingredient, nombre de cocktails débloqués) de la page, par
+            nombre décroissant puis par identifiant ; nombre total
+            d'ingrédients classés, et s'il en reste au-delà de la page dans le
+            sens de lecture
+        """
+        relation = MoteurRealisabilite().relation()
+        with self._verrou:
+            entree = self._entree(relation, id_utilisateur, ids_ingredients)
+            positions = entree.paquets[1]
+            inventaire = list(entree.inventaire)
+        if sans_alcool:
+            positions = positions[relation.sans_alcool[positions]]
+        ids, nombres = np.unique(relation.seul_manquant(positions, inventaire), return_counts=True)
+        ordre = np.lexsort((ids, -nombres))
+        classement = list(zip(ids[ordre].tolist(), nombres[ordre].tolist()))
+        # Liste triée sur (-nombre, id) : la clé du curseur est comparée sous cette forme
+        debut = rang(
+            [(-nb, id_ingredient) for id_ingredient, nb in classement],
+            None if cle is None else (-cle[0], cle[1]),
+            avant,
+        )
+        debut, fin, encore = tranche(len(classement), debut, limit, offset, avant)
+        return classement[debut:fin], len(classement), encore
+
+    def _entree(self, relation, id_utilisateur: int, ids_ingredients) -> _EntreeUtilisateur:
+        """Entrée à jour de l'utilisateur pour cet inventaire (appelé sous le verrou)"""
+        entree = self._entrees.get(id_utilisateur)
+        inventaire = set(ids_ingredients)
+        if entree is None or entree.generation != relation.generation:
+            entree = _EntreeUtilisateur(relation, inventaire)
+            self._entrees[id_utilisateur] = entree
+            while len(self._entrees) > self.taille:
+                self._entrees.popitem(last=False)
+        elif entree.inventaire != inventaire:
+            for id_ingredient in inventaire - entree.inventaire:
+                entree.appliquer(relation, id_ingredient, -1)
+            for id_ingredient in entree.inventaire - inventaire:
+                entree.appliquer(relation, id_ingredient, +1)
+            entree.inventaire = inventaire
+        self._entrees.move_to_end(id_utilisateur)
+        return entree
+
+    # ------------------------- Mises à jour -----------------------------
+
+    def ajouter(self, id_utilisateur: int, id_ingredient: int):
+        """L'ingrédient vient d'être ajouté à l'inventaire de l'utilisateur"""
+        self._modifier(id_utilisateur, id_ingredient, -1)
+
+    def retirer(self, id_utilisateur: int, id_ingredient: int):
+        """L'ingrédient vient d'être retiré de l'inventaire de l'utilisateur"""
+        self._modifier(id_utilisateur, id_ingredient, +1)
+
+    def _modifier(self, id_utilisateur: int, id_ingredient: int, delta: int):
+        if id_utilisateur not in self._entrees:
+            return
+        relation = MoteurRealisabilite().relation()
+        with self._verrou:
+            entree = self._entrees.get(id_utilisateur)
+            if entree is None:
+                return
+            if entree.generation != relation.generation:
+                # Catalogue rechargé : l'entrée sera reconstruite à la prochaine lecture
+                del self._entrees[id_utilisateur]
+                return
+            deja_present = id_ingredient in entree.inventaire
+            if (delta < 0) == deja_present:
+                return
+            entree.appliquer(relation, id_ingredient, delta)
+            if delta < 0:
+                entree.inventaire.add(id_ingredient)
+            else:
+                entree.inventaire.discard(id_ingredient)
+
+    def oublier(self, id_utilisateur: int):
+        """Retirer l'utilisateur de l'index (inventaire vidé, compte supprimé)"""
+        with self._verrou:
+            self._entrees.pop(id_utilisateur, None)
+
+    # ------------------------- Maintenance -----------------------------
+
+    def utilisateurs(self) -> list[int]:
+        """Identifiants des utilisateurs gardés dans l'index, du moins au plus récemment lu"""
+        with self._verrou:
+            return list(self._entrees)
+
+    def reconstruire(self) -> int:
+        """Reconstruire toutes les entrées depuis la relation courante et leur inventaire
+
+        Returns
+        -------
+        int
+            Nombre d'entrées reconstruites
+        """
+        relation = MoteurRealisabilite().relation()
+        with self._verrou:
+            for id_utilisateur, entree in list(self._entrees.items()):
+                self._entrees[id_utilisateur] = _EntreeUtilisateur(relation, entree.inventaire)
+            return len(self._entrees)
+
+    def verifier(self, id_utilisateur: int, ids_ingredients: list[int]) -> bool:
+        """Comparer l'entrée de l'utilisateur à un calcul complet ; la reconstruire si elle diverge
+
+        Returns
+        -------
+        bool
+            True si l'entrée était cohérente
+        """
+        relation = MoteurRealisabilite().relation()
+        reference = _EntreeUtilisateur(relation, ids_ingredients)
+        with self._verrou:
+            entree = self._entree(relation, id_utilisateur, ids_ingredients)
+            coherente = np.array_equal(entree.manquants, reference.manquants) and all(
+                np.array_equal(a, b) for a, b in zip(entree.paquets, reference.paquets)
+            )
+            if not coherente:
+                logging.warning(
+                    "Index des manquants incohérent pour l'utilisateur %s : reconstruit", id_utilisateur
+                )
+                self._entrees[id_utilisateur] = reference
+        return coherente
+
+    def verifier_tout(self, lire_inventaire) -> list[int]:
+        """Vérifier chaque entrée gardée contre l'inventaire lu en base (voir verifier)
+
+        Les listes ordonnées (nombre de manquants par cocktail et paquets triés
+        par nom) sont comparées telles que les pages les lisent : un ordre faux
+        est une incohérence.
+
+        Parameters
+        ----------
+        lire_inventaire : callable
+            id_utilisateur -> identifiants des ingrédients de son inventaire
+
+        Returns
+        -------
+        list[int]
+            Utilisateurs dont l'entrée était incohérente (et a été reconstruite)
+        """
+        return [
+            id_utilisateur
+            for id_utilisateur in self.utilisateurs()
+            if not self.verifier(id_utilisateur, lire_inventaire(id_utilisateur))
+        ]
+
+
+@abonner_rechargement
+def _vider_index():
+    # Les positions des cocktails changent avec le catalogue
+    with IndexManquants()._verrou:
+        IndexManquants()._entrees.clear()
+
@@ -0,0 +1,175 @@
+import logging
+import re
+import threading
+from bisect import bisect_left
+
+from dao.db_connection import CurseurTuple, DBConnection
+from utils.catalogue import abonner_rechargement
+from utils.singleton import Singleton
+
+_MOTS = re.compile(r"[^\W_]+")
+# Nombre maximal de propositions par complétion
+MAX_PROPOSITIONS = 20
+
+
+class PrefixesNoms:
+    """
+    Noms triés pour l'autocomplétion par préfixe
+
+    Les noms sont rangés par ordre alphabétique de leur version en
+    minuscules : ceux qui commencent par un préfixe sont consécutifs, à
+    partir du rang donné par bisect_left. Une complétion coûte une recherche
+    dichotomique puis la lecture d'au plus `limit` noms, quelle que soit la
+    taille du catalogue.
+
+    Un second tableau trié contient la fin de chaque nom à partir de son
+    deuxième mot, ou des suivants : "marg" complète aussi "Blue Margarita",
+    après les noms qui commencent par "marg".
+
+    Parameters
+    ----------
+    ids : list[int]
+        Identifiants
+    noms : list[str]
+        Noms, dans le même ordre
+    """
+
+    def __init__(self, ids: list[int], noms: list[str]):
+        """Constructeur"""
+        entrees = sorted((nom.lower(), nom, id_) for id_, nom in zip(ids, noms) if nom)
+        self.cles = [cle for cle, _, _ in entrees]
+        self.noms = [nom for _, nom, _ in entrees]
+        self.ids = [id_ for _, _, id_ in entrees]
+        mots = sorted(
+            (cle[mot.start() :], rang)
+            for rang, cle in enumerate(self.cles)
+            for mot in list(_MOTS.finditer(cle))[1:]
+        )
+        self.cles_mots = [cle for cle, _ in mots]
+        self.rangs_mots = [rang for _, rang in mots]
+
+    def __len__(self) -> int:
+        return len(self.cles)
+
+    def avec(self, id_: int, nom: str) -> "PrefixesNoms":
+        """Même index avec un nom de plus (l'index courant n'est pas modifié)"""
+        return PrefixesNoms(self.ids + [id_], self.noms + [nom])
+
+    def completer(self, prefixe: str, limit: int = 10) -> list[tuple[int, str]]:
+        """Noms qui commencent par le préfixe (insensible à la casse), par ordre
+        alphabétique, puis ceux dont un mot suivant commence par le préfixe
+
+        Returns
+        -------
+        list[tuple[int, str]]
+            (identifiant, nom), au plus limit
+        """
+        prefixe = prefixe.lower()
+        if not prefixe or limit <= 0:
+            return []
+        rangs = []
+        debut = bisect_left(self.cles, prefixe)
+        for rang in range(debut, min(debut + limit, len(self.cles))):
+            if not self.cles[rang].startswith(prefixe):
+                break
+            rangs.append(rang)
+        if len(rangs) < limit:
+            vus = set(rangs)
+            i = bisect_left(self.cles_mots, prefixe)
+            # Au plus un passage par mot des noms retenus : parcours borné
+            while len(rangs) < limit and i < len(self.cles_mots) and self.cles_mots[i].startswith(prefixe):
+                rang = self.rangs_mots[i]
+                if rang not in vus:
+                    vus.add(rang)
+                    rangs.append(rang)
+                i += 1
+        return [(self.ids[rang], self.noms[rang]) for rang in rangs]
+
+
+class IndexPrefixes(metaclass=Singleton):
+    """
+    Autocomplétion des noms de cocktails et d'ingrédients, en mémoire
+
+    Chaque frappe d'un client qui complète un nom se lit dans des tableaux
+    triés (voir PrefixesNoms) sans aller-retour avec la base. Trois index :
+    tous les cocktails, les cocktails non alcoolisés (mineurs) et les
+    ingrédients.
+
+    Les index sont lus au démarrage de l'API (charger), relus au prochain
+    appel après un rechargement du catalogue (voir utils.catalogue) ; un
+    ingrédient créé par InventaireDao y est ajouté aussitôt.
+    """
+
+    def __init__(self):
+        """Constructeur"""
+        self._verrou = threading.Lock()
+        self._donnees = None
+
+    def charger(self):
+        """Lire les noms des cocktails et des ingrédients dans la base"""
+        with DBConnection().connection as connection:
+            with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                cursor.execute("SELECT id_cocktail, nom_cocktail, alcool = 'Non alcoholic' FROM cocktail;")
+                cocktails = cursor.fetchall()
+                cursor.execute("SELECT id_ingredient, nom_ingredient FROM ingredient;")
+                ingredients = cursor.fetchall()
+        self.charger_noms(cocktails, ingredients)
+
+    def charger_noms(self, cocktails: list[tuple], ingredients: list[tuple]):
+        """Remplacer les index
+
+        Parameters
+        ----------
+        cocktails : list[tuple]
+            (id_cocktail, nom_cocktail, sans alcool)
+        ingredients : list[tuple]
+            (id_ingredient, nom_ingredient)
+        """
+        sans_alcool = [row for row in cocktails if row[2]]
+        self._donnees = {
+            "cocktails": PrefixesNoms([row[0] for row in cocktails], [row[1] for row in cocktails]),
+            "sans_alcool": PrefixesNoms([row[0] for row in sans_alcool], [row[1] for row in sans_alcool]),
+            "ingredients": PrefixesNoms([row[0] for row in ingredients], [row[1] for row in ingredients]),
+        }
+
+    def invalider(self):
+        """Oublier les index : ils seront relus au prochain appel"""
+        self._donnees = None
+
+    def _index(self) -> dict:
+        donnees = self._donnees
+        if donnees is None:
+            with self._verrou:
+                if self._donnees is None:
+                    self.charger()
+                donnees = self._donnees
+        return donnees
+
+    def cocktails(self, prefixe: str, limit: int = 10, sans_alcool: bool = False) -> list[tuple[int, str]]:
+        """(id_cocktail, nom_cocktail) des cocktails dont le nom complète le préfixe"""
+        return self._index()["sans_alcool" if sans_alcool else "cocktails"].completer(prefixe, limit)
+
+    def ingredients(self, prefixe: str, limit: int = 10) -> list[tuple[int, str]]:
+        """(id_ingredient, nom_ingredient) des ingrédients dont le nom complète le préfixe"""
+        return self._index()["ingredients"].completer(prefixe, limit)
+
+    def ajouter_ingredient(self, id_ingredient: int, nom_ingredient: str):
+        """Ingrédient créé dans la base : l'ajouter à l'index (s'il est chargé)"""
+        with self._verrou:
+            donnees = self._donnees
+            if donnees is not None:
+                # Nouvel index remplacé d'un bloc : les lectures en cours gardent l'ancien
+                self._donnees = {**donnees, "ingredients": donnees["ingredients"].avec(id_ingredient, nom_ingredient)}
+
+
+def prechauffer():
+    """Construire les index au démarrage de l'API (sinon au premier appel)"""
+    try:
+        IndexPrefixes()._index()
+    except Exception:
+        logging.exception("Index d'autocomplétion non construit au démarrage")
+
+
+@abonner_rechargement
+def _invalider_index():
+    IndexPrefixes().invalider()
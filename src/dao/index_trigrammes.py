@@ -0,0 +1,205 @@
+import os
+import re
+import threading
+
+import numpy as np
+
+from dao.db_connection import CurseurTuple, DBConnection
+from utils.catalogue import abonner_rechargement
+from utils.singleton import Singleton
+
+# Seuil de similarité par défaut (celui de pg_trgm)
+SEUIL_SIMILARITE = 0.3
+# En dessous (en caractères), la recherche par nom reste une recherche de sous-chaîne
+LONGUEUR_MIN = 3
+
+_MOTS = re.compile(r"[^\W_]+")
+
+
+def trigrammes(texte: str) -> set[str]:
+    """Trigrammes d'un texte, comme pg_trgm : en minuscules, mot par mot
+    (suites de lettres et chiffres), chaque mot précédé de deux espaces et
+    suivi d'un espace. Ex : "Gin" -> {"  g", " gi", "gin", "in "}"""
+    resultat = set()
+    for mot in _MOTS.findall(texte.lower()):
+        mot = f"  {mot} "
+        resultat.update([mot[i : i + 3] for i in range(len(mot) - 2)])
+    return resultat
+
+
+class TrigrammesNoms:
+    """
+    Index inversé des trigrammes des noms de cocktails
+
+    Comme un index GIN de pg_trgm : pour chaque trigramme, les positions
+    (croissantes) des noms qui le contiennent, mises bout à bout dans un seul
+    tableau (listes_positions[debuts[t]:debuts[t + 1]] pour le trigramme t).
+    Le nombre de trigrammes communs entre une recherche et chaque nom
+    s'obtient en comptant les positions des listes des trigrammes de la
+    recherche (np.bincount), sans parcourir les noms.
+
+    Les noms sont désignés par leur position, dans l'ordre des noms
+    (ORDER BY nom_cocktail, id_cocktail), comme dans RelationBits.
+
+    Parameters
+    ----------
+    ids_cocktails : list[int]
+        Identifiants des cocktails, dans l'ordre des noms
+    noms : list[str]
+        Noms des cocktails, dans le même ordre
+    sans_alcool : list[bool], optional
+        Cocktails "Non alcoholic", dans le même ordre
+    """
+
+    def __init__(self, ids_cocktails: list[int], noms: list[str], sans_alcool: list[bool] = None):
+        """Constructeur"""
+        self.ids_cocktails = np.asarray(ids_cocktails, dtype=np.int64)
+        if sans_alcool is None:
+            self.sans_alcool = np.zeros(len(self.ids_cocktails), dtype=bool)
+        else:
+            self.sans_alcool = np.asarray(sans_alcool, dtype=bool)
+        numeros = {}
+        codes, positions = [], []
+        self.nb_trigrammes = np.empty(len(noms), dtype=np.int32)
+        for position, nom in enumerate(noms):
+            trigrammes_nom = trigrammes(nom or "")
+            self.nb_trigrammes[position] = len(trigrammes_nom)
+            codes.extend(numeros.setdefault(t, len(numeros)) for t in trigrammes_nom)
+            positions.extend([position] * len(trigrammes_nom))
+        self.numeros = numeros
+        codes = np.asarray(codes, dtype=np.int32)
+        # Tri stable par trigramme : chaque liste garde les positions croissantes
+        ordre = np.argsort(codes, kind="stable")
+        self.listes_positions = np.asarray(positions, dtype=np.int32)[ordre]
+        self.debuts = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(numeros)))])
+
+        self.minuscules = [(nom or "").lower() for nom in noms]
+
+    def communs(self, trigrammes_recherche: set[str]) -> np.ndarray:
+        """Nombre de ces trigrammes dans chaque nom (lecture des listes de l'index)"""
+        listes = [
+            self.listes_positions[self.debuts[t] : self.debuts[t + 1]]
+            for t in (self.numeros.get(trigramme) for trigramme in trigrammes_recherche)
+            if t is not None
+        ]
+        return np.bincount(
+            np.concatenate(listes + [np.empty(0, dtype=np.int32)]), minlength=len(self.ids_cocktails)
+        )
+
+    def similarites(self, recherche: str) -> np.ndarray:
+        """Similarité de chaque nom avec la recherche, comme similarity() de pg_trgm :
+        trigrammes communs / trigrammes de l'un ou de l'autre"""
+        trigrammes_recherche = trigrammes(recherche)
+        communs = self.communs(trigrammes_recherche)
+        union = len(trigrammes_recherche) + self.nb_trigrammes - communs
+        return np.divide(communs, union, out=np.zeros(len(communs)), where=union > 0)
+
+    def contenant(self, recherche: str) -> np.ndarray:
+        """Positions (croissantes) des noms qui contiennent la recherche (comme ILIKE '%recherche%')
+
+        Un tel nom contient les trigrammes intérieurs (sans espace de bord) de
+        la recherche : seuls les noms qui les ont tous sont comparés.
+        """
+        motif = recherche.lower()
+        interieurs = {t for t in trigrammes(recherche) if " " not in t}
+        if interieurs:
+            candidats = np.flatnonzero(self.communs(interieurs) == len(interieurs))
+        else:
+            candidats = np.arange(len(self.minuscules))
+        return np.asarray([p for p in candidats.tolist() if motif in self.minuscules[p]], dtype=np.int64)
+
+    def rechercher(self, recherche: str, seuil: float = SEUIL_SIMILARITE, sans_alcool: bool = False) -> list[int]:
+        """Identifiants des cocktails dont le nom ressemble à la recherche, du plus
+        au moins semblable (à similarité égale, par nom)
+
+        Sont retenus les noms de similarité au moins égale au seuil et ceux qui
+        contiennent la recherche, comme
+            WHERE nom % recherche OR nom ILIKE '%recherche%'
+            ORDER BY similarity(nom, recherche) DESC, nom
+        avec pg_trgm. Avec sans_alcool, seuls les cocktails "Non alcoholic" sont retenus.
+        """
+        similarites = self.similarites(recherche)
+        gardes = similarites >= seuil
+        gardes[self.contenant(recherche)] = True
+        if sans_alcool:
+            gardes &= self.sans_alcool
+        positions = np.flatnonzero(gardes)
+        # lexsort : dernière clé principale ; positions croissantes = ordre des noms
+        positions = positions[np.lexsort((positions, -similarites[positions]))]
+        return self.ids_cocktails[positions].tolist()
+
+
+class IndexTrigrammes(metaclass=Singleton):
+    """
+    Recherche approchée des cocktails par nom (tolérante aux fautes de frappe)
+
+    Une recherche par ILIKE '%x%' ne trouve rien pour "margerita". Ici les
+    noms sont comparés par trigrammes (voir TrigrammesNoms), comme avec
+    l'extension pg_trgm : "margerita" et "Margarita" ont 7 trigrammes en
+    commun sur 13, similarité 0,54.
+
+    Le seuil de similarité par défaut vient de RECHERCHE_SEUIL_SIMILARITE
+    (0,3 par défaut, comme pg_trgm).
+
+    L'index est lu au premier appel puis gardé jusqu'au prochain
+    rechargement du catalogue (voir utils.catalogue).
+    """
+
+    def __init__(self, seuil: float | None = None):
+        """Constructeur"""
+        if seuil is None:
+            seuil = float(os.environ.get("RECHERCHE_SEUIL_SIMILARITE", SEUIL_SIMILARITE))
+        self.seuil = seuil
+        self._verrou = threading.Lock()
+        self._donnees = None
+
+    def charger(self):
+        """Lire les noms des cocktails dans la base"""
+        with DBConnection().connection as connection:
+            with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                cursor.execute(
+                    "SELECT id_cocktail, nom_cocktail, alcool = 'Non alcoholic' FROM cocktail "
+                    "ORDER BY nom_cocktail, id_cocktail;"
+                )
+                lignes = cursor.fetchall()
+        self.charger_noms(
+            [row[0] for row in lignes], [row[1] for row in lignes], [bool(row[2]) for row in lignes]
+        )
+
+    def charger_noms(self, ids_cocktails: list[int], noms: list[str], sans_alcool: list[bool] = None):
+        """Remplacer l'index par celui des noms donnés (dans l'ordre des noms)"""
+        self._donnees = TrigrammesNoms(ids_cocktails, noms, sans_alcool)
+
+    def invalider(self):
+        """Oublier l'index : il sera relu au prochain appel"""
+        self._donnees = None
+
+    def noms(self) -> TrigrammesNoms:
+        """Index courant (lu dans la base au premier appel)"""
+        donnees = self._donnees
+        if donnees is None:
+            with self._verrou:
+                if self._donnees is None:
+                    self.charger()
+                donnees = self._donnees
+        return donnees
+
+    def rechercher(self, recherche: str, seuil: float | None = None, sans_alcool: bool = False) -> list[int]:
+        """Identifiants des cocktails dont le nom ressemble à la recherche, du plus au moins semblable
+
+        Parameters
+        ----------
+        recherche : str
+            Nom (ou partie du nom) recherché
+        seuil : float, optional
+            Similarité minimale (entre 0 et 1), self.seuil par défaut. Les noms
+            qui contiennent la recherche sont toujours retenus.
+        sans_alcool : bool
+            Ne retenir que les cocktails "Non alcoholic"
+        """
+        return self.noms().rechercher(recherche, self.seuil if seuil is None else seuil, sans_alcool)
+
+
+@abonner_rechargement
+def _invalider_index():
+    IndexTrigrammes().invalider()
@@ -1,11 +1,26 @@
 import logging
-from typing import List, Optional
+from typing import List
 
 from business_object.ingredient import Ingredient
-from dao.db_connection import DBConnection
+from dao.db_connection import CurseurTuple, DBConnection
+from dao.index_ingredients import IndexIngredients
+from dao.index_manquants import IndexManquants
+from dao.index_prefixes import IndexPrefixes
+from dao.mappeur import Mappeur
+from dao.routage import lecture_seule
 from utils.log_decorator import log
 from utils.singleton import Singleton
 
+# Colonnes SQL -> paramètres du constructeur (voir Mappeur)
+MAPPEUR_INGREDIENT = Mappeur(
+    Ingredient,
+    {
+        "id_ingredient": "id_ingredient",
+        "nom_ingredient": "nom_ingredient",
+        "desc_ingredient": "desc_ingredient",
+    },
+)
+
 
 class InventaireDao(metaclass=Singleton):
     """Accès aux ingrédients de la base de données."""
@@ -35,6 +50,7 @@ class InventaireDao(metaclass=Singleton):
         ):
             return False
 
+        cree = False
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
@@ -68,6 +84,7 @@ class InventaireDao(metaclass=Singleton):
                                 return False
                             ing_id = row["id_ingredient"] if isinstance(row, dict) else row[0]
                             ingredient.id_ingredient = int(ing_id)
+                            cree = True
                     else:
                         ing_id = int(ingredient.id_ingredient)
 
@@ -80,11 +97,23 @@ class InventaireDao(metaclass=Singleton):
                         """,
                         {"id_ing": ing_id, "id_user": id_utilisateur},
                     )
-                    return True
+                    DBConnection().signaler_ecriture(id_utilisateur)
+                    ajoute = cursor.rowcount > 0
         except Exception as e:
             logging.exception("Erreur lors de l'ajout à l'inventaire: %s", e)
             return False
 
+        # Après le commit : nouvel ingrédient proposé à l'autocomplétion et à la recherche,
+        # mise à jour des cocktails de l'utilisateur qui utilisent l'ingrédient
+        if cree:
+            IndexPrefixes().ajouter_ingredient(int(ing_id), ingredient.nom_ingredient.strip())
+            IndexIngredients().ajouter(
+                int(ing_id), ingredient.nom_ingredient.strip(), getattr(ingredient, "desc_ingredient", None)
+            )
+        if ajoute:
+            IndexManquants().ajouter(id_utilisateur, int(ing_id))
+        return True
+
     @log
     def supprimer_ingredient(self, id_utilisateur: int, id_ingredient: int) -> bool:
         """Supprime l'un des ingrédients de l'inventaire de l'utilisateur.
@@ -126,8 +155,12 @@ class InventaireDao(metaclass=Singleton):
             )
             return False
 
+        if deleted > 0:
+            DBConnection().signaler_ecriture(id_utilisateur)
+            IndexManquants().retirer(id_utilisateur, id_ingredient)
         return deleted > 0
 
+    @lecture_seule(cle_utilisateur="id_utilisateur")
     @log
     def consulter_inventaire(self, id_utilisateur: int) -> List[Ingredient]:
         """
@@ -148,7 +181,7 @@ class InventaireDao(metaclass=Singleton):
 
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
                     cursor.execute(
                         """
                         SELECT i.id_ingredient, i.nom_ingredient, i.desc_ingredient
@@ -159,30 +192,187 @@ class InventaireDao(metaclass=Singleton):
                         """,
                         {"idu": id_utilisateur},
                     )
-                    rows = cursor.fetchall()
+                    return MAPPEUR_INGREDIENT.tous(cursor)
         except Exception as e:
             logging.exception("Erreur lors de la consultation de l'inventaire utilisateur: %s", e)
-            rows = None
-
-        if not rows:
             return []
 
-        result: List[Ingredient] = []
-        for r in rows:
-            if isinstance(r, dict):
-                _id = r["id_ingredient"]
-                _nom = r["nom_ingredient"]
-                _desc: Optional[str] = r["desc_ingredient"]
-
-            ingredient = Ingredient(
-                id_ingredient=int(_id) if _id is not None else None,
-                nom_ingredient=_nom,
-                desc_ingredient=_desc,
-            )
-            result.append(ingredient)
+    @lecture_seule(cle_utilisateur="id_utilisateur")
+    @log
+    def ids_inventaire(self, id_utilisateur: int) -> list[int]:
+        """
+        Identifiants des ingrédients de l'inventaire de l'utilisateur
+        (entrée de MoteurRealisabilite).
+
+        Parameters
+        ----------
+        id_utilisateur : int
+            L'indentifiant associé a l'utilisateur.
+
+        Returns
+        -------
+        list[int]
+            Identifiants des ingrédients, sans ordre particulier.
+
+        Raises
+        ------
+        Exception
+            Erreur de la base, relancée : un inventaire vide à tort fausserait
+            les cocktails réalisables.
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                    cursor.execute(
+                        "SELECT id_ingredient FROM inventaire_ingredient WHERE id_utilisateur = %(idu)s;",
+                        {"idu": id_utilisateur},
+                    )
+                    return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            logging.exception("Erreur lors de la lecture des ingrédients de l'inventaire utilisateur: %s", e)
+            raise
+
+    @log
+    def autoriser_partage(self, id_utilisateur: int, autorise: bool = True) -> bool:
+        """
+        Donner ou retirer le consentement de l'utilisateur à l'utilisation de
+        son inventaire pour les soirées (inventaire_commun).
+
+        Parameters
+        ----------
+        id_utilisateur : int
+            L'indentifiant associé a l'utilisateur.
+        autorise : bool
+            True pour partager l'inventaire, False pour ne plus le partager.
+
+        Returns
+        -------
+        bool
+            True si l'opération a réussi, False sinon.
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    if autorise:
+                        cursor.execute(
+                            """
+                            INSERT INTO partage_inventaire (id_utilisateur)
+                            VALUES (%(idu)s)
+                            ON CONFLICT (id_utilisateur) DO NOTHING;
+                            """,
+                            {"idu": id_utilisateur},
+                        )
+                    else:
+                        cursor.execute(
+                            "DELETE FROM partage_inventaire WHERE id_utilisateur = %(idu)s;",
+                            {"idu": id_utilisateur},
+                        )
+        except Exception as e:
+            logging.exception("Erreur lors de la modification du partage de l'inventaire: %s", e)
+            return False
+        return True
+
+    @lecture_seule(cle_utilisateur="id_hote")
+    @log
+    def inventaire_commun(self, id_hote: int, ids_invites: list[int]) -> tuple[list[int], list[int]]:
+        """
+        Réunion des inventaires de l'hôte et de ses invités, en une requête.
 
-        return result
+        Seuls les invités qui partagent leur inventaire (autoriser_partage)
+        sont pris en compte ; l'hôte n'a pas besoin de consentir.
 
+        Parameters
+        ----------
+        id_hote : int
+            Utilisateur qui organise la soirée.
+        ids_invites : list[int]
+            Identifiants des autres participants.
+
+        Returns
+        -------
+        tuple[list[int], list[int]]
+            (identifiants des ingrédients possédés par au moins un participant,
+            invités inconnus ou qui ne partagent pas leur inventaire, croissants).
+
+        Raises
+        ------
+        Exception
+            Erreur de la base, relancée.
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                    # 1) participants : chaque participant et son consentement
+                    # 2) les refus d'un côté, l'union des inventaires de l'autre (id_ingredient NULL / refus NULL)
+                    cursor.execute(
+                        """
+                        WITH participants AS (
+                            SELECT p.id_utilisateur,
+                                   p.id_utilisateur = %(id_hote)s OR pi.id_utilisateur IS NOT NULL AS consenti
+                            FROM UNNEST(%(ids)s::INT[]) AS p(id_utilisateur)
+                            LEFT JOIN partage_inventaire pi ON pi.id_utilisateur = p.id_utilisateur
+                        )
+                        SELECT NULL::INT AS id_ingredient, id_utilisateur AS refus
+                        FROM participants
+                        WHERE NOT consenti
+                        UNION ALL
+                        SELECT DISTINCT ii.id_ingredient, NULL::INT
+                        FROM participants p
+                        JOIN inventaire_ingredient ii ON ii.id_utilisateur = p.id_utilisateur
+                        WHERE p.consenti;
+                        """,
+                        {"id_hote": id_hote, "ids": [id_hote, *ids_invites]},
+                    )
+                    lignes = cursor.fetchall()
+        except Exception as e:
+            logging.exception("Erreur lors de la lecture de l'inventaire commun: %s", e)
+            raise
+        return (
+            [id_ingredient for id_ingredient, refus in lignes if refus is None],
+            sorted({refus for _, refus in lignes if refus is not None}),
+        )
+
+    @lecture_seule
+    @log
+    def trouver_par_ids(self, ids_ingredients: list[int]) -> List[Ingredient]:
+        """
+        Lire des ingrédients désignés par leurs identifiants.
+
+        Parameters
+        ----------
+        ids_ingredients : list[int]
+            Identifiants des ingrédients, dans l'ordre voulu.
+
+        Returns
+        -------
+        list[Ingredient]
+            Les ingrédients existants, dans l'ordre de ids_ingredients.
+
+        Raises
+        ------
+        Exception
+            Erreur de la base, relancée.
+        """
+        if not ids_ingredients:
+            return []
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                    cursor.execute(
+                        """
+                        SELECT id_ingredient, nom_ingredient, desc_ingredient
+                        FROM ingredient
+                        WHERE id_ingredient = ANY(%(ids)s)
+                        ORDER BY array_position(%(ids)s, id_ingredient);
+                        """,
+                        {"ids": list(ids_ingredients)},
+                    )
+                    return MAPPEUR_INGREDIENT.tous(cursor)
+        except Exception as e:
+            logging.exception("Erreur lors de la lecture des ingrédients: %s", e)
+            raise
+
+    @lecture_seule
     @log
     def recherche_ingredient(self, ingredient: str) -> Ingredient:
         """Permet de chercher un ingrédient avec son nom.
@@ -194,8 +384,8 @@ class InventaireDao(metaclass=Singleton):
 
         Returns
         -------
-        Ingredient
-            L'ingrédient recherché
+        Ingredient | None
+            L'ingrédient recherché, None s'il n'existe pas
         """
         try:
             with DBConnection().connection as connection:
@@ -209,21 +399,27 @@ class InventaireDao(metaclass=Singleton):
                         {"ingredient": ingredient},
                     )
                     row = cursor.fetchone()
-                sortie_ingredient = Ingredient(
-                    id_ingredient=row["id_ingredient"],
-                    nom_ingredient=row["nom_ingredient"],
-                    desc_ingredient=row["desc_ingredient"],
-                )
-                return sortie_ingredient
+        except Exception:
+            logging.exception("Erreur recherche_ingredient")
+            return None
 
-        except Exception as e:
-            return e
+        if not row:
+            return None
+        return Ingredient(
+            id_ingredient=row["id_ingredient"],
+            nom_ingredient=row["nom_ingredient"],
+            desc_ingredient=row["desc_ingredient"],
+        )
 
+    @lecture_seule
     @log
     def ingredients_aleatoires(self, nb: int) -> list[Ingredient]:
         """
         Propose une liste d'ingrédients choisis aléatoirement.
 
+        Les ingrédients sont tirés parmi ceux gardés en mémoire (voir
+        IndexIngredients.aleatoires), sans ORDER BY RANDOM() en base.
+
         Parameters
         ----------
         nb : int
@@ -232,28 +428,8 @@ class InventaireDao(metaclass=Singleton):
         Returns
         -------
         list[Ingredient]
-            Liste d'ingrédients aléatoires sélectionnés directement côté base de données.
+            Liste d'ingrédients distincts tirés aléatoirement.
         """
-        try:
-            with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
-                    # limite nombre entre 1 et 10
-                    nb_limite = min(max(1, nb), 10)
-
-                    cursor.execute(
-                        "SELECT * FROM ingredient ORDER BY RANDOM() LIMIT %(limit)s;",
-                        {"limit": nb_limite},
-                    )
-                    rows = cursor.fetchall()
-
-                    return [
-                        Ingredient(
-                            id_ingredient=row["id_ingredient"],
-                            nom_ingredient=row["nom_ingredient"],
-                            desc_ingredient=row.get("desc_ingredient"),
-                        )
-                        for row in rows
-                    ]
-        except Exception:
-            logging.exception("Erreur ingredients_aleatoires")
-            raise
+        # limite nombre entre 1 et 10
+        nb_limite = min(max(1, nb), 10)
+        return IndexIngredients().aleatoires(nb_limite)
@@ -0,0 +1,174 @@
+import logging
+from typing import List
+
+from business_object.ingredient import Ingredient
+from dao.async_db_connection import AsyncDBConnection
+from dao.index_ingredients import IndexIngredients
+from dao.index_prefixes import IndexPrefixes
+from utils.log_decorator import log
+from utils.singleton import Singleton
+
+
+class InventaireDaoAsync(metaclass=Singleton):
+    """Version asynchrone (asyncpg) de InventaireDao."""
+
+    @log
+    async def ajouter_ingredient_inventaire(self, id_utilisateur: int, ingredient: Ingredient) -> bool:
+        """Ajout d'un ingrédient dans l'inventaire personnel d'un utilisateur
+
+        Voir InventaireDao.ajouter_ingredient_inventaire.
+        """
+        if not isinstance(id_utilisateur, int) or id_utilisateur <= 0:
+            return False
+        if (
+            ingredient is None
+            or not isinstance(ingredient.nom_ingredient, str)
+            or not ingredient.nom_ingredient.strip()
+        ):
+            return False
+
+        cree = False
+        try:
+            async with AsyncDBConnection().connection as connection:
+                # 1) Récupérer/créer l'ingrédient si pas d'id
+                if ingredient.id_ingredient is None:
+                    row = await connection.fetchrow(
+                        """
+                        SELECT id_ingredient
+                        FROM ingredient
+                        WHERE lower(nom_ingredient) = lower(%(nom)s);
+                        """,
+                        {"nom": ingredient.nom_ingredient.strip()},
+                    )
+                    if not row:
+                        row = await connection.fetchrow(
+                            """
+                            INSERT INTO ingredient (nom_ingredient, desc_ingredient)
+                            VALUES (%(nom)s, %(desc)s)
+                            RETURNING id_ingredient;
+                            """,
+                            {
+                                "nom": ingredient.nom_ingredient.strip(),
+                                "desc": getattr(ingredient, "desc_ingredient", None),
+                            },
+                        )
+                        if not row:
+                            return False
+                        ingredient.id_ingredient = int(row["id_ingredient"])
+                        cree = True
+                    ing_id = int(row["id_ingredient"])
+                else:
+                    ing_id = int(ingredient.id_ingredient)
+
+                # 2) Lier à l'inventaire utilisateur (éviter doublons)
+                await connection.execute(
+                    """
+                    INSERT INTO inventaire_ingredient (id_ingredient, id_utilisateur)
+                    VALUES (%(id_ing)s, %(id_user)s)
+                    ON CONFLICT (id_ingredient, id_utilisateur) DO NOTHING;
+                    """,
+                    {"id_ing": ing_id, "id_user": id_utilisateur},
+                )
+        except Exception as e:
+            logging.exception("Erreur lors de l'ajout à l'inventaire: %s", e)
+            return False
+
+        # Après le commit : nouvel ingrédient proposé à l'autocomplétion et à la recherche
+        if cree:
+            IndexPrefixes().ajouter_ingredient(ing_id, ingredient.nom_ingredient.strip())
+            IndexIngredients().ajouter(
+                ing_id, ingredient.nom_ingredient.strip(), getattr(ingredient, "desc_ingredient", None)
+            )
+        return True
+
+    @log
+    async def supprimer_ingredient(self, id_utilisateur: int, id_ingredient: int) -> bool:
+        """Supprime l'un des ingrédients de l'inventaire de l'utilisateur."""
+        if not isinstance(id_utilisateur, int) or id_utilisateur <= 0:
+            return False
+        if not isinstance(id_ingredient, int) or id_ingredient <= 0:
+            return False
+
+        try:
+            async with AsyncDBConnection().connection as connection:
+                deleted = await connection.execute(
+                    """
+                    DELETE FROM inventaire_ingredient
+                    WHERE id_utilisateur = %(idu)s
+                      AND id_ingredient = %(idi)s;
+                    """,
+                    {"idu": id_utilisateur, "idi": id_ingredient},
+                )
+        except Exception as e:
+            logging.exception(
+                "Erreur lors de la suppression d'un ingrédient de l'inventaire utilisateur: %s",
+                e,
+            )
+            return False
+
+        return deleted > 0
+
+    @log
+    async def consulter_inventaire(self, id_utilisateur: int) -> List[Ingredient]:
+        """Permet de consulter l'inventaire de l'utilisateur."""
+        if not isinstance(id_utilisateur, int):
+            return []
+
+        try:
+            async with AsyncDBConnection().connection as connection:
+                rows = await connection.fetch(
+                    """
+                    SELECT i.id_ingredient, i.nom_ingredient, i.desc_ingredient
+                    FROM inventaire_ingredient ii
+                    JOIN ingredient i ON i.id_ingredient = ii.id_ingredient
+                    WHERE ii.id_utilisateur = %(idu)s
+                    ORDER BY LOWER(i.nom_ingredient);
+                    """,
+                    {"idu": id_utilisateur},
+                )
+        except Exception as e:
+            logging.exception("Erreur lors de la consultation de l'inventaire utilisateur: %s", e)
+            return []
+
+        return [
+            Ingredient(
+                id_ingredient=int(r["id_ingredient"]) if r["id_ingredient"] is not None else None,
+                nom_ingredient=r["nom_ingredient"],
+                desc_ingredient=r["desc_ingredient"],
+            )
+            for r in rows
+        ]
+
+    @log
+    async def recherche_ingredient(self, ingredient: str) -> Ingredient:
+        """Permet de chercher un ingrédient avec son nom, None s'il n'existe pas."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                row = await connection.fetchrow(
+                    """
+                    SELECT *
+                    FROM ingredient
+                    WHERE lower(nom_ingredient) = lower(%(ingredient)s);
+                    """,
+                    {"ingredient": ingredient},
+                )
+        except Exception:
+            logging.exception("Erreur recherche_ingredient")
+            return None
+
+        if not row:
+            return None
+        return Ingredient(
+            id_ingredient=row["id_ingredient"],
+            nom_ingredient=row["nom_ingredient"],
+            desc_ingredient=row["desc_ingredient"],
+        )
+
+    @log
+    async def ingredients_aleatoires(self, nb: int) -> list[Ingredient]:
+        """Propose une liste d'ingrédients choisis aléatoirement (entre 1 et 10).
+
+        Tirés en mémoire, comme InventaireDao.ingredients_aleatoires.
+        """
+        nb_limite = min(max(1, nb), 10)
+        return IndexIngredients().aleatoires(nb_limite)
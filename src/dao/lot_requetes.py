@@ -0,0 +1,100 @@
+import re
+
+from dao.db_connection import DBConnection
+
+_PARAMETRE_NOMME = re.compile(r"%\((\w+)\)s")
+_ECRITURE = re.compile(r"^\s*(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+_RETURNING = re.compile(r"\bRETURNING\b", re.IGNORECASE)
+
+
+class LotRequetes:
+    """
+    Plusieurs requêtes SQL envoyées à Postgres en un seul aller-retour réseau
+
+    psycopg2 n'a pas de mode pipeline, et un execute contenant plusieurs
+    requêtes ne renvoie que le résultat de la dernière. Le lot assemble donc
+    ses requêtes en une seule : chaque écriture (INSERT / UPDATE / DELETE)
+    devient une CTE, et le résultat de chaque requête revient dans sa propre
+    colonne sous forme d'un tableau JSON de lignes.
+
+    Toutes les requêtes du lot voient la base telle qu'elle était avant le lot
+    (un seul instantané) : une lecture ne voit pas l'écriture d'une autre
+    requête du même lot. Le lot réussit ou échoue en entier.
+
+    Exemple
+    -------
+    lot = LotRequetes()
+    i = lot.ajouter("SELECT * FROM cocktail WHERE id_cocktail = %(id)s", {"id": 1})
+    j = lot.ajouter("UPDATE utilisateur SET ... WHERE id_utilisateur = %(id)s", {"id": 2})
+    resultats = lot.executer()
+    resultats[i]       # lignes du SELECT (dictionnaires)
+    len(resultats[j])  # nombre de lignes modifiées
+    """
+
+    def __init__(self):
+        """Constructeur"""
+        self._requetes = []
+
+    def __len__(self):
+        return len(self._requetes)
+
+    def ajouter(self, requete: str, parametres: dict | None = None, conversions: dict | None = None) -> int:
+        """Ajouter une requête au lot ; renvoie la position de son résultat
+
+        Parameters
+        ----------
+        requete : str
+            Requête SQL avec des paramètres nommés %(nom)s
+        parametres : dict, optional
+            Valeurs des paramètres (propres à cette requête)
+        conversions : dict, optional
+            Colonne -> fonction appliquée à sa valeur, pour les types que JSON
+            ne porte pas (ex : {"date_creation": datetime.fromisoformat})
+        """
+        self._requetes.append((requete.strip().rstrip(";"), parametres or {}, conversions or {}))
+        return len(self._requetes) - 1
+
+    def sql(self) -> tuple:
+        """(requête SQL unique, paramètres) correspondant au lot"""
+        ctes = []
+        colonnes = []
+        valeurs = {}
+        for i, (requete, parametres, _) in enumerate(self._requetes):
+            # Paramètres préfixés par la position : deux requêtes peuvent utiliser le même nom
+            requete = _PARAMETRE_NOMME.sub(lambda m: f"%(l{i}_{m.group(1)})s", requete)
+            valeurs.update({f"l{i}_{nom}": valeur for nom, valeur in parametres.items()})
+
+            if _ECRITURE.match(requete):
+                if not _RETURNING.search(requete):
+                    requete += " RETURNING 1 AS ligne"
+                ctes.append(f"e{i} AS ({requete})")
+                source = f"e{i}"
+            else:
+                source = f"({requete})"
+            colonnes.append(f"(SELECT COALESCE(json_agg(r), '[]'::json) FROM {source} AS r) AS r{i}")
+
+        sql = ("WITH " + ",\n".join(ctes) + "\n" if ctes else "") + "SELECT " + ",\n".join(colonnes)
+        return sql, valeurs
+
+    def executer(self, cursor=None) -> list[list[dict]]:
+        """Exécuter le lot en un aller-retour ; renvoie une liste de lignes par requête
+
+        Sans curseur, une connexion est empruntée au pool le temps du lot.
+        """
+        if not self._requetes:
+            return []
+        if cursor is None:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    return self.executer(cursor)
+
+        cursor.execute(*self.sql())
+        ligne = cursor.fetchone()
+        resultats = list(ligne.values()) if isinstance(ligne, dict) else list(ligne)
+
+        for lignes, (_, _, conversions) in zip(resultats, self._requetes):
+            for colonne, conversion in conversions.items():
+                for valeur in lignes:
+                    if valeur.get(colonne) is not None:
+                        valeur[colonne] = conversion(valeur[colonne])
+        return resultats
@@ -0,0 +1,75 @@
+import inspect
+
+
+class Mappeur:
+    """
+    Construction d'objets métier à partir de lignes positionnelles (tuples)
+
+    Avec un RealDictCursor, chaque ligne devient un dictionnaire puis chaque
+    attribut est relu par son nom. Ici la ligne reste un tuple : pour chaque
+    forme de résultat (noms des colonnes de cursor.description), une fonction
+    est générée une seule fois, par exemple
+        lambda r: Cocktail(id_cocktail=r[0], nom_cocktail=r[1], ...)
+    puis appliquée à toutes les lignes.
+
+    S'utilise avec un curseur CurseurTuple (voir DBConnection).
+
+    Parameters
+    ----------
+    classe : type
+        Classe métier à construire
+    champs : dict
+        Paramètre du constructeur -> nom de la colonne SQL.
+        Si la colonne est absente du résultat, le paramètre garde sa valeur
+        par défaut (None s'il n'en a pas, comme row.get).
+    """
+
+    def __init__(self, classe, champs: dict):
+        """Constructeur"""
+        self.classe = classe
+        self.champs = champs
+        self._compilees = {}
+        parametres = inspect.signature(classe).parameters
+        self._avec_defaut = {
+            nom for nom in champs if nom in parametres and parametres[nom].default is not inspect.Parameter.empty
+        }
+
+    def compiler(self, description):
+        """Fonction ligne -> objet pour ce résultat (générée au premier appel)"""
+        return self._fonction(tuple(colonne.name for colonne in description))
+
+    def _fonction(self, colonnes: tuple):
+        fonction = self._compilees.get(colonnes)
+        if fonction is None:
+            positions = {}
+            for i, nom in enumerate(colonnes):
+                positions.setdefault(nom, i)
+            arguments = ", ".join(
+                f"{parametre}=r[{positions[colonne]}]" if colonne in positions else f"{parametre}=None"
+                for parametre, colonne in self.champs.items()
+                if colonne in positions or parametre not in self._avec_defaut
+            )
+            # Le texte évalué ne contient que les noms des paramètres du constructeur
+            # (champs fixés dans le code) et des positions entières, jamais de données
+            fonction = eval(f"lambda r: classe({arguments})", {"classe": self.classe})  # pylint: disable=eval-used
+            self._compilees[colonnes] = fonction
+        return fonction
+
+    def un(self, cursor):
+        """Objet construit depuis la ligne suivante du curseur, None s'il n'y en a plus"""
+        ligne = cursor.fetchone()
+        return None if ligne is None else self.compiler(cursor.description)(ligne)
+
+    def tous(self, cursor) -> list:
+        """Objets construits depuis toutes les lignes restantes du curseur"""
+        return list(map(self.compiler(cursor.description), cursor.fetchall()))
+
+    def depuis_dicts(self, lignes: list[dict]) -> list:
+        """Objets construits depuis des lignes en dictionnaires (ex : résultat d'un LotRequetes)
+
+        Les lignes d'un même résultat ont les mêmes clés, dans l'ordre des colonnes.
+        """
+        if not lignes:
+            return []
+        fonction = self._fonction(tuple(lignes[0]))
+        return [fonction(tuple(ligne.values())) for ligne in lignes]
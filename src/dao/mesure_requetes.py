@@ -0,0 +1,85 @@
+import contextvars
+import time
+
+from psycopg2.extensions import cursor as CurseurTuple
+from psycopg2.extras import RealDictCursor
+
+
+class MesureRequetes:
+    """Compteurs SQL d'une requête HTTP : nombre de requêtes et temps passé en base
+
+    Un même objet est partagé par le middleware et les threads qui exécutent
+    l'endpoint (le contexte est copié, l'objet reste le même).
+    """
+
+    def __init__(self):
+        """Constructeur"""
+        self.nb_requetes = 0
+        self.duree_bd = 0.0
+        self.debut = time.perf_counter()
+        self.fin_endpoint = None
+
+    def enregistrer(self, duree: float):
+        """Ajouter une requête SQL de durée donnée (secondes)"""
+        self.nb_requetes += 1
+        self.duree_bd += duree
+
+
+_mesure_courante = contextvars.ContextVar("mesure_requetes", default=None)
+
+
+def demarrer_mesure() -> tuple:
+    """Démarrer la mesure d'une requête HTTP ; renvoie (mesure, jeton pour terminer_mesure)"""
+    mesure = MesureRequetes()
+    return mesure, _mesure_courante.set(mesure)
+
+
+def terminer_mesure(jeton):
+    _mesure_courante.reset(jeton)
+
+
+def mesure_courante() -> MesureRequetes | None:
+    """Mesure de la requête HTTP en cours, None hors requête HTTP (scripts, tests)"""
+    return _mesure_courante.get()
+
+
+class _MesureCurseur:
+    """Chronomètre les appels execute / executemany / callproc d'un curseur psycopg2"""
+
+    def execute(self, query, vars=None):
+        mesure = _mesure_courante.get()
+        if mesure is None:
+            return super().execute(query, vars)
+        debut = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            mesure.enregistrer(time.perf_counter() - debut)
+
+    def executemany(self, query, vars_list):
+        mesure = _mesure_courante.get()
+        if mesure is None:
+            return super().executemany(query, vars_list)
+        debut = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            mesure.enregistrer(time.perf_counter() - debut)
+
+    def callproc(self, procname, vars=None):
+        mesure = _mesure_courante.get()
+        if mesure is None:
+            return super().callproc(procname, vars)
+        debut = time.perf_counter()
+        try:
+            return super().callproc(procname, vars)
+        finally:
+            mesure.enregistrer(time.perf_counter() - debut)
+
+
+class CurseurDictMesure(_MesureCurseur, RealDictCursor):
+    """RealDictCursor instrumenté (curseur par défaut des connexions du pool)"""
+
+
+class CurseurTupleMesure(_MesureCurseur, CurseurTuple):
+    """Curseur psycopg2 renvoyant des tuples, instrumenté (utilisé avec un Mappeur)"""
@@ -0,0 +1,268 @@
+import itertools
+import threading
+
+import numpy as np
+
+from dao.db_connection import CurseurTuple, DBConnection
+from dao.pagination import tranche
+from utils.catalogue import abonner_rechargement
+from utils.singleton import Singleton
+
+_generations = itertools.count(1)
+
+
+class RelationBits:
+    """
+    Relation cocktail × ingrédient figée, sous forme de bits
+
+    Chaque cocktail est une suite de mots de 64 bits (uint64), le bit j
+    indiquant si la recette utilise l'ingrédient de colonne j. Les bits sont
+    rangés mot par mot (un tableau contigu par mot) et les colonnes par
+    fréquence décroissante : les ingrédients courants, qui font l'essentiel
+    des inventaires, tiennent dans les premiers mots.
+
+    Les cocktails sont désignés par leur position, dans l'ordre des noms
+    (ORDER BY nom_cocktail de la base) : trier des positions revient à trier
+    par nom, comme les requêtes SQL.
+
+    Parameters
+    ----------
+    ids_cocktails : list[int]
+        Identifiants des cocktails, dans l'ordre des noms
+    paires : list[tuple]
+        Couples (id_cocktail, id_ingredient) des recettes
+    sans_alcool : list[bool], optional
+        Cocktails "Non alcoholic", dans le même ordre que ids_cocktails
+    """
+
+    def __init__(self, ids_cocktails: list[int], paires: list[tuple], sans_alcool: list[bool] = None):
+        """Constructeur"""
+        self.generation = next(_generations)
+        self.ids_cocktails = np.asarray(ids_cocktails, dtype=np.int64)
+        if sans_alcool is None:
+            self.sans_alcool = np.zeros(len(self.ids_cocktails), dtype=bool)
+        else:
+            self.sans_alcool = np.asarray(sans_alcool, dtype=bool)
+        paires = np.asarray(paires, dtype=np.int64).reshape(-1, 2)
+
+        # Colonnes : ingrédients du plus fréquent au moins fréquent
+        self.ids_ingredients, frequences = np.unique(paires[:, 1], return_counts=True)
+        ordre = np.argsort(-frequences, kind="stable")
+        self.colonne_de = np.empty(len(self.ids_ingredients), dtype=np.int64)
+        self.colonne_de[ordre] = np.arange(len(self.ids_ingredients))
+        self.ingredient_de = np.empty_like(self.ids_ingredients)
+        self.ingredient_de[self.colonne_de] = self.ids_ingredients
+        colonnes = self.colonne_de[np.searchsorted(self.ids_ingredients, paires[:, 1])]
+        self._tri = tri = np.argsort(self.ids_cocktails)
+        lignes = tri[np.searchsorted(self.ids_cocktails, paires[:, 0], sorter=tri)]
+
+        # Mêmes couples, triés par cocktail puis par colonne (parcours sans passer par les bits)
+        cles = np.unique(lignes * len(self.ids_ingredients) + colonnes)
+        self.paires_positions = cles // max(1, len(self.ids_ingredients))
+        self.paires_colonnes = cles % max(1, len(self.ids_ingredients))
+
+        nb_mots = max(1, (len(self.ids_ingredients) + 63) // 64)
+        self.bits = np.zeros((nb_mots, len(self.ids_cocktails)), dtype=np.uint64)
+        np.bitwise_or.at(self.bits, (colonnes >> 6, lignes), self._masque(colonnes))
+        self.totaux = np.bitwise_count(self.bits).sum(axis=0, dtype=np.uint8)
+
+    @staticmethod
+    def _masque(colonnes):
+        return np.left_shift(np.uint64(1), (colonnes & 63).astype(np.uint64))
+
+    def colonnes(self, ids_ingredients: list[int]) -> np.ndarray:
+        """Colonnes des ingrédients ; ceux qu'aucune recette n'utilise sont ignorés"""
+        ids = np.asarray(ids_ingredients, dtype=np.int64)
+        positions = np.searchsorted(self.ids_ingredients, ids)
+        utiles = positions < len(self.ids_ingredients)
+        utiles[utiles] = self.ids_ingredients[positions[utiles]] == ids[utiles]
+        return self.colonne_de[positions[utiles]]
+
+    def inventaire(self, ids_ingredients: list[int]) -> np.ndarray:
+        """Inventaire mis en bits : un mot de 64 bits par mot de la relation"""
+        colonnes = self.colonnes(ids_ingredients)
+        inventaire = np.zeros(self.bits.shape[0], dtype=np.uint64)
+        np.bitwise_or.at(inventaire, colonnes >> 6, self._masque(colonnes))
+        return inventaire
+
+    def manquants(self, ids_ingredients: list[int]) -> np.ndarray:
+        """Nombre d'ingrédients manquants de chaque cocktail pour cet inventaire :
+        totaux - popcount(recettes & inventaire), en ne parcourant que les mots
+        où l'inventaire a au moins un ingrédient"""
+        inventaire = self.inventaire(ids_ingredients)
+        presents = np.zeros(self.bits.shape[1], dtype=np.uint8)
+        tampon = np.empty(self.bits.shape[1], dtype=np.uint64)
+        for mot in np.flatnonzero(inventaire):
+            np.bitwise_and(self.bits[mot], inventaire[mot], out=tampon)
+            presents += np.bitwise_count(tampon)
+        return self.totaux - presents
+
+    def seul_manquant(self, positions: np.ndarray, ids_ingredients: list[int]) -> np.ndarray:
+        """Pour des cocktails auxquels il manque exactement un ingrédient,
+        identifiant de cet ingrédient : l'unique bit de recette & ~inventaire"""
+        restes = self.bits[:, positions] & ~self.inventaire(ids_ingredients)[:, None]
+        mots = np.argmax(restes != 0, axis=0)
+        bit = restes[mots, np.arange(len(positions))]
+        # Un seul bit à 1 : son rang est le nombre de bits de bit - 1
+        colonnes = mots * 64 + np.bitwise_count(bit - np.uint64(1))
+        return self.ingredient_de[colonnes]
+
+    def positions_avec(self, id_ingredient: int) -> np.ndarray:
+        """Positions (croissantes) des cocktails dont la recette utilise l'ingrédient"""
+        colonnes = self.colonnes([id_ingredient])
+        if not len(colonnes):
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.bits[colonnes[0] >> 6] & self._masque(colonnes[0]))
+
+    def position(self, id_cocktail: int) -> int | None:
+        """Position du cocktail dans l'ordre des noms, None s'il n'est pas dans la relation"""
+        rang = np.searchsorted(self.ids_cocktails, id_cocktail, sorter=self._tri)
+        if rang < len(self._tri) and self.ids_cocktails[self._tri[rang]] == id_cocktail:
+            return int(self._tri[rang])
+        return None
+
+    def ids(self, positions) -> list[int]:
+        """Identifiants des cocktails à ces positions"""
+        return self.ids_cocktails[positions].tolist()
+
+
+class MoteurRealisabilite(metaclass=Singleton):
+    """
+    Calcul en mémoire des cocktails complets et partiels d'un inventaire
+
+    Pour un inventaire mis en bits, le nombre d'ingrédients manquants de tous
+    les cocktails s'obtient par des opérations vectorisées :
+        manquants = totaux - popcount(recettes & inventaire)
+    (voir RelationBits). La base ne sert plus qu'à lire l'inventaire et la
+    page de cocktails finale.
+
+    La relation est lue au premier appel puis gardée jusqu'au prochain
+    rechargement du catalogue (voir utils.catalogue).
+    """
+
+    def __init__(self):
+        """Constructeur"""
+        self._verrou = threading.Lock()
+        self._donnees = None
+
+    # ------------------------- Chargement -----------------------------
+
+    def charger(self):
+        """Lire la relation cocktail × ingrédient dans la base"""
+        with DBConnection().connection as connection:
+            with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                cursor.execute(
+                    "SELECT id_cocktail, alcool = 'Non alcoholic' FROM cocktail "
+                    "ORDER BY nom_cocktail, id_cocktail;"
+                )
+                cocktails = cursor.fetchall()
+                cursor.execute("SELECT id_cocktail, id_ingredient FROM cocktail_ingredient;")
+                paires = cursor.fetchall()
+        self.charger_relation(
+            [row[0] for row in cocktails], paires, sans_alcool=[bool(row[1]) for row in cocktails]
+        )
+
+    def charger_relation(self, ids_cocktails: list[int], paires: list[tuple], sans_alcool: list[bool] = None):
+        """Remplacer la relation par celle décrite par la liste ordonnée des
+        cocktails et les couples (id_cocktail, id_ingredient) des recettes"""
+        self._donnees = RelationBits(ids_cocktails, paires, sans_alcool)
+
+    def invalider(self):
+        """Oublier la relation : elle sera relue au prochain appel"""
+        self._donnees = None
+
+    def relation(self) -> RelationBits:
+        """Relation courante (lue dans la base au premier appel)"""
+        donnees = self._donnees
+        if donnees is None:
+            with self._verrou:
+                if self._donnees is None:
+                    self.charger()
+                donnees = self._donnees
+        return donnees
+
+    # ------------------------- Calculs -----------------------------
+
+    def manquants(self, ids_ingredients: list[int]) -> np.ndarray:
+        """Nombre d'ingrédients manquants de chaque cocktail (ordre des noms) pour cet inventaire"""
+        return self.relation().manquants(ids_ingredients)
+
+    def complets(self, ids_ingredients: list[int], limit: int = 10, offset: int = 0) -> list[int]:
+        """Identifiants des cocktails réalisables avec l'inventaire, par nom
+
+        Les cocktails sans ingrédient ne sont pas réalisables (comme en SQL).
+        """
+        relation = self.relation()
+        positions = np.flatnonzero((relation.manquants(ids_ingredients) == 0) & (relation.totaux > 0))
+        return relation.ids(positions[offset : offset + limit])
+
+    def partiels(
+        self, ids_ingredients: list[int], nb_manquants: int, limit: int = 10, offset: int = 0
+    ) -> list[int]:
+        """Identifiants des cocktails auxquels il manque de 1 à nb_manquants ingrédients,
+        par nombre d'ingrédients manquants puis par nom"""
+        relation = self.relation()
+        manquants = relation.manquants(ids_ingredients)
+        positions = np.flatnonzero((manquants >= 1) & (manquants <= nb_manquants))
+        # Tri stable : à nombre égal de manquants, l'ordre des noms est conservé
+        positions = positions[np.argsort(manquants[positions], kind="stable")]
+        return relation.ids(positions[offset : offset + limit])
+
+    def par_manquants(
+        self,
+        ids_ingredients: list[int],
+        nb_manquants: int,
+        sans_alcool: bool = False,
+        limit: int = 10,
+        offset: int = 0,
+        cle: tuple[int, int] | None = None,
+        avant: bool = False,
+    ) -> tuple[list[tuple[int, int]], int, bool] | None:
+        """Cocktails auxquels il manque de 0 à nb_manquants ingrédients, avec ce nombre,
+        par nombre d'ingrédients manquants puis par nom
+
+        Parameters
+        ----------
+        cle : tuple[int, int], optional
+            (nombre de manquants, id_cocktail) d'un cocktail de bord de la page
+            voisine : la page commence juste après lui (pagination par clé)
+        avant : bool
+            La page se termine juste avant le cocktail de `cle` (page précédente)
+
+        Returns
+        -------
+        tuple[list[tuple[int, int]], int, bool] | None
+            (id_cocktail, nombre d'ingrédients manquants) de la page, nombre
+            total de cocktails de la liste, et s'il en reste au-delà de la page
+            dans le sens de lecture ; None si le cocktail de `cle` n'est plus
+            dans le catalogue (voir IndexManquants.page)
+        """
+        relation = self.relation()
+        if cle is not None and relation.position(cle[1]) is None:
+            return None
+        manquants = relation.manquants(ids_ingredients)
+        gardes = (manquants <= nb_manquants) & (relation.totaux > 0)
+        if sans_alcool:
+            gardes &= relation.sans_alcool
+        positions = np.flatnonzero(gardes)
+        positions = positions[np.argsort(manquants[positions], kind="stable")]
+        nombres = manquants[positions].astype(np.int64)
+        if cle is None:
+            debut = 0
+        else:
+            # Liste triée sur (manquants, position), codé en un seul entier
+            n = len(relation.totaux)
+            debut = int(
+                np.searchsorted(
+                    nombres * n + positions,
+                    min(max(cle[0], -1), nb_manquants + 1) * n + relation.position(cle[1]),
+                    side="left" if avant else "right",
+                )
+            )
+        debut, fin, encore = tranche(len(positions), debut, limit, offset, avant)
+        return list(zip(relation.ids(positions[debut:fin]), nombres[debut:fin].tolist())), len(positions), encore
+
+
+@abonner_rechargement
+def _invalider_moteur():
+    MoteurRealisabilite().invalider()
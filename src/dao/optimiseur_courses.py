@@ -0,0 +1,239 @@
+import time
+
+import numpy as np
+
+from dao.moteur_realisabilite import MoteurRealisabilite, RelationBits
+from utils.singleton import Singleton
+
+# Nombre maximal d'ingrédients à acheter
+K_MAX = 10
+# Taille maximale d'un lot d'ingrédients ajouté en une étape (3 au plus, voir _lots)
+TAILLE_LOT = 3
+# Durée au-delà de laquelle la recherche s'arrête et renvoie la meilleure solution trouvée
+DELAI_MS = 200
+
+
+class OptimiseurCourses(metaclass=Singleton):
+    """
+    Choix des k ingrédients à acheter qui rendent réalisables le plus de cocktails
+
+    Le problème (couverture maximale sous budget) est NP-difficile ; on le
+    résout par une recherche gloutonne sur les ensembles d'ingrédients
+    manquants de chaque cocktail, tirés de la relation en bits :
+
+    - à chaque étape, les candidats sont les ensembles manquants distincts
+      d'au plus TAILLE_LOT ingrédients tenant dans le budget restant ;
+    - un candidat vaut le nombre de cocktails dont l'ensemble manquant est
+      inclus dans le sien (somme des comptes de ses sous-ensembles, lus
+      dans des tables de comptes par singleton et par paire) ;
+    - on ajoute le meilleur candidat, puis on recommence avec le budget
+      restant, en écartant les cocktails qui n'y tiennent plus.
+
+    Deux critères sont essayés (cocktails par ingrédient acheté, puis
+    cocktails tout court) et la meilleure des deux solutions est gardée :
+    c'est la garantie classique de la couverture sous budget, le premier
+    critère seul pouvant gaspiller le budget.
+
+    Tout est vectorisé : le temps dépend du nombre de cocktails
+    atteignables en k ingrédients, pas du nombre de combinaisons. La
+    recherche est de plus bornée dans le temps (DELAI_MS) : passé ce délai,
+    elle s'arrête à la fin de l'étape en cours.
+
+    Mesures : PYTHONPATH=src python src/benchmarks/bench_optimiseur_courses.py
+    """
+
+    def meilleurs_achats(
+        self, ids_ingredients: list[int], k: int, sans_alcool: bool = False, delai_ms: float = DELAI_MS
+    ) -> tuple[list[int], int]:
+        """Ingrédients à acheter et nombre de cocktails qu'ils rendent réalisables
+
+        Parameters
+        ----------
+        ids_ingredients : list[int]
+            Inventaire de l'utilisateur
+        k : int
+            Nombre maximal d'ingrédients à acheter (K_MAX au plus)
+        sans_alcool : bool
+            Ne compter que les cocktails "Non alcoholic"
+        delai_ms : float
+            Durée maximale de la recherche : une fois dépassée, elle s'arrête
+            à la fin de l'étape en cours et renvoie la meilleure solution trouvée
+
+        Returns
+        -------
+        tuple[list[int], int]
+            (identifiants des ingrédients, dans l'ordre du choix ; nombre de
+            cocktails nouvellement réalisables). Moins de k ingrédients si
+            aucun achat supplémentaire ne complète de cocktail.
+        """
+        return meilleurs_achats(MoteurRealisabilite().relation(), ids_ingredients, k, sans_alcool, delai_ms)
+
+
+def ensembles_manquants(relation: RelationBits, ids_ingredients: list[int], k: int, sans_alcool: bool = False):
+    """Ingrédients manquants des cocktails réalisables en achetant au plus k ingrédients
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Couples (ligne, colonne) triés par ligne puis par colonne : une ligne
+        par cocktail atteignable (numérotées à partir de 0), une colonne par
+        ingrédient manquant
+    """
+    manquants = relation.manquants(ids_ingredients)
+    atteignables = (manquants >= 1) & (manquants <= k)
+    if sans_alcool:
+        atteignables &= relation.sans_alcool
+    possedes = np.zeros(len(relation.ids_ingredients), dtype=bool)
+    possedes[relation.colonnes(ids_ingredients)] = True
+
+    gardes = atteignables[relation.paires_positions] & ~possedes[relation.paires_colonnes]
+    lignes = np.cumsum(atteignables, dtype=np.int32)[relation.paires_positions[gardes]] - 1
+    return lignes, relation.paires_colonnes[gardes].astype(np.int32)
+
+
+def meilleurs_achats(
+    relation: RelationBits,
+    ids_ingredients: list[int],
+    k: int,
+    sans_alcool: bool = False,
+    delai_ms: float = DELAI_MS,
+) -> tuple[list[int], int]:
+    """Voir OptimiseurCourses.meilleurs_achats"""
+    if not 1 <= k <= K_MAX:
+        raise ValueError(f"k doit être compris entre 1 et {K_MAX}")
+    fin = time.monotonic() + delai_ms / 1000
+    lignes, colonnes = ensembles_manquants(relation, ids_ingredients, k, sans_alcool)
+    nb_colonnes = len(relation.ids_ingredients)
+
+    meilleur = ([], 0)
+    # Les deux recherches passent souvent par les mêmes ensembles d'ingrédients
+    # achetés : l'état et les lots de chaque étape sont partagés
+    nb_lignes = int(lignes[-1]) + 1 if len(lignes) else 0
+    etapes = {(): _Etape(lignes, colonnes, np.bincount(lignes, minlength=nb_lignes), 0)}
+    for par_ingredient in (True, False):
+        choix, gain = _glouton(etapes, nb_colonnes, k, par_ingredient, fin)
+        if gain > meilleur[1]:
+            meilleur = (choix, gain)
+        if time.monotonic() > fin:
+            break
+    return relation.ingredient_de[meilleur[0]].tolist(), meilleur[1]
+
+
+class _Etape:
+    """Cocktails encore atteignables après une suite d'achats"""
+
+    def __init__(self, lignes: np.ndarray, colonnes: np.ndarray, tailles: np.ndarray, nb_completes: int):
+        """Constructeur"""
+        self.lignes = lignes
+        self.colonnes = colonnes
+        self.tailles = tailles
+        self.nb_completes = nb_completes
+        self.lots = None
+
+    def suivante(self, lot: np.ndarray, nb_colonnes: int, budget: int) -> "_Etape":
+        """Étape après l'achat du lot, avec budget ingrédients encore à acheter
+
+        Les ingrédients du lot ne manquent plus ; les cocktails complétés et
+        ceux qui ne tiennent plus dans le budget sont écartés.
+        """
+        retires = np.zeros(nb_colonnes, dtype=bool)
+        retires[lot] = True
+        retires = retires[self.colonnes]
+        moins = np.bincount(self.lignes[retires], minlength=len(self.tailles))
+        tailles = self.tailles - moins
+        nb_completes = self.nb_completes + int(np.count_nonzero((moins > 0) & (tailles == 0)))
+        tailles[tailles > budget] = 0
+        gardes = ~retires & (tailles[self.lignes] > 0)
+        return _Etape(self.lignes[gardes], self.colonnes[gardes], tailles, nb_completes)
+
+
+def _glouton(etapes: dict, nb_colonnes: int, k: int, par_ingredient: bool, fin: float) -> tuple[list[int], int]:
+    """Ajout répété du meilleur lot d'ingrédients manquants tant que le budget
+    (et le temps, jusqu'à fin en time.monotonic) le permet
+
+    Returns
+    -------
+    tuple[list[int], int]
+        (colonnes choisies, nombre de cocktails complétés)
+    """
+    choix = []
+    etape = etapes[()]
+    while len(choix) < k and time.monotonic() <= fin:
+        if etape.lots is None:
+            etape.lots = _lots(
+                etape.lignes, etape.colonnes, etape.tailles, nb_colonnes, min(TAILLE_LOT, k - len(choix))
+            )
+        lots, tailles_lots, valeurs = etape.lots
+        if not len(lots):
+            break
+
+        score = valeurs / tailles_lots if par_ingredient else valeurs
+        # Meilleur score, puis plus grande valeur, puis plus petit lot (ordre déterministe)
+        meilleur = np.lexsort((tailles_lots, -valeurs, -score))[0]
+        lot = lots[meilleur][: tailles_lots[meilleur]]
+        choix += lot.tolist()
+
+        cle = tuple(sorted(choix))
+        if cle not in etapes:
+            etapes[cle] = etape.suivante(lot, nb_colonnes, k - len(choix))
+        etape = etapes[cle]
+    return choix, etape.nb_completes
+
+
+def _lots(lignes: np.ndarray, colonnes: np.ndarray, tailles: np.ndarray, nb_colonnes: int, largeur: int):
+    """Ensembles manquants distincts d'au plus largeur colonnes et leur valeur
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        (lots : colonnes croissantes complétées par nb_colonnes, tailles des
+        lots, nombre de cocktails dont l'ensemble manquant est inclus dans le lot)
+    """
+    # Colonnes des petits ensembles, une ligne par cocktail
+    petits = (tailles >= 1) & (tailles <= largeur)
+    gardes = petits[lignes]
+    lignes, colonnes = lignes[gardes], colonnes[gardes]
+    if not len(lignes):
+        return np.empty((0, largeur), dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+    nouvelles = np.r_[True, lignes[1:] != lignes[:-1]]
+    rangs = np.cumsum(nouvelles) - 1
+    debuts = np.flatnonzero(nouvelles)
+    ensembles = np.full((len(debuts), largeur), nb_colonnes, dtype=np.int64)
+    ensembles[rangs, np.arange(len(lignes)) - debuts[rangs]] = colonnes
+
+    # Ensembles distincts : clés triées, décodées en lots
+    base = nb_colonnes + 1
+    cles = np.sort(_cles(ensembles, base))
+    debuts = np.flatnonzero(np.r_[True, cles[1:] != cles[:-1]])
+    comptes = np.diff(np.r_[debuts, len(cles)])
+    cles = cles[debuts]
+    lots = np.empty((len(cles), largeur), dtype=np.int64)
+    for j in reversed(range(largeur)):
+        cles, lots[:, j] = np.divmod(cles, base)
+    tailles_lots = (lots != nb_colonnes).sum(axis=1)
+
+    # Valeur d'un lot : somme des comptes de ses sous-ensembles présents.
+    # Singletons et paires sont lus dans des tables denses indexées par les
+    # colonnes (la sentinelle nb_colonnes a un compte nul) ; un lot de 3
+    # colonnes n'a pas d'autre sous-ensemble de cette taille que lui-même.
+    par_singleton = np.zeros(base, dtype=np.int64)
+    par_paire = np.zeros((base, base), dtype=np.int64)
+    uns, deux = tailles_lots == 1, tailles_lots == 2
+    par_singleton[lots[uns, 0]] = comptes[uns]
+    if largeur >= 2:
+        par_paire[lots[deux, 0], lots[deux, 1]] = comptes[deux]
+
+    valeurs = np.where(tailles_lots == 3, comptes, 0)
+    for j in range(largeur):
+        valeurs += par_singleton[lots[:, j]]
+        for m in range(j + 1, largeur):
+            valeurs += par_paire[lots[:, j], lots[:, m]]
+    return lots, tailles_lots, valeurs
+
+
+def _cles(lots: np.ndarray, base: int) -> np.ndarray:
+    """Une clé entière par ligne de colonnes triées"""
+    cles = np.zeros(len(lots), dtype=np.int64)
+    for j in range(lots.shape[1]):
+        cles = cles * base + lots[:, j]
+    return cles
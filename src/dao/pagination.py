@@ -0,0 +1,252 @@
+import base64
+import json
+from bisect import bisect_left, bisect_right
+
+
+class Page(list):
+    """
+    Page d'une liste paginée par curseur
+
+    Une liste ordinaire (les éléments de la page) qui porte en plus :
+    - suivant : curseur de la page suivante (None s'il n'y a plus rien après)
+    - precedent : curseur de la page précédente (None sur la première page)
+    - total : nombre d'éléments de toute la liste, compté dans la même
+      requête que la page ; au-delà de TOTAL_MAX le comptage s'arrête
+      (total = TOTAL_MAX, total_exact = False)
+
+    Pagination par clé (keyset) : le curseur encode la clé de tri d'un
+    élément de bord de la page, par exemple (nom_cocktail, id_cocktail), et
+    la page suivante est lue avec WHERE (nom_cocktail, id_cocktail) > (clé)
+    (la précédente avec < et un tri inversé). Son coût ne dépend pas de sa
+    profondeur, contrairement à OFFSET qui relit puis écarte toutes les
+    lignes précédentes.
+    """
+
+    def __init__(
+        self,
+        elements=(),
+        suivant: str | None = None,
+        precedent: str | None = None,
+        total: int | None = None,
+        total_exact: bool = True,
+    ):
+        """Constructeur"""
+        super().__init__(elements)
+        self.suivant = suivant
+        self.precedent = precedent
+        self.total = len(self) if total is None else total
+        self.total_exact = total_exact
+
+    @property
+    def a_suivant(self) -> bool:
+        """Vrai s'il reste des éléments après cette page"""
+        return self.suivant is not None
+
+
+# Au-delà, le total d'une liste n'est plus compté exactement (comptage borné)
+TOTAL_MAX = 10_000
+
+
+def construire_page(
+    elements: list,
+    cles: list[tuple],
+    total: int,
+    encore: bool,
+    avant: bool = False,
+    depuis_debut: bool = True,
+) -> Page:
+    """Page à partir des éléments lus, dans l'ordre de la liste
+
+    Parameters
+    ----------
+    elements : list
+        Éléments de la page, dans l'ordre de la liste
+    cles : list[tuple]
+        Clé de tri de chaque élément
+    total : int
+        Nombre d'éléments de la liste (borné à TOTAL_MAX + 1)
+    encore : bool
+        Vrai s'il reste des éléments au-delà de la page, dans le sens de lecture
+    avant : bool
+        Page lue vers l'arrière (curseur de page précédente)
+    depuis_debut : bool
+        Page lue depuis le début de la liste (ni curseur ni décalage)
+    """
+    if avant:
+        suivant = encoder_curseur(cles[-1]) if elements else None
+        precedent = encoder_curseur(cles[0]) if encore and elements else None
+    else:
+        suivant = encoder_curseur(cles[-1]) if encore and elements else None
+        precedent = None if depuis_debut or not elements else encoder_curseur(cles[0])
+    return Page(elements, suivant, precedent, min(total, TOTAL_MAX), total <= TOTAL_MAX)
+
+
+def requete_page(
+    requete: str,
+    colonnes_cle: tuple,
+    params: dict,
+    limit: int,
+    offset: int,
+    cle: tuple | None,
+    avant: bool,
+    materialiser: bool = False,
+) -> str:
+    """Requête qui lit une page et le nombre total de résultats en une fois
+
+    La requête de base (sans tri ni pagination) devient une CTE, lue deux fois :
+    - le total, compté jusqu'à TOTAL_MAX + 1 lignes au plus (comptage borné :
+      une liste immense ne se compte pas en entier à chaque page) ;
+    - la page, après (ou avant) la clé de tri du curseur, avec une ligne de
+      plus que limit pour savoir s'il en reste au-delà.
+    La page est jointe au total par un LEFT JOIN LATERAL : une page vide
+    donne une ligne sans résultat, qui porte quand même le total (dernière
+    colonne). Les paramètres de la page sont ajoutés à params.
+
+    Parameters
+    ----------
+    requete : str
+        Requête de base ; ses colonnes comprennent celles de colonnes_cle
+    colonnes_cle : tuple
+        Colonnes de la clé de tri (la dernière doit être unique, ex : id_cocktail)
+    materialiser : bool
+        Calculer la requête de base une seule fois (agrégation par
+        utilisateur, dont toutes les lignes sont de toute façon lues) ;
+        sinon elle est recopiée dans les deux lectures, ce qui laisse la
+        page suivre un index sur la clé et le comptage s'arrêter tôt.
+    """
+    comparaison, sens = ("<", " DESC") if avant else (">", "")
+    colonnes = ", ".join(f"r.{colonne}" for colonne in colonnes_cle)
+    filtre = ""
+    if cle is not None:
+        marqueurs = ", ".join(f"%(cle_{i})s" for i in range(len(cle)))
+        filtre = f"WHERE ({colonnes}) {comparaison} ({marqueurs})"
+        params.update({f"cle_{i}": valeur for i, valeur in enumerate(cle)})
+    tri = ", ".join(f"r.{colonne}{sens}" for colonne in colonnes_cle)
+    params.update({"total_max": TOTAL_MAX + 1, "limit_lu": limit + 1, "offset": offset})
+    return f"""
+        WITH resultats AS {"MATERIALIZED" if materialiser else "NOT MATERIALIZED"} ({requete})
+        SELECT p.*, t.total
+        FROM (SELECT COUNT(*) AS total FROM (SELECT 1 FROM resultats LIMIT %(total_max)s) n) t
+        LEFT JOIN LATERAL (
+            SELECT * FROM resultats r {filtre}
+            ORDER BY {tri}
+            LIMIT %(limit_lu)s OFFSET %(offset)s
+        ) p ON TRUE;
+        """
+
+
+def lire_page(lignes: list, construire, cle_de, limit: int, avant: bool, depuis_debut: bool) -> Page:
+    """Page à partir des lignes lues par une requête de requete_page
+
+    Parameters
+    ----------
+    lignes : list
+        Lignes du résultat (la première colonne est vide pour une page vide,
+        la dernière porte le total)
+    construire : callable
+        Ligne -> élément de la page
+    cle_de : callable
+        Ligne -> clé de tri de l'élément
+    """
+    total = lignes[0][-1]
+    # La ligne d'une page vide n'a pas de résultat
+    lignes = [row for row in lignes if row[0] is not None]
+    encore = len(lignes) > limit
+    lignes = lignes[:limit]
+    if avant:
+        lignes.reverse()
+    return construire_page(
+        [construire(row) for row in lignes],
+        [cle_de(row) for row in lignes],
+        total,
+        encore,
+        avant,
+        depuis_debut,
+    )
+
+
+def tranche(total: int, rang: int, limit: int, offset: int, avant: bool = False) -> tuple[int, int, bool]:
+    """Bornes [debut, fin) de la page dans une liste de total éléments déjà triée
+
+    Parameters
+    ----------
+    rang : int
+        Indice où commence la lecture : premier élément après la clé du
+        curseur, ou (avant) premier élément à partir de la clé
+    avant : bool
+        Page lue vers l'arrière : elle se termine à rang
+
+    Returns
+    -------
+    tuple[int, int, bool]
+        debut, fin, et s'il reste des éléments au-delà de la page dans le sens de lecture
+    """
+    if avant:
+        fin = max(0, rang - offset)
+        debut = max(0, fin - limit)
+        return debut, fin, debut > 0
+    debut = min(total, rang + offset)
+    fin = min(total, debut + limit)
+    return debut, fin, fin < total
+
+
+def rang(cles: list[tuple], cle: tuple | None, avant: bool = False) -> int:
+    """Rang où commence la lecture (voir tranche) dans une liste triée selon cles
+
+    Premier élément après la clé du curseur, ou (avant) premier élément à
+    partir d'elle ; la clé n'a pas besoin d'être encore dans la liste.
+    """
+    if cle is None:
+        return 0
+    return (bisect_left if avant else bisect_right)(cles, cle)
+
+
+def encoder_curseur(cle: tuple) -> str:
+    """Curseur opaque (base64 URL) d'une clé de tri"""
+    texte = json.dumps(list(cle), ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(texte.encode()).decode().rstrip("=")
+
+
+def decoder_curseur(curseur: str, types: tuple) -> tuple:
+    """Clé de tri encodée par encoder_curseur
+
+    Parameters
+    ----------
+    curseur : str
+        Curseur reçu du client
+    types : tuple
+        Type attendu de chaque composante de la clé, ex : (str, int)
+
+    Raises
+    ------
+    ValueError
+        Si le curseur n'a pas été produit par encoder_curseur pour une clé de cette forme
+    """
+    try:
+        texte = base64.urlsafe_b64decode(curseur + "=" * (-len(curseur) % 4)).decode()
+        cle = json.loads(texte)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Curseur de pagination invalide") from None
+    if (
+        not isinstance(cle, list)
+        or len(cle) != len(types)
+        # bool est un int pour isinstance : exclu explicitement
+        or not all(isinstance(v, t) and not isinstance(v, bool) for v, t in zip(cle, types))
+    ):
+        raise ValueError("Curseur de pagination invalide")
+    return tuple(cle)
+
+
+def cle_des_curseurs(apres: str | None, avant: str | None, types: tuple) -> tuple[tuple | None, bool]:
+    """Clé de tri décodée du curseur reçu, et vrai s'il s'agit d'un curseur de page précédente
+
+    Raises
+    ------
+    ValueError
+        Si les deux curseurs sont donnés, ou si le curseur est invalide
+    """
+    if apres is not None and avant is not None:
+        raise ValueError("Un seul curseur de pagination à la fois : 'apres' ou 'avant'")
+    if avant is not None:
+        return decoder_curseur(avant, types), True
+    return (None if apres is None else decoder_curseur(apres, types)), False
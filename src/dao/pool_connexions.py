@@ -0,0 +1,212 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.pool import PoolError
+
+
+class PoolConnexionsEpuise(PoolError):
+    """Aucune connexion ne s'est libérée avant la fin du délai d'attente."""
+
+
+class PoolConnexions:
+    """
+    Pool de connexions psycopg2 utilisable depuis plusieurs threads
+
+    FastAPI exécute les endpoints synchrones dans un pool de threads :
+    chaque appel emprunte sa propre connexion au lieu de faire la queue
+    derrière une connexion unique.
+
+    Attributs
+    ----------
+    min_connexions : int
+        nombre de connexions ouvertes dès la création du pool
+    max_connexions : int
+        nombre maximal de connexions ouvertes simultanément
+    delai_attente : float
+        durée maximale (en secondes) d'attente d'une connexion libre
+    """
+
+    def __init__(self, min_connexions=1, max_connexions=10, delai_attente=5.0, **parametres):
+        """Constructeur : ouvre immédiatement min_connexions connexions"""
+        if min_connexions < 0 or max_connexions < 1 or min_connexions > max_connexions:
+            raise ValueError("Il faut 0 <= min_connexions <= max_connexions et max_connexions >= 1")
+
+        self.min_connexions = min_connexions
+        self.max_connexions = max_connexions
+        self.delai_attente = delai_attente
+        self._parametres = parametres
+
+        self._condition = threading.Condition()
+        self._libres = []
+        self._nb_ouvertes = 0
+        self._nb_empruntees = 0
+        self._nb_en_attente = 0
+
+        self._nb_emprunts = 0
+        self._nb_attentes = 0
+        self._nb_expirations = 0
+        self._nb_creees = 0
+        self._nb_jetees = 0
+        self._temps_attente_total = 0.0
+        self._temps_attente_max = 0.0
+
+        for _ in range(min_connexions):
+            self._libres.append(self._ouvrir())
+            self._nb_ouvertes += 1
+
+    def _ouvrir(self):
+        """Ouverture d'une nouvelle connexion physique"""
+        connexion = psycopg2.connect(**self._parametres)
+        with self._condition:
+            self._nb_creees += 1
+        return connexion
+
+    def prendre(self, delai=None):
+        """Emprunter une connexion au pool
+
+        Parameters
+        ----------
+        delai : float, optional
+            Durée maximale d'attente en secondes (par défaut delai_attente)
+
+        Returns
+        -------
+        connection
+            Une connexion psycopg2 réservée à l'appelant
+
+        Raises
+        ------
+        PoolConnexionsEpuise
+            Si aucune connexion ne s'est libérée à temps
+        """
+        delai = self.delai_attente if delai is None else delai
+        debut = time.perf_counter()
+        echeance = debut + delai
+        a_attendu = False
+        connexion = None
+
+        with self._condition:
+            while True:
+                if self._libres:
+                    connexion = self._libres.pop()
+                    break
+                if self._nb_ouvertes < self.max_connexions:
+                    # On réserve la place, l'ouverture se fait hors du verrou
+                    self._nb_ouvertes += 1
+                    break
+                restant = echeance - time.perf_counter()
+                if restant <= 0:
+                    self._nb_expirations += 1
+                    raise PoolConnexionsEpuise(
+                        f"Aucune connexion libre après {delai:.3f}s "
+                        f"({self.max_connexions} connexions déjà utilisées)"
+                    )
+                a_attendu = True
+                self._nb_en_attente += 1
+                self._condition.wait(restant)
+                self._nb_en_attente -= 1
+
+            attente = time.perf_counter() - debut
+            self._nb_emprunts += 1
+            self._nb_empruntees += 1
+            self._nb_attentes += int(a_attendu)
+            self._temps_attente_total += attente
+            self._temps_attente_max = max(self._temps_attente_max, attente)
+
+        if connexion is None or connexion.closed:
+            if connexion is not None:
+                # Connexion fermée côté serveur pendant qu'elle dormait : on la remplace
+                with self._condition:
+                    self._nb_jetees += 1
+            try:
+                connexion = self._ouvrir()
+            except Exception:
+                with self._condition:
+                    self._nb_ouvertes -= 1
+                    self._nb_empruntees -= 1
+                    self._condition.notify()
+                raise
+
+        return connexion
+
+    def rendre(self, connexion):
+        """Rendre une connexion au pool
+
+        Une transaction laissée ouverte est annulée ; une connexion cassée est jetée.
+        """
+        if not connexion.closed and connexion.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                connexion.rollback()
+            except psycopg2.Error:
+                logging.exception("Impossible d'annuler la transaction avant de rendre la connexion")
+                connexion.close()
+
+        with self._condition:
+            self._nb_empruntees -= 1
+            if connexion.closed:
+                self._nb_ouvertes -= 1
+                self._nb_jetees += 1
+            else:
+                self._libres.append(connexion)
+            self._condition.notify()
+
+    @contextmanager
+    def connexion(self, delai=None):
+        """Contexte qui emprunte une connexion et la rend à la sortie
+
+        Même comportement que `with connection:` de psycopg2 : commit si le bloc
+        se termine normalement, rollback s'il lève une exception.
+        """
+        connexion = self.prendre(delai)
+        try:
+            yield connexion
+        except BaseException:
+            if not connexion.closed:
+                try:
+                    connexion.rollback()
+                except psycopg2.Error:
+                    connexion.close()
+            raise
+        else:
+            connexion.commit()
+        finally:
+            self.rendre(connexion)
+
+    def metriques(self) -> dict:
+        """Photographie des compteurs du pool
+
+        Returns
+        -------
+        dict
+            taille, connexions libres / empruntées, threads en attente,
+            nombre d'emprunts, d'attentes et d'expirations, temps d'attente (ms)
+        """
+        with self._condition:
+            return {
+                "taille": self._nb_ouvertes,
+                "min": self.min_connexions,
+                "max": self.max_connexions,
+                "libres": len(self._libres),
+                "empruntees": self._nb_empruntees,
+                "en_attente": self._nb_en_attente,
+                "emprunts": self._nb_emprunts,
+                "attentes": self._nb_attentes,
+                "expirations": self._nb_expirations,
+                "connexions_creees": self._nb_creees,
+                "connexions_jetees": self._nb_jetees,
+                "attente_totale_ms": round(self._temps_attente_total * 1000, 3),
+                "attente_max_ms": round(self._temps_attente_max * 1000, 3),
+            }
+
+    def fermer(self):
+        """Fermer toutes les connexions libres du pool"""
+        with self._condition:
+            for connexion in self._libres:
+                connexion.close()
+            self._nb_ouvertes -= len(self._libres)
+            self._libres.clear()
+            self._condition.notify_all()
@@ -0,0 +1,132 @@
+import hashlib
+import threading
+import time
+import weakref
+
+from dao.sql_utils import convertir_requete
+from utils.singleton import Singleton
+
+
+class RegistreRequetesPreparees(metaclass=Singleton):
+    """
+    Registre des requêtes préparées côté serveur (PREPARE / EXECUTE)
+
+    Une requête est préparée une seule fois par connexion du pool, puis
+    exécutée avec ses paramètres : Postgres ne refait plus l'analyse
+    syntaxique et, après quelques exécutions, réutilise un plan générique.
+
+    Le nom d'une requête préparée contient une empreinte du texte SQL :
+    chaque variante (colonne d'instructions selon la langue, filtres
+    présents...) obtient donc sa propre requête préparée.
+    """
+
+    def __init__(self):
+        """Constructeur"""
+        self._verrou = threading.Lock()
+        # connexion -> noms des requêtes déjà préparées sur cette connexion
+        self._preparees = weakref.WeakKeyDictionary()
+        # nom -> compteurs
+        self._statistiques = {}
+        self._generation = 0
+
+    def nom_requete(self, prefixe: str, requete: str) -> str:
+        """Nom de la requête préparée : préfixe + empreinte du texte SQL"""
+        empreinte = hashlib.sha1(requete.encode("utf-8")).hexdigest()[:10]
+        return f"{prefixe}_{empreinte}_g{self._generation}"
+
+    def executer(self, cursor, prefixe: str, requete: str, parametres: dict | None = None):
+        """Exécuter une requête via sa version préparée
+
+        Parameters
+        ----------
+        cursor : cursor
+            Curseur psycopg2 d'une connexion du pool
+        prefixe : str
+            Nom lisible de la requête (ex : "cocktail_complet")
+        requete : str
+            Requête SQL avec des paramètres nommés %(nom)s
+        parametres : dict, optional
+            Valeurs des paramètres
+        """
+        sql, valeurs = convertir_requete(requete, parametres)
+        nom = self.nom_requete(prefixe, requete)
+        connexion = cursor.connection
+
+        with self._verrou:
+            deja_preparees = self._preparees.setdefault(connexion, set())
+            a_preparer = nom not in deja_preparees
+            stats = self._statistiques.setdefault(
+                nom,
+                {"prefixe": prefixe, "preparations": 0, "executions": 0, "preparation_s": 0.0},
+            )
+
+        if a_preparer:
+            debut = time.perf_counter()
+            cursor.execute(f"PREPARE {nom} AS {sql.rstrip().rstrip(';')}")
+            duree = time.perf_counter() - debut
+            with self._verrou:
+                deja_preparees.add(nom)
+                stats["preparations"] += 1
+                stats["preparation_s"] += duree
+
+        if valeurs:
+            marqueurs = ", ".join(["%s"] * len(valeurs))
+            cursor.execute(f"EXECUTE {nom} ({marqueurs});", valeurs)
+        else:
+            cursor.execute(f"EXECUTE {nom};")
+
+        with self._verrou:
+            stats["executions"] += 1
+
+    def statistiques(self) -> list[dict]:
+        """Compteurs par requête préparée
+
+        Le gain estimé correspond au temps de préparation (analyse et réécriture
+        de la requête) évité à chaque réutilisation : exécutions qui n'ont pas
+        eu besoin d'un PREPARE multipliées par la durée moyenne d'un PREPARE.
+
+        Returns
+        -------
+        list[dict]
+            nom, prefixe, preparations, executions, preparation_ms_moyen, gain_estime_ms
+        """
+        resultat = []
+        with self._verrou:
+            for nom, stats in sorted(self._statistiques.items()):
+                moyenne = stats["preparation_s"] / stats["preparations"] if stats["preparations"] else 0
+                reutilisations = stats["executions"] - stats["preparations"]
+                resultat.append(
+                    {
+                        "nom": nom,
+                        "prefixe": stats["prefixe"],
+                        "preparations": stats["preparations"],
+                        "executions": stats["executions"],
+                        "preparation_ms_moyen": round(moyenne * 1000, 3),
+                        "gain_estime_ms": round(max(reutilisations, 0) * moyenne * 1000, 3),
+                    }
+                )
+        return resultat
+
+    @staticmethod
+    def plans(cursor) -> list:
+        """Requêtes préparées de la connexion du curseur, avec le nombre de plans
+        génériques (planification évitée) et personnalisés utilisés par Postgres"""
+        cursor.execute(
+            """
+            SELECT name, generic_plans, custom_plans
+            FROM pg_prepared_statements
+            ORDER BY name;
+            """
+        )
+        return cursor.fetchall()
+
+    def reinitialiser(self):
+        """Oublier les requêtes préparées (après une réinitialisation du schéma)
+
+        Les anciennes requêtes restent sur le serveur jusqu'à la fermeture des
+        connexions ; les nouvelles portent un autre numéro de génération.
+        """
+        with self._verrou:
+            self._generation += 1
+            self._preparees = weakref.WeakKeyDictionary()
+            self._statistiques = {}
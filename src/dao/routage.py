@@ -0,0 +1,50 @@
+import contextvars
+import inspect
+from functools import wraps
+
+# Méthode de DAO en cours d'exécution marquée @lecture_seule (None sinon).
+# Valeur : identifiant de l'utilisateur concerné par la lecture, ou 0 si inconnu
+_lecture_en_cours = contextvars.ContextVar("lecture_en_cours", default=None)
+
+
+def lecture_en_cours():
+    """None hors d'une méthode @lecture_seule, sinon l'id utilisateur lu (0 si inconnu)"""
+    return _lecture_en_cours.get()
+
+
+def lecture_seule(func=None, *, cle_utilisateur=None):
+    """Décorateur marquant une méthode de DAO comme lecture seule
+
+    Les connexions empruntées pendant l'appel peuvent être servies par la
+    base de lecture (voir DBConnection). Avec cle_utilisateur, le paramètre
+    nommé donne l'utilisateur lu : s'il vient de modifier son inventaire, la
+    lecture repart sur la base principale (lecture de ses propres écritures).
+
+    Exemples
+    --------
+    @lecture_seule
+    def lister_categories(self): ...
+
+    @lecture_seule(cle_utilisateur="id_utilisateur")
+    def cocktail_complet(self, id_utilisateur, ...): ...
+    """
+
+    def decorateur(fonction):
+        signature = inspect.signature(fonction)
+
+        @wraps(fonction)
+        def wrapper(*args, **kwargs):
+            # Appel imbriqué sans clé : l'utilisateur de la méthode appelante reste valable
+            id_utilisateur = _lecture_en_cours.get() or 0
+            if cle_utilisateur:
+                arguments = signature.bind_partial(*args, **kwargs).arguments
+                id_utilisateur = arguments.get(cle_utilisateur) or 0
+            jeton = _lecture_en_cours.set(id_utilisateur)
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                _lecture_en_cours.reset(jeton)
+
+        return wrapper
+
+    return decorateur(func) if func is not None else decorateur
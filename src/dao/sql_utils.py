@@ -0,0 +1,37 @@
+import re
+
+_PARAMETRE_NOMME = re.compile(r"%\((\w+)\)s|%%")
+
+
+def convertir_requete(requete: str, parametres: dict | None = None) -> tuple:
+    """Convertit une requête au format psycopg2 (%(nom)s) au format positionnel ($1, $2...)
+
+    Les DAO asynchrones (asyncpg) écrivent ainsi leurs requêtes comme les DAO
+    synchrones ; RegistreRequetesPreparees s'en sert pour ses PREPARE.
+
+    Parameters
+    ----------
+    requete : str
+        Requête SQL avec des paramètres nommés %(nom)s
+    parametres : dict, optional
+        Valeurs des paramètres
+
+    Returns
+    -------
+    tuple
+        (requête avec paramètres positionnels, liste des valeurs)
+    """
+    parametres = parametres or {}
+    positions = {}
+    valeurs = []
+
+    def remplacer(match):
+        nom = match.group(1)
+        if nom is None:
+            return "%"
+        if nom not in positions:
+            valeurs.append(parametres[nom])
+            positions[nom] = len(valeurs)
+        return f"${positions[nom]}"
+
+    return _PARAMETRE_NOMME.sub(remplacer, requete), valeurs
@@ -0,0 +1,132 @@
+import logging
+import random
+import threading
+from datetime import date
+
+import numpy as np
+
+from dao.db_connection import CurseurTuple, DBConnection
+from utils.catalogue import abonner_rechargement
+from utils.singleton import Singleton
+
+# Classe d'alcool des cocktails proposés aux mineurs
+SANS_ALCOOL = "Non alcoholic"
+
+
+def tirer(ids: np.ndarray, nombre: int, generateur: random.Random = random) -> list[int]:
+    """nombre identifiants distincts tirés au hasard (ou tous s'il y en a moins)
+
+    random.sample sur un range tire des positions sans les recopier : le coût
+    dépend du nombre tiré, pas de la taille du tableau.
+    """
+    positions = generateur.sample(range(len(ids)), min(nombre, len(ids)))
+    return ids[positions].tolist()
+
+
+class TirageCocktails(metaclass=Singleton):
+    """
+    Tirage aléatoire de cocktails sans ORDER BY RANDOM()
+
+    ORDER BY RANDOM() LIMIT n trie toute la table à chaque appel. Ici les
+    identifiants des cocktails sont gardés en mémoire, par classe d'alcool
+    (Alcoholic, Non alcoholic, ...) : un tirage sans remise de n cocktails
+    lit n positions au hasard dans le tableau voulu (tous les cocktails, ou
+    les seuls "Non alcoholic" pour un mineur), puis les cocktails sont lus
+    par leur clé primaire.
+
+    Le cocktail du jour est tiré avec un générateur initialisé par la date :
+    le même toute la journée, pour tous les processus de l'API ; il est gardé
+    en mémoire une fois lu (par langue).
+
+    Les identifiants sont lus au premier appel puis gardés jusqu'au prochain
+    rechargement du catalogue (voir utils.catalogue).
+    """
+
+    def __init__(self):
+        """Constructeur"""
+        self._verrou = threading.Lock()
+        self._donnees = None
+        self._du_jour = {}
+
+    def charger(self):
+        """Lire les identifiants et classes d'alcool des cocktails dans la base"""
+        with DBConnection().connection as connection:
+            with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+                cursor.execute("SELECT id_cocktail, alcool FROM cocktail ORDER BY id_cocktail;")
+                lignes = cursor.fetchall()
+        self.charger_cocktails(lignes)
+
+    def charger_cocktails(self, lignes: list[tuple]):
+        """Remplacer les tableaux d'identifiants
+
+        Parameters
+        ----------
+        lignes : list[tuple]
+            (id_cocktail, alcool), dans l'ordre des identifiants
+        """
+        ids = np.asarray([row[0] for row in lignes], dtype=np.int64)
+        classes = np.asarray([row[1] or "" for row in lignes], dtype=object)
+        self._donnees = {"tous": ids, **{classe: ids[classes == classe] for classe in set(classes.tolist())}}
+        self._du_jour = {}
+
+    def invalider(self):
+        """Oublier les identifiants : ils seront relus au prochain appel"""
+        self._donnees = None
+        self._du_jour = {}
+
+    def _ids(self, sans_alcool: bool) -> np.ndarray:
+        donnees = self._donnees
+        if donnees is None:
+            with self._verrou:
+                if self._donnees is None:
+                    self.charger()
+                donnees = self._donnees
+        return donnees.get(SANS_ALCOOL, np.empty(0, dtype=np.int64)) if sans_alcool else donnees["tous"]
+
+    def tirer(self, nombre: int, sans_alcool: bool = False) -> list[int]:
+        """Identifiants de nombre cocktails distincts tirés au hasard
+
+        Parameters
+        ----------
+        nombre : int
+            Nombre de cocktails (moins si le catalogue en compte moins)
+        sans_alcool : bool
+            Ne tirer que parmi les cocktails "Non alcoholic"
+        """
+        return tirer(self._ids(sans_alcool), nombre)
+
+    def du_jour(self, jour: date, sans_alcool: bool = False) -> int | None:
+        """Identifiant du cocktail du jour (None si aucun cocktail), le même pour une date donnée"""
+        ids = self._ids(sans_alcool)
+        if len(ids) == 0:
+            return None
+        return int(ids[random.Random(jour.toordinal()).randrange(len(ids))])
+
+    def cocktail_du_jour(self, jour: date, sans_alcool: bool, langue: str, lire):
+        """Cocktail du jour, lu par lire(id_cocktail) au premier appel de la journée puis gardé
+
+        Seuls les cocktails de la date demandée sont gardés : ceux de la veille
+        sont oubliés au premier appel du lendemain.
+        """
+        cle = (jour, sans_alcool, langue)
+        du_jour = self._du_jour
+        if cle not in du_jour:
+            id_cocktail = self.du_jour(jour, sans_alcool)
+            cocktail = None if id_cocktail is None else lire(id_cocktail)
+            du_jour = {c: v for c, v in du_jour.items() if c[0] == jour}
+            du_jour[cle] = cocktail
+            self._du_jour = du_jour
+        return du_jour[cle]
+
+
+def prechauffer():
+    """Lire les identifiants au démarrage de l'API (sinon au premier appel)"""
+    try:
+        TirageCocktails()._ids(False)
+    except Exception:
+        logging.exception("Identifiants des cocktails non lus au démarrage")
+
+
+@abonner_rechargement
+def _invalider_tirage():
+    TirageCocktails().invalider()
@@ -1,10 +1,28 @@
 import logging
+from typing import Iterator
 
 from business_object.utilisateur import Utilisateur
-from dao.db_connection import DBConnection
+from dao.db_connection import CurseurTuple, DBConnection
+from dao.index_manquants import IndexManquants
+from dao.mappeur import Mappeur
 from utils.log_decorator import log
 from utils.singleton import Singleton
 
+# Colonnes SQL -> paramètres du constructeur (voir Mappeur)
+MAPPEUR_UTILISATEUR = Mappeur(
+    Utilisateur,
+    {
+        "pseudo": "pseudo",
+        "mdp": "mdp",
+        "age": "age",
+        "langue": "langue",
+        "est_majeur": "est_majeur",
+        "date_creation": "date_creation",
+        "id_utilisateur": "id_utilisateur",
+        "cocktails_realises": "cocktails_realises",
+    },
+)
+
 
 class UtilisateurDao(metaclass=Singleton):
     """Classe contenant les méthodes pour accéder aux Utlilisateurs de la base de données"""
@@ -83,10 +101,10 @@ class UtilisateurDao(metaclass=Singleton):
         Utilisateur
             Renvoie l'utilisateur qui se connecte
         """
-        res = None
+        utilisateur = None
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
                     cursor.execute(
                         "SELECT *                           "
                         "  FROM utilisateur                      "
@@ -94,24 +112,10 @@ class UtilisateurDao(metaclass=Singleton):
                         "   AND mdp = %(mdp)s;              ",
                         {"pseudo": pseudo, "mdp": mdp},
                     )
-                    res = cursor.fetchone()
+                    utilisateur = MAPPEUR_UTILISATEUR.un(cursor)
         except Exception as e:
             logging.info(e)
 
-        utilisateur = None
-
-        if res:
-            utilisateur = Utilisateur(
-                pseudo=res["pseudo"],
-                mdp=res["mdp"],
-                age=res["age"],
-                langue=res["langue"],
-                est_majeur=res["est_majeur"],
-                date_creation=res["date_creation"],
-                id_utilisateur=res["id_utilisateur"],
-                cocktails_realises=res["cocktails_realises"],
-            )
-
         return utilisateur
 
     @log
@@ -142,6 +146,8 @@ class UtilisateurDao(metaclass=Singleton):
             logging.exception("Erreur lors de la création de compte")
             raise
 
+        if res > 0:
+            IndexManquants().oublier(utilisateur.id_utilisateur)
         return res > 0
 
     def supprimer_inventaire(self, id_utilisateur: int) -> bool:
@@ -178,6 +184,9 @@ class UtilisateurDao(metaclass=Singleton):
             )
             return False
 
+        if deleted > 0:
+            DBConnection().signaler_ecriture(id_utilisateur)
+            IndexManquants().oublier(id_utilisateur)
         return deleted > 0
 
     @log
@@ -196,31 +205,18 @@ class UtilisateurDao(metaclass=Singleton):
         """
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
                     cursor.execute(
                         "SELECT *                           "
                         "  FROM utilisateur                      "
                         " WHERE id_utilisateur = %(id_utilisateur)s;  ",
                         {"id_utilisateur": id_utilisateur},
                     )
-                    res = cursor.fetchone()
+                    utilisateur = MAPPEUR_UTILISATEUR.un(cursor)
         except Exception as e:
             logging.info(e)
             raise
 
-        utilisateur = None
-        if res:
-            utilisateur = Utilisateur(
-                pseudo=res["pseudo"],
-                mdp=res["mdp"],
-                age=res["age"],
-                langue=res["langue"],
-                est_majeur=res["est_majeur"],
-                date_creation=res["date_creation"],
-                id_utilisateur=res["id_utilisateur"],
-                cocktails_realises=res["cocktails_realises"],
-            )
-
         return utilisateur
 
     @log
@@ -239,31 +235,18 @@ class UtilisateurDao(metaclass=Singleton):
         """
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
                     cursor.execute(
                         "SELECT *                           "
                         "  FROM utilisateur                      "
                         " WHERE pseudo = %(pseudo)s;  ",
                         {"pseudo": pseudo},
                     )
-                    res = cursor.fetchone()
+                    utilisateur = MAPPEUR_UTILISATEUR.un(cursor)
         except Exception as e:
             logging.info(e)
             raise
 
-        utilisateur = None
-        if res:
-            utilisateur = Utilisateur(
-                pseudo=res["pseudo"],
-                mdp=res["mdp"],
-                age=res["age"],
-                langue=res["langue"],
-                est_majeur=res["est_majeur"],
-                date_creation=res["date_creation"],
-                id_utilisateur=res["id_utilisateur"],
-                cocktails_realises=res["cocktails_realises"],
-            )
-
         return utilisateur
 
     @log
@@ -282,34 +265,40 @@ class UtilisateurDao(metaclass=Singleton):
 
         try:
             with DBConnection().connection as connection:
-                with connection.cursor() as cursor:
+                with connection.cursor(cursor_factory=CurseurTuple) as cursor:
                     cursor.execute(
                         "SELECT *                              "
                         "  FROM utilisateur;                        "
                     )
-                    res = cursor.fetchall()
+                    liste_utilisateurs = MAPPEUR_UTILISATEUR.tous(cursor)
         except Exception as e:
             logging.info(e)
             raise
 
-        liste_utilisateurs = []
+        return liste_utilisateurs
+
+    @log
+    def iterer_tous(self, taille_lot: int = None) -> Iterator[Utilisateur]:
+        """Parcourir tous les utilisateurs sans les charger tous en mémoire
 
-        if res:
-            for row in res:
-                utilisateur = Utilisateur(
-                    pseudo=row["pseudo"],
-                    mdp=row["mdp"],
-                    age=row["age"],
-                    langue=row["langue"],
-                    est_majeur=row["est_majeur"],
-                    date_creation=row["date_creation"],
-                    id_utilisateur=row["id_utilisateur"],
-                    cocktails_realises=row["cocktails_realises"],
-                )
+        Les lignes sont lues par lots de taille_lot via un curseur serveur
+        (voir DBConnection.flux).
 
-                liste_utilisateurs.append(utilisateur)
+        Parameters
+        ----------
+        taille_lot : int, optional
+            Nombre d'utilisateurs lus par aller-retour avec la base
 
-        return liste_utilisateurs
+        Returns
+        -------
+        Iterator[Utilisateur]
+            Générateur des utilisateurs, par id croissant
+        """
+        return DBConnection().flux(
+            "SELECT * FROM utilisateur ORDER BY id_utilisateur;",
+            taille_lot=taille_lot,
+            mappeur=MAPPEUR_UTILISATEUR,
+        )
 
     # ----------------------------- Fonctionnalitées supplémentaires -----------------------------------
 
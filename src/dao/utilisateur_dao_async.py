@@ -0,0 +1,201 @@
+import logging
+
+from business_object.utilisateur import Utilisateur
+from dao.async_db_connection import AsyncDBConnection
+from utils.log_decorator import log
+from utils.singleton import Singleton
+
+
+class UtilisateurDaoAsync(metaclass=Singleton):
+    """Version asynchrone (asyncpg) de UtilisateurDao."""
+
+    @staticmethod
+    def _utilisateur(res) -> Utilisateur:
+        """Construction d'un Utilisateur à partir d'une ligne asyncpg"""
+        return Utilisateur(
+            pseudo=res["pseudo"],
+            mdp=res["mdp"],
+            age=res["age"],
+            langue=res["langue"],
+            est_majeur=res["est_majeur"],
+            date_creation=res["date_creation"],
+            id_utilisateur=res["id_utilisateur"],
+            cocktails_realises=res["cocktails_realises"],
+        )
+
+    @log
+    async def creer_compte(self, utilisateur: Utilisateur) -> bool:
+        """Creation d'un Utilisateur dans la base de données (voir UtilisateurDao)."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                res = await connection.fetchrow(
+                    "INSERT INTO utilisateur(pseudo, mdp, age, langue, est_majeur, date_creation, cocktails_realises) VALUES "
+                    "(%(pseudo)s, %(mdp)s, %(age)s, %(langue)s, %(est_majeur)s, %(date_creation)s, %(cocktails_realises)s) "
+                    "RETURNING id_utilisateur;",
+                    {
+                        "pseudo": utilisateur.pseudo,
+                        "mdp": utilisateur.mdp,
+                        "age": utilisateur.age,
+                        "langue": utilisateur.langue,
+                        "est_majeur": utilisateur.est_majeur,
+                        "date_creation": utilisateur.date_creation,
+                        "cocktails_realises": utilisateur.cocktails_realises,
+                    },
+                )
+                if not res:
+                    return False
+                utilisateur.id_utilisateur = res["id_utilisateur"]
+                # on ajoute l'eau par défaut dans l'inventaire
+                await connection.execute(
+                    """
+                    INSERT INTO inventaire_ingredient (id_utilisateur, id_ingredient)
+                    VALUES (%(id_utilisateur)s, %(id_ingredient)s)
+                    ON CONFLICT DO NOTHING;
+                    """,
+                    {"id_utilisateur": utilisateur.id_utilisateur, "id_ingredient": 408},
+                )
+                return True
+        except Exception as e:
+            logging.info(e)
+            return False
+
+    @log
+    async def se_connecter(self, pseudo: str, mdp: str) -> Utilisateur:
+        """Se connecter avec un pseudo et un mot de passe haché."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                res = await connection.fetchrow(
+                    "SELECT * FROM utilisateur WHERE pseudo = %(pseudo)s AND mdp = %(mdp)s;",
+                    {"pseudo": pseudo, "mdp": mdp},
+                )
+        except Exception as e:
+            logging.info(e)
+            return None
+
+        return self._utilisateur(res) if res else None
+
+    @log
+    async def supprimer_utilisateur(self, utilisateur: Utilisateur) -> bool:
+        """Supprimer le compte d'un utilisateur."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                res = await connection.execute(
+                    "DELETE FROM utilisateur WHERE id_utilisateur = %(id_utilisateur)s;",
+                    {"id_utilisateur": utilisateur.id_utilisateur},
+                )
+        except Exception:
+            logging.exception("Erreur lors de la suppression du compte")
+            raise
+
+        return res > 0
+
+    @log
+    async def supprimer_inventaire(self, id_utilisateur: int) -> bool:
+        """Supprime l'inventaire de l'utilisateur."""
+        if not isinstance(id_utilisateur, int) or id_utilisateur <= 0:
+            return False
+
+        try:
+            async with AsyncDBConnection().connection as connection:
+                deleted = await connection.execute(
+                    "DELETE FROM inventaire_ingredient WHERE id_utilisateur = %(idu)s;",
+                    {"idu": id_utilisateur},
+                )
+        except Exception as e:
+            logging.exception(
+                "Erreur lors de la suppression de l'inventaire de l'utilisateur: %s", e
+            )
+            return False
+
+        return deleted > 0
+
+    @log
+    async def trouver_par_id(self, id_utilisateur: int) -> Utilisateur:
+        """Trouver un utilisateur grâce à son id."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                res = await connection.fetchrow(
+                    "SELECT * FROM utilisateur WHERE id_utilisateur = %(id_utilisateur)s;",
+                    {"id_utilisateur": id_utilisateur},
+                )
+        except Exception as e:
+            logging.info(e)
+            raise
+
+        return self._utilisateur(res) if res else None
+
+    @log
+    async def trouver_par_pseudo(self, pseudo: str) -> Utilisateur:
+        """Trouver un utilisateur grâce à son pseudo."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                res = await connection.fetchrow(
+                    "SELECT * FROM utilisateur WHERE pseudo = %(pseudo)s;",
+                    {"pseudo": pseudo},
+                )
+        except Exception as e:
+            logging.info(e)
+            raise
+
+        return self._utilisateur(res) if res else None
+
+    @log
+    async def lister_tous(self) -> list[Utilisateur]:
+        """Lister tous les utilisateurs."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                res = await connection.fetch("SELECT * FROM utilisateur;")
+        except Exception as e:
+            logging.info(e)
+            raise
+
+        return [self._utilisateur(row) for row in res]
+
+    @log
+    async def modifier(self, utilisateur: Utilisateur) -> bool:
+        """Modification d'un utilisateur dans la base de données."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                res = await connection.execute(
+                    """
+                    UPDATE utilisateur
+                    SET pseudo = %(pseudo)s,
+                        mdp = %(mdp)s,
+                        age = %(age)s,
+                        langue = %(langue)s,
+                        est_majeur = %(est_majeur)s,
+                        cocktails_realises = %(cocktails_realises)s
+                    WHERE id_utilisateur = %(id_utilisateur)s;
+                    """,
+                    {
+                        "pseudo": utilisateur.pseudo,
+                        "mdp": utilisateur.mdp,
+                        "age": utilisateur.age,
+                        "langue": utilisateur.langue,
+                        "est_majeur": utilisateur.est_majeur,
+                        "id_utilisateur": utilisateur.id_utilisateur,
+                        "cocktails_realises": utilisateur.cocktails_realises,
+                    },
+                )
+        except Exception as e:
+            logging.info(e)
+            return False
+        return res == 1
+
+    @log
+    async def ajout_cocktail_realise(self, utilisateur: Utilisateur) -> bool:
+        """Incrémente le nombre de cocktails réalisés par l'utilisateur."""
+        try:
+            async with AsyncDBConnection().connection as connection:
+                res = await connection.execute(
+                    """
+                    UPDATE utilisateur
+                    SET cocktails_realises = COALESCE(cocktails_realises, 0) + 1
+                    WHERE id_utilisateur = %(id_utilisateur)s;
+                    """,
+                    {"id_utilisateur": utilisateur.id_utilisateur},
+                )
+        except Exception as e:
+            logging.info(e)
+            return None
+        return res
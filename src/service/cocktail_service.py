@@ -1,19 +1,32 @@
+from typing import Iterator
+
 from business_object.cocktail import Cocktail
 from business_object.cocktail_complet import CocktailComplet
+from business_object.ingredient import Ingredient
 from dao.cocktail_dao import CocktailDao
+from dao.donnees_reference import DonneesReference
+from dao.index_prefixes import MAX_PROPOSITIONS, IndexPrefixes
+from dao.inventaire_dao import InventaireDao
+from dao.optimiseur_courses import K_MAX
+from dao.pagination import Page
 from utils.log_decorator import log
 
+# Hôte compris
+MAX_PARTICIPANTS = 50
+# Types d'alcool acceptés par rechercher_par_filtre, en minuscules
+ALCOOLS_VALIDES = frozenset({"alcoholic", "non alcoholic", "optional alcohol"})
+
 
 class CocktailService:
     """Classe contenant les méthodes de service pour les cocktails."""
 
-    def _filter_cocktails_for_minor(self, cocktails):
-        """Filtre les cocktails pour ne garder que les non alcoolisés."""
-        return [c for c in cocktails if c.alcoolise_cocktail == "Non alcoholic"]
-
     @log
     def realiser_cocktail(
-        self, id_cocktail: int = None, nom_cocktail: str = None, langue: str = "ENG"
+        self,
+        id_cocktail: int = None,
+        nom_cocktail: str = None,
+        langue: str = "ENG",
+        id_utilisateur: int = None,
     ) -> CocktailComplet:
         """Obtenir les détails d'un cocktail par ID ou nom.
 
@@ -25,12 +38,20 @@ class CocktailService:
             Nom du cocktail (insensible à la casse).
         langue : str
             Langue des instructions.
+        id_utilisateur : int, optional
+            Utilisateur connecté : le cocktail est ajouté à ses cocktails
+            réalisés dans le même aller-retour avec la base.
 
         """
 
-        cocktail = CocktailDao().realiser_cocktail(
-            id_cocktail=id_cocktail, nom_cocktail=nom_cocktail, langue=langue
-        )
+        if id_utilisateur is not None:
+            cocktail = CocktailDao().realiser_cocktail_et_compter(
+                id_utilisateur, id_cocktail=id_cocktail, nom_cocktail=nom_cocktail, langue=langue
+            )
+        else:
+            cocktail = CocktailDao().realiser_cocktail(
+                id_cocktail=id_cocktail, nom_cocktail=nom_cocktail, langue=langue
+            )
 
         if not cocktail:
             raise ValueError(" Zéro cocktail trouvé")
@@ -49,7 +70,10 @@ class CocktailService:
         langue=None,
         limit=10,
         offset=0,
-    ) -> list[Cocktail]:
+        apres=None,
+        avant=None,
+        seuil_similarite=None,
+    ) -> Page:
         """
         Recherche les cocktails selon différents filtres.
 
@@ -58,7 +82,7 @@ class CocktailService:
         est_majeur : bool, optional
             Si majeur ou pas, filtre automatiquement les cocktails non alcoolisés.
         nom_cocktail : str, optional
-            Nom ou partie du nom du cocktail à rechercher.
+            Nom ou partie du nom du cocktail à rechercher (fautes de frappe tolérées).
         categ : str, optional
             Catégorie du cocktail.
         alcool : str, optional
@@ -73,33 +97,39 @@ class CocktailService:
             Nombre maximum de résultats (défaut: 10).
         offset : int, optional
             Décalage pour la pagination (défaut: 0).
+        apres : str, optional
+            Curseur Page.suivant de la page précédente.
+        avant : str, optional
+            Curseur Page.precedent de la page suivante.
+        seuil_similarite : float, optional
+            Ressemblance minimale (entre 0 et 1) entre le nom recherché et celui des cocktails.
 
         Returns
         -------
-        list[Cocktail]
-            Liste des cocktails correspondant aux critères.
+        Page
+            Liste des cocktails correspondant aux critères, avec le total et les curseurs des pages voisines.
 
         Raises
         ------
         ValueError
             Si le type d'alcool est invalide ou si l'utilisateur est introuvable.
+            Si le curseur est invalide.
             Si l'utilisateur mineur veut appliquer un filtre Alcoholic.
+            Si le seuil de similarité n'est pas entre 0 et 1.
         """
 
         # Validation du type d'alcool
-        alcool_liste = ["Alcoholic", "Non alcoholic", "Optional alcohol"]
-        alcool_valide = [alcool.lower() for alcool in alcool_liste]
-        if alcool and alcool.lower() not in alcool_valide:
+        if alcool and alcool.lower() not in ALCOOLS_VALIDES:
             raise ValueError(
                 "Le type d'alcool doit être 'Alcoholic', 'Non alcoholic' ou 'Optional alcohol'"
             )
 
-        # Validation catégories
+        if seuil_similarite is not None and not 0 <= seuil_similarite <= 1:
+            raise ValueError("Le seuil de similarité doit être compris entre 0 et 1")
+
+        # Validation catégories (listes de référence gardées en mémoire)
         if categ:
-            categories_valides = [
-                categorie.lower() for categorie in CocktailDao().lister_categories()
-            ]
-            if categ.lower() not in categories_valides:
+            if not DonneesReference().categorie_existe(categ):
                 raise ValueError(
                     f"La catégorie '{categ}' n'existe pas. "
                     f"Utilisez GET /cocktails/categories pour voir les catégories disponibles."
@@ -107,8 +137,7 @@ class CocktailService:
 
         # Validation du type de verre
         if verre:
-            verres_valides = [verre.lower() for verre in CocktailDao().lister_verres()]
-            if verre.lower() not in verres_valides:
+            if not DonneesReference().verre_existe(verre):
                 raise ValueError(
                     f"Le verre '{verre}' n'existe pas. "
                     f"Utilisez GET /cocktails/verres pour voir les verres disponibles."
@@ -120,20 +149,28 @@ class CocktailService:
                 " Zéro alcool pour les mineurs ici, mais 100% fun garanti avec nos cocktails non alcolisé 😎🍹"
             )
 
+        # Si mineur, le filtre est fait par la requête (pages pleines)
         cocktails = CocktailDao().rechercher_cocktails(
-            nom_cocktail, categ, verre, alcool, liste_ingredients, langue, limit, offset
+            nom_cocktail,
+            categ,
+            verre,
+            alcool,
+            liste_ingredients,
+            langue,
+            limit,
+            offset,
+            apres,
+            avant,
+            sans_alcool=est_majeur is False,
+            seuil_similarite=seuil_similarite,
         )
 
-        # Filtrer si mineur
-        if est_majeur is False:
-            cocktails = self._filter_cocktails_for_minor(cocktails)
-
-        return cocktails if cocktails else []
+        return cocktails if cocktails is not None else Page()
 
     @log
     def lister_cocktails_complets(
-        self, id_utilisateur, est_majeur, langue=None, limit=10, offset=0
-    ) -> list[Cocktail]:
+        self, id_utilisateur, est_majeur, langue=None, limit=10, offset=0, apres=None, avant=None
+    ) -> Page:
         """
         Liste tous les cocktails que l'utilisateur peut préparer
         avec tous les ingrédients disponibles dans son inventaire.
@@ -150,32 +187,35 @@ class CocktailService:
             Nombre maximum de résultats (défaut: 10).
         offset : int, optional
             Décalage pour la pagination (défaut: 0).
+        apres : str, optional
+            Curseur Page.suivant de la page précédente.
+        avant : str, optional
+            Curseur Page.precedent de la page suivante.
 
         Returns
         -------
-        list[Cocktail]
-            Liste de tous les cocktails complets.
+        Page
+            Liste de tous les cocktails complets, avec le total et les curseurs des pages voisines.
 
         Raises
         ------
         ValueError
-            Si l'ID utilisateur est manquant ou invalide.
+            Si l'ID utilisateur est manquant ou invalide, ou si le curseur est invalide.
         """
         if not id_utilisateur:
             raise ValueError("La connexion est requise pour accéder à l'inventaire")
 
-        cocktails = CocktailDao().cocktail_complet(id_utilisateur, langue, limit, offset)
-
-        # Filtrer si mineur
-        if est_majeur is False:
-            cocktails = self._filter_cocktails_for_minor(cocktails)
+        # Si mineur, le filtre est fait par la requête (pages pleines)
+        cocktails = CocktailDao().cocktail_complet(
+            id_utilisateur, langue, limit, offset, apres, avant, sans_alcool=est_majeur is False
+        )
 
-        return cocktails if cocktails else []
+        return cocktails if cocktails is not None else Page()
 
     @log
     def lister_cocktails_partiels(
-        self, nb_manquants, id_utilisateur, est_majeur, langue=None, limit=10, offset=0
-    ) -> list[Cocktail]:
+        self, nb_manquants, id_utilisateur, est_majeur, langue=None, limit=10, offset=0, apres=None, avant=None
+    ) -> Page:
         """
         Liste tous les cocktails que l'utilisateur peut préparer avec au plus
         un certain nombre d'ingrédients manquants.
@@ -194,16 +234,22 @@ class CocktailService:
             Nombre maximum de résultats (défaut: 10).
         offset : int, optional
             Décalage pour la pagination (défaut: 0).
+        apres : str, optional
+            Curseur Page.suivant de la page précédente.
+        avant : str, optional
+            Curseur Page.precedent de la page suivante.
 
         Returns
         -------
-        list[Cocktail]
-            Liste des cocktails réalisables avec au plus nb_manquants ingrédients manquants.
+        Page
+            Liste des cocktails réalisables avec au plus nb_manquants ingrédients manquants,
+            avec le total et les curseurs des pages voisines.
 
         Raises
         ------
         ValueError
             Si nb_manquants est négatif, si l'ID utilisateur est manquant ou invalide.
+            Si le curseur est invalide.
         """
         if nb_manquants < 0 or nb_manquants > 5:
             raise ValueError("Le nombre d'ingrédients manquants doit être compris entre 0 et 5")
@@ -211,15 +257,199 @@ class CocktailService:
         if not id_utilisateur:
             raise ValueError("La connexion est requise pour accéder à l'inventaire")
 
+        # Si mineur, le filtre est fait par la requête (pages pleines)
         cocktails = CocktailDao().cocktail_partiel(
-            id_utilisateur, nb_manquants, langue, limit, offset
+            id_utilisateur, nb_manquants, langue, limit, offset, apres, avant, sans_alcool=est_majeur is False
         )
 
-        # Filtrer si mineur
-        if est_majeur is False:
-            cocktails = self._filter_cocktails_for_minor(cocktails)
+        return cocktails if cocktails is not None else Page()
 
-        return cocktails if cocktails else []
+    @log
+    def classer_ingredients_debloquants(
+        self, id_utilisateur, est_majeur, limit=10, offset=0, apres=None, avant=None
+    ) -> Page:
+        """
+        Classe les ingrédients que l'utilisateur ne possède pas selon le nombre
+        de cocktails supplémentaires qu'ils lui permettraient de réaliser complètement.
+
+        Parameters
+        ----------
+        id_utilisateur : int
+            ID de l'utilisateur.
+        est_majeur : bool
+            Si mineur, seuls les cocktails non alcoolisés sont comptés.
+        limit : int, optional
+            Nombre maximum de résultats (défaut: 10).
+        offset : int, optional
+            Décalage pour la pagination (défaut: 0).
+        apres : str, optional
+            Curseur Page.suivant de la page précédente.
+        avant : str, optional
+            Curseur Page.precedent de la page suivante.
+
+        Returns
+        -------
+        Page
+            (ingrédient, nombre de cocktails débloqués), du plus utile au moins utile,
+            avec le total et les curseurs des pages voisines.
+
+        Raises
+        ------
+        ValueError
+            Si l'ID utilisateur est manquant ou invalide.
+            Si le curseur est invalide.
+        """
+        if not id_utilisateur:
+            raise ValueError("La connexion est requise pour accéder à l'inventaire")
+
+        # Le filtre mineur change les comptes eux-mêmes : il est appliqué pendant le calcul
+        classement = CocktailDao().ingredients_debloquants(
+            id_utilisateur, sans_alcool=est_majeur is False, limit=limit, offset=offset, apres=apres, avant=avant
+        )
+        return classement if classement is not None else Page()
+
+    @log
+    def optimiser_courses(self, id_utilisateur, est_majeur, k) -> tuple[list[Ingredient], int]:
+        """
+        Choisit les k ingrédients à acheter qui, ensemble, permettent à l'utilisateur
+        de réaliser le plus de cocktails supplémentaires.
+
+        Parameters
+        ----------
+        id_utilisateur : int
+            ID de l'utilisateur.
+        est_majeur : bool
+            Si mineur, seuls les cocktails non alcoolisés sont comptés.
+        k : int
+            Nombre maximal d'ingrédients à acheter (1 à 10).
+
+        Returns
+        -------
+        tuple[list[Ingredient], int]
+            (ingrédients à acheter, nombre de cocktails supplémentaires réalisables).
+
+        Raises
+        ------
+        ValueError
+            Si l'ID utilisateur est manquant ou si k est invalide.
+        """
+        if not id_utilisateur:
+            raise ValueError("La connexion est requise pour accéder à l'inventaire")
+        if not isinstance(k, int) or not 1 <= k <= K_MAX:
+            raise ValueError(f"Le nombre d'ingrédients à acheter doit être compris entre 1 et {K_MAX}")
+
+        return CocktailDao().optimiser_courses(id_utilisateur, k, sans_alcool=est_majeur is False)
+
+    @log
+    def lister_cocktails_soiree(
+        self,
+        id_utilisateur,
+        est_majeur,
+        ids_invites,
+        nb_manquants=0,
+        langue=None,
+        limit=10,
+        offset=0,
+        apres=None,
+        avant=None,
+    ) -> Page:
+        """
+        Liste les cocktails réalisables en réunissant l'inventaire de l'utilisateur
+        et ceux de ses invités, classés par nombre d'ingrédients manquants.
+
+        Parameters
+        ----------
+        id_utilisateur : int
+            ID de l'utilisateur qui organise la soirée.
+        est_majeur : bool
+            Si mineur, seuls les cocktails non alcoolisés sont proposés.
+        ids_invites : list[int]
+            ID des autres participants, qui doivent avoir accepté de partager leur inventaire.
+        nb_manquants : int, optional
+            Nombre maximal d'ingrédients manquants autorisés (0 à 5, défaut 0).
+        langue : str
+           Langue de l'utilisateur.
+        limit : int, optional
+            Nombre maximum de résultats (défaut: 10).
+        offset : int, optional
+            Décalage pour la pagination (défaut: 0).
+        apres : str, optional
+            Curseur Page.suivant de la page précédente.
+        avant : str, optional
+            Curseur Page.precedent de la page suivante.
+
+        Returns
+        -------
+        Page
+            (cocktail, nombre d'ingrédients manquants), les réalisables d'abord,
+            avec le total et les curseurs des pages voisines.
+
+        Raises
+        ------
+        ValueError
+            Si l'ID utilisateur est manquant, si les paramètres sont invalides
+            ou si un invité n'a pas accepté de partager son inventaire.
+            Si le curseur est invalide.
+        """
+        if not id_utilisateur:
+            raise ValueError("La connexion est requise pour accéder à l'inventaire")
+        if nb_manquants < 0 or nb_manquants > 5:
+            raise ValueError("Le nombre d'ingrédients manquants doit être compris entre 0 et 5")
+        invites = sorted(set(ids_invites or []) - {id_utilisateur})
+        if not invites:
+            raise ValueError("Indiquez au moins un invité")
+        if len(invites) >= MAX_PARTICIPANTS:
+            raise ValueError(f"Une soirée réunit au plus {MAX_PARTICIPANTS} participants")
+
+        ids_ingredients, refus = InventaireDao().inventaire_commun(id_utilisateur, invites)
+        if refus:
+            raise ValueError(
+                "Ces utilisateurs n'existent pas ou ne partagent pas leur inventaire : "
+                + ", ".join(map(str, refus))
+            )
+
+        return CocktailDao().cocktails_soiree(
+            ids_ingredients,
+            nb_manquants,
+            sans_alcool=est_majeur is False,
+            langue=langue,
+            limit=limit,
+            offset=offset,
+            apres=apres,
+            avant=avant,
+        )
+
+    def completer_nom(self, prefixe, est_majeur=None, limit=10, sans_alcool=False) -> list[tuple[int, str]]:
+        """
+        Noms de cocktails qui complètent le début de saisie de l'utilisateur,
+        lus en mémoire (sans requête SQL).
+
+        Parameters
+        ----------
+        prefixe : str
+            Début du nom saisi (insensible à la casse).
+        est_majeur : bool, optional
+            Si mineur (False), seuls les cocktails non alcoolisés sont proposés.
+        limit : int, optional
+            Nombre maximal de propositions (de 1 à MAX_PROPOSITIONS).
+        sans_alcool : bool, optional
+            Ne proposer que les cocktails non alcoolisés, même à un majeur
+            (ne peut que restreindre : un mineur n'a jamais d'alcool).
+
+        Returns
+        -------
+        list[tuple[int, str]]
+            (id_cocktail, nom_cocktail) des noms qui commencent par le préfixe,
+            puis de ceux dont un autre mot commence par lui.
+
+        Raises
+        ------
+        ValueError
+            Si limit n'est pas entre 1 et MAX_PROPOSITIONS.
+        """
+        if limit < 1 or limit > MAX_PROPOSITIONS:
+            raise ValueError(f"Le nombre de propositions doit être compris entre 1 et {MAX_PROPOSITIONS}")
+        return IndexPrefixes().cocktails(prefixe.strip(), limit, sans_alcool=sans_alcool or est_majeur is False)
 
     @log
     def cocktails_aleatoires(self, est_majeur=None, nb=5, langue=None) -> list[Cocktail]:
@@ -250,14 +480,30 @@ class CocktailService:
 
         # Dans tous les cas on ne renverra pas plus de 5
         nb_limite = min(nb, 5)
-        cocktails = CocktailDao().cocktails_aleatoires(nb_limite, langue)
-
-        # Filtrer si mineur
-        if est_majeur is False:
-            cocktails = self._filter_cocktails_for_minor(cocktails)
+        # Si mineur, le tirage ne se fait que parmi les cocktails non alcoolisés
+        cocktails = CocktailDao().cocktails_aleatoires(nb_limite, langue, sans_alcool=est_majeur is False)
 
         return cocktails if cocktails else []
 
+    @log
+    def cocktail_du_jour(self, est_majeur=None, langue=None) -> Cocktail | None:
+        """
+        Récupérer le cocktail du jour, le même pour tous toute la journée.
+
+        Parameters
+        ----------
+        est_majeur : bool, optional
+            Si mineur (False), le cocktail du jour est tiré parmi les cocktails non alcoolisés.
+        langue : str
+           Langue de l'utilisateur.
+
+        Returns
+        -------
+        Cocktail | None
+            Le cocktail du jour, None si le catalogue est vide.
+        """
+        return CocktailDao().cocktail_du_jour(langue or "ENG", sans_alcool=est_majeur is False)
+
     @log
     def obtenir_cocktail_par_id(self, id_cocktail) -> Cocktail:
         """
@@ -301,6 +547,28 @@ class CocktailService:
         cocktails = CocktailDao().lister_tous()
         return cocktails if cocktails else []
 
+    @log
+    def exporter_catalogue(self, est_majeur=None, langue="ENG") -> Iterator[Cocktail]:
+        """
+        Parcourir tout le catalogue en mémoire constante (export).
+
+        Parameters
+        ----------
+        est_majeur : bool, optional
+            Si False, seuls les cocktails non alcoolisés sont exportés.
+        langue : str
+            Langue des instructions.
+
+        Returns
+        -------
+        Iterator[Cocktail]
+            Générateur des cocktails, lus par lots depuis la base.
+        """
+        cocktails = CocktailDao().iterer_catalogue(langue)
+        if est_majeur is False:
+            return (c for c in cocktails if c.alcoolise_cocktail == "Non alcoholic")
+        return cocktails
+
     @log
     def lister_categories(self) -> list[str]:
         """
@@ -309,10 +577,10 @@ class CocktailService:
         Returns
         -------
         list[str]
-            Liste des catégories uniques, triées alphabétiquement.
+            Liste des catégories uniques, triées alphabétiquement (gardée en
+            mémoire, voir DonneesReference).
         """
-        categories = CocktailDao().lister_categories()
-        return categories if categories else []
+        return DonneesReference().categories()
 
     @log
     def lister_verres(self) -> list[str]:
@@ -322,7 +590,7 @@ class CocktailService:
         Returns
         -------
         list[str]
-            Liste des types de verres uniques, triés alphabétiquement.
+            Liste des types de verres uniques, triés alphabétiquement (gardée
+            en mémoire, voir DonneesReference).
         """
-        verres = CocktailDao().lister_verres()
-        return verres if verres else []
+        return DonneesReference().verres()
@@ -85,6 +85,25 @@ class CommentaireService:
         """
         return CommentaireDao().trouver_par_cocktail(id_cocktail)
 
+    @log
+    def consulter_commentaires_cocktail(self, id_cocktail: int) -> tuple:
+        """
+        Récupère un cocktail, ses commentaires et sa note moyenne en une seule
+        fois (un aller-retour avec la base au lieu de trois)
+
+        Parameters
+        ----------
+        id_cocktail : int
+            Identifiant du cocktail
+
+        Returns
+        -------
+        tuple[Cocktail | None, list[Commentaire], float]
+            Le cocktail (None s'il n'existe pas), ses commentaires
+            et sa note moyenne (0.0 sans commentaire)
+        """
+        return CommentaireDao().trouver_avec_cocktail(id_cocktail)
+
     @log
     def obtenir_commentaire_utilisateur(self, id_utilisateur: int, id_cocktail: int) -> Commentaire:
         """
@@ -1,6 +1,9 @@
 from typing import List
 
 from business_object.ingredient import Ingredient
+from dao.index_ingredients import IndexIngredients
+from dao.index_manquants import IndexManquants
+from dao.index_prefixes import MAX_PROPOSITIONS, IndexPrefixes
 from dao.inventaire_dao import InventaireDao
 
 
@@ -68,6 +71,25 @@ class InventaireService:
         """
         return InventaireDao().supprimer_ingredient(id_utilisateur, id_ingredient)
 
+    def partager(self, id_utilisateur: int, autorise: bool = True) -> bool:
+        """Accepte ou refuse que l'inventaire de l'utilisateur serve aux soirées
+        organisées par d'autres utilisateurs.
+
+        Parameters
+        ----------
+        id_utilisateur: int
+            L'id associé à l'utilisateur
+        autorise: bool
+            True pour partager l'inventaire, False pour ne plus le partager
+
+        Returns
+        -------
+        bool
+            True si la modification est un succès
+            False sinon
+        """
+        return InventaireDao().autoriser_partage(id_utilisateur, autorise)
+
     def recherche_ingredient(self, ingredient: str) -> Ingredient:
         """
         Recherche un ingrédient grâce à son nom et renvoie un type Ingredient
@@ -83,6 +105,56 @@ class InventaireService:
         """
         return InventaireDao().recherche_ingredient(ingredient)
 
+    def resoudre_ingredient(self, nom: str, nb_suggestions: int = 5) -> tuple[Ingredient | None, List[Ingredient]]:
+        """
+        Trouve l'ingrédient désigné par un nom saisi, même avec quelques fautes
+        de frappe ("vodak" -> Vodka), sans requête en base.
+
+        Parameters
+        ----------
+        nom : str
+            Nom saisi par l'utilisateur.
+        nb_suggestions : int
+            Nombre maximal d'ingrédients proposés quand le nom est ambigu.
+
+        Returns
+        -------
+        tuple[Ingredient | None, List[Ingredient]]
+            L'ingrédient si le nom est exact ou si un seul ingrédient est le
+            plus proche (None sinon), et les ingrédients proposés à sa place,
+            du plus au moins proche (liste vide si l'ingrédient est trouvé).
+        """
+        proches = IndexIngredients().proches(nom, nb_suggestions)
+        if proches and (len(proches) == 1 or proches[0][0] < proches[1][0]):
+            return proches[0][1], []
+        return None, [ingredient for _, ingredient in proches]
+
+    def completer_ingredient(self, prefixe: str, limit: int = 10) -> List[str]:
+        """
+        Noms d'ingrédients qui complètent le début de saisie de l'utilisateur,
+        lus en mémoire (sans requête SQL).
+
+        Parameters
+        ----------
+        prefixe : str
+            Début du nom saisi (insensible à la casse).
+        limit : int
+            Nombre maximal de propositions (de 1 à MAX_PROPOSITIONS).
+
+        Returns
+        -------
+        List[str]
+            Noms qui commencent par le préfixe, puis ceux dont un autre mot commence par lui.
+
+        Raises
+        ------
+        ValueError
+            Si limit n'est pas entre 1 et MAX_PROPOSITIONS.
+        """
+        if limit < 1 or limit > MAX_PROPOSITIONS:
+            raise ValueError(f"Le nombre de propositions doit être compris entre 1 et {MAX_PROPOSITIONS}")
+        return [nom for _, nom in IndexPrefixes().ingredients(prefixe.strip(), limit)]
+
     def suggerer_ingredients(self, n: int = 5):
         """
         Retourne entre 1 et n ingrédients aléatoires pour informer
@@ -105,3 +177,30 @@ class InventaireService:
         elif n > 10:
             n = 10
         return InventaireDao().ingredients_aleatoires(n)
+
+    def verifier_index_manquants(self) -> dict:
+        """
+        Vérifie l'index des manquants du processus (IndexManquants) contre
+        l'inventaire de chaque utilisateur lu en base ; les entrées incohérentes
+        sont reconstruites.
+
+        Returns
+        -------
+        dict
+            {"verifies": nombre d'utilisateurs vérifiés,
+             "incoherents": identifiants des utilisateurs dont l'entrée a été reconstruite}
+        """
+        verifies = IndexManquants().utilisateurs()
+        incoherents = IndexManquants().verifier_tout(InventaireDao().ids_inventaire)
+        return {"verifies": len(verifies), "incoherents": incoherents}
+
+    def reconstruire_index_manquants(self) -> int:
+        """
+        Reconstruit toutes les entrées de l'index des manquants du processus.
+
+        Returns
+        -------
+        int
+            Nombre d'utilisateurs reconstruits.
+        """
+        return IndexManquants().reconstruire()
@@ -0,0 +1,62 @@
+import os
+import random
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from dao.analyse_realisabilite import AnalyseRealisabilite, statistiques_realisabilite
+from dao.db_connection import DBConnection
+from dao.inventaire_dao import InventaireDao
+from dao.moteur_realisabilite import MoteurRealisabilite, RelationBits
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def attendu(relation, inventaire) -> list[int]:
+    """Complets, à un et à deux manquants d'après le moteur en mémoire"""
+    manquants = relation.manquants(inventaire)[relation.totaux > 0]
+    return [int(np.count_nonzero(manquants == k)) for k in range(3)]
+
+
+def test_lancer(setup_test_environment):
+    # WHEN
+    mesures = AnalyseRealisabilite().lancer(taille_lot=3)
+
+    # THEN
+    relation = MoteurRealisabilite().relation()
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT id_utilisateur, nb_complets, nb_un_manquant, nb_deux_manquants "
+                "  FROM statistiques_realisabilite ORDER BY id_utilisateur;"
+            )
+            lignes = cursor.fetchall()
+    assert mesures["utilisateurs"] == len(lignes) > 0
+    for ligne in lignes:
+        inventaire = InventaireDao().ids_inventaire(ligne["id_utilisateur"])
+        assert [ligne["nb_complets"], ligne["nb_un_manquant"], ligne["nb_deux_manquants"]] == attendu(
+            relation, inventaire
+        )
+
+
+def test_identique_au_moteur():
+    """Catalogues aléatoires : mêmes comptes que le moteur, utilisateur par utilisateur"""
+    generateur = random.Random(5)
+    for _ in range(20):
+        recettes = {c: generateur.sample(range(1, 30), generateur.randint(1, 5)) for c in range(1, 60)}
+        relation = RelationBits(list(recettes), [(c, i) for c, ingr in recettes.items() for i in ingr])
+        inventaires = {u: generateur.sample(range(1, 35), generateur.randint(0, 15)) for u in range(100, 140)}
+        couples = np.array([(u, i) for u, inv in inventaires.items() for i in inv], dtype=np.int64).reshape(-1, 2)
+
+        statistiques = statistiques_realisabilite(relation, np.array(list(inventaires)[::-1]), couples, taille_lot=7)
+
+        for ligne, u in zip(statistiques, list(inventaires)[::-1]):
+            assert list(ligne) == attendu(relation, inventaires[u])
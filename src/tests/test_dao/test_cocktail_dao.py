@@ -5,6 +5,7 @@ import pytest
 
 from business_object.cocktail import Cocktail
 from dao.cocktail_dao import CocktailDao
+from dao.db_connection import DBConnection
 from utils.reset_database import ResetDatabase
 
 
@@ -128,5 +129,127 @@ def test_cocktails_aleatoires_limite(setup_test_environment):
     assert len(cocktails) <= 5
 
 
+# -------------------- TEST 5 : Parcours du catalogue --------------------
+
+
+def test_iterer_catalogue(setup_test_environment):
+    """Le catalogue est parcouru par lots, dans l'ordre des id"""
+
+    # WHEN
+    cocktails = CocktailDao().iterer_catalogue(taille_lot=2)
+
+    # THEN
+    assert not isinstance(cocktails, list)
+    noms = [c.nom_cocktail for c in cocktails]
+    assert noms == ["Mojito", "Old Fashioned", "Long Island Tea", "Coke and Drops"]
+
+
+def test_lister_tous(setup_test_environment):
+    """La liste complète contient les mêmes cocktails que le parcours"""
+
+    cocktails = CocktailDao().lister_tous(langue="FRA")
+
+    assert len(cocktails) == 4
+    assert all(isinstance(c, Cocktail) for c in cocktails)
+
+
+def test_nb_ingredients_suit_les_recettes(setup_test_environment):
+    """cocktail.nb_ingredients est tenu à jour par trigger sur cocktail_ingredient"""
+
+    def nb_ingredients(cursor):
+        cursor.execute(
+            "SELECT c.id_cocktail, c.nb_ingredients, COUNT(ci.id_ingredient) AS attendu "
+            "FROM cocktail c LEFT JOIN cocktail_ingredient ci ON c.id_cocktail = ci.id_cocktail "
+            "GROUP BY c.id_cocktail ORDER BY c.id_cocktail;"
+        )
+        lignes = cursor.fetchall()
+        assert all(ligne["nb_ingredients"] == ligne["attendu"] for ligne in lignes)
+        return [ligne["nb_ingredients"] for ligne in lignes]
+
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            # GIVEN : valeurs posées au chargement du catalogue
+            assert nb_ingredients(cursor) == [5, 4, 5, 0]
+
+            # WHEN / THEN
+            cursor.execute(
+                "INSERT INTO cocktail_ingredient (id_cocktail, id_ingredient) VALUES (3, 1), (3, 3);"
+            )
+            assert nb_ingredients(cursor) == [5, 4, 5, 2]
+            cursor.execute("UPDATE cocktail_ingredient SET id_cocktail = 1 WHERE id_cocktail = 3 AND id_ingredient = 1;")
+            assert nb_ingredients(cursor) == [5, 5, 5, 1]
+            cursor.execute("DELETE FROM cocktail_ingredient WHERE id_ingredient IN (1, 3) AND id_cocktail IN (1, 3);")
+            assert nb_ingredients(cursor) == [5, 4, 5, 0]
+
+
+def test_rechercher_par_curseur(setup_test_environment):
+    """La page suivante d'une recherche commence après le dernier cocktail de la précédente"""
+    # GIVEN
+    tous = CocktailDao().rechercher_cocktails(limit=1000)
+    premiere = CocktailDao().rechercher_cocktails(limit=3)
+
+    # WHEN
+    suivante = CocktailDao().rechercher_cocktails(limit=3, apres=premiere.suivant)
+
+    # THEN
+    assert [c.id_cocktail for c in premiere + suivante] == [c.id_cocktail for c in tous[:6]]
+    assert tous.suivant is None
+    assert premiere.total == suivante.total == len(tous)
+    assert premiere.precedent is None
+    retour = CocktailDao().rechercher_cocktails(limit=3, avant=suivante.precedent)
+    assert [c.id_cocktail for c in retour] == [c.id_cocktail for c in premiere]
+
+
+def test_rechercher_sans_alcool_pages_pleines(setup_test_environment):
+    """Pour un mineur, les pages sont pleines de cocktails non alcoolisés"""
+    # GIVEN
+    tous = [c for c in CocktailDao().rechercher_cocktails(limit=1000) if c.alcoolise_cocktail == "Non alcoholic"]
+
+    # WHEN
+    page = CocktailDao().rechercher_cocktails(limit=2, sans_alcool=True)
+
+    # THEN
+    assert tous
+    assert [c.id_cocktail for c in page] == [c.id_cocktail for c in tous[:2]]
+    assert page.total == len(tous)
+    assert page.a_suivant == (len(tous) > 2)
+
+
+def test_cocktails_aleatoires_sans_alcool(setup_test_environment):
+    """Le tirage pour un mineur ne propose que des cocktails non alcoolisés"""
+    # WHEN
+    cocktails = CocktailDao().cocktails_aleatoires(5, sans_alcool=True)
+
+    # THEN
+    assert cocktails
+    assert all(c.alcoolise_cocktail == "Non alcoholic" for c in cocktails)
+
+
+def test_rechercher_total_page_vide(setup_test_environment):
+    """Une page au-delà de la fin est vide mais porte le total"""
+    # WHEN
+    page = CocktailDao().rechercher_cocktails(limit=3, offset=1000)
+
+    # THEN
+    assert page == []
+    assert page.total == len(CocktailDao().rechercher_cocktails(limit=1000))
+    assert not page.a_suivant
+
+
+# -------------------- Détail d'un cocktail --------------------
+
+
+def test_realiser_cocktail_ingredients_structures(setup_test_environment):
+    """Ingrédients et quantités en listes alignées, même quand une quantité est NULL"""
+    # WHEN
+    cocktail = CocktailDao().realiser_cocktail(nom_cocktail="mojito")
+
+    # THEN
+    assert cocktail.ingredients == ["Light Rum", "Lime", "Mint", "Soda Water", "Sugar"]
+    assert cocktail.quantites == ["2-3 oz", "Juice of 1", "2-4", None, "2 tsp"]
+    assert cocktail.ingredients_detailles[3] == {"ingredient": "Soda Water", "quantite": None}
+    assert cocktail.ingredients_detailles[4] == {"ingredient": "Sugar", "quantite": "2 tsp"}
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
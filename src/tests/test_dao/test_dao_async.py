@@ -0,0 +1,218 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+
+from business_object.cocktail import Cocktail
+from business_object.commentaire import Commentaire
+from dao.async_db_connection import AsyncDBConnection
+from dao.cocktail_dao import CocktailDao
+from dao.cocktail_dao_async import CocktailDaoAsync
+from dao.commentaire_dao_async import CommentaireDaoAsync
+from dao.inventaire_dao_async import InventaireDaoAsync
+from dao.sql_utils import convertir_requete
+from dao.utilisateur_dao_async import UtilisateurDaoAsync
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def executer(coroutine):
+    """Exécute une coroutine dans une boucle neuve puis ferme le pool asyncpg"""
+
+    async def scenario():
+        try:
+            return await coroutine
+        finally:
+            await AsyncDBConnection().fermer()
+
+    return asyncio.run(scenario())
+
+
+# -------------------- Conversion des paramètres --------------------
+
+
+def test_convertir_requete():
+    """Les paramètres nommés deviennent positionnels, un nom répété garde sa position"""
+    # GIVEN
+    requete = "SELECT * FROM t WHERE a = %(a)s AND b ILIKE %(b)s OR a > %(a)s AND c LIKE '10%%'"
+
+    # WHEN
+    sql, valeurs = convertir_requete(requete, {"a": 1, "b": "x", "inutile": 3})
+
+    # THEN
+    assert sql == "SELECT * FROM t WHERE a = $1 AND b ILIKE $2 OR a > $1 AND c LIKE '10%'"
+    assert valeurs == [1, "x"]
+
+
+# -------------------- CocktailDaoAsync --------------------
+
+
+def test_cocktail_complet_async(setup_test_environment):
+    """Mêmes résultats que la version synchrone : John (id 3) peut faire un Mojito"""
+    cocktails = executer(CocktailDaoAsync().cocktail_complet(3))
+
+    noms = [c.nom_cocktail for c in cocktails]
+    assert all(isinstance(c, Cocktail) for c in cocktails)
+    assert "Mojito" in noms
+    assert "Old Fashioned" not in noms
+
+
+def test_cocktail_partiel_async(setup_test_environment):
+    """John (id 3) n'a besoin que d'un ingrédient pour l'Old Fashioned"""
+    cocktails = executer(CocktailDaoAsync().cocktail_partiel(3, 2))
+
+    assert [c.nom_cocktail for c in cocktails] == ["Old Fashioned"]
+
+
+def test_rechercher_multi_filtres_async(setup_test_environment):
+    """Recherche combinant nom, catégorie, verre et alcool"""
+    cocktails = executer(
+        CocktailDaoAsync().rechercher_cocktails(
+            "Coke", "Soft Drink", "Cocktail glass", "Non alcoholic"
+        )
+    )
+
+    assert [c.nom_cocktail for c in cocktails] == ["Coke and Drops"]
+
+
+def test_page_async(setup_test_environment):
+    """Même page, même total et mêmes curseurs que la recherche synchrone"""
+    page = executer(CocktailDaoAsync().rechercher_cocktails(limit=2))
+    attendue = CocktailDao().rechercher_cocktails(limit=2)
+
+    assert [c.id_cocktail for c in page] == [c.id_cocktail for c in attendue]
+    assert (page.total, page.total_exact, page.a_suivant) == (4, True, True)
+    assert (page.suivant, page.precedent) == (attendue.suivant, attendue.precedent)
+    assert executer(CocktailDaoAsync().cocktail_partiel(3, 2)).total == 1
+
+
+def test_curseurs_async(setup_test_environment):
+    """Pages suivante et précédente lues par curseur, comme la recherche synchrone"""
+    dao = CocktailDaoAsync()
+    premiere = executer(dao.rechercher_cocktails(limit=2))
+
+    seconde = executer(dao.rechercher_cocktails(limit=2, apres=premiere.suivant))
+    retour = executer(dao.rechercher_cocktails(limit=2, avant=seconde.precedent))
+
+    attendue = CocktailDao().rechercher_cocktails(limit=2, apres=premiere.suivant)
+    assert [c.id_cocktail for c in seconde] == [c.id_cocktail for c in attendue]
+    assert not seconde.a_suivant
+    assert [c.id_cocktail for c in retour] == [c.id_cocktail for c in premiere]
+    with pytest.raises(ValueError):
+        executer(dao.cocktail_complet(3, apres="invalide"))
+
+
+@pytest.mark.parametrize(
+    "filtres",
+    [
+        {"nom_cocktail": "mojitto"},
+        {"nom_cocktail": "old fashoned", "seuil_similarite": 0.5},
+        {"nom_cocktail": "mojitto", "categorie": "Shot"},
+        {"nom_cocktail": "cocktail old and tea", "seuil_similarite": 0, "limit": 2},
+        {"nom_cocktail": "cocktail old and tea", "seuil_similarite": 0, "alcool": "Alcoholic", "limit": 1},
+    ],
+)
+def test_recherche_floue_async(setup_test_environment, filtres):
+    """Même classement par ressemblance, même total et mêmes curseurs que la recherche synchrone"""
+    page = executer(CocktailDaoAsync().rechercher_cocktails(**filtres))
+    attendue = CocktailDao().rechercher_cocktails(**filtres)
+
+    assert [c.id_cocktail for c in page] == [c.id_cocktail for c in attendue]
+    assert (page.total, page.suivant, page.precedent) == (attendue.total, attendue.suivant, attendue.precedent)
+    if page.suivant:
+        suivante = executer(CocktailDaoAsync().rechercher_cocktails(**filtres, apres=page.suivant))
+        assert [c.id_cocktail for c in suivante] == [
+            c.id_cocktail for c in CocktailDao().rechercher_cocktails(**filtres, apres=attendue.suivant)
+        ]
+
+
+def test_sans_alcool_async(setup_test_environment):
+    """Filtre des mineurs appliqué dans la requête, avant la pagination"""
+    dao = CocktailDaoAsync()
+
+    recherche = executer(dao.rechercher_cocktails(sans_alcool=True))
+    complets = executer(dao.cocktail_complet(3, sans_alcool=True))
+    partiels = executer(dao.cocktail_partiel(3, 2, sans_alcool=True))
+
+    assert [c.nom_cocktail for c in recherche] == ["Coke and Drops"]
+    assert complets == []
+    assert partiels == []
+
+
+def test_realiser_cocktail_async(setup_test_environment):
+    """Même détail (ingrédients et quantités en listes) que le DAO synchrone"""
+    cocktail = executer(CocktailDaoAsync().realiser_cocktail(nom_cocktail="mojito"))
+
+    assert cocktail.nom_cocktail == "Mojito"
+    assert vars(cocktail) == vars(CocktailDao().realiser_cocktail(nom_cocktail="mojito"))
+
+
+# -------------------- Autres DAO asynchrones --------------------
+
+
+def test_cocktails_aleatoires_async(setup_test_environment):
+    """Tirage sans remise, parmi les seuls cocktails sans alcool pour un mineur"""
+    dao = CocktailDaoAsync()
+    tous = executer(dao.cocktails_aleatoires(5))
+    sans_alcool = executer(dao.cocktails_aleatoires(5, sans_alcool=True))
+
+    assert sorted(c.id_cocktail for c in tous) == [0, 1, 2, 3]
+    assert [c.nom_cocktail for c in sans_alcool] == ["Coke and Drops"]
+
+
+def test_trouver_utilisateur_par_id_async(setup_test_environment):
+    """Lecture d'un utilisateur existant et d'un utilisateur inexistant"""
+
+    async def scenario():
+        dao = UtilisateurDaoAsync()
+        return await asyncio.gather(dao.trouver_par_id(3), dao.trouver_par_id(9999))
+
+    existant, inexistant = executer(scenario())
+
+    assert existant.pseudo == "John"
+    assert inexistant is None
+
+
+def test_ajouter_supprimer_inventaire_async(setup_test_environment):
+    """Ajout puis suppression d'un ingrédient dans l'inventaire"""
+
+    async def scenario():
+        dao = InventaireDaoAsync()
+        ingredient = await dao.recherche_ingredient("sugar")
+        ajoute = await dao.ajouter_ingredient_inventaire(6, ingredient)
+        supprime = await dao.supprimer_ingredient(6, ingredient.id_ingredient)
+        inconnu = await dao.recherche_ingredient("ingredient inconnu")
+        return ajoute, supprime, inconnu
+
+    ajoute, supprime, inconnu = executer(scenario())
+
+    assert ajoute is True
+    assert supprime is True
+    assert inconnu is None
+
+
+def test_creer_supprimer_commentaire_async(setup_test_environment):
+    """Création puis suppression d'un commentaire"""
+    async def scenario():
+        dao = CommentaireDaoAsync()
+        commentaire = Commentaire(id_utilisateur=6, id_cocktail=3, texte="Async", note=5)
+        cree = await dao.creer(commentaire)
+        supprime = await dao.supprimer(commentaire.id_commentaire, 6)
+        return cree, supprime
+
+    cree, supprime = executer(scenario())
+
+    assert cree is True
+    assert supprime is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
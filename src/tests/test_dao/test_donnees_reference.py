@@ -0,0 +1,79 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dao.cocktail_dao import CocktailDao
+from dao.donnees_reference import DonneesReference
+from utils.catalogue import notifier_rechargement
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def test_listes_de_la_base(setup_test_environment):
+    """Mêmes listes que CocktailDao, validation sans la casse"""
+    # GIVEN
+    DonneesReference().invalider()
+
+    # WHEN / THEN
+    assert DonneesReference().categories() == CocktailDao().lister_categories()
+    assert DonneesReference().verres() == CocktailDao().lister_verres()
+    assert DonneesReference().categorie_existe("soft DRINK")
+    assert not DonneesReference().categorie_existe("Punch")
+    assert DonneesReference().verre_existe("highball glass")
+
+
+def test_duree_de_vie():
+    """Une liste est relue une fois échue, pas avant"""
+    # GIVEN
+    references = DonneesReference()
+    references.invalider()
+    lire = MagicMock(return_value=["Cocktail"])
+
+    with (
+        patch.object(references, "duree_vie", 60),
+        patch("dao.donnees_reference.time.monotonic", return_value=1000.0) as horloge,
+    ):
+        # WHEN
+        references._liste("categories", lire)
+        horloge.return_value = 1059.0
+        references._liste("categories", lire)
+        assert lire.call_count == 1
+        horloge.return_value = 1060.0
+        references._liste("categories", lire)
+
+    # THEN
+    assert lire.call_count == 2
+    references.invalider()
+
+
+def test_liste_non_modifiable_par_l_appelant(setup_test_environment):
+    """Modifier la liste renvoyée ne change pas celle gardée en mémoire"""
+    # GIVEN
+    categories = DonneesReference().categories()
+
+    # WHEN
+    categories.append("Inventée")
+
+    # THEN
+    assert "Inventée" not in DonneesReference().categories()
+
+
+def test_rechargement_catalogue(setup_test_environment):
+    """Un rechargement du catalogue oublie les listes"""
+    # GIVEN
+    DonneesReference().verres()
+    assert DonneesReference()._listes
+
+    # WHEN
+    notifier_rechargement()
+
+    # THEN
+    assert DonneesReference()._listes == {}
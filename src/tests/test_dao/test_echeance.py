@@ -0,0 +1,152 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from psycopg2.errors import QueryCanceled
+
+from app.core.echeance import EcheanceMiddleware
+from dao.cocktail_dao import CocktailDao
+from dao.db_connection import DBConnection
+from dao.echeance import BudgetEpuise, delai_maximal, demarrer_echeance, terminer_echeance
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def requete_lente(secondes: float = 2) -> bool:
+    """Requête SQL lente ; les erreurs sont interceptées comme dans les DAO"""
+    try:
+        with DBConnection().connection as connection:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_sleep(%(s)s);", {"s": secondes})
+        return True
+    except Exception:
+        return False
+
+
+@pytest.fixture
+def client(setup_test_environment):
+    application = FastAPI()
+    application.add_middleware(EcheanceMiddleware, budget_ms=5000)
+
+    @application.get("/lent")
+    def lent():
+        return {"termine": requete_lente()}
+
+    @application.get("/categories")
+    def categories():
+        time.sleep(0.05)
+        return CocktailDao().lister_categories()
+
+    return TestClient(application)
+
+
+def test_requete_annulee_par_le_budget(setup_test_environment):
+    """La requête SQL est annulée par Postgres à la fin du budget"""
+    # GIVEN
+    echeance, jeton = demarrer_echeance(100)
+
+    # WHEN
+    debut = time.perf_counter()
+    try:
+        with pytest.raises(QueryCanceled):
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_sleep(2);")
+    finally:
+        terminer_echeance(jeton)
+
+    # THEN
+    assert time.perf_counter() - debut < 1
+    assert echeance.etat == "annulee"
+
+
+def test_plafond_de_la_methode(setup_test_environment):
+    """Sans budget de requête HTTP, le plafond de la méthode s'applique"""
+    # GIVEN
+    lente = delai_maximal(100)(requete_lente)
+
+    # WHEN
+    debut = time.perf_counter()
+    termine = lente()
+
+    # THEN
+    assert termine is False
+    assert time.perf_counter() - debut < 1
+
+
+def test_budget_epuise_avant_la_requete(setup_test_environment):
+    """Budget déjà écoulé : aucune requête SQL ne part"""
+    # GIVEN
+    echeance, jeton = demarrer_echeance(1)
+    time.sleep(0.01)
+
+    # WHEN / THEN
+    try:
+        with pytest.raises(BudgetEpuise):
+            CocktailDao().lister_categories()
+    finally:
+        terminer_echeance(jeton)
+    assert echeance.etat == "epuise"
+
+
+def test_timeout_limite_a_la_transaction(setup_test_environment):
+    """Le statement_timeout ne reste pas sur la connexion rendue au pool"""
+    # GIVEN
+    echeance, jeton = demarrer_echeance(5000)
+    try:
+        CocktailDao().lister_verres()
+    finally:
+        terminer_echeance(jeton)
+
+    # WHEN
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout;")
+            valeur = cursor.fetchone()["statement_timeout"]
+
+    # THEN
+    assert valeur == "0"
+
+
+def test_reponse_504(client):
+    """Requête SQL annulée : l'endpoint renvoie une erreur 504"""
+    # WHEN
+    reponse = client.get("/lent", headers={"X-Budget-Ms": "100"})
+
+    # THEN
+    assert reponse.status_code == 504
+    assert "annulée" in reponse.json()["detail"]
+
+
+def test_reponse_503(client):
+    """Budget écoulé avant la requête SQL : l'exception de l'endpoint devient une 503"""
+    # WHEN
+    reponse = client.get("/categories", headers={"X-Budget-Ms": "10"})
+
+    # THEN
+    assert reponse.status_code == 503
+
+
+def test_reponse_normale(client):
+    """Requête SQL dans le budget : réponse de l'endpoint inchangée"""
+    # WHEN
+    with patch("tests.test_dao.test_echeance.requete_lente", return_value=True):
+        reponse = client.get("/lent")
+
+    # THEN
+    assert reponse.status_code == 200
+    assert reponse.json() == {"termine": True}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
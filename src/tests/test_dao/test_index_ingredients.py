@@ -0,0 +1,142 @@
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+
+from dao.index_ingredients import IndexIngredients, SuppressionsNoms, distance_edition, suppressions
+from dao.inventaire_dao import InventaireDao
+from utils.catalogue import notifier_rechargement
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+@pytest.fixture
+def catalogue_fictif():
+    """Index chargé avec quelques ingrédients, oublié après le test"""
+    IndexIngredients().charger_ingredients(
+        [
+            (1, "Vodka", None),
+            (2, "Lime Juice", "Jus de citron vert"),
+            (3, "Lime", None),
+            (4, "Lemon Juice", None),
+            (5, "Mint", None),
+            (6, "Gin", None),
+        ]
+    )
+    yield
+    IndexIngredients().invalider()
+
+
+def noms(proches):
+    return [(distance, ingredient.nom_ingredient) for distance, ingredient in proches]
+
+
+@pytest.mark.parametrize(
+    "a, b, levenshtein, transpositions",
+    [
+        ("vodak", "vodka", 2, 1),
+        ("lime juce", "lime juice", 1, 1),
+        ("gin", "gin", 0, 0),
+        ("", "rum", 3, 3),
+        ("ca", "abc", 3, 3),
+    ],
+)
+def test_distance_edition(a, b, levenshtein, transpositions):
+    """Levenshtein, et distance OSA quand une transposition compte pour une faute"""
+    assert distance_edition(a, b) == distance_edition(b, a) == levenshtein
+    assert distance_edition(a, b, transpositions=True) == transpositions
+
+
+def test_suppressions():
+    """Toutes les chaînes à au plus n caractères supprimés"""
+    assert suppressions("gin", 1) == {"gin", "in", "gn", "gi"}
+    assert len(suppressions("vodka", 2)) == 1 + 5 + 10
+
+
+def test_proches_aleatoires():
+    """Mêmes noms que le calcul de la distance de tous les noms"""
+    # GIVEN
+    generateur = random.Random(3)
+    lettres = "aeilmnorst "
+    tous = ["".join(generateur.choices(lettres, k=generateur.randint(2, 9))) for _ in range(300)]
+    index = SuppressionsNoms(tous)
+
+    for recherche in ["lime", "mint", "sorte", "ro", "amin tr"]:
+        for fautes in [1, 2]:
+            # WHEN
+            resultat = sorted(index.proches(recherche, fautes))
+
+            # THEN
+            attendus = sorted(
+                (distance_edition(recherche, nom, transpositions=True), rang)
+                for rang, nom in enumerate(tous)
+                if distance_edition(recherche, nom, transpositions=True) <= fautes
+            )
+            assert resultat == attendus
+
+
+def test_fautes_de_frappe(catalogue_fictif):
+    """"vodak" et "lime juce" trouvent Vodka et Lime Juice ; le nom exact est seul"""
+    assert noms(IndexIngredients().proches("vodak")) == [(1, "Vodka")]
+    assert noms(IndexIngredients().proches("  LIME JUCE")) == [(1, "Lime Juice")]
+    assert noms(IndexIngredients().proches("lime")) == [(0, "Lime")]
+    assert IndexIngredients().proches("lime juce")[0][1].desc_ingredient == "Jus de citron vert"
+
+
+def test_ambigu_et_inconnu(catalogue_fictif):
+    """Plusieurs ingrédients à la même distance : tous proposés, par nom ; rien au-delà de la tolérance"""
+    assert noms(IndexIngredients().proches("lxme juice")) == [(1, "Lime Juice")]
+    assert noms(IndexIngredients().proches("lim")) == [(1, "Lime")]
+    assert noms(IndexIngredients().proches("gint")) == [(1, "Gin"), (1, "Mint")]
+    assert IndexIngredients().proches("blublub") == []
+    # Deux caractères : pas de faute admise
+    assert IndexIngredients().proches("gi") == []
+
+
+def test_ingredient_ajoute(catalogue_fictif):
+    """Un ingrédient créé est trouvé aussitôt, sans relecture de la base"""
+    # GIVEN
+    with patch.object(IndexIngredients(), "charger") as charger:
+        # WHEN
+        IndexIngredients().ajouter(7, "Triple Sec")
+
+        # THEN
+        assert noms(IndexIngredients().proches("tripple sec")) == [(1, "Triple Sec")]
+        charger.assert_not_called()
+
+
+def test_index_lu_dans_la_base(setup_test_environment):
+    """Les ingrédients de la base sont trouvés malgré les fautes, sans requête"""
+    # GIVEN
+    IndexIngredients().invalider()
+    IndexIngredients().proches("lemon")
+
+    with patch.object(IndexIngredients(), "charger") as charger:
+        # WHEN
+        proches = IndexIngredients().proches("lemn")
+
+    # THEN
+    charger.assert_not_called()
+    assert [(d, i.id_ingredient, i.nom_ingredient) for d, i in proches] == [(1, 240, "Lemon")]
+    assert proches[0][1].desc_ingredient == InventaireDao().recherche_ingredient("lemon").desc_ingredient
+
+
+def test_rechargement_catalogue(setup_test_environment):
+    """Un rechargement du catalogue oublie l'index"""
+    # GIVEN
+    IndexIngredients().proches("gin")
+    assert IndexIngredients()._donnees is not None
+
+    # WHEN
+    notifier_rechargement()
+
+    # THEN
+    assert IndexIngredients()._donnees is None
@@ -0,0 +1,286 @@
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+
+from business_object.ingredient import Ingredient
+from dao.cocktail_dao import CocktailDao
+from dao.db_connection import DBConnection
+from dao.index_manquants import IndexManquants
+from dao.inventaire_dao import InventaireDao
+from dao.moteur_realisabilite import MoteurRealisabilite
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def identiques_au_sql(id_utilisateur) -> bool:
+    """Complets et partiels de l'index identiques aux requêtes SQL"""
+    dao = CocktailDao()
+    complets = [c.id_cocktail for c in dao.cocktail_complet(id_utilisateur, limit=100)]
+    partiels = [c.id_cocktail for c in dao.cocktail_partiel(id_utilisateur, 5, limit=100)]
+    return complets == [c.id_cocktail for c in dao._cocktail_complet_sql(id_utilisateur, limit=100)] and (
+        partiels == [c.id_cocktail for c in dao._cocktail_partiel_sql(id_utilisateur, 5, limit=100)]
+    )
+
+
+def test_ajout_et_suppression_par_delta(setup_test_environment):
+    """Ajouter puis retirer un ingrédient met l'entrée à jour sans la reconstruire"""
+    # GIVEN
+    assert identiques_au_sql(5)
+    entree = IndexManquants()._entrees[5]
+    sucre = Ingredient(id_ingredient=379, nom_ingredient="Sugar", desc_ingredient=None)
+
+    # WHEN
+    InventaireDao().ajouter_ingredient_inventaire(5, sucre)
+    # Un second ajout du même ingrédient ne change rien
+    InventaireDao().ajouter_ingredient_inventaire(5, sucre)
+
+    # THEN
+    assert IndexManquants()._entrees[5] is entree
+    assert 379 in entree.inventaire
+    assert identiques_au_sql(5)
+    assert IndexManquants()._entrees[5] is entree
+
+    # WHEN
+    InventaireDao().supprimer_ingredient(5, 379)
+
+    # THEN
+    assert 379 not in entree.inventaire
+    assert identiques_au_sql(5)
+    assert IndexManquants()._entrees[5] is entree
+
+
+def test_modification_hors_dao(setup_test_environment):
+    """Un inventaire modifié directement en base est rattrapé à la lecture suivante"""
+    # GIVEN
+    assert identiques_au_sql(6)
+
+    # WHEN
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM inventaire_ingredient WHERE id_utilisateur = 6 AND id_ingredient = 273;"
+                "INSERT INTO inventaire_ingredient (id_utilisateur, id_ingredient) VALUES (6, 361);"
+            )
+
+    # THEN
+    assert identiques_au_sql(6)
+    assert IndexManquants().verifier(6, InventaireDao().ids_inventaire(6))
+
+
+def test_rechargement_catalogue(setup_test_environment):
+    """Après un rechargement du catalogue, l'index reste cohérent"""
+    # GIVEN
+    assert identiques_au_sql(3)
+
+    # WHEN
+    ResetDatabase().lancer(test_dao=True)
+
+    # THEN
+    assert 3 not in IndexManquants()._entrees
+    assert identiques_au_sql(3)
+    assert IndexManquants().verifier(3, InventaireDao().ids_inventaire(3))
+
+
+def test_verifier_reconstruit(setup_test_environment):
+    """Une entrée incohérente est détectée et reconstruite"""
+    # GIVEN
+    inventaire = InventaireDao().ids_inventaire(3)
+    IndexManquants().complets(3, inventaire)
+    IndexManquants()._entrees[3].manquants[:] = 1
+
+    # WHEN / THEN
+    assert not IndexManquants().verifier(3, inventaire)
+    assert IndexManquants().verifier(3, inventaire)
+
+
+def test_verifier_tout_ordre(setup_test_environment):
+    """Un paquet dans le mauvais ordre (mêmes cocktails) est une incohérence ; seule cette entrée est reconstruite"""
+    # GIVEN
+    for id_utilisateur in (1, 3):
+        assert identiques_au_sql(id_utilisateur)
+    paquets = IndexManquants()._entrees[1].paquets
+    k = next(k for k, paquet in enumerate(paquets) if len(paquet) > 1)
+    paquets[k] = paquets[k][::-1].copy()
+
+    # WHEN
+    incoherents = IndexManquants().verifier_tout(InventaireDao().ids_inventaire)
+
+    # THEN
+    assert incoherents == [1]
+    assert IndexManquants().verifier_tout(InventaireDao().ids_inventaire) == []
+    assert identiques_au_sql(1)
+
+
+def test_deltas_aleatoires():
+    """Une suite d'ajouts et de suppressions donne le même index qu'un calcul complet"""
+    # GIVEN
+    generateur = random.Random(7)
+    recettes = {c: generateur.sample(range(1, 60), generateur.randint(1, 7)) for c in range(300)}
+    moteur = MoteurRealisabilite()
+    moteur.charger_relation(list(recettes), [(c, i) for c, ingr in recettes.items() for i in ingr])
+    index = IndexManquants()
+    inventaire = set(generateur.sample(range(1, 60), 20))
+
+    try:
+        index.complets(999, list(inventaire))
+        # WHEN
+        for _ in range(200):
+            id_ingredient = generateur.randint(1, 65)
+            if id_ingredient in inventaire:
+                inventaire.discard(id_ingredient)
+                index.retirer(999, id_ingredient)
+            else:
+                inventaire.add(id_ingredient)
+                index.ajouter(999, id_ingredient)
+
+        # THEN
+        assert index._entrees[999].inventaire == inventaire
+        assert index.verifier(999, list(inventaire))
+        assert index.partiels(999, list(inventaire), 5, limit=1000) == moteur.partiels(
+            list(inventaire), 5, limit=1000
+        )
+    finally:
+        index.oublier(999)
+        moteur.invalider()
+
+
+@pytest.mark.parametrize("sans_alcool", [False, True])
+def test_debloquants_identiques_au_sql(setup_test_environment, sans_alcool):
+    """Même classement des ingrédients à acheter que la requête SQL"""
+    for id_utilisateur in range(1, 9):
+        # WHEN
+        index = CocktailDao().ingredients_debloquants(id_utilisateur, sans_alcool, limit=100)
+        sql = CocktailDao()._ingredients_debloquants_sql(id_utilisateur, sans_alcool, limit=100)
+
+        # THEN
+        assert [(i.id_ingredient, nb) for i, nb in index] == [(i.id_ingredient, nb) for i, nb in sql]
+        assert index.total == sql.total == len(index)
+
+
+def test_debloquants(setup_test_environment):
+    """Il ne manque que Water (408) à John pour un Old Fashioned"""
+    # WHEN
+    classement = CocktailDao().ingredients_debloquants(3)
+
+    # THEN
+    assert [(i.id_ingredient, nb) for i, nb in classement] == [(408, 1)]
+    # Aucun cocktail sans alcool à débloquer dans la base de test
+    assert CocktailDao().ingredients_debloquants(3, sans_alcool=True) == []
+
+
+def test_debloquants_aleatoires():
+    """Sur un catalogue aléatoire, le classement correspond au calcul ensembliste"""
+    # GIVEN
+    generateur = random.Random(3)
+    recettes = {c: set(generateur.sample(range(1, 150), generateur.randint(1, 6))) for c in range(2000)}
+    sans_alcool = [c % 3 == 0 for c in recettes]
+    moteur = MoteurRealisabilite()
+    moteur.charger_relation(
+        list(recettes), [(c, i) for c, ingr in recettes.items() for i in ingr], sans_alcool
+    )
+    inventaire = set(generateur.sample(range(1, 150), 60))
+
+    try:
+        for filtre in (False, True):
+            # WHEN
+            classement, total, encore = IndexManquants().debloquants(999, list(inventaire), filtre, limit=1000)
+
+            # THEN
+            attendus = {}
+            for c, ingr in recettes.items():
+                if len(ingr - inventaire) == 1 and (sans_alcool[c] or not filtre):
+                    (manquant,) = ingr - inventaire
+                    attendus[manquant] = attendus.get(manquant, 0) + 1
+            assert classement == sorted(attendus.items(), key=lambda p: (-p[1], p[0]))
+            assert (total, encore) == (len(classement), False)
+
+            # Pages par clé (nombre, id) enchaînées dans les deux sens : même classement, même ordre
+            pages, cle = [], None
+            while True:
+                page, _, encore = IndexManquants().debloquants(999, list(inventaire), filtre, limit=7, cle=cle)
+                pages.append(page)
+                if not encore:
+                    break
+                cle = (page[-1][1], page[-1][0])
+            assert [p for page in pages for p in page] == classement
+            cle = (pages[-1][0][1], pages[-1][0][0])
+            page, _, _ = IndexManquants().debloquants(999, list(inventaire), filtre, limit=7, cle=cle, avant=True)
+            assert page == pages[-2]
+    finally:
+        IndexManquants().oublier(999)
+        moteur.invalider()
+
+
+def test_page_sans_alcool_aleatoire():
+    """Pages par clé des cocktails non alcoolisés = liste filtrée, dans les deux sens"""
+    # GIVEN
+    generateur = random.Random(5)
+    recettes = {c: set(generateur.sample(range(1, 40), generateur.randint(1, 6))) for c in range(500)}
+    sans_alcool = [c % 3 == 0 for c in recettes]
+    moteur = MoteurRealisabilite()
+    moteur.charger_relation(
+        list(recettes), [(c, i) for c, ingr in recettes.items() for i in ingr], sans_alcool
+    )
+    relation = moteur.relation()
+    inventaire = list(generateur.sample(range(1, 40), 25))
+    attendus = sorted(
+        ((c, len(ingr - set(inventaire))) for c, ingr in recettes.items() if sans_alcool[c]),
+        key=lambda p: (p[1], relation.position(p[0])),
+    )
+    attendus = [p for p in attendus if 1 <= p[1] <= 5]
+
+    try:
+        # WHEN
+        pages, cle = [], None
+        while True:
+            page, total, encore = IndexManquants().page(
+                999, inventaire, range(1, 6), limit=7, cle=cle, sans_alcool=True
+            )
+            pages.append(page)
+            if not encore:
+                break
+            cle = page[-1][::-1]
+        retour, _, _ = IndexManquants().page(
+            999, inventaire, range(1, 6), limit=7, cle=pages[-1][0][::-1], avant=True, sans_alcool=True
+        )
+
+        # THEN
+        assert [p for page in pages for p in page] == attendus
+        assert total == len(attendus)
+        assert all(len(page) == 7 for page in pages[:-1])
+        assert len(pages) == 1 or retour == pages[-2]
+    finally:
+        IndexManquants().oublier(999)
+        moteur.invalider()
+
+
+def test_taille_limitee():
+    """Les utilisateurs les moins récemment lus sortent de l'index"""
+    # GIVEN
+    moteur = MoteurRealisabilite()
+    moteur.charger_relation([1, 2], [(1, 10), (2, 20)])
+    index = IndexManquants()
+    taille = index.taille
+    index.taille = 2
+
+    try:
+        # WHEN
+        for id_utilisateur in (101, 102, 101, 103):
+            index.complets(id_utilisateur, [10])
+
+        # THEN
+        assert list(index._entrees) == [101, 103]
+    finally:
+        index.taille = taille
+        for id_utilisateur in (101, 102, 103):
+            index.oublier(id_utilisateur)
+        moteur.invalider()
@@ -0,0 +1,126 @@
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+
+from business_object.ingredient import Ingredient
+from dao.index_prefixes import IndexPrefixes, PrefixesNoms
+from dao.inventaire_dao import InventaireDao
+from utils.catalogue import notifier_rechargement
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def noms(propositions):
+    return [nom for _, nom in propositions]
+
+
+def test_completer_debut_puis_mots_suivants():
+    """Noms qui commencent par le préfixe d'abord (ordre alphabétique), puis ceux dont un autre mot commence par lui"""
+    # GIVEN
+    index = PrefixesNoms([1, 2, 3, 4, 5], ["Margarita", "Blue Margarita", "mango Mule", "Mojito", "Margarita Royale"])
+
+    # WHEN / THEN
+    assert index.completer("MAR") == [(1, "Margarita"), (5, "Margarita Royale"), (2, "Blue Margarita")]
+    assert noms(index.completer("m", limit=3)) == ["mango Mule", "Margarita", "Margarita Royale"]
+    assert noms(index.completer("mu")) == ["mango Mule"]
+    assert index.completer("") == []
+    assert index.completer("x") == []
+
+
+def test_completer_sans_doublon():
+    """Un nom dont plusieurs mots commencent par le préfixe n'est proposé qu'une fois"""
+    # GIVEN
+    index = PrefixesNoms([1, 2], ["Gin Gin Mule", "Sloe Gin Gin Fizz"])
+
+    # WHEN / THEN
+    assert index.completer("gin") == [(1, "Gin Gin Mule"), (2, "Sloe Gin Gin Fizz")]
+
+
+def test_completer_aleatoire():
+    """Même résultat que le parcours de tous les noms"""
+    # GIVEN
+    generateur = random.Random(5)
+    syllabes = ["ma", "gar", "ri", "ta", "mo", "ji", "to", "Sour", "gin", "fizz", " "]
+    tous = ["".join(generateur.choices(syllabes, k=generateur.randint(1, 5))) for _ in range(300)]
+    index = PrefixesNoms(list(range(len(tous))), tous)
+    ordre = sorted(range(len(tous)), key=lambda i: (tous[i].lower(), i))
+
+    for prefixe in ["ma", "gin", "so", "tom", "z"]:
+        # WHEN
+        resultat = index.completer(prefixe, limit=8)
+
+        # THEN
+        debut = [i for i in ordre if tous[i].lower().startswith(prefixe)]
+        autres = [i for i in ordre if i not in debut and any(m.startswith(prefixe) for m in tous[i].lower().split()[1:])]
+        # Les noms qui ne commencent pas par le préfixe sont rangés par la fin du nom à partir du mot trouvé
+        assert [i for i, _ in resultat[: len(debut)]] == debut[:8]
+        assert {i for i, _ in resultat[len(debut) :]} <= set(autres)
+        assert len(resultat) == min(8, len(debut) + len(autres))
+
+
+def test_cocktails_sans_alcool(setup_test_environment):
+    """L'index lu dans la base distingue les cocktails sans alcool"""
+    # GIVEN
+    IndexPrefixes().invalider()
+
+    # WHEN
+    tous = IndexPrefixes().cocktails("o")
+    sans_alcool = IndexPrefixes().cocktails("o", sans_alcool=True)
+
+    # THEN
+    assert noms(tous) == ["Old Fashioned"]
+    assert noms(IndexPrefixes().cocktails("dro")) == ["Coke and Drops"]
+    assert sans_alcool == []
+    assert IndexPrefixes().cocktails("c", sans_alcool=True) == [(3, "Coke and Drops")]
+
+
+def test_nouvel_ingredient_propose(setup_test_environment):
+    """Un ingrédient créé dans la base est proposé aussitôt, sans relecture de l'index"""
+    # GIVEN
+    avant = IndexPrefixes().ingredients("a")
+    with patch.object(IndexPrefixes(), "charger") as charger:
+        # WHEN
+        IndexPrefixes().ajouter_ingredient(9999, "Zzyzx Bitters")
+        propositions = IndexPrefixes().ingredients("bit")
+
+    # THEN
+    assert (9999, "Zzyzx Bitters") in propositions
+    assert IndexPrefixes().ingredients("a") == avant
+    charger.assert_not_called()
+
+
+def test_ajout_inventaire_sans_creation(setup_test_environment):
+    """Un ingrédient déjà dans la base n'est pas ajouté une seconde fois à l'index"""
+    # GIVEN
+    nom = noms(IndexPrefixes().ingredients("l", limit=1))[0]
+    avant = len(IndexPrefixes()._index()["ingredients"])
+
+    # WHEN
+    InventaireDao().ajouter_ingredient_inventaire(
+        4, Ingredient(id_ingredient=None, nom_ingredient=nom.upper(), desc_ingredient=None)
+    )
+
+    # THEN
+    assert len(IndexPrefixes()._index()["ingredients"]) == avant
+
+
+def test_rechargement_catalogue(setup_test_environment):
+    """Un rechargement du catalogue oublie les index"""
+    # GIVEN
+    IndexPrefixes().cocktails("mo")
+    assert IndexPrefixes()._donnees is not None
+
+    # WHEN
+    notifier_rechargement()
+
+    # THEN
+    assert IndexPrefixes()._donnees is None
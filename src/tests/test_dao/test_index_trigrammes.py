@@ -0,0 +1,131 @@
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+
+from dao.cocktail_dao import CocktailDao
+from dao.index_trigrammes import IndexTrigrammes, TrigrammesNoms, trigrammes
+from utils.catalogue import notifier_rechargement
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def ids(cocktails):
+    return [c.id_cocktail for c in cocktails]
+
+
+def test_trigrammes_comme_pg_trgm():
+    """Mêmes trigrammes que show_trgm() : mot par mot, en minuscules, avec les espaces de bord"""
+    assert trigrammes("Gin") == {"  g", " gi", "gin", "in "}
+    assert trigrammes("Coca-cola") == trigrammes("coca cola") == {"  c", " co", "coc", "oca", "ca ", "col", "ola", "la "}
+    assert trigrammes("  ") == set()
+
+
+def test_similarite_faute_de_frappe():
+    """margerita / Margarita : 7 trigrammes communs sur 13 (similarity() de pg_trgm : 0.538462)"""
+    # GIVEN
+    noms = TrigrammesNoms([1, 2, 3], ["Blue Margarita", "Margarita", "Mojito"])
+
+    # WHEN
+    similarites = noms.similarites("margerita")
+
+    # THEN
+    assert similarites[1] == pytest.approx(7 / 13)
+    assert noms.rechercher("margerita") == [2, 1]
+
+
+def test_sous_chaine_toujours_retenue():
+    """Un nom qui contient la recherche est retenu même sous le seuil (comme ILIKE)"""
+    # GIVEN
+    noms = TrigrammesNoms([1, 2], ["Rum Punch", "Caribbean Planter's Rum Cooler Deluxe"])
+
+    # WHEN / THEN
+    assert noms.rechercher("rum punch", seuil=0.9) == [1]
+    assert noms.rechercher("rum", seuil=0.9) == [1, 2]
+
+
+def test_similarites_aleatoires():
+    """Similarités identiques au calcul ensembliste, classement par similarité puis par nom"""
+    # GIVEN
+    generateur = random.Random(11)
+    syllabes = ["ma", "gar", "ri", "ta", "mo", "ji", "to", "sour", "gin", "fizz", " "]
+    noms = sorted("".join(generateur.choices(syllabes, k=generateur.randint(1, 6))) for _ in range(400))
+    index = TrigrammesNoms(list(range(len(noms))), noms)
+
+    for recherche in ["margarita", "gin fizz", "mojto", "sour"]:
+        # WHEN
+        resultat = index.rechercher(recherche, seuil=0.3)
+
+        # THEN
+        attendus = []
+        for position, nom in enumerate(noms):
+            a, b = trigrammes(recherche), trigrammes(nom)
+            similarite = len(a & b) / len(a | b) if a | b else 0
+            assert index.similarites(recherche)[position] == pytest.approx(similarite)
+            if similarite >= 0.3 or recherche in nom:
+                attendus.append((-similarite, position))
+        assert resultat == [position for _, position in sorted(attendus)]
+
+
+def test_rechercher_avec_faute(setup_test_environment):
+    """'mojitto' et 'old fashoned' trouvent Mojito et Old Fashioned"""
+    # WHEN
+    mojito = CocktailDao().rechercher_cocktails(nom_cocktail="mojitto")
+    old_fashioned = CocktailDao().rechercher_cocktails(nom_cocktail="old fashoned", seuil_similarite=0.5)
+
+    # THEN
+    assert [c.nom_cocktail for c in mojito] == ["Mojito"]
+    assert [c.nom_cocktail for c in old_fashioned] == ["Old Fashioned"]
+
+
+def test_rechercher_avec_faute_et_filtres(setup_test_environment):
+    """Les autres filtres s'appliquent aux cocktails trouvés par ressemblance"""
+    # WHEN
+    cocktails = CocktailDao().rechercher_cocktails(nom_cocktail="mojitto", categorie="Shot")
+
+    # THEN
+    assert cocktails == []
+    assert cocktails.total == 0
+
+
+def test_rechercher_par_ressemblance_par_curseur(setup_test_environment):
+    """Pages par curseur dans l'ordre de ressemblance, dans les deux sens"""
+    # GIVEN
+    dao = CocktailDao()
+    tous = dao.rechercher_cocktails(nom_cocktail="cocktail old and tea", seuil_similarite=0, limit=100)
+
+    # WHEN
+    premiere = dao.rechercher_cocktails(nom_cocktail="cocktail old and tea", seuil_similarite=0, limit=1)
+    suivante = dao.rechercher_cocktails(
+        nom_cocktail="cocktail old and tea", seuil_similarite=0, limit=1, apres=premiere.suivant
+    )
+    retour = dao.rechercher_cocktails(
+        nom_cocktail="cocktail old and tea", seuil_similarite=0, limit=1, avant=suivante.precedent
+    )
+
+    # THEN
+    assert len(tous) > 2
+    assert ids(premiere + suivante) == ids(tous)[:2]
+    assert ids(retour) == ids(premiere)
+    assert premiere.total == len(tous)
+
+
+def test_rechargement_catalogue(setup_test_environment):
+    """Un rechargement du catalogue oublie l'index des noms"""
+    # GIVEN
+    IndexTrigrammes().rechercher("mojito")
+    assert IndexTrigrammes()._donnees is not None
+
+    # WHEN
+    notifier_rechargement()
+
+    # THEN
+    assert IndexTrigrammes()._donnees is None
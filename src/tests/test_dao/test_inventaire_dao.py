@@ -234,7 +234,7 @@ def test_rechercher_ingredient_ko(setup_test_environment):
     ingredient = InventaireDao().recherche_ingredient(ingredient_a_chercher)
 
     # THEN
-    assert not isinstance(ingredient, Ingredient)
+    assert ingredient is None
 
 
 # ----------------------------------------------------------------------
@@ -265,6 +265,43 @@ def test_ingredients_aleatoires_limite(setup_test_environment):
     assert len(ingredients) <= 10
 
 
+# ----------------------------------------------------------------------
+# Tests inventaire_commun / autoriser_partage
+# ----------------------------------------------------------------------
+
+
+def test_inventaire_commun(setup_test_environment):
+    """Union des inventaires de l'hôte et des invités qui partagent le leur (5 et 6)"""
+    # WHEN
+    ids_ingredients, refus = InventaireDao().inventaire_commun(3, [5, 6])
+
+    # THEN
+    attendus = set().union(*(InventaireDao().ids_inventaire(u) for u in (3, 5, 6)))
+    assert sorted(ids_ingredients) == sorted(attendus)
+    assert refus == []
+
+
+def test_inventaire_commun_sans_consentement(setup_test_environment):
+    """Les invités qui ne partagent pas leur inventaire, ou inconnus, sont refusés"""
+    # WHEN
+    ids_ingredients, refus = InventaireDao().inventaire_commun(3, [2, 5, 9999])
+
+    # THEN
+    assert refus == [2, 9999]
+    assert set(InventaireDao().ids_inventaire(5)) <= set(ids_ingredients)
+
+
+def test_autoriser_partage(setup_test_environment):
+    """Le consentement se donne puis se retire"""
+    # WHEN / THEN
+    assert InventaireDao().autoriser_partage(2)
+    assert InventaireDao().autoriser_partage(2)
+    assert InventaireDao().inventaire_commun(3, [2])[1] == []
+
+    assert InventaireDao().autoriser_partage(2, autorise=False)
+    assert InventaireDao().inventaire_commun(3, [2])[1] == [2]
+
+
 if __name__ == "__main__":
     import pytest
 
@@ -0,0 +1,130 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from dao.cocktail_dao import CocktailDao
+from dao.commentaire_dao import CommentaireDao
+from dao.lot_requetes import LotRequetes
+from dao.mesure_requetes import demarrer_mesure, terminer_mesure
+from dao.utilisateur_dao import UtilisateurDao
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def test_lot_un_seul_aller_retour(setup_test_environment):
+    """Lectures et écriture du lot partent dans une seule requête SQL"""
+    # GIVEN
+    avant = UtilisateurDao().trouver_par_id(8).cocktails_realises
+    lot = LotRequetes()
+    noms = lot.ajouter(
+        "SELECT nom_cocktail FROM cocktail WHERE id_cocktail < %(id)s ORDER BY id_cocktail", {"id": 2}
+    )
+    modif = lot.ajouter(
+        "UPDATE utilisateur SET cocktails_realises = cocktails_realises + 1 "
+        "WHERE id_utilisateur = %(id)s",
+        {"id": 8},
+    )
+    vide = lot.ajouter("SELECT * FROM cocktail WHERE id_cocktail = %(id)s;", {"id": 99999})
+
+    # WHEN
+    mesure, jeton = demarrer_mesure()
+    try:
+        resultats = lot.executer()
+    finally:
+        terminer_mesure(jeton)
+
+    # THEN
+    assert mesure.nb_requetes == 1
+    assert resultats[noms] == [{"nom_cocktail": "Mojito"}, {"nom_cocktail": "Old Fashioned"}]
+    assert len(resultats[modif]) == 1
+    assert resultats[vide] == []
+    assert UtilisateurDao().trouver_par_id(8).cocktails_realises == avant + 1
+
+
+def test_lot_atomique(setup_test_environment):
+    """Une requête en erreur annule les écritures du lot"""
+    # GIVEN
+    avant = UtilisateurDao().trouver_par_id(8).cocktails_realises
+    lot = LotRequetes()
+    lot.ajouter(
+        "UPDATE utilisateur SET cocktails_realises = cocktails_realises + 1 "
+        "WHERE id_utilisateur = %(id)s",
+        {"id": 8},
+    )
+    lot.ajouter("SELECT 1 / %(zero)s AS division", {"zero": 0})
+
+    # WHEN / THEN
+    with pytest.raises(Exception):
+        lot.executer()
+    assert UtilisateurDao().trouver_par_id(8).cocktails_realises == avant
+
+
+def test_realiser_cocktail_et_compter(setup_test_environment):
+    """Détails du cocktail et compteur de l'utilisateur en un aller-retour"""
+    # GIVEN
+    avant = UtilisateurDao().trouver_par_id(7).cocktails_realises
+
+    # WHEN
+    cocktail = CocktailDao().realiser_cocktail_et_compter(7, nom_cocktail="old fashioned")
+    inconnu = CocktailDao().realiser_cocktail_et_compter(7, nom_cocktail="Cocktail inconnu")
+
+    # THEN
+    assert vars(cocktail) == vars(CocktailDao().realiser_cocktail(nom_cocktail="old fashioned"))
+    assert inconnu is None
+    # Seul le cocktail existant est compté
+    assert UtilisateurDao().trouver_par_id(7).cocktails_realises == avant + 1
+
+
+def test_realiser_cocktail_sans_ingredient(setup_test_environment):
+    """Un cocktail sans ingrédient n'a pas de détails : il n'est pas compté"""
+    # GIVEN
+    avant = UtilisateurDao().trouver_par_id(7).cocktails_realises
+
+    # WHEN
+    cocktail = CocktailDao().realiser_cocktail_et_compter(7, nom_cocktail="Coke and Drops")
+
+    # THEN
+    assert cocktail is None
+    assert UtilisateurDao().trouver_par_id(7).cocktails_realises == avant
+
+
+def test_realiser_cocktail_compteur_null(setup_test_environment):
+    """Un compteur encore NULL (colonne sans valeur par défaut) part de 0"""
+    # GIVEN
+    lot = LotRequetes()
+    lot.ajouter(
+        "UPDATE utilisateur SET cocktails_realises = NULL WHERE id_utilisateur = %(id)s",
+        {"id": 6},
+    )
+    lot.executer()
+    assert UtilisateurDao().trouver_par_id(6).cocktails_realises is None
+
+    # WHEN
+    CocktailDao().realiser_cocktail_et_compter(6, nom_cocktail="old fashioned")
+
+    # THEN
+    assert UtilisateurDao().trouver_par_id(6).cocktails_realises == 1
+
+
+def test_trouver_avec_cocktail(setup_test_environment):
+    """Cocktail, commentaires et note moyenne identiques aux trois lectures séparées"""
+    # WHEN
+    cocktail, commentaires, note_moyenne = CommentaireDao().trouver_avec_cocktail(1)
+    absent, aucun, zero = CommentaireDao().trouver_avec_cocktail(99999)
+
+    # THEN
+    assert cocktail.nom_cocktail == "Old Fashioned"
+    separes = CommentaireDao().trouver_par_cocktail(1)
+    assert [(c.texte, c.note, c.date_creation, c.pseudo_utilisateur) for c in commentaires] == [
+        (c.texte, c.note, c.date_creation, c.pseudo_utilisateur) for c in separes
+    ]
+    assert note_moyenne == sum(c.note for c in separes) / len(separes)
+    assert (absent, aucun, zero) == (None, [], 0.0)
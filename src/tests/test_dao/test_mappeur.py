@@ -0,0 +1,68 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from business_object.commentaire import Commentaire
+from dao.cocktail_dao import MAPPEUR_COCKTAIL
+from dao.commentaire_dao import MAPPEUR_COMMENTAIRE
+from dao.db_connection import CurseurTuple, DBConnection
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def lire(requete, mappeur):
+    with DBConnection().connection as connection:
+        with connection.cursor(cursor_factory=CurseurTuple) as cursor:
+            cursor.execute(requete)
+            return mappeur.tous(cursor), mappeur.compiler(cursor.description)
+
+
+def test_mappeur_construit_les_objets(setup_test_environment):
+    """Les colonnes sont lues par position, quel que soit leur ordre dans la requête"""
+    # WHEN
+    cocktails, _ = lire(
+        "SELECT alcool, nom_cocktail, id_cocktail, categorie, image_url, verre, instructions "
+        "FROM cocktail ORDER BY id_cocktail;",
+        MAPPEUR_COCKTAIL,
+    )
+
+    # THEN
+    assert [c.nom_cocktail for c in cocktails] == [
+        "Mojito", "Old Fashioned", "Long Island Tea", "Coke and Drops"
+    ]
+    assert cocktails[3].alcoolise_cocktail == "Non alcoholic"
+    assert cocktails[0].id_cocktail == 0
+
+
+def test_mappeur_compile_une_fois(setup_test_environment):
+    """Une même forme de résultat réutilise la fonction déjà générée"""
+    # WHEN
+    _, premiere = lire("SELECT * FROM cocktail;", MAPPEUR_COCKTAIL)
+    _, seconde = lire("SELECT * FROM cocktail WHERE id_cocktail > 1;", MAPPEUR_COCKTAIL)
+
+    # THEN
+    assert premiere is seconde
+
+
+def test_mappeur_colonne_absente(setup_test_environment):
+    """Colonne absente : valeur par défaut du constructeur (None s'il n'y en a pas)"""
+    # WHEN
+    commentaires, _ = lire("SELECT * FROM commentaire ORDER BY id_commentaire;", MAPPEUR_COMMENTAIRE)
+    cocktails, _ = lire("SELECT id_cocktail, nom_cocktail FROM cocktail;", MAPPEUR_COCKTAIL)
+
+    # THEN
+    assert all(isinstance(c, Commentaire) for c in commentaires)
+    assert commentaires[0].pseudo_utilisateur == ""
+    assert cocktails[0].categ_cocktail is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
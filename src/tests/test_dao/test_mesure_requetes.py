@@ -0,0 +1,102 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.mesures import MesureRequetesMiddleware, RouteMesuree
+from dao.async_db_connection import AsyncDBConnection
+from dao.cocktail_dao import CocktailDao
+from dao.cocktail_dao_async import CocktailDaoAsync
+from dao.mesure_requetes import demarrer_mesure, terminer_mesure
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+@pytest.fixture
+def client(setup_test_environment):
+    """Petite application : un endpoint synchrone qui fait une requête SQL par cocktail"""
+    router = APIRouter(route_class=RouteMesuree)
+
+    @router.get("/noms")
+    def noms():
+        return [CocktailDao().trouver_par_id(i).nom_cocktail for i in range(3)]
+
+    application = FastAPI()
+    application.add_middleware(MesureRequetesMiddleware, budget_requetes=2)
+    application.include_router(router)
+    return TestClient(application)
+
+
+def test_compter_requetes_sql(setup_test_environment):
+    """Chaque execute d'un curseur du pool est compté dans la mesure en cours"""
+    # GIVEN
+    mesure, jeton = demarrer_mesure()
+
+    # WHEN
+    try:
+        CocktailDao().trouver_par_id(0)
+        CocktailDao().lister_categories()
+    finally:
+        terminer_mesure(jeton)
+
+    # THEN
+    assert mesure.nb_requetes == 2
+    assert mesure.duree_bd > 0
+
+
+def test_compter_requetes_async(setup_test_environment):
+    """Les requêtes asyncpg sont comptées aussi"""
+
+    async def scenario():
+        mesure, jeton = demarrer_mesure()
+        try:
+            await CocktailDaoAsync().trouver_par_id(0)
+        finally:
+            terminer_mesure(jeton)
+            await AsyncDBConnection().fermer()
+        return mesure
+
+    mesure = asyncio.run(scenario())
+
+    assert mesure.nb_requetes == 1
+
+
+def test_entete_server_timing(client):
+    """L'en-tête Server-Timing donne le temps en base, le nombre de requêtes,
+    la sérialisation et le total"""
+    # WHEN
+    reponse = client.get("/noms")
+
+    # THEN
+    entete = reponse.headers["Server-Timing"]
+    assert reponse.json() == ["Mojito", "Old Fashioned", "Long Island Tea"]
+    assert 'desc="3 requetes"' in entete
+    assert "serialisation;dur=" in entete
+    assert "total;dur=" in entete
+
+
+def test_log_budget_depasse(client, caplog):
+    """Au-delà du budget de requêtes SQL, la ligne de log passe en WARNING"""
+    # WHEN
+    with caplog.at_level("INFO"):
+        client.get("/noms")
+
+    # THEN
+    lignes = [r for r in caplog.records if "requete_http" in r.getMessage()]
+    assert lignes[-1].levelname == "WARNING"
+    assert '"nb_requetes_sql": 3' in lignes[-1].getMessage()
+    assert '"budget_requetes_depasse": true' in lignes[-1].getMessage()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
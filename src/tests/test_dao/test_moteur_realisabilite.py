@@ -0,0 +1,227 @@
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+
+from dao.cocktail_dao import CocktailDao
+from dao.inventaire_dao import InventaireDao
+from dao.moteur_realisabilite import MoteurRealisabilite
+from dao.pagination import decoder_curseur, encoder_curseur
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def ids(cocktails):
+    return [c.id_cocktail for c in cocktails]
+
+
+@pytest.mark.parametrize("id_utilisateur", range(1, 9))
+def test_complets_identiques_au_sql(setup_test_environment, id_utilisateur):
+    """Le moteur en mémoire renvoie les mêmes cocktails complets que la requête SQL"""
+    # WHEN
+    moteur = CocktailDao().cocktail_complet(id_utilisateur, limit=1000)
+    sql = CocktailDao()._cocktail_complet_sql(id_utilisateur, limit=1000)
+
+    # THEN
+    assert ids(moteur) == ids(sql)
+
+
+@pytest.mark.parametrize("id_utilisateur", range(1, 9))
+def test_sans_alcool_identiques_au_sql(setup_test_environment, id_utilisateur):
+    """Le filtre des mineurs donne les mêmes listes (et les mêmes totaux) par le moteur qu'en SQL"""
+    # WHEN
+    moteur = CocktailDao().cocktail_partiel(id_utilisateur, 5, limit=1000, sans_alcool=True)
+    sql = CocktailDao()._cocktail_partiel_sql(id_utilisateur, 5, limit=1000, sans_alcool=True)
+    complets = CocktailDao().cocktail_complet(id_utilisateur, limit=1000, sans_alcool=True)
+
+    # THEN
+    assert ids(moteur) == ids(sql)
+    assert moteur.total == sql.total
+    assert ids(complets) == ids(CocktailDao()._cocktail_complet_sql(id_utilisateur, limit=1000, sans_alcool=True))
+    assert all(c.alcoolise_cocktail == "Non alcoholic" for c in moteur + complets)
+
+
+@pytest.mark.parametrize("id_utilisateur", range(1, 9))
+def test_partiels_identiques_au_sql(setup_test_environment, id_utilisateur):
+    """Mêmes cocktails partiels, dans le même ordre, pour chaque nombre de manquants"""
+    for nb_manquants in range(1, 7):
+        # WHEN
+        moteur = CocktailDao().cocktail_partiel(id_utilisateur, nb_manquants, limit=1000)
+        sql = CocktailDao()._cocktail_partiel_sql(id_utilisateur, nb_manquants, limit=1000)
+
+        # THEN
+        assert ids(moteur) == ids(sql)
+
+
+@pytest.mark.parametrize("sans_alcool", [False, True])
+def test_soiree_identique_au_sql(setup_test_environment, sans_alcool):
+    """Mêmes cocktails, dans le même ordre et avec les mêmes manquants, pour des inventaires réunis"""
+    ids_ingredients, _ = InventaireDao().inventaire_commun(3, [5, 6])
+    for nb_manquants in range(0, 6):
+        # WHEN
+        moteur = CocktailDao().cocktails_soiree(ids_ingredients, nb_manquants, sans_alcool, limit=1000)
+        sql = CocktailDao()._cocktails_soiree_sql(ids_ingredients, nb_manquants, sans_alcool, limit=1000)
+
+        # THEN
+        assert [(c.id_cocktail, nb) for c, nb in moteur] == [(c.id_cocktail, nb) for c, nb in sql]
+        assert moteur.total == sql.total == len(moteur)
+
+
+def test_pagination(setup_test_environment):
+    """limit / offset appliqués après le tri"""
+    # GIVEN
+    tous = CocktailDao().cocktail_partiel(1, 5, limit=1000)
+
+    # WHEN
+    page = CocktailDao().cocktail_partiel(1, 5, limit=2, offset=1)
+
+    # THEN
+    assert ids(page) == ids(tous)[1:3]
+
+
+def pages(lire, limit, cles=ids):
+    """Toutes les pages d'une liste, en suivant les curseurs vers l'avant puis vers l'arrière"""
+    en_avant, page = [], lire(limit=limit, apres=None, avant=None)
+    while True:
+        en_avant.append((cles(page), page.total))
+        if page.suivant is None:
+            break
+        page = lire(limit=limit, apres=page.suivant, avant=None)
+    en_arriere = [cles(page)]
+    while page.precedent is not None:
+        page = lire(limit=limit, apres=None, avant=page.precedent)
+        en_arriere.insert(0, cles(page))
+    return en_avant, en_arriere
+
+
+@pytest.mark.parametrize("sans_alcool", [False, True])
+@pytest.mark.parametrize("id_utilisateur", [1, 3, 5])
+def test_pagination_par_curseur(setup_test_environment, id_utilisateur, sans_alcool):
+    """Pages enchaînées par curseur = liste complète, dans les deux sens, par le moteur comme en SQL"""
+    dao = CocktailDao()
+    for lire, lire_sql, types in [
+        (
+            lambda **k: dao.cocktail_complet(id_utilisateur, sans_alcool=sans_alcool, **k),
+            lambda **k: dao._cocktail_complet_sql(id_utilisateur, sans_alcool=sans_alcool, **k),
+            (str, int),
+        ),
+        (
+            lambda **k: dao.cocktail_partiel(id_utilisateur, 5, sans_alcool=sans_alcool, **k),
+            lambda **k: dao._cocktail_partiel_sql(id_utilisateur, 5, sans_alcool=sans_alcool, **k),
+            (int, str, int),
+        ),
+    ]:
+        # GIVEN
+        tous = ids(lire(limit=1000))
+
+        # WHEN
+        moteur, moteur_arriere = pages(lire, 2)
+        # Le SQL reçoit la clé décodée, comme cocktail_complet / cocktail_partiel
+        sql, sql_arriere = pages(
+            lambda limit, apres, avant: lire_sql(
+                limit=limit,
+                cle=decoder_curseur(apres or avant, types) if apres or avant else None,
+                avant=avant is not None,
+            ),
+            2,
+        )
+
+        # THEN
+        assert [i for page, _ in moteur for i in page] == tous
+        assert all(total == len(tous) for _, total in moteur)
+        assert moteur_arriere == [page for page, _ in moteur]
+        assert (moteur, moteur_arriere) == (sql, sql_arriere)
+        assert all(len(page) == 2 for page, _ in moteur[:-1])
+
+
+@pytest.mark.parametrize("sans_alcool", [False, True])
+def test_soiree_par_curseur(setup_test_environment, sans_alcool):
+    """Pages de la soirée enchaînées par curseur = classement complet, dans les deux sens, comme en SQL"""
+    # GIVEN
+    ids_ingredients, _ = InventaireDao().inventaire_commun(3, [5, 6])
+    dao = CocktailDao()
+
+    def classement(page):
+        return [(c.id_cocktail, nb) for c, nb in page]
+
+    tous = classement(dao.cocktails_soiree(ids_ingredients, 5, sans_alcool, limit=1000))
+
+    # WHEN
+    moteur, moteur_arriere = pages(
+        lambda **k: dao.cocktails_soiree(ids_ingredients, 5, sans_alcool, **k), 1, classement
+    )
+    sql, sql_arriere = pages(
+        lambda limit, apres, avant: dao._cocktails_soiree_sql(
+            ids_ingredients,
+            5,
+            sans_alcool,
+            limit=limit,
+            cle=decoder_curseur(apres or avant, (int, str, int)) if apres or avant else None,
+            avant=avant is not None,
+        ),
+        1,
+        classement,
+    )
+
+    # THEN
+    assert [p for page, _ in moteur for p in page] == tous
+    assert all(total == len(tous) for _, total in moteur)
+    assert moteur_arriere == [page for page, _ in moteur]
+    assert (moteur, moteur_arriere) == (sql, sql_arriere)
+
+
+def test_curseur_invalide(setup_test_environment):
+    with pytest.raises(ValueError):
+        CocktailDao().cocktail_partiel(1, 5, apres="pas un curseur")
+    with pytest.raises(ValueError):
+        # Curseur de cocktail_complet (nom, id) donné à cocktail_partiel
+        CocktailDao().cocktail_partiel(1, 5, apres=encoder_curseur(("Mojito", 1)))
+
+
+def test_rechargement_catalogue(setup_test_environment):
+    """Un rechargement du catalogue oblige le moteur à relire la relation"""
+    # GIVEN
+    CocktailDao().cocktail_complet(3)
+    assert MoteurRealisabilite()._donnees is not None
+
+    # WHEN
+    ResetDatabase().lancer(test_dao=True)
+
+    # THEN
+    assert MoteurRealisabilite()._donnees is None
+    assert ids(CocktailDao().cocktail_complet(3, limit=1000)) == ids(
+        CocktailDao()._cocktail_complet_sql(3, limit=1000)
+    )
+
+
+def test_relation_aleatoire():
+    """Sur un catalogue aléatoire, le calcul par bits correspond au calcul ensembliste"""
+    # GIVEN
+    generateur = random.Random(42)
+    ids_cocktails = list(range(500))
+    recettes = {c: set(generateur.sample(range(1, 200), generateur.randint(1, 8))) for c in ids_cocktails}
+    inventaire = set(generateur.sample(range(1, 250), 120))
+    moteur = MoteurRealisabilite()
+    moteur.charger_relation(ids_cocktails, [(c, i) for c, ingr in recettes.items() for i in ingr])
+
+    # WHEN
+    try:
+        complets = moteur.complets(list(inventaire), limit=1000)
+        partiels = moteur.partiels(list(inventaire), 2, limit=1000)
+    finally:
+        moteur.invalider()
+
+    # THEN
+    manquants = {c: len(ingr - inventaire) for c, ingr in recettes.items()}
+    assert complets == [c for c in ids_cocktails if manquants[c] == 0]
+    assert partiels == sorted(
+        (c for c in ids_cocktails if 1 <= manquants[c] <= 2), key=lambda c: (manquants[c], c)
+    )
@@ -0,0 +1,70 @@
+import itertools
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+
+from dao.cocktail_dao import CocktailDao
+from dao.moteur_realisabilite import RelationBits
+from dao.optimiseur_courses import meilleurs_achats
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def gain(recettes, inventaire, achats) -> int:
+    """Nombre de cocktails non réalisables avec l'inventaire, réalisables après les achats"""
+    return sum(
+        1 for ingredients in recettes.values() if ingredients - inventaire and ingredients <= inventaire | set(achats)
+    )
+
+
+def test_optimiser_courses(setup_test_environment):
+    """Il ne manque que Water (408) à John pour un Old Fashioned"""
+    # WHEN
+    ingredients, nb_cocktails = CocktailDao().optimiser_courses(3, 1)
+
+    # THEN
+    assert [i.id_ingredient for i in ingredients] == [408]
+    assert nb_cocktails == 1
+    # Aucun cocktail sans alcool à compléter
+    assert CocktailDao().optimiser_courses(3, 1, sans_alcool=True) == ([], 0)
+
+
+def test_k_invalide():
+    """k doit être compris entre 1 et K_MAX"""
+    relation = RelationBits([1], [(1, 10)])
+    for k in (0, 11):
+        with pytest.raises(ValueError):
+            meilleurs_achats(relation, [], k)
+
+
+def test_proche_de_la_recherche_exhaustive():
+    """Sur des catalogues aléatoires, le gain annoncé est exact et proche de l'optimum"""
+    generateur = random.Random(11)
+    ratios = []
+    for _ in range(6):
+        # GIVEN
+        recettes = {c: set(generateur.sample(range(1, 31), generateur.randint(2, 5))) for c in range(500)}
+        relation = RelationBits(list(recettes), [(c, i) for c, ingr in recettes.items() for i in ingr])
+        inventaire = set(generateur.sample(range(1, 31), 10))
+        candidats = sorted(set(range(1, 31)) - inventaire)
+
+        for k in (1, 2, 3):
+            # WHEN
+            achats, nb_cocktails = meilleurs_achats(relation, list(inventaire), k, delai_ms=10**6)
+
+            # THEN
+            assert len(achats) <= k and not set(achats) & inventaire
+            assert nb_cocktails == gain(recettes, inventaire, achats)
+            optimum = max(gain(recettes, inventaire, c) for c in itertools.combinations(candidats, k))
+            ratios.append(nb_cocktails / optimum)
+    assert min(ratios) >= 0.9
+    assert sum(ratios) / len(ratios) >= 0.98
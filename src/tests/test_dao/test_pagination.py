@@ -0,0 +1,64 @@
+import pytest
+
+from dao.pagination import TOTAL_MAX, Page, construire_page, decoder_curseur, encoder_curseur, tranche
+
+
+def test_curseur_aller_retour():
+    # GIVEN
+    cle = (2, "Piña Colada / Frozen", 17)
+
+    # WHEN
+    curseur = encoder_curseur(cle)
+
+    # THEN
+    assert "=" not in curseur and "/" not in curseur
+    assert decoder_curseur(curseur, (int, str, int)) == cle
+
+
+@pytest.mark.parametrize(
+    "curseur",
+    ["", "abc", "pas un curseur !", encoder_curseur(("Mojito", 1)), encoder_curseur((True, "Mojito", 1))],
+)
+def test_curseur_invalide(curseur):
+    with pytest.raises(ValueError):
+        decoder_curseur(curseur, (int, str, int))
+
+
+def test_page():
+    # WHEN
+    page = Page([1, 2], suivant="x")
+
+    # THEN
+    assert page == [1, 2]
+    assert page.suivant == "x"
+    assert Page().suivant is None
+
+
+def test_construire_page():
+    # WHEN
+    premiere = construire_page(["a", "b"], [("a", 1), ("b", 2)], total=5, encore=True)
+    milieu = construire_page(["c", "d"], [("c", 3), ("d", 4)], total=5, encore=True, depuis_debut=False)
+    arriere = construire_page(["a", "b"], [("a", 1), ("b", 2)], total=5, encore=False, avant=True)
+
+    # THEN
+    assert (premiere.precedent, decoder_curseur(premiere.suivant, (str, int))) == (None, ("b", 2))
+    assert decoder_curseur(milieu.precedent, (str, int)) == ("c", 3)
+    assert arriere.precedent is None and arriere.a_suivant
+
+
+def test_total_borne():
+    # WHEN
+    page = construire_page([], [], total=TOTAL_MAX + 1, encore=False)
+
+    # THEN
+    assert page.total == TOTAL_MAX
+    assert not page.total_exact
+
+
+def test_tranche():
+    """Bornes de page dans une liste de 10 éléments, vers l'avant puis vers l'arrière"""
+    assert tranche(10, 0, 3, 0) == (0, 3, True)
+    assert tranche(10, 8, 3, 0) == (8, 10, False)
+    assert tranche(10, 3, 3, 20) == (10, 10, False)
+    assert tranche(10, 6, 3, 0, avant=True) == (3, 6, True)
+    assert tranche(10, 2, 3, 0, avant=True) == (0, 2, False)
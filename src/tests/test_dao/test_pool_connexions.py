@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from dao.db_connection import parametres_connexion
+from dao.pool_connexions import PoolConnexions, PoolConnexionsEpuise
+
+
+@pytest.fixture
+def pool():
+    """Petit pool dédié aux tests"""
+    pool = PoolConnexions(min_connexions=1, max_connexions=2, delai_attente=0.2,
+                          **parametres_connexion())
+    yield pool
+    pool.fermer()
+
+
+def test_pool_ouvre_min_connexions(pool):
+    """Le pool ouvre min_connexions connexions dès sa création"""
+    # THEN
+    metriques = pool.metriques()
+    assert metriques["taille"] == 1
+    assert metriques["libres"] == 1
+    assert metriques["empruntees"] == 0
+
+
+def test_pool_parametres_invalides():
+    """min_connexions ne peut pas dépasser max_connexions"""
+    with pytest.raises(ValueError):
+        PoolConnexions(min_connexions=3, max_connexions=2)
+
+
+def test_pool_connexion_reutilisee(pool):
+    """Une connexion rendue est réutilisée par l'emprunt suivant"""
+    # WHEN
+    with pool.connexion() as c1:
+        id_c1 = id(c1)
+    with pool.connexion() as c2:
+        id_c2 = id(c2)
+
+    # THEN
+    assert id_c1 == id_c2
+    assert pool.metriques()["connexions_creees"] == 1
+    assert pool.metriques()["emprunts"] == 2
+
+
+def test_pool_expiration_quand_epuise(pool):
+    """Au-delà de max_connexions, l'attente est bornée par le délai"""
+    # GIVEN
+    c1 = pool.prendre()
+    c2 = pool.prendre()
+
+    # WHEN / THEN
+    with pytest.raises(PoolConnexionsEpuise):
+        pool.prendre()
+    assert pool.metriques()["expirations"] == 1
+
+    pool.rendre(c1)
+    pool.rendre(c2)
+
+
+def test_pool_attente_puis_connexion_liberee(pool):
+    """Un thread en attente récupère la connexion dès qu'elle est rendue"""
+    # GIVEN
+    c1 = pool.prendre()
+    c2 = pool.prendre()
+    threading.Timer(0.05, pool.rendre, args=(c1,)).start()
+
+    # WHEN
+    c3 = pool.prendre(delai=2)
+
+    # THEN
+    assert c3 is c1
+    assert pool.metriques()["attentes"] == 1
+    pool.rendre(c2)
+    pool.rendre(c3)
+
+
+def test_pool_rollback_si_exception(pool):
+    """Une exception dans le bloc annule la transaction et rend la connexion"""
+    # WHEN
+    with pytest.raises(RuntimeError):
+        with pool.connexion() as connexion:
+            with connexion.cursor() as cursor:
+                cursor.execute("SELECT 1 AS un;")
+            raise RuntimeError("boom")
+
+    # THEN
+    assert pool.metriques()["empruntees"] == 0
+    assert pool.metriques()["libres"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,73 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from dao.cocktail_dao import CocktailDao
+from dao.db_connection import DBConnection
+from dao.requetes_preparees import RegistreRequetesPreparees
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+def test_requete_preparee_une_fois_par_connexion(setup_test_environment):
+    """Deux exécutions sur la même connexion : un seul PREPARE"""
+    # GIVEN
+    registre = RegistreRequetesPreparees()
+    requete = "SELECT nom_cocktail FROM cocktail WHERE id_cocktail = %(id)s;"
+
+    # WHEN
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            registre.executer(cursor, "test_unique", requete, {"id": 0})
+            premier = cursor.fetchone()
+            registre.executer(cursor, "test_unique", requete, {"id": 1})
+            second = cursor.fetchone()
+
+    # THEN
+    stats = [s for s in registre.statistiques() if s["prefixe"] == "test_unique"]
+    assert premier["nom_cocktail"] == "Mojito"
+    assert second["nom_cocktail"] == "Old Fashioned"
+    assert stats[0]["preparations"] == 1
+    assert stats[0]["executions"] == 2
+
+
+def test_une_variante_par_langue(setup_test_environment):
+    """La colonne d'instructions change le texte SQL, donc la requête préparée
+    (cocktail_complet lit sa page de résultats avec trouver_par_ids)"""
+    # WHEN
+    eng = CocktailDao().cocktail_complet(3, langue="ENG")
+    fra = CocktailDao().cocktail_complet(3, langue="FRA")
+
+    # THEN
+    variantes = [
+        s for s in RegistreRequetesPreparees().statistiques() if s["prefixe"] == "trouver_par_ids"
+    ]
+    assert len(variantes) >= 2
+    assert [c.nom_cocktail for c in eng] == [c.nom_cocktail for c in fra]
+    assert eng[0].instruc_cocktail != fra[0].instruc_cocktail
+
+
+def test_requete_sans_parametre(setup_test_environment):
+    """Une requête sans paramètre est exécutée sans parenthèses"""
+    # WHEN
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            RegistreRequetesPreparees().executer(
+                cursor, "test_sans_parametre", "SELECT COUNT(*) AS nb FROM cocktail;"
+            )
+            row = cursor.fetchone()
+
+    # THEN
+    assert row["nb"] == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
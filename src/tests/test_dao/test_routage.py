@@ -0,0 +1,115 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from business_object.ingredient import Ingredient
+from dao.cocktail_dao import CocktailDao
+from dao.db_connection import DBConnection
+from dao.inventaire_dao import InventaireDao
+from utils.reset_database import ResetDatabase
+
+SCHEMA_REPLICA = "projet_test_replica"
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+@pytest.fixture
+def replica(setup_test_environment):
+    """Réplica simulée par un second schéma, rempli avec les mêmes données
+    puis modifié pour savoir quelle base a répondu :
+    le Mojito est renommé et John (id 3) n'a plus d'inventaire"""
+    with open("data/init_db.sql", encoding="utf-8") as f:
+        init_db = f.read()
+    with open("data/pop_db_test.sql", encoding="utf-8") as f:
+        pop_db = f.read()
+
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DROP SCHEMA IF EXISTS {SCHEMA_REPLICA} CASCADE; CREATE SCHEMA {SCHEMA_REPLICA};"
+                f"SET LOCAL search_path TO {SCHEMA_REPLICA};"
+            )
+            cursor.execute(init_db)
+            cursor.execute(pop_db)
+            cursor.execute(
+                "UPDATE cocktail SET nom_cocktail = 'Mojito réplica' WHERE id_cocktail = 0;"
+                "DELETE FROM inventaire_ingredient WHERE id_utilisateur = 3;"
+            )
+
+    DBConnection().configurer_lecture(f"options='-c search_path={SCHEMA_REPLICA}'")
+    yield
+    DBConnection().configurer_lecture(None)
+    DBConnection().delai_lecture_ecritures = 0
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA_REPLICA} CASCADE;")
+
+
+def test_lecture_sur_replica(replica):
+    """Les méthodes @lecture_seule lisent la réplica"""
+    # WHEN
+    cocktail = CocktailDao().trouver_par_id(0)
+    complets = CocktailDao().cocktail_complet(3)
+
+    # THEN
+    assert cocktail.nom_cocktail == "Mojito réplica"
+    assert complets == []
+    assert DBConnection().metriques_routage()["lectures_replica"] >= 2
+
+
+def test_ecriture_sur_principale(replica):
+    """Les écritures restent sur la base principale (réplica en lecture seule)"""
+    # GIVEN
+    ingredient = Ingredient(id_ingredient=379, nom_ingredient="Sugar", desc_ingredient=None)
+
+    # WHEN
+    ajoute = InventaireDao().ajouter_ingredient_inventaire(6, ingredient)
+    supprime = InventaireDao().supprimer_ingredient(6, 379)
+
+    # THEN
+    assert ajoute is True
+    assert supprime is True
+
+
+def test_lire_ses_ecritures(replica):
+    """Après une modification d'inventaire, les lectures de l'utilisateur
+    repassent sur la base principale pendant le délai configuré"""
+    # GIVEN
+    DBConnection().delai_lecture_ecritures = 60
+
+    # WHEN
+    DBConnection().signaler_ecriture(3)
+    complets_john = CocktailDao().cocktail_complet(3)
+    cocktail = CocktailDao().trouver_par_id(0)
+
+    # THEN
+    assert "Mojito" in [c.nom_cocktail for c in complets_john]
+    assert cocktail.nom_cocktail == "Mojito réplica"
+
+
+def test_bascule_si_replica_indisponible(setup_test_environment):
+    """Réplica injoignable : la lecture est servie par la base principale"""
+    # GIVEN
+    DBConnection().configurer_lecture("host=127.0.0.1 port=1")
+    bascules = DBConnection().metriques_routage()["bascules"]
+
+    # WHEN
+    try:
+        cocktail = CocktailDao().trouver_par_id(0)
+    finally:
+        DBConnection().configurer_lecture(None)
+
+    # THEN
+    assert cocktail.nom_cocktail == "Mojito"
+    assert DBConnection().metriques_routage()["bascules"] == bascules + 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
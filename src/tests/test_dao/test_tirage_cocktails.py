@@ -0,0 +1,130 @@
+import os
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from dao.cocktail_dao import CocktailDao
+from dao.tirage_cocktails import TirageCocktails, tirer
+from utils.catalogue import notifier_rechargement
+from utils.reset_database import ResetDatabase
+
+
+@pytest.fixture(scope="session")
+def setup_test_environment():
+    """Initialisation des données de test"""
+    with patch.dict(os.environ, {"POSTGRES_SCHEMA": "projet_test_dao"}):
+        ResetDatabase().lancer(test_dao=True)
+        yield
+
+
+@pytest.fixture
+def catalogue_fictif():
+    """1000 cocktails, un sur quatre sans alcool ; oubliés après le test"""
+    TirageCocktails().charger_cocktails(
+        [(i, "Non alcoholic" if i % 4 == 0 else "Alcoholic") for i in range(1000)]
+    )
+    yield
+    TirageCocktails().invalider()
+
+
+def test_tirer_sans_remise():
+    """Identifiants distincts, tous si on en demande plus qu'il n'y en a"""
+    # GIVEN
+    ids = np.arange(100, 110)
+
+    # WHEN / THEN
+    for _ in range(50):
+        tires = tirer(ids, 5)
+        assert len(set(tires)) == 5
+        assert set(tires) <= set(ids.tolist())
+    assert sorted(tirer(ids, 50)) == ids.tolist()
+    assert tirer(np.empty(0, dtype=np.int64), 5) == []
+
+
+def test_tirer_uniforme():
+    """Chaque identifiant sort à peu près aussi souvent que les autres"""
+    # GIVEN
+    ids = np.arange(10)
+
+    # WHEN
+    sorties = np.bincount([i for _ in range(5000) for i in tirer(ids, 2)], minlength=10)
+
+    # THEN
+    assert sorties.sum() == 10_000
+    assert sorties.min() > 850 and sorties.max() < 1150
+
+
+def test_tirage_par_classe(catalogue_fictif):
+    """Un mineur ne tire que parmi les cocktails sans alcool"""
+    # WHEN
+    tires = [i for _ in range(100) for i in TirageCocktails().tirer(5, sans_alcool=True)]
+
+    # THEN
+    assert all(i % 4 == 0 for i in tires)
+    assert any(i % 4 for i in TirageCocktails().tirer(50))
+
+
+def test_du_jour_meme_toute_la_journee(catalogue_fictif):
+    """Même cocktail pour une date donnée, d'autres les jours suivants"""
+    # GIVEN
+    jour = date(2026, 10, 18)
+
+    # WHEN
+    du_jour = TirageCocktails().du_jour(jour)
+    semaine = {TirageCocktails().du_jour(jour + timedelta(days=n)) for n in range(7)}
+
+    # THEN
+    assert TirageCocktails().du_jour(jour) == du_jour
+    assert len(semaine) > 1
+    assert TirageCocktails().du_jour(jour, sans_alcool=True) % 4 == 0
+
+
+def test_cocktail_du_jour_garde(catalogue_fictif):
+    """Le cocktail du jour n'est lu qu'une fois par langue ; la veille est oubliée"""
+    # GIVEN
+    jour = date(2026, 10, 18)
+    lire = MagicMock(side_effect=lambda id_cocktail: f"cocktail {id_cocktail}")
+
+    # WHEN
+    premier = TirageCocktails().cocktail_du_jour(jour, False, "FRA", lire)
+    second = TirageCocktails().cocktail_du_jour(jour, False, "FRA", lire)
+    TirageCocktails().cocktail_du_jour(jour + timedelta(days=1), False, "FRA", lire)
+
+    # THEN
+    assert premier == second == f"cocktail {TirageCocktails().du_jour(jour)}"
+    assert lire.call_count == 2
+    assert all(cle[0] == jour + timedelta(days=1) for cle in TirageCocktails()._du_jour)
+
+
+def test_cocktail_du_jour_dao(setup_test_environment):
+    """Le cocktail du jour d'un mineur est le seul cocktail sans alcool ; lu une seule fois"""
+    # GIVEN
+    TirageCocktails().invalider()
+    jour = date(2026, 10, 18)
+
+    # WHEN
+    cocktail = CocktailDao().cocktail_du_jour("FRA", sans_alcool=True, jour=jour)
+    with patch.object(CocktailDao(), "trouver_par_ids") as trouver_par_ids:
+        encore = CocktailDao().cocktail_du_jour("FRA", sans_alcool=True, jour=jour)
+
+    # THEN
+    assert cocktail.nom_cocktail == "Coke and Drops"
+    assert encore is cocktail
+    trouver_par_ids.assert_not_called()
+    assert CocktailDao().cocktail_du_jour(jour=jour).id_cocktail in {0, 1, 2, 3}
+
+
+def test_rechargement_catalogue(setup_test_environment):
+    """Un rechargement du catalogue oublie les identifiants et le cocktail du jour"""
+    # GIVEN
+    CocktailDao().cocktail_du_jour()
+    assert TirageCocktails()._donnees is not None
+
+    # WHEN
+    notifier_rechargement()
+
+    # THEN
+    assert TirageCocktails()._donnees is None
+    assert TirageCocktails()._du_jour == {}
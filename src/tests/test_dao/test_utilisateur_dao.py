@@ -68,6 +68,13 @@ def test_lister_tous():
     assert len(utilisateurs) >= 8
 
 
+def test_iterer_tous():
+    """Parcours des utilisateurs par lots : mêmes utilisateurs que lister_tous"""
+    utilisateurs = UtilisateurDao().iterer_tous(taille_lot=3)
+    ids = [u.id_utilisateur for u in utilisateurs]
+    assert ids == sorted(u.id_utilisateur for u in UtilisateurDao().lister_tous())
+
+
 # --- TESTS DE CREATION ----------------------------------------------------
 
 
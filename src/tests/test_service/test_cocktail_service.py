@@ -3,7 +3,12 @@ from unittest.mock import MagicMock
 import pytest
 
 from business_object.cocktail import Cocktail
+from business_object.ingredient import Ingredient
 from dao.cocktail_dao import CocktailDao
+from dao.donnees_reference import DonneesReference
+from dao.index_prefixes import IndexPrefixes
+from dao.inventaire_dao import InventaireDao
+from dao.pagination import Page
 from service.cocktail_service import CocktailService
 
 # ----- données de test -----
@@ -54,6 +59,16 @@ def test_rechercher_par_filtre_ok():
     assert res[0].nom_cocktail == "Mojito"
 
 
+def test_rechercher_par_filtre_seuil_invalide():
+    """Exception si le seuil de similarité n'est pas entre 0 et 1"""
+    # GIVEN
+    service = CocktailService()
+
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        service.rechercher_par_filtre(nom_cocktail="margerita", seuil_similarite=1.5)
+
+
 def test_lister_cocktails_complets_ok():
     """Lister cocktails complets"""
     # GIVEN
@@ -68,16 +83,32 @@ def test_lister_cocktails_complets_ok():
 
 
 def test_lister_cocktails_complets_mineur():
-    """Lister cocktails complets pour mineur filtre alcool"""
+    """Pour un mineur, le filtre alcool est fait par le DAO"""
     # GIVEN
-    CocktailDao().cocktail_complet = MagicMock(return_value=liste_cocktails)
+    CocktailDao().cocktail_complet = MagicMock(return_value=Page([cocktail2]))
     service = CocktailService()
 
     # WHEN
     res = service.lister_cocktails_complets(id_utilisateur=1, est_majeur=False)
 
     # THEN
-    assert all(c.alcoolise_cocktail == "Non alcoholic" for c in res)
+    assert res == [cocktail2]
+    CocktailDao().cocktail_complet.assert_called_once_with(1, None, 10, 0, None, None, sans_alcool=True)
+
+
+def test_lister_cocktails_complets_mineur_garde_le_curseur():
+    """La page du DAO est rendue telle quelle (curseur de la page suivante compris)"""
+    # GIVEN
+    CocktailDao().cocktail_complet = MagicMock(return_value=Page([cocktail2], suivant="curseur"))
+    service = CocktailService()
+
+    # WHEN
+    res = service.lister_cocktails_complets(id_utilisateur=1, est_majeur=False, apres="precedent")
+
+    # THEN
+    assert res == [cocktail2]
+    assert res.suivant == "curseur"
+    CocktailDao().cocktail_complet.assert_called_once_with(1, None, 10, 0, "precedent", None, sans_alcool=True)
 
 
 def test_lister_cocktails_partiels_ok():
@@ -107,6 +138,99 @@ def test_lister_cocktails_partiels_nb_manquants_invalide():
         )
 
 
+def test_classer_ingredients_debloquants_mineur():
+    """Pour un mineur, seuls les cocktails non alcoolisés sont comptés"""
+    # GIVEN
+    menthe = Ingredient(id_ingredient=273, nom_ingredient="Mint", desc_ingredient=None)
+    CocktailDao().ingredients_debloquants = MagicMock(return_value=[(menthe, 2)])
+    service = CocktailService()
+
+    # WHEN
+    res = service.classer_ingredients_debloquants(id_utilisateur=4, est_majeur=False)
+
+    # THEN
+    assert res == [(menthe, 2)]
+    CocktailDao().ingredients_debloquants.assert_called_once_with(
+        4, sans_alcool=True, limit=10, offset=0, apres=None, avant=None
+    )
+
+
+def test_classer_ingredients_debloquants_non_connecte():
+    """Exception sans utilisateur"""
+    # GIVEN
+    service = CocktailService()
+
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        service.classer_ingredients_debloquants(id_utilisateur=None, est_majeur=True)
+
+
+def test_optimiser_courses_mineur():
+    """Pour un mineur, seuls les cocktails non alcoolisés sont comptés"""
+    # GIVEN
+    menthe = Ingredient(id_ingredient=273, nom_ingredient="Mint", desc_ingredient=None)
+    CocktailDao().optimiser_courses = MagicMock(return_value=([menthe], 3))
+    service = CocktailService()
+
+    # WHEN
+    res = service.optimiser_courses(id_utilisateur=4, est_majeur=False, k=2)
+
+    # THEN
+    assert res == ([menthe], 3)
+    CocktailDao().optimiser_courses.assert_called_once_with(4, 2, sans_alcool=True)
+
+
+@pytest.mark.parametrize("k", [0, 11, None])
+def test_optimiser_courses_k_invalide(k):
+    """Exception si k n'est pas compris entre 1 et 10"""
+    # GIVEN
+    service = CocktailService()
+
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        service.optimiser_courses(id_utilisateur=4, est_majeur=True, k=k)
+
+
+def test_lister_cocktails_soiree_mineur():
+    """Inventaires réunis, cocktails non alcoolisés seulement pour un mineur"""
+    # GIVEN
+    InventaireDao().inventaire_commun = MagicMock(return_value=([244, 251], []))
+    CocktailDao().cocktails_soiree = MagicMock(return_value=[(cocktail1, 0)])
+    service = CocktailService()
+
+    # WHEN
+    res = service.lister_cocktails_soiree(id_utilisateur=4, est_majeur=False, ids_invites=[6, 5, 4, 6])
+
+    # THEN
+    assert res == [(cocktail1, 0)]
+    InventaireDao().inventaire_commun.assert_called_once_with(4, [5, 6])
+    CocktailDao().cocktails_soiree.assert_called_once_with(
+        [244, 251], 0, sans_alcool=True, langue=None, limit=10, offset=0, apres=None, avant=None
+    )
+
+
+def test_lister_cocktails_soiree_refus():
+    """Exception si un invité ne partage pas son inventaire"""
+    # GIVEN
+    InventaireDao().inventaire_commun = MagicMock(return_value=([244], [2]))
+    service = CocktailService()
+
+    # WHEN / THEN
+    with pytest.raises(ValueError, match="2"):
+        service.lister_cocktails_soiree(id_utilisateur=3, est_majeur=True, ids_invites=[2])
+
+
+@pytest.mark.parametrize("invites", [[], [3], list(range(100, 150))])
+def test_lister_cocktails_soiree_invites_invalides(invites):
+    """Exception sans invité ou avec trop de participants"""
+    # GIVEN
+    service = CocktailService()
+
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        service.lister_cocktails_soiree(id_utilisateur=3, est_majeur=True, ids_invites=invites)
+
+
 def test_cocktails_aleatoires_ok():
     """Cocktails aléatoires"""
     # GIVEN
@@ -120,6 +244,33 @@ def test_cocktails_aleatoires_ok():
     assert len(res) == 3
 
 
+def test_cocktails_aleatoires_mineur():
+    """Pour un mineur, le tirage est fait parmi les cocktails non alcoolisés"""
+    # GIVEN
+    CocktailDao().cocktails_aleatoires = MagicMock(return_value=[cocktail2])
+    service = CocktailService()
+
+    # WHEN
+    res = service.cocktails_aleatoires(est_majeur=False, nb=3)
+
+    # THEN
+    assert res == [cocktail2]
+    CocktailDao().cocktails_aleatoires.assert_called_once_with(3, None, sans_alcool=True)
+
+
+def test_cocktail_du_jour_mineur():
+    """Le cocktail du jour d'un mineur est tiré parmi les cocktails sans alcool"""
+    # GIVEN
+    CocktailDao().cocktail_du_jour = MagicMock(return_value=cocktail3)
+
+    # WHEN
+    res = CocktailService().cocktail_du_jour(est_majeur=False, langue="FRA")
+
+    # THEN
+    assert res is cocktail3
+    CocktailDao().cocktail_du_jour.assert_called_once_with("FRA", sans_alcool=True)
+
+
 def test_cocktails_aleatoires_nb_invalide():
     """Exception si nb invalide"""
     # GIVEN
@@ -153,6 +304,35 @@ def test_obtenir_cocktail_par_id_invalide():
         service.obtenir_cocktail_par_id(-1)
 
 
+def test_realiser_cocktail_connecte():
+    """Utilisateur connecté : détails et compteur en un seul appel à la DAO"""
+    # GIVEN
+    CocktailDao().realiser_cocktail = MagicMock()
+    CocktailDao().realiser_cocktail_et_compter = MagicMock(return_value=cocktail1)
+    service = CocktailService()
+
+    # WHEN
+    res = service.realiser_cocktail(nom_cocktail="Mojito", langue="FRA", id_utilisateur=3)
+
+    # THEN
+    assert res is cocktail1
+    CocktailDao().realiser_cocktail_et_compter.assert_called_once_with(
+        3, id_cocktail=None, nom_cocktail="Mojito", langue="FRA"
+    )
+    CocktailDao().realiser_cocktail.assert_not_called()
+
+
+def test_realiser_cocktail_introuvable():
+    """Exception si le cocktail n'existe pas"""
+    # GIVEN
+    CocktailDao().realiser_cocktail_et_compter = MagicMock(return_value=None)
+    service = CocktailService()
+
+    # WHEN / THEN
+    with pytest.raises(ValueError):
+        service.realiser_cocktail(id_cocktail=999, id_utilisateur=3)
+
+
 def test_lister_tous_cocktails_ok():
     """Lister tous les cocktails"""
     # GIVEN
@@ -166,6 +346,19 @@ def test_lister_tous_cocktails_ok():
     assert len(res) == 3
 
 
+def test_exporter_catalogue_mineur():
+    """Un mineur n'exporte que les cocktails non alcoolisés"""
+    # GIVEN
+    CocktailDao().iterer_catalogue = MagicMock(return_value=iter(liste_cocktails))
+    service = CocktailService()
+
+    # WHEN
+    res = list(service.exporter_catalogue(est_majeur=False))
+
+    # THEN
+    assert [c.nom_cocktail for c in res] == ["Eau fraîche"]
+
+
 def test_lister_categories_verres():
     """Lister catégories et verres"""
     # GIVEN
@@ -173,6 +366,7 @@ def test_lister_categories_verres():
     CocktailDao().lister_verres = MagicMock(
         return_value=["Highball glass", "Martini glass"]
     )
+    DonneesReference().invalider()
     service = CocktailService()
 
     # WHEN
@@ -184,5 +378,65 @@ def test_lister_categories_verres():
     assert verres == ["Highball glass", "Martini glass"]
 
 
+
+def test_rechercher_par_filtre_categorie_verre_en_memoire():
+    """Catégorie et verre validés sans la casse, listes de référence lues une seule fois"""
+    # GIVEN
+    CocktailDao().rechercher_cocktails = MagicMock(return_value=Page(liste_cocktails))
+    CocktailDao().lister_categories = MagicMock(return_value=["Cocktail", "Shot"])
+    CocktailDao().lister_verres = MagicMock(return_value=["Highball glass"])
+    DonneesReference().invalider()
+    service = CocktailService()
+
+    # WHEN
+    service.rechercher_par_filtre(categ="cocktail", verre="HIGHBALL GLASS")
+    service.rechercher_par_filtre(categ="Shot")
+    with pytest.raises(ValueError, match="catégorie"):
+        service.rechercher_par_filtre(categ="Punch")
+    with pytest.raises(ValueError, match="verre"):
+        service.rechercher_par_filtre(verre="Mug")
+
+    # THEN
+    assert CocktailDao().lister_categories.call_count == 1
+    assert CocktailDao().lister_verres.call_count == 1
+
+
+def test_completer_nom_mineur():
+    """Un mineur ne se voit proposer que des cocktails sans alcool"""
+    # GIVEN
+    IndexPrefixes().cocktails = MagicMock(return_value=[(12, "Virgin Mojito")])
+    service = CocktailService()
+
+    # WHEN
+    res = service.completer_nom(" vir", est_majeur=False, limit=3)
+
+    # THEN
+    assert res == [(12, "Virgin Mojito")]
+    IndexPrefixes().cocktails.assert_called_once_with("vir", 3, sans_alcool=True)
+
+
+@pytest.mark.parametrize(
+    "est_majeur, sans_alcool, attendu",
+    [(True, False, False), (None, False, False), (True, True, True), (False, False, True)],
+)
+def test_completer_nom_sans_alcool(est_majeur, sans_alcool, attendu):
+    """sans_alcool ne fait que restreindre : un mineur n'a jamais de cocktail alcoolisé"""
+    # GIVEN
+    IndexPrefixes().cocktails = MagicMock(return_value=[])
+
+    # WHEN
+    CocktailService().completer_nom("mo", est_majeur=est_majeur, sans_alcool=sans_alcool)
+
+    # THEN
+    IndexPrefixes().cocktails.assert_called_once_with("mo", 10, sans_alcool=attendu)
+
+
+@pytest.mark.parametrize("limit", [0, 21])
+def test_completer_nom_limit_invalide(limit):
+    """Nombre de propositions hors de 1..20 -> ValueError"""
+    with pytest.raises(ValueError):
+        CocktailService().completer_nom("mo", limit=limit)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
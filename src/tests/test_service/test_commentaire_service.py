@@ -153,6 +153,20 @@ def test_supprimer_commentaire_echec():
     CommentaireDao().supprimer.assert_called_once_with(1, 3)
 
 
+# -----------------------------
+# Tests consulter
+# -----------------------------
+def test_consulter_commentaires_cocktail():
+    """Cocktail, commentaires et note relayés depuis un seul appel à la DAO"""
+    CommentaireDao().trouver_avec_cocktail = MagicMock(return_value=("cocktail", COM_LISTE, 4.0))
+    service = CommentaireService()
+
+    cocktail, commentaires, note = service.consulter_commentaires_cocktail(0)
+
+    assert (cocktail, commentaires, note) == ("cocktail", COM_LISTE, 4.0)
+    CommentaireDao().trouver_avec_cocktail.assert_called_once_with(0)
+
+
 if __name__ == "__main__":
     import pytest
     pytest.main([__file__, "-v"])
@@ -3,6 +3,9 @@ from unittest.mock import MagicMock
 import pytest
 
 from business_object.ingredient import Ingredient
+from dao.index_ingredients import IndexIngredients
+from dao.index_manquants import IndexManquants
+from dao.index_prefixes import IndexPrefixes
 from dao.inventaire_dao import InventaireDao
 from service.inventaire_service import InventaireService
 
@@ -170,6 +173,78 @@ def test_suggerer_ingredients_type_invalide():
         assert True
 
 
+
+def test_resoudre_ingredient_plus_proche_unique():
+    """Un seul ingrédient au plus près du nom saisi -> il est retenu, sans suggestion"""
+    # GIVEN
+    IndexIngredients().proches = MagicMock(return_value=[(1, ING_LISTE[1]), (2, ING_LISTE[0])])
+
+    # WHEN
+    ingredient, suggestions = InventaireService().resoudre_ingredient("lme")
+
+    # THEN
+    assert ingredient is ING_LISTE[1]
+    assert suggestions == []
+
+
+def test_resoudre_ingredient_ambigu():
+    """Plusieurs ingrédients à la même distance -> aucun retenu, tous proposés dans l'ordre"""
+    # GIVEN
+    IndexIngredients().proches = MagicMock(return_value=[(1, ING_LISTE[1]), (1, ING_LISTE[2])])
+
+    # WHEN
+    ingredient, suggestions = InventaireService().resoudre_ingredient("lugar", nb_suggestions=3)
+
+    # THEN
+    assert ingredient is None
+    assert suggestions == [ING_LISTE[1], ING_LISTE[2]]
+    IndexIngredients().proches.assert_called_once_with("lugar", 3)
+
+
+def test_resoudre_ingredient_inconnu():
+    """Aucun ingrédient proche -> ni ingrédient ni suggestion"""
+    # GIVEN
+    IndexIngredients().proches = MagicMock(return_value=[])
+
+    # WHEN / THEN
+    assert InventaireService().resoudre_ingredient("blublub") == (None, [])
+
+
+def test_completer_ingredient_noms():
+    """Le service ne renvoie que les noms des ingrédients proposés par l'index"""
+    # GIVEN
+    IndexPrefixes().ingredients = MagicMock(return_value=[(244, "Light Rum"), (251, "Lime")])
+    service = InventaireService()
+
+    # WHEN
+    res = service.completer_ingredient("  li ", limit=5)
+
+    # THEN
+    assert res == ["Light Rum", "Lime"]
+    IndexPrefixes().ingredients.assert_called_once_with("li", 5)
+
+
+@pytest.mark.parametrize("limit", [0, 21])
+def test_completer_ingredient_limit_invalide(limit):
+    """Nombre de propositions hors de 1..20 -> ValueError"""
+    with pytest.raises(ValueError):
+        InventaireService().completer_ingredient("li", limit=limit)
+
+
+def test_verifier_index_manquants():
+    """Entrées de l'index vérifiées contre l'inventaire lu en base"""
+    # GIVEN
+    IndexManquants().utilisateurs = MagicMock(return_value=[3, 5])
+    IndexManquants().verifier_tout = MagicMock(return_value=[5])
+
+    # WHEN
+    res = InventaireService().verifier_index_manquants()
+
+    # THEN
+    assert res == {"verifies": 2, "incoherents": [5]}
+    IndexManquants().verifier_tout.assert_called_once_with(InventaireDao().ids_inventaire)
+
+
 if __name__ == "__main__":
     import pytest
 
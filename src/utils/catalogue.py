@@ -0,0 +1,25 @@
+"""Notification des rechargements du catalogue (cocktails, ingrédients, recettes)
+
+Les structures construites en mémoire à partir du catalogue s'abonnent ici ;
+ResetDatabase les prévient après chaque rechargement pour qu'elles se
+reconstruisent au prochain appel.
+"""
+
+import logging
+
+_abonnes = []
+
+
+def abonner_rechargement(fonction):
+    """Appeler fonction() après chaque rechargement du catalogue (utilisable en décorateur)"""
+    _abonnes.append(fonction)
+    return fonction
+
+
+def notifier_rechargement():
+    """Prévenir les abonnés que le catalogue a été rechargé"""
+    for fonction in list(_abonnes):
+        try:
+            fonction()
+        except Exception:
+            logging.exception("Erreur lors de la notification du rechargement du catalogue")
@@ -1,3 +1,4 @@
+import inspect
 import logging.config
 import numbers
 
@@ -34,53 +35,72 @@ def log(func):
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        logger = logging.getLogger(__name__)
-
-        LogIndetation.increase_indentation()
-        indentation = LogIndetation.get_indentation()
-
-        # Recuperation des parametres de la methode
-        class_name = args[0].__class__.__name__ if args else ""
-        method_name = func.__name__
-        args_list = list(
-            [
-                str(arg) if not isinstance(arg, numbers.Number) else arg
-                for arg in args[1:]
-            ]
-            + list(kwargs.values())
-        )
-
-        # pour cacher les mots de passe
-        param_names = func.__code__.co_varnames[1 : func.__code__.co_argcount]
-        for i, v in enumerate(param_names):
-            if v in ["password", "passwd", "pwd", "pass", "mot_de_passe", "mdp"]:
-                args_list[i] = "*****"
-
-        # Transforme en tuple pour avoir un affichage avec des parentheses
-        args_list = tuple(args_list)
-
-        # Affichage dans le fichier de log
-        logger.info(f"{indentation}{class_name}.{method_name}{args_list} - DEBUT")
+        logger, indentation, appel = _debut_log(func, args, kwargs)
         result = func(*args, **kwargs)
-        logger.info(f"{indentation}{class_name}.{method_name}{args_list} - FIN")
-
-        # Reduction de l affichage de la sortie si trop longue
-        if isinstance(result, list):
-            result_str = str([str(item) for item in result[:3]])
-            result_str += " ... (" + str(len(result)) + " elements)"
-        elif isinstance(result, dict):
-            result_str = [(str(k), str(v)) for k, v in result.items()][:3]
-            result_str += " ... (" + str(len(result)) + " elements)"
-        elif isinstance(result, str) and len(result) > 50:
-            result_str = result[:50]
-            result_str += " ... (" + str(len(result)) + " caracteres)"
-        else:
-            result_str = str(result)
-
-        logger.info(f"{indentation}   └─> Sortie : {result_str}")
-
-        LogIndetation.decrease_indentation()
+        _fin_log(logger, indentation, appel, result)
+        return result
 
+    @wraps(func)
+    async def wrapper_async(*args, **kwargs):
+        logger, indentation, appel = _debut_log(func, args, kwargs)
+        result = await func(*args, **kwargs)
+        _fin_log(logger, indentation, appel, result)
         return result
 
-    return wrapper
+    # Les méthodes des DAO asynchrones doivent rester des coroutines
+    return wrapper_async if inspect.iscoroutinefunction(func) else wrapper
+
+
+def _debut_log(func, args, kwargs):
+    """Log de l'appel de la méthode avec ses paramètres"""
+    logger = logging.getLogger(__name__)
+
+    LogIndetation.increase_indentation()
+    indentation = LogIndetation.get_indentation()
+
+    # Recuperation des parametres de la methode
+    class_name = args[0].__class__.__name__ if args else ""
+    method_name = func.__name__
+    args_list = list(
+        [
+            str(arg) if not isinstance(arg, numbers.Number) else arg
+            for arg in args[1:]
+        ]
+        + list(kwargs.values())
+    )
+
+    # pour cacher les mots de passe
+    param_names = func.__code__.co_varnames[1 : func.__code__.co_argcount]
+    for i, v in enumerate(param_names):
+        if v in ["password", "passwd", "pwd", "pass", "mot_de_passe", "mdp"]:
+            args_list[i] = "*****"
+
+    # Transforme en tuple pour avoir un affichage avec des parentheses
+    args_list = tuple(args_list)
+    appel = f"{class_name}.{method_name}{args_list}"
+
+    # Affichage dans le fichier de log
+    logger.info(f"{indentation}{appel} - DEBUT")
+    return logger, indentation, appel
+
+
+def _fin_log(logger, indentation, appel, result):
+    """Log de la sortie (réduite si trop longue) de la méthode"""
+    logger.info(f"{indentation}{appel} - FIN")
+
+    # Reduction de l affichage de la sortie si trop longue
+    if isinstance(result, list):
+        result_str = str([str(item) for item in result[:3]])
+        result_str += " ... (" + str(len(result)) + " elements)"
+    elif isinstance(result, dict):
+        result_str = [(str(k), str(v)) for k, v in result.items()][:3]
+        result_str += " ... (" + str(len(result)) + " elements)"
+    elif isinstance(result, str) and len(result) > 50:
+        result_str = result[:50]
+        result_str += " ... (" + str(len(result)) + " caracteres)"
+    else:
+        result_str = str(result)
+
+    logger.info(f"{indentation}   └─> Sortie : {result_str}")
+
+    LogIndetation.decrease_indentation()
@@ -5,6 +5,8 @@ from unittest import mock
 import dotenv
 
 from dao.db_connection import DBConnection
+from dao.requetes_preparees import RegistreRequetesPreparees
+from utils.catalogue import notifier_rechargement
 from utils.log_decorator import log
 from utils.singleton import Singleton
 
@@ -48,6 +50,11 @@ class ResetDatabase(metaclass=Singleton):
             logging.info(e)
             raise
 
+        # Les requêtes préparées visaient les tables supprimées
+        RegistreRequetesPreparees().reinitialiser()
+        # Les structures en mémoire construites depuis le catalogue sont à refaire
+        notifier_rechargement()
+
         return True
 
 